@@ -0,0 +1,78 @@
+"""Add meeting_recording_index maintained from meetings.data recordings
+
+Revision ID: b2c3d4e5f6a7
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2c3d4e5f6a7'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'meeting_recording_index',
+        sa.Column('recording_id', sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column('meeting_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.Text(), server_default='', nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('recording_id'),
+    )
+    op.create_index('ix_meeting_recording_index_meeting_id', 'meeting_recording_index', ['meeting_id'])
+    op.create_index(
+        'ix_meeting_recording_index_user_created',
+        'meeting_recording_index',
+        ['user_id', 'created_at', 'recording_id'],
+    )
+
+    op.execute("""
+CREATE OR REPLACE FUNCTION sync_meeting_recording_index() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.data->'recordings' IS NOT DISTINCT FROM OLD.data->'recordings' THEN
+        RETURN NEW;
+    END IF;
+    DELETE FROM meeting_recording_index WHERE meeting_id = NEW.id;
+    IF jsonb_typeof(NEW.data->'recordings') = 'array' THEN
+        INSERT INTO meeting_recording_index (recording_id, meeting_id, user_id, created_at)
+        SELECT DISTINCT ON ((rec->>'id')::bigint)
+               (rec->>'id')::bigint, NEW.id, NEW.user_id, COALESCE(rec->>'created_at', '')
+        FROM jsonb_array_elements(NEW.data->'recordings') AS rec
+        WHERE jsonb_typeof(rec) = 'object' AND (rec->>'id') ~ '^[0-9]{1,18}$'
+        ON CONFLICT (recording_id) DO UPDATE
+            SET meeting_id = EXCLUDED.meeting_id, user_id = EXCLUDED.user_id, created_at = EXCLUDED.created_at;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""")
+    op.execute("""
+CREATE TRIGGER trg_meeting_recording_index
+AFTER INSERT OR UPDATE OF data ON meetings
+FOR EACH ROW EXECUTE FUNCTION sync_meeting_recording_index()
+""")
+    op.execute("""
+INSERT INTO meeting_recording_index (recording_id, meeting_id, user_id, created_at)
+SELECT DISTINCT ON ((rec->>'id')::bigint)
+       (rec->>'id')::bigint, m.id, m.user_id, COALESCE(rec->>'created_at', '')
+FROM meetings AS m, jsonb_array_elements(m.data->'recordings') AS rec
+WHERE jsonb_typeof(m.data->'recordings') = 'array'
+  AND jsonb_typeof(rec) = 'object' AND (rec->>'id') ~ '^[0-9]{1,18}$'
+ORDER BY (rec->>'id')::bigint, m.id DESC
+ON CONFLICT (recording_id) DO NOTHING
+""")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_meeting_recording_index ON meetings")
+    op.execute("DROP FUNCTION IF EXISTS sync_meeting_recording_index()")
+    op.drop_index('ix_meeting_recording_index_user_created', table_name='meeting_recording_index')
+    op.drop_index('ix_meeting_recording_index_meeting_id', table_name='meeting_recording_index')
+    op.drop_table('meeting_recording_index')
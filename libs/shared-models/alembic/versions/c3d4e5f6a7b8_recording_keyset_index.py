@@ -0,0 +1,25 @@
+"""Extend ix_recording_user_created with id for keyset pagination
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d4e5f6a7b8'
+down_revision = 'b2c3d4e5f6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_recording_user_created', table_name='recordings')
+    op.create_index('ix_recording_user_created', 'recordings', ['user_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recording_user_created', table_name='recordings')
+    op.create_index('ix_recording_user_created', 'recordings', ['user_id', 'created_at'])
@@ -0,0 +1,123 @@
+"""Partition transcriptions by month of the meeting's creation time
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19 00:00:00.000000
+
+Rebuilds ``transcriptions`` as a table partitioned by ``RANGE (meeting_created_at)``
+with one partition per month that has meetings with segments, the next two
+months and a default partition. Existing rows are copied in a single
+INSERT ... SELECT, so on large installs run it in a maintenance window.
+
+"""
+from datetime import datetime
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e5f6a7b8c9'
+down_revision = 'c3d4e5f6a7b8'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ["id", "meeting_id", "start_time", "end_time", "text", "speaker", "language", "created_at", "session_uid"]
+INDEXES = (
+    ('ix_transcriptions_id', ['id']),
+    ('ix_transcriptions_meeting_id', ['meeting_id']),
+    ('ix_transcriptions_session_uid', ['session_uid']),
+    ('ix_transcription_meeting_start', ['meeting_id', 'start_time']),
+)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _drop_indexes():
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_indexes():
+    for name, columns in INDEXES:
+        op.create_index(name, 'transcriptions', columns)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE transcriptions RENAME TO transcriptions_unpartitioned")
+    op.execute("ALTER TABLE transcriptions_unpartitioned RENAME CONSTRAINT transcriptions_pkey TO transcriptions_unpartitioned_pkey")
+    _drop_indexes()
+    op.execute("ALTER SEQUENCE transcriptions_id_seq OWNED BY NONE")
+
+    op.execute("""
+CREATE TABLE transcriptions (
+    id INTEGER NOT NULL DEFAULT nextval('transcriptions_id_seq'),
+    meeting_created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    meeting_id INTEGER NOT NULL REFERENCES meetings (id),
+    start_time FLOAT NOT NULL,
+    end_time FLOAT NOT NULL,
+    text TEXT NOT NULL,
+    speaker VARCHAR(255),
+    language VARCHAR(10),
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    session_uid VARCHAR,
+    PRIMARY KEY (id, meeting_created_at)
+) PARTITION BY RANGE (meeting_created_at)
+""")
+    op.execute("ALTER SEQUENCE transcriptions_id_seq OWNED BY transcriptions.id")
+    op.execute("CREATE TABLE transcriptions_default PARTITION OF transcriptions DEFAULT")
+
+    # One partition per month from the oldest meeting with segments to two months ahead
+    oldest = op.get_bind().exec_driver_sql(
+        "SELECT min(m.created_at) FROM meetings m WHERE EXISTS "
+        "(SELECT 1 FROM transcriptions_unpartitioned t WHERE t.meeting_id = m.id)"
+    ).scalar()
+    now = datetime.utcnow()
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), 2)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE transcriptions_p{month.year:04d}_{month.month:02d} PARTITION OF transcriptions "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        month = end
+
+    # Meetings without created_at keep their segments in the default partition
+    op.execute(f"""
+INSERT INTO transcriptions (meeting_created_at, {', '.join(COLUMNS)})
+SELECT COALESCE(m.created_at, TIMESTAMP '1970-01-01'), {', '.join('t.' + c for c in COLUMNS)}
+FROM transcriptions_unpartitioned t JOIN meetings m ON m.id = t.meeting_id
+""")
+    op.execute("DROP TABLE transcriptions_unpartitioned")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE transcriptions RENAME TO transcriptions_partitioned")
+    op.execute("ALTER TABLE transcriptions_partitioned RENAME CONSTRAINT transcriptions_pkey TO transcriptions_partitioned_pkey")
+    _drop_indexes()
+    op.execute("ALTER SEQUENCE transcriptions_id_seq OWNED BY NONE")
+
+    op.execute("""
+CREATE TABLE transcriptions (
+    id INTEGER NOT NULL DEFAULT nextval('transcriptions_id_seq'),
+    meeting_id INTEGER NOT NULL REFERENCES meetings (id),
+    start_time FLOAT NOT NULL,
+    end_time FLOAT NOT NULL,
+    text TEXT NOT NULL,
+    speaker VARCHAR(255),
+    language VARCHAR(10),
+    created_at TIMESTAMP WITHOUT TIME ZONE,
+    session_uid VARCHAR,
+    CONSTRAINT transcriptions_pkey PRIMARY KEY (id)
+)
+""")
+    op.execute("ALTER SEQUENCE transcriptions_id_seq OWNED BY transcriptions.id")
+    columns = ', '.join(COLUMNS)
+    op.execute(f"INSERT INTO transcriptions ({columns}) SELECT {columns} FROM transcriptions_partitioned")
+    # Drops the partitions too
+    op.execute("DROP TABLE transcriptions_partitioned")
+    _create_indexes()
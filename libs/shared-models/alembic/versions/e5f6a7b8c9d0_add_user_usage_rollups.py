@@ -0,0 +1,166 @@
+"""Add user_usage_stats and user_usage_daily rollups maintained from meetings
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f6a7b8c9d0'
+down_revision = 'd4e5f6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_usage_stats',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('total_meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('failed_meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('active_meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_duration_s', sa.Float(), server_default='0', nullable=False),
+        sa.Column('completed_with_duration', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('first_meeting_at', sa.DateTime(), nullable=True),
+        sa.Column('last_meeting_at', sa.DateTime(), nullable=True),
+        sa.Column('hour_counts', postgresql.ARRAY(sa.Integer()), server_default=sa.text('array_fill(0, ARRAY[24])'), nullable=False),
+        sa.Column('platform_counts', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_table(
+        'user_usage_daily',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('failed_meetings', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_duration_s', sa.Float(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+    op.create_index('ix_user_usage_daily_day', 'user_usage_daily', ['day'])
+
+    # No meeting may change between the backfill and the trigger taking over
+    op.execute("LOCK TABLE meetings IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+CREATE OR REPLACE FUNCTION apply_meeting_usage(m meetings, delta integer) RETURNS void AS $$
+DECLARE
+    d_completed integer := CASE WHEN m.status = 'completed' THEN delta ELSE 0 END;
+    d_failed integer := CASE WHEN m.status = 'failed' THEN delta ELSE 0 END;
+    d_active integer := CASE WHEN m.status IN ('requested', 'joining', 'awaiting_admission', 'active') THEN delta ELSE 0 END;
+    d_timed integer := CASE WHEN m.status = 'completed' AND m.start_time IS NOT NULL AND m.end_time IS NOT NULL THEN delta ELSE 0 END;
+    d_duration double precision := CASE WHEN d_timed <> 0 THEN delta * EXTRACT(EPOCH FROM m.end_time - m.start_time) ELSE 0 END;
+    d_hour integer := EXTRACT(HOUR FROM m.created_at)::integer + 1;
+BEGIN
+    INSERT INTO user_usage_stats (user_id) VALUES (m.user_id) ON CONFLICT (user_id) DO NOTHING;
+    UPDATE user_usage_stats SET
+        total_meetings = total_meetings + delta,
+        completed_meetings = completed_meetings + d_completed,
+        failed_meetings = failed_meetings + d_failed,
+        active_meetings = active_meetings + d_active,
+        completed_duration_s = completed_duration_s + d_duration,
+        completed_with_duration = completed_with_duration + d_timed,
+        platform_counts = jsonb_set(platform_counts, ARRAY[m.platform::text],
+                                    to_jsonb(COALESCE((platform_counts->>m.platform)::integer, 0) + delta)),
+        first_meeting_at = CASE WHEN delta > 0 THEN LEAST(first_meeting_at, m.created_at) ELSE first_meeting_at END,
+        last_meeting_at = CASE WHEN delta > 0 THEN GREATEST(last_meeting_at, m.created_at) ELSE last_meeting_at END
+    WHERE user_id = m.user_id;
+    IF m.created_at IS NOT NULL THEN
+        UPDATE user_usage_stats SET hour_counts[d_hour] = hour_counts[d_hour] + delta WHERE user_id = m.user_id;
+        INSERT INTO user_usage_daily AS d (user_id, day, meetings, completed_meetings, failed_meetings, completed_duration_s)
+        VALUES (m.user_id, m.created_at::date, delta, d_completed, d_failed, d_duration)
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            meetings = d.meetings + EXCLUDED.meetings,
+            completed_meetings = d.completed_meetings + EXCLUDED.completed_meetings,
+            failed_meetings = d.failed_meetings + EXCLUDED.failed_meetings,
+            completed_duration_s = d.completed_duration_s + EXCLUDED.completed_duration_s;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+""")
+    op.execute("""
+CREATE OR REPLACE FUNCTION sync_user_usage() RETURNS trigger AS $$
+BEGIN
+    -- All of a user's meetings share one rollup row, so leave it alone unless a counter moves:
+    -- requested -> joining -> awaiting_admission -> active, or times set before completion, don't
+    IF TG_OP = 'UPDATE' AND (
+            NEW.user_id, NEW.platform, NEW.created_at,
+            CASE WHEN NEW.status IN ('requested', 'joining', 'awaiting_admission', 'active') THEN 'active' ELSE NEW.status END,
+            CASE WHEN NEW.status = 'completed' THEN NEW.end_time - NEW.start_time END
+        ) IS NOT DISTINCT FROM (
+            OLD.user_id, OLD.platform, OLD.created_at,
+            CASE WHEN OLD.status IN ('requested', 'joining', 'awaiting_admission', 'active') THEN 'active' ELSE OLD.status END,
+            CASE WHEN OLD.status = 'completed' THEN OLD.end_time - OLD.start_time END
+        ) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_meeting_usage(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_meeting_usage(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+    op.execute("""
+CREATE TRIGGER trg_user_usage
+AFTER INSERT OR DELETE OR UPDATE OF user_id, platform, status, start_time, end_time, created_at ON meetings
+FOR EACH ROW EXECUTE FUNCTION sync_user_usage()
+""")
+    op.execute("""
+INSERT INTO user_usage_stats (user_id, total_meetings, completed_meetings, failed_meetings, active_meetings,
+                              completed_duration_s, completed_with_duration, first_meeting_at, last_meeting_at,
+                              hour_counts, platform_counts)
+SELECT m.user_id,
+       count(*),
+       count(*) FILTER (WHERE m.status = 'completed'),
+       count(*) FILTER (WHERE m.status = 'failed'),
+       count(*) FILTER (WHERE m.status IN ('requested', 'joining', 'awaiting_admission', 'active')),
+       COALESCE(sum(EXTRACT(EPOCH FROM m.end_time - m.start_time))
+                FILTER (WHERE m.status = 'completed' AND m.start_time IS NOT NULL AND m.end_time IS NOT NULL), 0),
+       count(*) FILTER (WHERE m.status = 'completed' AND m.start_time IS NOT NULL AND m.end_time IS NOT NULL),
+       min(m.created_at),
+       max(m.created_at),
+       (SELECT array_agg(COALESCE(c.n, 0) ORDER BY g.hour)
+        FROM generate_series(0, 23) AS g(hour)
+        LEFT JOIN (SELECT EXTRACT(HOUR FROM created_at)::integer AS hour, count(*)::integer AS n
+                   FROM meetings WHERE user_id = m.user_id AND created_at IS NOT NULL GROUP BY 1) AS c
+        ON c.hour = g.hour),
+       (SELECT jsonb_object_agg(p.platform, p.n)
+        FROM (SELECT platform, count(*) AS n FROM meetings WHERE user_id = m.user_id GROUP BY platform) AS p)
+FROM meetings AS m
+GROUP BY m.user_id
+ON CONFLICT (user_id) DO NOTHING
+""")
+    op.execute("""
+INSERT INTO user_usage_daily (user_id, day, meetings, completed_meetings, failed_meetings, completed_duration_s)
+SELECT user_id,
+       created_at::date,
+       count(*),
+       count(*) FILTER (WHERE status = 'completed'),
+       count(*) FILTER (WHERE status = 'failed'),
+       COALESCE(sum(EXTRACT(EPOCH FROM end_time - start_time))
+                FILTER (WHERE status = 'completed' AND start_time IS NOT NULL AND end_time IS NOT NULL), 0)
+FROM meetings
+WHERE created_at IS NOT NULL
+GROUP BY user_id, created_at::date
+ON CONFLICT (user_id, day) DO NOTHING
+""")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_user_usage ON meetings")
+    op.execute("DROP FUNCTION IF EXISTS sync_user_usage()")
+    op.execute("DROP FUNCTION IF EXISTS apply_meeting_usage(meetings, integer)")
+    op.drop_index('ix_user_usage_daily_day', table_name='user_usage_daily')
+    op.drop_table('user_usage_daily')
+    op.drop_table('user_usage_stats')
@@ -0,0 +1,297 @@
+"""
+Cached API-token authentication shared by the user-facing services.
+
+Every authenticated request used to run ``SELECT api_tokens JOIN users``.
+``authenticate_token()`` puts two tiers in front of that query:
+
+- an in-process TTL LRU (per service replica), and
+- an optional Redis tier shared by all replicas/services.
+
+Entries are keyed by a SHA-256 hash of the token, so raw tokens are never
+stored in Redis. admin-api calls ``invalidate_token()`` / ``invalidate_user()``
+when tokens are revoked or user limits/data change; the invalidation deletes
+the Redis entries and is broadcast on a pub/sub channel so that the local
+tiers of the other services drop them as well.
+
+Cached users are returned as *transient* ``User`` instances (not attached to
+any session). Code that modifies the user must load it with ``db.get(User, id)``
+and call ``invalidate_user()`` after committing.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import APIToken, User
+
+logger = logging.getLogger(__name__)
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_REDIS_TTL_SECONDS = int(os.getenv("AUTH_CACHE_REDIS_TTL_SECONDS", "300"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_ENABLED = os.getenv("AUTH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+INVALIDATION_CHANNEL = "auth_cache:invalidate"
+_TOKEN_KEY = "auth_cache:token:{}"
+_USER_TOKENS_KEY = "auth_cache:user_tokens:{}"
+
+# Columns copied into the cache; everything the services read off the user.
+_USER_FIELDS = ("id", "email", "name", "image_url", "created_at", "max_concurrent_bots", "data")
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key for a raw API token."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _user_to_entry(user: User) -> Dict[str, Any]:
+    entry = {field: getattr(user, field) for field in _USER_FIELDS}
+    if isinstance(entry["created_at"], datetime):
+        entry["created_at"] = entry["created_at"].isoformat()
+    return entry
+
+
+def _entry_to_user(entry: Dict[str, Any]) -> User:
+    fields = dict(entry)
+    if fields.get("created_at"):
+        fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+    # Deep-copy ``data`` so a handler mutating it cannot leak into the cache.
+    fields["data"] = json.loads(json.dumps(fields.get("data") or {}))
+    return User(**fields)
+
+
+class AuthCache:
+    """Two-tier (local TTL LRU + optional Redis) cache of token -> user."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = AUTH_CACHE_TTL_SECONDS,
+        redis_ttl_seconds: int = AUTH_CACHE_REDIS_TTL_SECONDS,
+        max_entries: int = AUTH_CACHE_MAX_ENTRIES,
+        enabled: bool = AUTH_CACHE_ENABLED,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._redis = None
+        self._listener_task: Optional[asyncio.Task] = None
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._user_index: Dict[int, Set[str]] = {}
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    # --- Redis wiring -----------------------------------------------------
+
+    async def attach_redis(self, redis_client, listen: bool = True) -> None:
+        """Enable the shared Redis tier (a ``redis.asyncio`` client).
+
+        With ``listen=True`` a background task applies invalidations published
+        by other services to this process's local tier.
+        """
+        self._redis = redis_client
+        if listen and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def detach_redis(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        self._redis = None
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        event = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    if event.get("user_id") is not None:
+                        self._drop_local_user(int(event["user_id"]))
+                    if event.get("token_hash"):
+                        self._drop_local(event["token_hash"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Fall back to TTL expiry until the subscription is back.
+                logger.warning(f"Auth cache invalidation listener error: {e}. Reconnecting in 5s")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    # --- Local tier -------------------------------------------------------
+
+    def _get_local(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        item = self._local.get(token_hash)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            self._drop_local(token_hash)
+            return None
+        self._local.move_to_end(token_hash)
+        return entry
+
+    def _put_local(self, token_hash: str, entry: Dict[str, Any]) -> None:
+        self._drop_local(token_hash)
+        self._local[token_hash] = (time.monotonic() + self.ttl_seconds, entry)
+        self._user_index.setdefault(entry["user"]["id"], set()).add(token_hash)
+        while len(self._local) > self.max_entries:
+            self._drop_local(next(iter(self._local)))
+
+    def _drop_local(self, token_hash: str) -> None:
+        item = self._local.pop(token_hash, None)
+        if item is None:
+            return
+        user_id = item[1]["user"]["id"]
+        hashes = self._user_index.get(user_id)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._user_index[user_id]
+
+    def _drop_local_user(self, user_id: int) -> None:
+        for token_hash in self._user_index.pop(user_id, set()):
+            self._local.pop(token_hash, None)
+
+    # --- Public API -------------------------------------------------------
+
+    async def get(self, token: str) -> Optional[Tuple[int, User]]:
+        """Return ``(token_id, user)`` from the cache, or None on a miss."""
+        if not self.enabled:
+            return None
+        token_hash = hash_token(token)
+        entry = self._get_local(token_hash)
+        if entry is not None:
+            self.local_hits += 1
+            return entry["token_id"], _entry_to_user(entry["user"])
+
+        if self._redis is not None:
+            try:
+                raw = await self._redis.get(_TOKEN_KEY.format(token_hash))
+            except Exception as e:
+                logger.warning(f"Auth cache Redis read failed: {e}")
+                raw = None
+            if raw:
+                entry = json.loads(raw)
+                self._put_local(token_hash, entry)
+                self.redis_hits += 1
+                return entry["token_id"], _entry_to_user(entry["user"])
+
+        self.misses += 1
+        return None
+
+    async def set(self, token: str, token_id: int, user: User) -> None:
+        if not self.enabled:
+            return
+        token_hash = hash_token(token)
+        entry = {"token_id": token_id, "user": _user_to_entry(user)}
+        self._put_local(token_hash, entry)
+        if self._redis is not None:
+            try:
+                user_key = _USER_TOKENS_KEY.format(user.id)
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.set(_TOKEN_KEY.format(token_hash), json.dumps(entry), ex=self.redis_ttl_seconds)
+                    pipe.sadd(user_key, token_hash)
+                    pipe.expire(user_key, self.redis_ttl_seconds)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Auth cache Redis write failed: {e}")
+
+    async def invalidate_token(self, token: str) -> None:
+        """Drop a single token everywhere (e.g. after it was revoked)."""
+        token_hash = hash_token(token)
+        self._drop_local(token_hash)
+        self.invalidations += 1
+        if self._redis is not None:
+            try:
+                await self._redis.delete(_TOKEN_KEY.format(token_hash))
+                await self._redis.publish(INVALIDATION_CHANNEL, json.dumps({"token_hash": token_hash}))
+            except Exception as e:
+                logger.warning(f"Auth cache Redis invalidation failed for token: {e}")
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token of a user (limits, data or tokens changed)."""
+        self._drop_local_user(user_id)
+        self.invalidations += 1
+        if self._redis is not None:
+            try:
+                user_key = _USER_TOKENS_KEY.format(user_id)
+                token_hashes = await self._redis.smembers(user_key)
+                keys = [_TOKEN_KEY.format(h.decode() if isinstance(h, bytes) else h) for h in token_hashes]
+                await self._redis.delete(user_key, *keys)
+                await self._redis.publish(INVALIDATION_CHANNEL, json.dumps({"user_id": user_id}))
+            except Exception as e:
+                logger.warning(f"Auth cache Redis invalidation failed for user {user_id}: {e}")
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._user_index.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "redis_enabled": self._redis is not None,
+            "entries": len(self._local),
+            "lookups": lookups,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+# Process-wide cache used by the services' auth dependencies.
+auth_cache = AuthCache()
+
+
+async def authenticate_token(
+    db: AsyncSession, token: str, cache: Optional[AuthCache] = None
+) -> Optional[User]:
+    """Resolve an API token to its user, consulting the cache first.
+
+    Returns None if the token does not exist. Unknown tokens are not cached,
+    so a freshly issued token works immediately.
+    """
+    cache = cache or auth_cache
+    cached = await cache.get(token)
+    if cached is not None:
+        return cached[1]
+
+    result = await db.execute(
+        select(APIToken.id, User)
+        .join(User, APIToken.user_id == User.id)
+        .where(APIToken.token == token)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    token_id, user = row
+    await cache.set(token, token_id, user)
+    return user
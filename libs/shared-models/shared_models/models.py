@@ -1,11 +1,11 @@
 import sqlalchemy
-from sqlalchemy import (Column, String, Text, Integer, DateTime, Float, ForeignKey, Index, UniqueConstraint)
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (BigInteger, Column, DDL, String, Text, Integer, Date, DateTime, Float, ForeignKey, Index, UniqueConstraint, event)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.sql import func, text
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime # Needed for Transcription model default
 from shared_models.schemas import Platform # Import Platform for the static method
-from typing import Optional # Added for the return type hint in constructed_meeting_url
+from typing import List, Optional # Added for the return type hint in constructed_meeting_url
 
 # Define the base class for declarative models
 Base = declarative_base()
@@ -84,8 +84,17 @@ class Meeting(Base):
         return None
 
 class Transcription(Base):
+    """
+    A finalized transcript segment.
+
+    Range-partitioned by month of ``meeting_created_at`` (the owning meeting's
+    ``created_at``); see ``shared_models.partitions``. Queries of one meeting
+    should also filter on ``meeting_created_at`` so only its partition is read.
+    """
     __tablename__ = "transcriptions"
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    # Partition key; part of the primary key because Postgres requires it
+    meeting_created_at = Column(DateTime, primary_key=True, nullable=False)
     meeting_id = Column(Integer, ForeignKey("meetings.id"), nullable=False, index=True) # Changed nullable to False, should always link
     # Removed redundant platform, meeting_url, token, client_uid, server_id as they belong to the Meeting
     start_time = Column(Float, nullable=False)
@@ -100,7 +109,18 @@ class Transcription(Base):
     session_uid = Column(String, nullable=True, index=True) # Link to the specific bot session
 
     # Index for efficient querying by meeting_id and start_time
-    __table_args__ = (Index('ix_transcription_meeting_start', 'meeting_id', 'start_time'),)
+    __table_args__ = (
+        Index('ix_transcription_meeting_start', 'meeting_id', 'start_time'),
+        {'postgresql_partition_by': 'RANGE (meeting_created_at)'},
+    )
+
+# Databases created with Base.metadata.create_all get a default partition, so inserts
+# succeed before the monthly partitions exist
+event.listen(
+    Transcription.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS transcriptions_default PARTITION OF transcriptions DEFAULT").execute_if(dialect="postgresql"),
+)
 
 # New table to store session start times
 class MeetingSession(Base):
@@ -141,7 +161,7 @@ class Recording(Base):
 
     __table_args__ = (
         Index('ix_recording_meeting_session', 'meeting_id', 'session_uid'),
-        Index('ix_recording_user_created', 'user_id', 'created_at'),
+        Index('ix_recording_user_created', 'user_id', 'created_at', 'id'),
     )
 
 
@@ -169,6 +189,10 @@ class MediaFile(Base):
     recording = relationship("Recording", back_populates="media_files")
 
 
+# Segments of a TranscriptionJob are stored with "<recording session_uid>:job-<job id>" as session_uid
+JOB_SESSION_UID_MARKER = ":job-"
+
+
 class TranscriptionJob(Base):
     """A batch transcription job — processes a recording through the transcription service."""
     __tablename__ = "transcription_jobs"
@@ -202,3 +226,241 @@ class TranscriptionJob(Base):
         Index('ix_transcription_job_status_created', 'status', 'created_at'),
         Index('ix_transcription_job_user_created', 'user_id', 'created_at'),
     )
+
+
+class MeetingRecordingIndex(Base):
+    """
+    Lookup index of the recordings stored in meetings.data['recordings'] (meeting_data metadata mode).
+
+    Maintained by the trg_meeting_recording_index trigger on meetings, so every writer of
+    meetings.data keeps it in sync. Lets listing, pagination and by-id lookups run in SQL
+    instead of loading and walking every meeting a user owns.
+    """
+    __tablename__ = "meeting_recording_index"
+    recording_id = Column(BigInteger, primary_key=True, autoincrement=False)  # Numeric id from the JSON payload
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(Text, nullable=False, server_default="")  # ISO timestamp as stored in the JSON
+
+    __table_args__ = (
+        Index('ix_meeting_recording_index_user_created', 'user_id', 'created_at', 'recording_id'),
+    )
+
+
+# Rebuilds a meeting's index rows whenever its recordings array changes.
+MEETING_RECORDING_INDEX_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_meeting_recording_index() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.data->'recordings' IS NOT DISTINCT FROM OLD.data->'recordings' THEN
+        RETURN NEW;
+    END IF;
+    DELETE FROM meeting_recording_index WHERE meeting_id = NEW.id;
+    IF jsonb_typeof(NEW.data->'recordings') = 'array' THEN
+        INSERT INTO meeting_recording_index (recording_id, meeting_id, user_id, created_at)
+        SELECT DISTINCT ON ((rec->>'id')::bigint)
+               (rec->>'id')::bigint, NEW.id, NEW.user_id, COALESCE(rec->>'created_at', '')
+        FROM jsonb_array_elements(NEW.data->'recordings') AS rec
+        WHERE jsonb_typeof(rec) = 'object' AND (rec->>'id') ~ '^[0-9]{1,18}$'
+        ON CONFLICT (recording_id) DO UPDATE
+            SET meeting_id = EXCLUDED.meeting_id, user_id = EXCLUDED.user_id, created_at = EXCLUDED.created_at;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+MEETING_RECORDING_INDEX_TRIGGER = """
+CREATE TRIGGER trg_meeting_recording_index
+AFTER INSERT OR UPDATE OF data ON meetings
+FOR EACH ROW EXECUTE FUNCTION sync_meeting_recording_index()
+"""
+
+MEETING_RECORDING_INDEX_BACKFILL = """
+INSERT INTO meeting_recording_index (recording_id, meeting_id, user_id, created_at)
+SELECT DISTINCT ON ((rec->>'id')::bigint)
+       (rec->>'id')::bigint, m.id, m.user_id, COALESCE(rec->>'created_at', '')
+FROM meetings AS m, jsonb_array_elements(m.data->'recordings') AS rec
+WHERE jsonb_typeof(m.data->'recordings') = 'array'
+  AND jsonb_typeof(rec) = 'object' AND (rec->>'id') ~ '^[0-9]{1,18}$'
+ORDER BY (rec->>'id')::bigint, m.id DESC
+ON CONFLICT (recording_id) DO NOTHING
+"""
+
+# Databases created with Base.metadata.create_all get the trigger and existing rows too
+for _statement in (MEETING_RECORDING_INDEX_FUNCTION, MEETING_RECORDING_INDEX_TRIGGER, MEETING_RECORDING_INDEX_BACKFILL):
+    event.listen(
+        MeetingRecordingIndex.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+
+
+class UserUsageStats(Base):
+    """
+    Per-user rollup of the meetings table, for the admin analytics endpoints.
+
+    Maintained by the trg_user_usage trigger on meetings together with
+    UserUsageDaily, so dashboards read one row instead of every meeting a user
+    owns. The trigger writes them only when a meeting is created or deleted, or
+    changes a counted state (active, completed, failed, or a completed meeting's
+    duration), not on every step of joining. first/last_meeting_at only move
+    forward: deleting a meeting does not roll them back.
+    """
+    __tablename__ = "user_usage_stats"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    total_meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    completed_meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    failed_meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    active_meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    completed_duration_s = Column(Float, nullable=False, server_default='0', default=0.0)  # Completed meetings with start and end
+    completed_with_duration = Column(Integer, nullable=False, server_default='0', default=0)
+    first_meeting_at = Column(DateTime, nullable=True)
+    last_meeting_at = Column(DateTime, nullable=True)
+    hour_counts = Column(ARRAY(Integer), nullable=False, server_default=text("array_fill(0, ARRAY[24])"))  # Meetings per creation hour (0-23)
+    platform_counts = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"), default=lambda: {})
+
+    def most_used_platform(self) -> Optional[str]:
+        counts = {platform: n for platform, n in (self.platform_counts or {}).items() if n > 0}
+        return max(counts, key=counts.get) if counts else None
+
+    def peak_hours(self, top: int = 3) -> List[int]:
+        hours = [hour for hour, n in enumerate(self.hour_counts or []) if n > 0]
+        return sorted(hours, key=lambda hour: self.hour_counts[hour], reverse=True)[:top]
+
+
+class UserUsageDaily(Base):
+    """Per-user, per-day (meeting creation date) rollup of the meetings table; see UserUsageStats."""
+    __tablename__ = "user_usage_daily"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    day = Column(Date, primary_key=True)
+    meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    completed_meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    failed_meetings = Column(Integer, nullable=False, server_default='0', default=0)
+    completed_duration_s = Column(Float, nullable=False, server_default='0', default=0.0)
+
+    __table_args__ = (
+        Index('ix_user_usage_daily_day', 'day'),
+    )
+
+
+# Adds (delta=1) or removes (delta=-1) one meeting row's contribution to the rollups.
+USER_USAGE_APPLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION apply_meeting_usage(m meetings, delta integer) RETURNS void AS $$
+DECLARE
+    d_completed integer := CASE WHEN m.status = 'completed' THEN delta ELSE 0 END;
+    d_failed integer := CASE WHEN m.status = 'failed' THEN delta ELSE 0 END;
+    d_active integer := CASE WHEN m.status IN ('requested', 'joining', 'awaiting_admission', 'active') THEN delta ELSE 0 END;
+    d_timed integer := CASE WHEN m.status = 'completed' AND m.start_time IS NOT NULL AND m.end_time IS NOT NULL THEN delta ELSE 0 END;
+    d_duration double precision := CASE WHEN d_timed <> 0 THEN delta * EXTRACT(EPOCH FROM m.end_time - m.start_time) ELSE 0 END;
+    d_hour integer := EXTRACT(HOUR FROM m.created_at)::integer + 1;
+BEGIN
+    INSERT INTO user_usage_stats (user_id) VALUES (m.user_id) ON CONFLICT (user_id) DO NOTHING;
+    UPDATE user_usage_stats SET
+        total_meetings = total_meetings + delta,
+        completed_meetings = completed_meetings + d_completed,
+        failed_meetings = failed_meetings + d_failed,
+        active_meetings = active_meetings + d_active,
+        completed_duration_s = completed_duration_s + d_duration,
+        completed_with_duration = completed_with_duration + d_timed,
+        platform_counts = jsonb_set(platform_counts, ARRAY[m.platform::text],
+                                    to_jsonb(COALESCE((platform_counts->>m.platform)::integer, 0) + delta)),
+        first_meeting_at = CASE WHEN delta > 0 THEN LEAST(first_meeting_at, m.created_at) ELSE first_meeting_at END,
+        last_meeting_at = CASE WHEN delta > 0 THEN GREATEST(last_meeting_at, m.created_at) ELSE last_meeting_at END
+    WHERE user_id = m.user_id;
+    IF m.created_at IS NOT NULL THEN
+        UPDATE user_usage_stats SET hour_counts[d_hour] = hour_counts[d_hour] + delta WHERE user_id = m.user_id;
+        INSERT INTO user_usage_daily AS d (user_id, day, meetings, completed_meetings, failed_meetings, completed_duration_s)
+        VALUES (m.user_id, m.created_at::date, delta, d_completed, d_failed, d_duration)
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            meetings = d.meetings + EXCLUDED.meetings,
+            completed_meetings = d.completed_meetings + EXCLUDED.completed_meetings,
+            failed_meetings = d.failed_meetings + EXCLUDED.failed_meetings,
+            completed_duration_s = d.completed_duration_s + EXCLUDED.completed_duration_s;
+    END IF;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+USER_USAGE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_user_usage() RETURNS trigger AS $$
+BEGIN
+    -- All of a user's meetings share one rollup row, so leave it alone unless a counter moves:
+    -- requested -> joining -> awaiting_admission -> active, or times set before completion, don't
+    IF TG_OP = 'UPDATE' AND (
+            NEW.user_id, NEW.platform, NEW.created_at,
+            CASE WHEN NEW.status IN ('requested', 'joining', 'awaiting_admission', 'active') THEN 'active' ELSE NEW.status END,
+            CASE WHEN NEW.status = 'completed' THEN NEW.end_time - NEW.start_time END
+        ) IS NOT DISTINCT FROM (
+            OLD.user_id, OLD.platform, OLD.created_at,
+            CASE WHEN OLD.status IN ('requested', 'joining', 'awaiting_admission', 'active') THEN 'active' ELSE OLD.status END,
+            CASE WHEN OLD.status = 'completed' THEN OLD.end_time - OLD.start_time END
+        ) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_meeting_usage(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_meeting_usage(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+USER_USAGE_TRIGGER = """
+CREATE TRIGGER trg_user_usage
+AFTER INSERT OR DELETE OR UPDATE OF user_id, platform, status, start_time, end_time, created_at ON meetings
+FOR EACH ROW EXECUTE FUNCTION sync_user_usage()
+"""
+
+USER_USAGE_STATS_BACKFILL = """
+INSERT INTO user_usage_stats (user_id, total_meetings, completed_meetings, failed_meetings, active_meetings,
+                              completed_duration_s, completed_with_duration, first_meeting_at, last_meeting_at,
+                              hour_counts, platform_counts)
+SELECT m.user_id,
+       count(*),
+       count(*) FILTER (WHERE m.status = 'completed'),
+       count(*) FILTER (WHERE m.status = 'failed'),
+       count(*) FILTER (WHERE m.status IN ('requested', 'joining', 'awaiting_admission', 'active')),
+       COALESCE(sum(EXTRACT(EPOCH FROM m.end_time - m.start_time))
+                FILTER (WHERE m.status = 'completed' AND m.start_time IS NOT NULL AND m.end_time IS NOT NULL), 0),
+       count(*) FILTER (WHERE m.status = 'completed' AND m.start_time IS NOT NULL AND m.end_time IS NOT NULL),
+       min(m.created_at),
+       max(m.created_at),
+       (SELECT array_agg(COALESCE(c.n, 0) ORDER BY g.hour)
+        FROM generate_series(0, 23) AS g(hour)
+        LEFT JOIN (SELECT EXTRACT(HOUR FROM created_at)::integer AS hour, count(*)::integer AS n
+                   FROM meetings WHERE user_id = m.user_id AND created_at IS NOT NULL GROUP BY 1) AS c
+        ON c.hour = g.hour),
+       (SELECT jsonb_object_agg(p.platform, p.n)
+        FROM (SELECT platform, count(*) AS n FROM meetings WHERE user_id = m.user_id GROUP BY platform) AS p)
+FROM meetings AS m
+GROUP BY m.user_id
+ON CONFLICT (user_id) DO NOTHING
+"""
+
+USER_USAGE_DAILY_BACKFILL = """
+INSERT INTO user_usage_daily (user_id, day, meetings, completed_meetings, failed_meetings, completed_duration_s)
+SELECT user_id,
+       created_at::date,
+       count(*),
+       count(*) FILTER (WHERE status = 'completed'),
+       count(*) FILTER (WHERE status = 'failed'),
+       COALESCE(sum(EXTRACT(EPOCH FROM end_time - start_time))
+                FILTER (WHERE status = 'completed' AND start_time IS NOT NULL AND end_time IS NOT NULL), 0)
+FROM meetings
+WHERE created_at IS NOT NULL
+GROUP BY user_id, created_at::date
+ON CONFLICT (user_id, day) DO NOTHING
+"""
+
+
+# The functions reference the meetings row type, so they are created once every table exists
+@event.listens_for(Base.metadata, "after_create")
+def _create_user_usage_trigger(target, connection, tables=(), **kw):
+    if connection.dialect.name != "postgresql" or UserUsageStats.__table__ not in tables:
+        return
+    for statement in (USER_USAGE_APPLY_FUNCTION, USER_USAGE_TRIGGER_FUNCTION, USER_USAGE_TRIGGER,
+                      USER_USAGE_STATS_BACKFILL, USER_USAGE_DAILY_BACKFILL):
+        connection.execute(text(statement))
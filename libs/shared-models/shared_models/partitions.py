@@ -0,0 +1,167 @@
+"""
+Monthly range partitions of the ``transcriptions`` table.
+
+``transcriptions`` is partitioned by ``RANGE (meeting_created_at)``, a copy of
+the owning meeting's ``created_at``. All segments of a meeting therefore live
+in one partition. A query that filters on the meeting's key (see
+``transcription_partition_clause``) reads only that partition, and a month of
+old meetings can be detached and archived as a whole instead of being deleted
+row by row.
+
+Rows whose key has no monthly partition land in ``transcriptions_default``.
+The collector creates the partitions for the coming months at startup and
+then once a day (``ensure_transcription_partitions``). Nothing is detached
+automatically; operators call ``detach_transcription_partitions`` (or
+``python -m shared_models.partitions detach --before YYYY-MM``) once a month's
+data has been archived.
+"""
+import argparse
+import asyncio
+import logging
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.sql import text
+
+from .models import Meeting, Transcription
+
+logger = logging.getLogger("shared_models.partitions")
+
+TRANSCRIPTIONS_TABLE = "transcriptions"
+DEFAULT_PARTITION = "transcriptions_default"
+# Key of segments whose meeting has no created_at; they stay in the default partition
+MISSING_KEY = datetime(1970, 1, 1)
+
+_PARTITION_RE = re.compile(r"^transcriptions_p(\d{4})_(\d{2})$")
+
+
+def month_start(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"transcriptions_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """The month a partition created by this module covers, or None for any other table."""
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: datetime) -> str:
+    start, end = month_start(month), add_months(month_start(month), 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {TRANSCRIPTIONS_TABLE} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+
+
+def create_default_partition_sql() -> str:
+    return f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TRANSCRIPTIONS_TABLE} DEFAULT"
+
+
+def partition_months(first: datetime, last: datetime) -> List[datetime]:
+    """Every month from the one containing ``first`` to the one containing ``last``."""
+    months, month, end = [], month_start(first), month_start(last)
+    while month <= end:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def partitions_before(names: Iterable[str], before: datetime) -> List[str]:
+    """Monthly partitions among ``names`` whose whole range ends on or before ``before``."""
+    cutoff = month_start(before)
+    return sorted(name for name in names if (month := partition_month(name)) is not None and month < cutoff)
+
+
+def partition_key(meeting_created_at: Optional[datetime]) -> datetime:
+    """``meeting_created_at`` value of a segment of a meeting created at ``meeting_created_at``."""
+    return meeting_created_at if meeting_created_at is not None else MISSING_KEY
+
+
+def transcription_partition_clause(meeting: Meeting):
+    """Filter on a meeting's segments that lets Postgres read only its partition."""
+    return (Transcription.meeting_id == meeting.id) & (Transcription.meeting_created_at == partition_key(meeting.created_at))
+
+
+async def meeting_partition_keys(db, meeting_ids: Iterable[int]) -> Dict[int, datetime]:
+    """Partition keys of the given meetings, in one query."""
+    ids = sorted(set(meeting_ids))
+    if not ids:
+        return {}
+    result = await db.execute(select(Meeting.id, Meeting.created_at).where(Meeting.id.in_(ids)))
+    return {meeting_id: partition_key(created_at) for meeting_id, created_at in result.all()}
+
+
+async def ensure_transcription_partitions(conn, now: Optional[datetime] = None, months_ahead: int = 2) -> List[str]:
+    """Create the default partition and the partitions of this month and ``months_ahead`` more."""
+    now = now or datetime.utcnow()
+    months = partition_months(now, add_months(month_start(now), months_ahead))
+    await conn.execute(text(create_default_partition_sql()))
+    created = []
+    for month in months:
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(create_partition_sql(month)))
+            created.append(partition_name(month))
+        except Exception as e:
+            # Fails when the default partition already holds rows of that month
+            logger.warning(f"Could not create transcription partition {partition_name(month)}: {e}")
+    return created
+
+
+async def attached_partitions(conn) -> List[str]:
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": TRANSCRIPTIONS_TABLE})
+    return [row[0] for row in result.all()]
+
+
+async def detach_transcription_partitions(conn, before: datetime) -> List[str]:
+    """
+    Detach the monthly partitions of meetings created before the month of ``before``.
+
+    Detached partitions stay in the database as plain tables, ready to be
+    dumped and dropped; their segments no longer appear in transcripts.
+    """
+    detached = partitions_before(await attached_partitions(conn), before)
+    for name in detached:
+        await conn.execute(text(f"ALTER TABLE {TRANSCRIPTIONS_TABLE} DETACH PARTITION {name}"))
+        logger.info(f"Detached transcription partition {name}")
+    return detached
+
+
+async def _main(argv: Optional[List[str]] = None):
+    from .database import engine
+
+    parser = argparse.ArgumentParser(description="Manage the monthly partitions of the transcriptions table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure = sub.add_parser("ensure", help="Create the partitions of the coming months.")
+    ensure.add_argument("--months-ahead", type=int, default=2)
+    detach = sub.add_parser("detach", help="Detach the partitions of meetings created before a month.")
+    detach.add_argument("--before", required=True, help="First month to keep, as YYYY-MM.")
+    args = parser.parse_args(argv)
+
+    async with engine.begin() as conn:
+        if args.command == "ensure":
+            names = await ensure_transcription_partitions(conn, months_ahead=args.months_ahead)
+        else:
+            names = await detach_transcription_partitions(conn, datetime.strptime(args.before, "%Y-%m"))
+    print("\n".join(names))
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Tuple, Any
 from pydantic import BaseModel, Field, EmailStr, field_serializer, field_validator, ValidationInfo
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum, auto
 import re # Import re for native ID validation
 import logging # Import logging for status validation warnings
@@ -807,6 +807,14 @@ class UserAnalyticsResponse(BaseModel):
     meeting_stats: UserMeetingStats
     usage_patterns: UserUsagePatterns
     api_tokens: Optional[List[TokenResponse]]  # Optional for security
+
+class DailyUsageResponse(BaseModel):
+    """Meeting usage of one day (by meeting creation date), for one user or all users"""
+    day: date
+    meetings: int
+    completed_meetings: int
+    failed_meetings: int
+    completed_duration: float  # seconds, completed meetings with start and end times
 # --- END Analytics Schemas ---
 
 # --- Recording Schemas ---
@@ -860,6 +868,34 @@ class RecordingResponse(BaseModel):
 
 class RecordingListResponse(BaseModel):
     recordings: List[RecordingResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null on the last page")
+
+class TranscriptionJobCreate(BaseModel):
+    language: Optional[str] = Field(None, max_length=10, description="Language code; detected from the audio when omitted")
+    task: str = Field("transcribe", pattern="^(transcribe|translate)$")
+
+class TranscriptionJobResponse(BaseModel):
+    id: int
+    recording_id: int
+    meeting_id: Optional[int] = None
+    language: Optional[str] = None
+    task: str
+    status: str
+    error_message: Optional[str] = None
+    progress: Optional[float] = None
+    segments_count: Optional[int] = None
+    session_uid: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class TranscriptionJobSegmentsResponse(BaseModel):
+    job_id: int
+    status: str
+    segments: List[TranscriptionSegment] = Field(default_factory=list, description="Segments of the job, ordered by start time")
 # --- END Recording Schemas ---
 
 
@@ -11,6 +11,7 @@ import hashlib
 import hmac
 import json
 import logging
+import os
 import time
 from typing import Any, Dict, Optional
 
@@ -20,6 +21,31 @@ from .retry import with_retry
 
 logger = logging.getLogger(__name__)
 
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "100"))
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Process-wide pooled client, so bursts reuse keep-alive connections."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=WEBHOOK_MAX_CONNECTIONS,
+                max_keepalive_connections=WEBHOOK_MAX_CONNECTIONS,
+            ),
+        )
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
 
 def sign_payload(payload_bytes: bytes, secret: str) -> str:
     """Create HMAC-SHA256 signature for webhook payload.
@@ -80,11 +106,10 @@ async def deliver(
     headers = build_headers(webhook_secret, payload_bytes)
 
     async def _send() -> httpx.Response:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            resp = await client.post(url, content=payload_bytes, headers=headers, timeout=timeout)
-            if resp.status_code >= 500 or resp.status_code == 429:
-                resp.raise_for_status()
-            return resp
+        resp = await get_shared_client().post(url, content=payload_bytes, headers=headers, timeout=timeout)
+        if resp.status_code >= 500 or resp.status_code == 429:
+            resp.raise_for_status()
+        return resp
 
     try:
         resp = await with_retry(_send, max_retries=max_retries, label=label or f"webhook {url}")
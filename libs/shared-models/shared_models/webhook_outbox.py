@@ -0,0 +1,392 @@
+"""
+Durable webhook outbox backed by a Redis stream.
+
+``enqueue()`` appends a delivery job to the ``webhook_outbox`` stream and
+returns immediately. A pool of workers in the same process consumes the
+stream through a consumer group and POSTs with the shared pooled client from
+``webhook_delivery``:
+
+- at most WEBHOOK_PER_DESTINATION_CONCURRENCY requests in flight per host;
+- failed attempts (network errors, 429, 5xx) are rescheduled with
+  exponential backoff in the ``webhook_outbox:scheduled`` sorted set and
+  moved back onto the stream by a scheduler task when due, atomically so a
+  crash cannot lose them;
+- jobs that exhaust WEBHOOK_MAX_ATTEMPTS, or get a non-retryable 4xx, are
+  moved to the ``webhook_outbox:dead`` sorted set for inspection/replay;
+- jobs left pending by a crashed/restarted replica are reclaimed with
+  XAUTOCLAIM once they have been idle for WEBHOOK_OUTBOX_CLAIM_IDLE_MS
+  (except the replica's own jobs still waiting for a worker);
+- with WEBHOOK_BATCH_MAX_EVENTS > 1, jobs enqueued with ``batchable=True``
+  for the same URL/secret are sent as one ``{"events": [...]}`` POST.
+
+If the outbox has not been started (no Redis), ``enqueue()`` falls back to
+an in-memory ``deliver()`` task, which is the previous behaviour.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .webhook_delivery import build_headers, deliver, get_shared_client
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_OUTBOX_STREAM = os.getenv("WEBHOOK_OUTBOX_STREAM", "webhook_outbox")
+WEBHOOK_OUTBOX_GROUP = os.getenv("WEBHOOK_OUTBOX_GROUP", "webhook_workers")
+WEBHOOK_OUTBOX_WORKERS = int(os.getenv("WEBHOOK_OUTBOX_WORKERS", "8"))
+WEBHOOK_PER_DESTINATION_CONCURRENCY = int(os.getenv("WEBHOOK_PER_DESTINATION_CONCURRENCY", "4"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_RETRY_BASE_DELAY = float(os.getenv("WEBHOOK_RETRY_BASE_DELAY", "2.0"))
+WEBHOOK_RETRY_MAX_DELAY = float(os.getenv("WEBHOOK_RETRY_MAX_DELAY", "600"))
+WEBHOOK_BATCH_MAX_EVENTS = int(os.getenv("WEBHOOK_BATCH_MAX_EVENTS", "1"))
+WEBHOOK_OUTBOX_CLAIM_IDLE_MS = int(os.getenv("WEBHOOK_OUTBOX_CLAIM_IDLE_MS", "120000"))
+
+_RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_LATENCY_SAMPLES = 1000
+_SCHEDULER_BATCH = 100
+
+# Moves due jobs from the scheduled set (KEYS[1]) onto the stream (KEYS[2]) in one step
+_MOVE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('XADD', KEYS[2], '*', 'job', member)
+end
+return #due
+"""
+
+
+class WebhookOutbox:
+    """Redis-stream webhook queue with an in-process worker pool."""
+
+    def __init__(
+        self,
+        stream: str = WEBHOOK_OUTBOX_STREAM,
+        group: str = WEBHOOK_OUTBOX_GROUP,
+        workers: int = WEBHOOK_OUTBOX_WORKERS,
+        per_destination_concurrency: int = WEBHOOK_PER_DESTINATION_CONCURRENCY,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        retry_base_delay: float = WEBHOOK_RETRY_BASE_DELAY,
+        retry_max_delay: float = WEBHOOK_RETRY_MAX_DELAY,
+        batch_max_events: int = WEBHOOK_BATCH_MAX_EVENTS,
+        claim_idle_ms: int = WEBHOOK_OUTBOX_CLAIM_IDLE_MS,
+        poll_interval: float = 1.0,
+    ):
+        self.stream = stream
+        self.group = group
+        self.scheduled_key = f"{stream}:scheduled"
+        self.dead_letter_key = f"{stream}:dead"
+        self.workers = max(1, workers)
+        self.per_destination_concurrency = max(1, per_destination_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.batch_max_events = max(1, batch_max_events)
+        self.claim_idle_ms = claim_idle_ms
+        self.poll_interval = poll_interval
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+        self._redis = None
+        self._move_due = None
+        self._queue: Optional[asyncio.Queue] = None
+        # Entries read by this consumer and not yet processed by a worker
+        self._in_flight: set = set()
+        self._tasks: List[asyncio.Task] = []
+        self._destination_limits: Dict[str, asyncio.Semaphore] = {}
+        self._fallback_tasks: set = set()
+
+        self.delivered = 0
+        self.failed_attempts = 0
+        self.dead_lettered = 0
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+    @property
+    def running(self) -> bool:
+        return self._redis is not None
+
+    # --- Lifecycle --------------------------------------------------------
+
+    async def start(self, redis_client, consume: bool = True) -> None:
+        """Create the consumer group and start reader, scheduler and workers.
+
+        With ``consume=False`` the outbox only enqueues (producer-only
+        services); another process runs the workers.
+        """
+        if self._redis is not None:
+            return
+        try:
+            await redis_client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._redis = redis_client
+        if not consume:
+            return
+        self._move_due = redis_client.register_script(_MOVE_DUE_SCRIPT)
+        self._queue = asyncio.Queue(maxsize=self.workers * 2)
+        self._tasks = [
+            asyncio.create_task(self._reader_loop()),
+            asyncio.create_task(self._scheduler_loop()),
+        ] + [asyncio.create_task(self._worker_loop()) for _ in range(self.workers)]
+        logger.info(
+            f"Webhook outbox started (stream={self.stream}, consumer={self.consumer}, "
+            f"workers={self.workers}, batch_max_events={self.batch_max_events})"
+        )
+
+    async def stop(self) -> None:
+        """Stop consuming. Unacknowledged jobs stay pending and are reclaimed later."""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+        self._in_flight.clear()
+        self._redis = None
+
+    # --- Producer ---------------------------------------------------------
+
+    async def enqueue(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        webhook_secret: Optional[str] = None,
+        timeout: float = 30.0,
+        label: str = "",
+        batchable: bool = False,
+    ) -> None:
+        """Queue a webhook for delivery. Never raises on delivery problems."""
+        job = {
+            "id": uuid.uuid4().hex,
+            "url": url,
+            "payload": payload,
+            "secret": webhook_secret,
+            "timeout": timeout,
+            "label": label,
+            "batchable": batchable,
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        }
+        if self._redis is not None:
+            try:
+                await self._redis.xadd(self.stream, {"job": json.dumps(job)})
+                return
+            except Exception as e:
+                logger.warning(f"Webhook outbox unavailable, delivering in-process: {e}")
+        task = asyncio.create_task(
+            deliver(url, payload, webhook_secret=webhook_secret, timeout=timeout, label=label)
+        )
+        self._fallback_tasks.add(task)
+        task.add_done_callback(self._fallback_tasks.discard)
+
+    # --- Consumer side ----------------------------------------------------
+
+    async def _reader_loop(self) -> None:
+        last_claim = 0.0
+        while True:
+            try:
+                entries: List[Tuple[str, Dict[str, str]]] = []
+                if time.monotonic() - last_claim > self.claim_idle_ms / 2000:
+                    last_claim = time.monotonic()
+                    entries.extend(await self._claim_stale())
+                response = await self._redis.xreadgroup(
+                    self.group, self.consumer, {self.stream: ">"},
+                    count=self.workers * self.batch_max_events,
+                    block=int(self.poll_interval * 1000),
+                )
+                for _stream, messages in response or []:
+                    entries.extend(messages)
+                self._in_flight.update(message_id for message_id, _ in entries)
+                for batch in self._make_batches(entries):
+                    await self._queue.put(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook outbox reader error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _claim_stale(self) -> List[Tuple[str, Dict[str, str]]]:
+        claimed: List[Tuple[str, Dict[str, str]]] = []
+        start_id = "0-0"
+        while True:
+            result = await self._redis.xautoclaim(
+                self.stream, self.group, self.consumer,
+                min_idle_time=self.claim_idle_ms, start_id=start_id, count=100,
+            )
+            start_id, messages = result[0], result[1]
+            # Our own entries may just be queued behind a slow destination
+            claimed.extend(m for m in messages if m[1] and m[0] not in self._in_flight)
+            if not messages or start_id in ("0-0", b"0-0"):
+                break
+        if claimed:
+            logger.info(f"Webhook outbox reclaimed {len(claimed)} stale deliveries")
+        return claimed
+
+    def _make_batches(self, entries) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        batches: List[List[Tuple[str, Dict[str, Any]]]] = []
+        grouped: Dict[Tuple[str, Optional[str]], List[Tuple[str, Dict[str, Any]]]] = {}
+        for message_id, fields in entries:
+            raw = fields.get("job") or fields.get(b"job")
+            try:
+                job = json.loads(raw)
+            except (TypeError, ValueError):
+                logger.error(f"Dropping malformed webhook outbox entry {message_id}")
+                batches.append([(message_id, None)])
+                continue
+            if self.batch_max_events > 1 and job.get("batchable"):
+                grouped.setdefault((job["url"], job.get("secret")), []).append((message_id, job))
+            else:
+                batches.append([(message_id, job)])
+        for jobs in grouped.values():
+            for i in range(0, len(jobs), self.batch_max_events):
+                batches.append(jobs[i:i + self.batch_max_events])
+        return batches
+
+    async def _worker_loop(self) -> None:
+        while True:
+            batch = await self._queue.get()
+            try:
+                await self._process(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Leave the entries pending; they are reclaimed after claim_idle_ms.
+                logger.error(f"Webhook outbox worker error: {e}", exc_info=True)
+            finally:
+                self._in_flight.difference_update(message_id for message_id, _ in batch)
+                self._queue.task_done()
+
+    async def _process(self, batch: List[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        message_ids = [message_id for message_id, _ in batch]
+        jobs = [job for _, job in batch if job is not None]
+        if not jobs:
+            await self._ack(message_ids)
+            return
+
+        first = jobs[0]
+        if len(jobs) == 1:
+            body = json.dumps(first["payload"]).encode()
+        else:
+            body = json.dumps({"events": [job["payload"] for job in jobs]}).encode()
+        headers = build_headers(first.get("secret"), body)
+        if len(jobs) > 1:
+            headers["X-Webhook-Batch-Size"] = str(len(jobs))
+
+        error: Optional[str] = None
+        retryable = True
+        try:
+            async with self._destination_limit(first["url"]):
+                resp = await get_shared_client().post(
+                    first["url"], content=body, headers=headers, timeout=first.get("timeout", 30.0)
+                )
+            if resp.status_code < 300:
+                now = time.time()
+                for job in jobs:
+                    self._latencies.append(now - job["enqueued_at"])
+                self.delivered += len(jobs)
+                logger.info(f"Webhook delivered to {first['url']}: {resp.status_code} ({len(jobs)} event(s))")
+            else:
+                error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+                retryable = resp.status_code in _RETRYABLE_STATUS_CODES
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is not None:
+            self.failed_attempts += 1
+            for job in jobs:
+                await self._retry_or_dead_letter(job, error, retryable)
+        await self._ack(message_ids)
+
+    def _destination_limit(self, url: str) -> asyncio.Semaphore:
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        if key not in self._destination_limits:
+            self._destination_limits[key] = asyncio.Semaphore(self.per_destination_concurrency)
+        return self._destination_limits[key]
+
+    async def _retry_or_dead_letter(self, job: Dict[str, Any], error: str, retryable: bool) -> None:
+        job = dict(job, attempts=job.get("attempts", 0) + 1, last_error=error)
+        label = job.get("label") or job["url"]
+        if retryable and job["attempts"] < self.max_attempts:
+            delay = min(self.retry_base_delay * (2 ** (job["attempts"] - 1)), self.retry_max_delay)
+            delay += random.uniform(0, delay * 0.1)
+            logger.warning(
+                f"Webhook [{label}] attempt {job['attempts']}/{self.max_attempts} failed: {error}. "
+                f"Retrying in {delay:.1f}s"
+            )
+            await self._redis.zadd(self.scheduled_key, {json.dumps(job): time.time() + delay})
+        else:
+            self.dead_lettered += 1
+            logger.error(f"Webhook [{label}] dead-lettered after {job['attempts']} attempt(s): {error}")
+            await self._redis.zadd(self.dead_letter_key, {json.dumps(job): time.time()})
+
+    async def _ack(self, message_ids: List[str]) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, *message_ids)
+            pipe.xdel(self.stream, *message_ids)
+            await pipe.execute()
+
+    async def _scheduler_loop(self) -> None:
+        """Move due retries from the scheduled set back onto the stream."""
+        while True:
+            try:
+                moved = await self._move_due(
+                    keys=[self.scheduled_key, self.stream], args=[time.time(), _SCHEDULER_BATCH]
+                )
+                if moved < _SCHEDULER_BATCH:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Webhook outbox scheduler error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    # --- Metrics ----------------------------------------------------------
+
+    async def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def _pct(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3)
+
+        result: Dict[str, Any] = {
+            "running": self.running,
+            "delivered": self.delivered,
+            "failed_attempts": self.failed_attempts,
+            "dead_lettered": self.dead_lettered,
+            "delivery_latency_seconds": {"p50": _pct(0.5), "p95": _pct(0.95), "p99": _pct(0.99),
+                                         "samples": len(latencies)},
+        }
+        if self._redis is not None:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.xlen(self.stream)
+                pipe.xpending(self.stream, self.group)
+                pipe.zcard(self.scheduled_key)
+                pipe.zcard(self.dead_letter_key)
+                queued, pending, scheduled, dead = await pipe.execute()
+            result["backlog"] = {
+                "stream": queued,
+                "in_flight": (pending or {}).get("pending", 0),
+                "scheduled_retries": scheduled,
+                "dead_letter": dead,
+            }
+        return result
+
+
+# Process-wide outbox; services call ``await webhook_outbox.start(redis)`` on startup.
+webhook_outbox = WebhookOutbox()
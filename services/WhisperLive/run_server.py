@@ -33,6 +33,13 @@ if __name__ == "__main__":
                         action='store_true',
                         help='Set this if every connection should instantiate its own model. Only relevant for custom model, passed using -trt or -fw.')
     
+    parser.add_argument('--batch_inference',
+                        action='store_true',
+                        default=settings.BATCH_INFERENCE,
+                        help='Decode pending windows from all clients as one batch on the shared faster_whisper model. Ignored with --no_single_model.')
+    parser.add_argument('--batch_max_size', type=int, default=settings.BATCH_MAX_SIZE)
+    parser.add_argument('--batch_max_wait_ms', type=float, default=settings.BATCH_MAX_WAIT_MS)
+
     # Audio buffer settings
     parser.add_argument('--max_buffer_s', type=float, default=settings.MAX_BUFFER_S)
     parser.add_argument('--discard_buffer_s', type=float, default=settings.DISCARD_BUFFER_S)
@@ -117,5 +124,8 @@ if __name__ == "__main__":
             "same_output_threshold_tier2": args.same_output_threshold_tier2,
             "show_prev_out_thresh_s": args.show_prev_out_thresh_s,
             "add_pause_thresh_s": args.add_pause_thresh_s,
+            "batch_inference": args.batch_inference,
+            "batch_max_size": args.batch_max_size,
+            "batch_max_wait_ms": args.batch_max_wait_ms,
         }
     )
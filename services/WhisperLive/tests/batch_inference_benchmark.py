@@ -0,0 +1,97 @@
+"""
+CPU benchmark: serialized single-model inference vs. cross-client batching.
+
+Simulates N concurrent streams, each repeatedly submitting a growing window
+(like ServeClientFasterWhisper.speech_to_text does) for a fixed amount of
+wall time, and reports windows/s and p50/p95 per-window latency for:
+
+  * ``locked``  - one shared WhisperModel behind a lock (the single_model path)
+  * ``batched`` - the same model behind BatchedTranscriptionScheduler
+
+Usage:
+    PYTHONPATH=. python tests/batch_inference_benchmark.py --model tiny --streams 1 4 8
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from faster_whisper.audio import decode_audio
+
+from whisper_live.batch_inference import (
+    BatchedTranscriptionScheduler,
+    FasterWhisperBatchRunner,
+    TranscriptionRequest,
+)
+from whisper_live.transcriber import WhisperModel
+
+
+def _windows(audio, min_s=1.0, step_s=1.0, sr=16000):
+    end = int(min_s * sr)
+    while True:
+        yield audio[:end]
+        end = end + int(step_s * sr) if end < audio.shape[0] else int(min_s * sr)
+
+
+def _run(streams, duration_s, transcribe, audio):
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration_s
+
+    def stream():
+        for window in _windows(audio):
+            if time.monotonic() >= stop_at:
+                return
+            started = time.monotonic()
+            segments, _ = transcribe(window)
+            list(segments or [])
+            with lock:
+                latencies.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=stream) for _ in range(streams)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return {
+        "windows_per_s": round(len(latencies) / duration_s, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--audio", default="assets/jfk.flac")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--max_wait_ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    model = WhisperModel(args.model, device="cpu", compute_type="int8")
+    audio = decode_audio(args.audio, sampling_rate=16000)
+    model_lock = threading.Lock()
+
+    def locked(window):
+        with model_lock:
+            segments, info = model.transcribe(window, language="en", vad_filter=True)
+            return list(segments or []), info
+
+    for streams in args.streams:
+        scheduler = BatchedTranscriptionScheduler(
+            FasterWhisperBatchRunner(model), max_batch_size=max(streams, 1), max_wait_ms=args.max_wait_ms
+        )
+
+        def batched(window):
+            return scheduler.transcribe(TranscriptionRequest(window, language="en"))
+
+        print(f"streams={streams} locked={_run(streams, args.duration, locked, audio)}")
+        print(f"streams={streams} batched={_run(streams, args.duration, batched, audio)} {scheduler.stats()}")
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+CPU benchmark: log-mel extraction per realtime cycle with and without the cache.
+
+Replays a stream the way ServeClientFasterWhisper re-transcribes it: the
+window grows by ``--step`` seconds per cycle up to ``--window`` seconds, then
+the offset jumps forward (as when segments are finalized) and it grows again.
+
+Usage:
+    PYTHONPATH=. python tests/feature_cache_benchmark.py --window 30 --step 0.5
+"""
+
+import argparse
+import time
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_live.feature_cache import StreamingLogMelCache
+
+
+def _cycles(total_s, window_s, step_s, sr=16000):
+    start, end = 0, int(step_s * sr)
+    while end <= total_s * sr:
+        yield start, end
+        end += int(step_s * sr)
+        if end - start > window_s * sr:
+            start = end - int(step_s * sr) - int(5 * sr)  # keep 5s of context after the jump
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--total", type=float, default=120.0)
+    parser.add_argument("--window", type=float, default=30.0)
+    parser.add_argument("--step", type=float, default=0.5)
+    args = parser.parse_args()
+
+    stream = (np.random.default_rng(0).standard_normal(int(args.total * 16000)) * 0.1).astype(np.float32)
+    extractor = FeatureExtractor(feature_size=80)
+    cache = StreamingLogMelCache(extractor)
+    cycles = list(_cycles(args.total, args.window, args.step))
+
+    started = time.perf_counter()
+    for start, end in cycles:
+        extractor(stream[start:end])
+    full = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for start, end in cycles:
+        cache(stream[start:end], start)
+    cached = time.perf_counter() - started
+
+    print(f"cycles={len(cycles)} window<={args.window}s step={args.step}s")
+    print(f"full extraction:   {full / len(cycles) * 1000:.2f} ms/cycle")
+    print(f"cached extraction: {cached / len(cycles) * 1000:.2f} ms/cycle ({full / cached:.1f}x) {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
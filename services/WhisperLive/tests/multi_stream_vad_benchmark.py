@@ -0,0 +1,47 @@
+"""
+CPU benchmark: Silero VAD cost per stream with batch-1 calls vs. MultiStreamVAD.
+
+Each stream receives one second of audio in 4096-sample packets. ``per-stream``
+runs every window with its own ONNX call (max_batch_size=1, the old
+per-packet behaviour minus the torch copies); ``batched`` stacks the windows
+of all streams into one call per tick.
+
+Usage:
+    PYTHONPATH=. python tests/multi_stream_vad_benchmark.py --streams 10 100 500
+"""
+
+import argparse
+import time
+
+
+from faster_whisper.audio import decode_audio
+
+from whisper_live.multi_stream_vad import MultiStreamVAD
+
+
+def _cpu_ms_per_stream(vad, streams, audio, packet=4096):
+    started = time.process_time()
+    for offset in range(0, 16000, packet):
+        for stream_id in range(streams):
+            vad.feed(stream_id, audio[offset:offset + packet])
+        vad.tick()
+    return (time.process_time() - started) * 1000 / streams
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--audio", default="assets/jfk.flac")
+    args = parser.parse_args()
+
+    audio = decode_audio(args.audio, sampling_rate=16000)[:16000]
+    for streams in args.streams:
+        single = _cpu_ms_per_stream(MultiStreamVAD(max_batch_size=1), streams, audio)
+        batched_vad = MultiStreamVAD(max_batch_size=512)
+        batched = _cpu_ms_per_stream(batched_vad, streams, audio)
+        print(f"streams={streams}: per-stream {single:.2f} ms CPU/stream-second, "
+              f"batched {batched:.2f} ms CPU/stream-second ({single / batched:.1f}x) {batched_vad.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from whisper_live.batch_inference import BatchedTranscriptionScheduler, TranscriptionRequest
+
+
+class _RecordingRunner:
+    """Echoes each request's first sample and records the batch sizes it saw."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.batch_sizes = []
+
+    def __call__(self, requests):
+        self.batch_sizes.append(len(requests))
+        time.sleep(self.latency)
+        return [(float(r.audio[0]), r.language) for r in requests]
+
+
+class TestBatchedTranscriptionScheduler(unittest.TestCase):
+    def _submit_concurrently(self, scheduler, count):
+        results = [None] * count
+
+        def client(i):
+            results[i] = scheduler.transcribe(TranscriptionRequest(np.full(16000, i, dtype=np.float32), language="en"))
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        return results
+
+    def test_concurrent_windows_share_a_batch_and_results_are_routed_back(self):
+        runner = _RecordingRunner()
+        scheduler = BatchedTranscriptionScheduler(runner, max_batch_size=8, max_wait_ms=100)
+        self.addCleanup(scheduler.stop)
+
+        results = self._submit_concurrently(scheduler, 6)
+
+        self.assertEqual(results, [(float(i), "en") for i in range(6)])
+        self.assertEqual(runner.batch_sizes, [6])
+        self.assertEqual(scheduler.stats()["avg_batch_size"], 6.0)
+
+    def test_batches_are_capped_at_max_batch_size(self):
+        runner = _RecordingRunner()
+        scheduler = BatchedTranscriptionScheduler(runner, max_batch_size=4, max_wait_ms=100)
+        self.addCleanup(scheduler.stop)
+
+        self._submit_concurrently(scheduler, 10)
+
+        self.assertEqual(sum(runner.batch_sizes), 10)
+        self.assertLessEqual(max(runner.batch_sizes), 4)
+        self.assertEqual(scheduler.stats()["largest_batch"], 4)
+
+    def test_lone_request_waits_at_most_max_wait(self):
+        runner = _RecordingRunner(latency=0.0)
+        scheduler = BatchedTranscriptionScheduler(runner, max_batch_size=8, max_wait_ms=30)
+        self.addCleanup(scheduler.stop)
+
+        started = time.monotonic()
+        scheduler.transcribe(TranscriptionRequest(np.zeros(16000, dtype=np.float32)))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(runner.batch_sizes, [1])
+
+    def test_batch_failure_is_raised_in_every_client(self):
+        def failing_runner(requests):
+            raise RuntimeError("decoder crashed")
+
+        scheduler = BatchedTranscriptionScheduler(failing_runner, max_batch_size=8, max_wait_ms=10)
+        self.addCleanup(scheduler.stop)
+
+        with self.assertRaises(RuntimeError):
+            scheduler.transcribe(TranscriptionRequest(np.zeros(16000, dtype=np.float32)))
+        # The scheduler thread survives and keeps serving.
+        scheduler.run_batch = _RecordingRunner(latency=0.0)
+        self.assertEqual(scheduler.transcribe(TranscriptionRequest(np.ones(16000, dtype=np.float32))), (1.0, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from whisper_live.feature_cache import StreamingLogMelCache
+
+
+class TestStreamingLogMelCache(unittest.TestCase):
+    def setUp(self):
+        self.extractor = FeatureExtractor(feature_size=80)
+        self.stream = (np.random.default_rng(0).standard_normal(16000 * 40) * 0.1).astype(np.float32)
+
+    def assert_matches_extractor(self, cache, start, end):
+        window = self.stream[start:end]
+        expected = self.extractor(window)
+        features = cache(window, start)
+        self.assertEqual(features.shape, expected.shape)
+        np.testing.assert_allclose(features, expected, atol=1e-5)
+
+    def test_growing_window_matches_and_only_computes_new_frames(self):
+        cache = StreamingLogMelCache(self.extractor)
+        for end in range(16000, 16000 * 30, 8000):
+            self.assert_matches_extractor(cache, 0, end)
+        # Each frame inside the stream is computed once, not once per cycle.
+        self.assertLess(cache.computed_frames, 3000)
+        self.assertGreater(cache.reused_frames, 10 * cache.computed_frames)
+
+    def test_advancing_offset_keeps_aligned_frames_and_resets_on_phase_change(self):
+        cache = StreamingLogMelCache(self.extractor)
+        self.assert_matches_extractor(cache, 0, 16000 * 10)
+        computed = cache.computed_frames
+        self.assert_matches_extractor(cache, 16000 * 2, 16000 * 10)  # hop-aligned: all reused
+        self.assertEqual(cache.computed_frames, computed)
+        self.assert_matches_extractor(cache, 16000 * 2 + 37, 16000 * 11)  # different phase: rebuilt
+        self.assertEqual(cache.stats()["cached_frames"], cache.computed_frames - computed)
+
+    def test_windows_shorter_than_one_fft_fall_back_to_extractor(self):
+        cache = StreamingLogMelCache(self.extractor)
+        for length in (100, 300, 400, 600):
+            self.assert_matches_extractor(cache, 0, length)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from whisper_live.language_cache import LanguageCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLanguageCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.cache = LanguageCache(half_life_s=100, speaker_fallback=0.5, min_confidence=0.5, clock=self.clock)
+
+    def test_empty_cache_misses(self):
+        self.assertEqual(self.cache.lookup(), (None, 0.0))
+
+    def test_confidence_decays_until_the_language_is_redetected(self):
+        self.cache.observe("de", 0.9)
+        language, confidence = self.cache.lookup()
+        self.assertEqual(language, "de")
+        self.assertAlmostEqual(confidence, 0.9)
+
+        self.clock.now = 100
+        self.assertAlmostEqual(self.cache.lookup(min_confidence=0.0)[1], 0.45)
+        self.assertEqual(self.cache.lookup(), (None, 0.0))
+
+        self.cache.observe("de", 0.95)
+        self.assertEqual(self.cache.lookup()[0], "de")
+
+    def test_speakers_keep_their_own_language_and_new_speakers_fall_back_weakly(self):
+        self.cache.observe("en", 0.9, speaker="alice")
+        self.cache.observe("fr", 0.8, speaker="bob")
+
+        self.assertEqual(self.cache.lookup("alice")[0], "en")
+        self.assertEqual(self.cache.lookup("bob")[0], "fr")
+        # carol falls back to the session's latest language at half confidence
+        self.assertEqual(self.cache.lookup("carol"), (None, 0.0))
+        language, confidence = self.cache.lookup("carol", min_confidence=0.0)
+        self.assertEqual(language, "fr")
+        self.assertAlmostEqual(confidence, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from whisper_live.latency import StageLatency
+
+
+class StageLatencyTests(unittest.TestCase):
+    def test_renders_cumulative_buckets_per_stage(self):
+        stages = StageLatency("wl_stage_seconds", buckets=(0.1, 1.0))
+        stages.observe("transcribe", 0.05)
+        stages.observe("transcribe", 0.5)
+        stages.observe("transcribe", 3.0)
+        stages.observe("buffer_wait", 0.2)
+
+        text = stages.render('server_id="a"')
+
+        self.assertIn("# TYPE wl_stage_seconds histogram", text)
+        self.assertIn('wl_stage_seconds_bucket{server_id="a",stage="transcribe",le="0.1"} 1', text)
+        self.assertIn('wl_stage_seconds_bucket{server_id="a",stage="transcribe",le="1.0"} 2', text)
+        self.assertIn('wl_stage_seconds_bucket{server_id="a",stage="transcribe",le="+Inf"} 3', text)
+        self.assertIn('wl_stage_seconds_sum{server_id="a",stage="transcribe"} 3.550000', text)
+        self.assertIn('wl_stage_seconds_count{server_id="a",stage="buffer_wait"} 1', text)
+        self.assertLess(text.index('stage="buffer_wait"'), text.index('stage="transcribe"'))
+
+    def test_clamps_skew_and_ignores_missing(self):
+        stages = StageLatency("wl_stage_seconds", buckets=(0.1,))
+        stages.observe("end_to_end", -0.02)
+        stages.observe("end_to_end", None)
+
+        text = stages.render()
+
+        self.assertIn('wl_stage_seconds_bucket{stage="end_to_end",le="0.1"} 1', text)
+        self.assertIn('wl_stage_seconds_count{stage="end_to_end"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from whisper_live.load_report import INSTANCES_KEY, LoadReporter, queued_audio_s, snapshot
+
+
+class _Pipeline:
+    def __init__(self, store):
+        self.store = store
+        self.ops = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+    def execute(self):
+        for name, args, kwargs in self.ops:
+            if name == "set":
+                self.store.values[args[0]] = (args[1], kwargs.get("ex"))
+            elif name == "delete":
+                self.store.values.pop(args[0], None)
+            elif name == "sadd":
+                self.store.sets.setdefault(args[0], set()).add(args[1])
+            elif name == "srem":
+                self.store.sets.get(args[0], set()).discard(args[1])
+
+
+class _Redis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def pipeline(self):
+        return _Pipeline(self)
+
+
+def _client(buffered_s, offset_s=0.0, transcribed_to_s=0.0, in_flight=False):
+    return SimpleNamespace(
+        RATE=16000,
+        frames_np=np.zeros(int(buffered_s * 16000), dtype=np.float32),
+        frames_offset=offset_s,
+        timestamp_offset=transcribed_to_s,
+        transcription_in_flight=in_flight,
+    )
+
+
+class TestLoadReport(unittest.TestCase):
+    def test_queued_audio_is_what_was_received_but_not_transcribed(self):
+        self.assertAlmostEqual(queued_audio_s(_client(10, offset_s=30, transcribed_to_s=36)), 4.0)
+        self.assertEqual(queued_audio_s(SimpleNamespace(frames_np=None)), 0.0)
+
+    def test_snapshot_counts_sessions_and_queue(self):
+        report = snapshot("wl-1", "ws://10.0.0.5:9090/ws",
+                          [_client(3), _client(2, in_flight=True), None], max_clients=10)
+        self.assertEqual(report["sessions"], 2)
+        self.assertEqual(report["in_flight"], 1)
+        self.assertAlmostEqual(report["queued_audio_s"], 5.0)
+        self.assertFalse(report["draining"])
+
+    def test_publish_and_withdraw(self):
+        redis = _Redis()
+        reporter = LoadReporter(redis, "wl-1", lambda: snapshot("wl-1", "ws://a/ws", [], 10), ttl_s=15)
+        reporter.publish()
+        value, ttl = redis.values["whisperlive:load:wl-1"]
+        self.assertEqual(json.loads(value)["url"], "ws://a/ws")
+        self.assertEqual(ttl, 15)
+        self.assertEqual(redis.sets[INSTANCES_KEY], {"wl-1"})
+
+        reporter.stop()
+        self.assertNotIn("whisperlive:load:wl-1", redis.values)
+        self.assertEqual(redis.sets[INSTANCES_KEY], set())
+
+
+if __name__ == "__main__":
+    unittest.main()
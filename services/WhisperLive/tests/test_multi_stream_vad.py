@@ -0,0 +1,98 @@
+import os
+import threading
+import unittest
+
+import numpy as np
+
+from whisper_live.multi_stream_vad import MultiStreamVAD
+
+
+class _FakeSileroSession:
+    """Silero v5 interface: probability = peak of the window, state counts windows seen."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def run(self, _, inputs):
+        x, state = inputs["input"], inputs["state"]
+        self.batch_sizes.append(x.shape[0])
+        probs = np.abs(x[:, 64:]).max(axis=1, keepdims=True)
+        return probs, state + 1.0
+
+
+class TestMultiStreamVAD(unittest.TestCase):
+    def setUp(self):
+        self.session = _FakeSileroSession()
+        self.vad = MultiStreamVAD(session=self.session, max_batch_size=64)
+        self.addCleanup(self.vad.stop)
+
+    def test_tick_batches_one_window_per_stream_per_call(self):
+        for i in range(10):
+            self.vad.feed(i, np.full(512 * 3 + 100, 0.01 * i, dtype=np.float32))
+        probs = self.vad.tick()
+
+        self.assertEqual(self.session.batch_sizes, [10, 10, 10])
+        for i in range(10):
+            np.testing.assert_allclose(probs[i], [0.01 * i] * 3, rtol=1e-6)
+        # The 100-sample remainder waits for the next packet.
+        self.vad.feed(0, np.zeros(412, dtype=np.float32))
+        self.assertEqual(list(self.vad.tick()), [0])
+
+    def test_state_and_context_are_kept_per_stream(self):
+        self.vad.feed("a", np.ones(512 * 4, dtype=np.float32))
+        self.vad.feed("b", np.full(512, 0.5, dtype=np.float32))
+        self.vad.tick()
+        streams = self.vad._streams
+        np.testing.assert_array_equal(streams["a"].state, np.full((2, 128), 4.0))
+        np.testing.assert_array_equal(streams["b"].state, np.full((2, 128), 1.0))
+        np.testing.assert_array_equal(streams["b"].context, np.full(64, 0.5))
+
+        self.vad.remove_stream("a")
+        self.vad.feed("a", np.ones(512, dtype=np.float32))
+        self.vad.tick()
+        np.testing.assert_array_equal(streams["a"].state, np.full((2, 128), 1.0))
+
+    def test_concurrent_is_speech_callers_share_ticks(self):
+        results = {}
+        barrier = threading.Barrier(20)
+
+        def client(i):
+            barrier.wait()
+            results[i] = self.vad.is_speech(i, np.full(4096, 0.9 if i % 2 else 0.1, dtype=np.float32))
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        self.assertEqual(results, {i: bool(i % 2) for i in range(20)})
+        self.assertEqual(self.vad.stats()["windows"], 20 * 8)
+        self.assertLess(self.vad.stats()["onnx_calls"], 20 * 8)
+
+    def test_short_packet_keeps_last_decision(self):
+        self.assertTrue(self.vad.is_speech("s", np.full(512, 0.9, dtype=np.float32)))
+        self.assertTrue(self.vad.is_speech("s", np.zeros(100, dtype=np.float32)))
+        self.assertFalse(self.vad.is_speech("s", np.zeros(512, dtype=np.float32)))
+
+
+MODEL_PATH = os.path.expanduser("~/.cache/whisper-live/silero_vad.onnx")
+
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH), "Silero VAD model not downloaded")
+class TestMultiStreamVADModel(unittest.TestCase):
+    def test_batched_probabilities_match_single_stream_runs(self):
+        rng = np.random.default_rng(0)
+        streams = [(rng.standard_normal(16000) * 0.05 * (i + 1)).astype(np.float32) for i in range(4)]
+        batched = MultiStreamVAD(model_path=MODEL_PATH)
+        for i, audio in enumerate(streams):
+            batched.feed(i, audio)
+        probs = batched.tick()
+        for i, audio in enumerate(streams):
+            single = MultiStreamVAD(model_path=MODEL_PATH, max_batch_size=1)
+            single.feed(i, audio)
+            np.testing.assert_allclose(probs[i], single.tick()[i], atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
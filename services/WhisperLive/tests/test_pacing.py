@@ -0,0 +1,86 @@
+import unittest
+
+from whisper_live.pacing import AIMDPacer
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class AIMDPacerTests(unittest.TestCase):
+    def test_fast_idle_responses_shrink_interval_down_to_minimum(self):
+        clock = _Clock()
+        pacer = AIMDPacer(initial_interval_s=1.0, min_interval_s=0.2, max_interval_s=5.0, increase_rps_per_s=0.5,
+                          clock=clock, rng=lambda: 0.5)
+
+        clock.now += 1.0
+        pacer.on_success(0.3, load_hint=0.1)
+        # rate 1.0 + 0.5 rps/s * 1s
+        self.assertAlmostEqual(pacer.interval_s, 1 / 1.5)
+
+        for _ in range(50):
+            clock.now += pacer.interval_s
+            pacer.on_success(0.3, load_hint=0.1)
+        self.assertAlmostEqual(pacer.interval_s, 0.2)
+
+    def test_without_load_hint_recovers_to_but_not_below_the_configured_interval(self):
+        clock = _Clock()
+        pacer = AIMDPacer(initial_interval_s=1.0, min_interval_s=0.2, max_interval_s=5.0, increase_rps_per_s=0.5,
+                          clock=clock, rng=lambda: 0.5)
+
+        clock.now += 1.0
+        pacer.on_success(0.3)
+        self.assertEqual(pacer.interval_s, 1.0)
+
+        pacer.on_overload(retry_after_s=1.0)
+        self.assertEqual(pacer.interval_s, 2.0)
+        for _ in range(20):
+            clock.now += pacer.interval_s
+            pacer.on_success(0.3)
+        self.assertEqual(pacer.interval_s, 1.0)
+
+    def test_busy_load_hint_holds_and_high_load_backs_off_once_per_cooldown(self):
+        clock = _Clock()
+        pacer = AIMDPacer(initial_interval_s=1.0, min_interval_s=0.2, max_interval_s=5.0, increase_rps_per_s=0.5,
+                          clock=clock, rng=lambda: 0.5)
+
+        clock.now += 1.0
+        pacer.on_success(0.3, load_hint=0.75)
+        self.assertEqual(pacer.interval_s, 1.0)
+
+        pacer.on_success(0.3, load_hint=1.5)
+        self.assertEqual(pacer.interval_s, 2.0)
+        # Many sessions reporting the same congestion count once
+        pacer.on_success(0.3, load_hint=1.5)
+        pacer.on_success(3.0)
+        self.assertEqual(pacer.interval_s, 2.0)
+
+        clock.now += 2.0
+        pacer.on_success(3.0)
+        self.assertEqual(pacer.interval_s, 4.0)
+        clock.now += 4.0
+        pacer.on_success(3.0)
+        self.assertEqual(pacer.interval_s, 5.0)
+
+    def test_overload_holds_sessions_until_retry_after_with_jitter(self):
+        clock = _Clock()
+        pacer = AIMDPacer(initial_interval_s=1.0, min_interval_s=0.2, max_interval_s=5.0, increase_rps_per_s=0.5,
+                          clock=clock, rng=lambda: 0.5)
+        self.assertAlmostEqual(pacer.delay_s(clock.now - 0.4), 0.6)
+
+        pacer.on_overload(retry_after_s=3.0)
+
+        self.assertEqual(pacer.interval_s, 2.0)
+        # Hold for Retry-After plus half (rng) of the new interval
+        self.assertAlmostEqual(pacer.delay_s(clock.now - 10.0), 4.0)
+        clock.now += 5.0
+        self.assertAlmostEqual(pacer.delay_s(clock.now - 0.5), 1.5)
+        self.assertEqual(pacer.stats()["overloads"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
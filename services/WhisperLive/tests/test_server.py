@@ -8,7 +8,9 @@ import numpy as np
 import jiwer
 
 from websockets.exceptions import ConnectionClosed
-from whisper_live.server import TranscriptionServer, BackendType, ClientManager
+import threading
+
+from whisper_live.server import TranscriptionServer, BackendType, ClientManager, ServeClientTensorRT
 from whisper_live.client import Client, TranscriptionClient, TranscriptionTeeClient
 from whisper.normalizers import EnglishTextNormalizer
 
@@ -116,6 +118,46 @@ class TestServerInferenceAccuracy(unittest.TestCase):
         self.check_prediction("transcript2.srt")
 
 
+class TestPerClientVoiceActivity(unittest.TestCase):
+    def setUp(self):
+        self.server = TranscriptionServer()
+        self.server.client_manager = ClientManager(max_clients=4, max_connection_time=600)
+        self.silent_ws, self.speaking_ws = mock.Mock(), mock.Mock()
+        for ws in (self.silent_ws, self.speaking_ws):
+            client = ServeClientTensorRT.__new__(ServeClientTensorRT)
+            client.eos = False
+            client.no_voice_activity_chunks = 0
+            client.lock = threading.Lock()
+            client.audio_event = threading.Event()
+            self.server.client_manager.clients[ws] = client
+        self.server.vad_detector = mock.Mock()
+        self.server.vad_detector.is_speech.side_effect = lambda ws, frame: ws is self.speaking_ws
+
+    @mock.patch('whisper_live.server.time.sleep')
+    def test_silence_sets_eos_only_for_that_client_without_sleeping(self, mock_sleep):
+        frame = np.zeros(4096, dtype=np.float32)
+        for _ in range(5):
+            self.assertFalse(self.server.voice_activity(self.silent_ws, frame))
+            self.assertTrue(self.server.voice_activity(self.speaking_ws, frame))
+
+        silent = self.server.client_manager.get_client(self.silent_ws)
+        speaking = self.server.client_manager.get_client(self.speaking_ws)
+        self.assertTrue(silent.eos)
+        self.assertEqual(silent.no_voice_activity_chunks, 5)
+        self.assertFalse(speaking.eos)
+        self.assertEqual(speaking.no_voice_activity_chunks, 0)
+        mock_sleep.assert_not_called()
+
+    def test_speech_clears_eos(self):
+        silent = self.server.client_manager.get_client(self.silent_ws)
+        for _ in range(4):
+            silent.update_voice_activity(False)
+        self.assertTrue(silent.eos)
+        silent.update_voice_activity(True)
+        self.assertFalse(silent.eos)
+        self.assertTrue(silent.audio_event.is_set())
+
+
 class TestExceptionHandling(unittest.TestCase):
     def setUp(self):
         self.server = TranscriptionServer()
@@ -0,0 +1,135 @@
+import io
+import json
+import threading
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from whisper_live.language_cache import LanguageCache
+from whisper_live.session_handoff import (
+    HANDOFF_KEY, export_state, restore_state, store_state, take_state,
+)
+
+RATE = 16000
+
+
+def _client(spool_dir=None):
+    return SimpleNamespace(
+        RATE=RATE,
+        lock=threading.Lock(),
+        _recording_lock=threading.Lock(),
+        client_uid="uid-1",
+        meeting_id=42,
+        platform="google_meet",
+        transcription_tier="realtime",
+        language=None,
+        language_provided=False,
+        language_cache=LanguageCache(),
+        frames_np=None,
+        frames_offset=0.0,
+        timestamp_offset=0.0,
+        transcript=[],
+        transcription_buffer=SimpleNamespace(max_segments=2, completed_segments=[]),
+        _last_sent_completed_idx=0,
+        audio_event=threading.Event(),
+        _recording_chunk_dir=spool_dir,
+        _recording_chunk_handle=None,
+        _recording_manifest=[],
+        _recording_chunk_index=0,
+    )
+
+
+class _Redis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def getdel(self, key):
+        return self.values.pop(key, None)
+
+
+class SessionHandoffTests(unittest.TestCase):
+    def _live_client(self):
+        client = _client(spool_dir="/spool/uid-1")
+        # 12s received after a 5s trim; transcribed up to 15s
+        client.frames_offset = 5.0
+        client.frames_np = np.arange(12 * RATE, dtype=np.float32)
+        client.timestamp_offset = 15.0
+        client.language = "de"
+        client.transcript = [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+        client.transcription_buffer.completed_segments = [{"text": "c"}]
+        client._recording_chunk_handle = io.BytesIO()
+        client._recording_manifest = [{"name": "000000.webm"}]
+        client._recording_chunk_index = 1
+        return client
+
+    def test_export_captures_pending_audio_and_closes_chunk(self):
+        client = self._live_client()
+        handle = client._recording_chunk_handle
+
+        state = export_state(client)
+
+        self.assertEqual(state["stream_end_s"], 17.0)
+        self.assertEqual(state["timestamp_offset"], 15.0)
+        self.assertEqual(state["language"], "de")
+        self.assertEqual([s["text"] for s in state["transcript"]], ["b", "c"])
+        self.assertEqual(state["spool"]["chunk_index"], 1)
+        self.assertTrue(handle.closed)
+        self.assertIsNone(client._recording_chunk_handle)
+        json.dumps(state)
+
+    def test_export_caps_pending_audio_to_newest(self):
+        client = self._live_client()
+        client.timestamp_offset = 5.0
+
+        state = export_state(client, max_pending_s=4)
+
+        self.assertEqual(state["timestamp_offset"], 13.0)
+
+    def test_restore_continues_timeline_with_gap_filled(self):
+        state = export_state(self._live_client())
+        peer = _client(spool_dir="/spool/uid-1")
+        peer._recording_manifest = [{"name": "000000.webm", "peer": True}]
+
+        restore_state(peer, state, now=state["exported_at"] + 3.0, max_gap_s=10)
+
+        self.assertEqual(peer.timestamp_offset, 15.0)
+        self.assertEqual(peer.frames_offset, 15.0)
+        self.assertEqual(peer.frames_np.shape[0], 2 * RATE + 3 * RATE)
+        self.assertEqual(peer.frames_np[0], float(10 * RATE))
+        self.assertFalse(peer.frames_np[-RATE:].any())
+        self.assertEqual(peer._last_sent_completed_idx, 2)
+        self.assertEqual(peer.language, "de")
+        self.assertEqual(peer.language_cache.lookup()[0], "de")
+        self.assertEqual(len(peer._recording_manifest), 2)
+        self.assertEqual(peer._recording_chunk_index, 2)
+        self.assertTrue(peer.audio_event.is_set())
+
+    def test_restore_keeps_own_spool_when_not_shared(self):
+        state = export_state(self._live_client())
+        peer = _client(spool_dir="/other/uid-1")
+
+        restore_state(peer, state, now=state["exported_at"] + 60.0, max_gap_s=2)
+
+        self.assertEqual(peer._recording_manifest, [])
+        self.assertEqual(peer._recording_chunk_index, 0)
+        self.assertEqual(peer.frames_np.shape[0], 2 * RATE + 2 * RATE)
+
+    def test_take_state_is_single_use_and_checks_meeting(self):
+        redis = _Redis()
+        state = export_state(self._live_client())
+        store_state(redis, state)
+
+        self.assertIsNone(take_state(redis, "uid-1", meeting_id=7))
+        self.assertNotIn(HANDOFF_KEY.format("uid-1"), redis.values)
+
+        store_state(redis, state)
+        self.assertEqual(take_state(redis, "uid-1", meeting_id=42)["uid"], "uid-1")
+        self.assertIsNone(take_state(redis, "uid-1", meeting_id=42))
+
+
+if __name__ == "__main__":
+    unittest.main()
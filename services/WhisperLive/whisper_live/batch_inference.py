@@ -0,0 +1,343 @@
+"""
+Server-wide batched inference for the faster-whisper backend.
+
+With ``single_model`` every ``ServeClientFasterWhisper`` used to hold
+``SINGLE_MODEL_LOCK`` for a whole ``WhisperModel.transcribe`` call, so N
+streams shared the GPU strictly one window at a time. The scheduler below
+collects the windows that are pending across all clients and decodes them
+through one ``WhisperModel`` as a padded batch, reusing the batched
+encode/generate path of ``BatchedInferencePipeline``. Each client thread
+blocks on its own request and receives its segments back, which it then
+feeds to ``update_segments`` exactly as before.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.vad import VadOptions, collect_chunks, get_speech_timestamps
+
+from whisper_live import settings
+from whisper_live.transcriber import (
+    BatchedInferencePipeline,
+    Segment,
+    TranscriptionInfo,
+    TranscriptionOptions,
+    WhisperModel,
+    get_suppressed_tokens,
+    restore_speech_timestamps,
+)
+
+TranscriptionResult = Tuple[Optional[List[Segment]], Optional[TranscriptionInfo]]
+
+# Returned by FasterWhisperBatchRunner._prepare for speech longer than one model window.
+_OVERSIZED = object()
+
+
+class TranscriptionRequest:
+    """One client's pending audio window."""
+
+    __slots__ = (
+        "audio", "language", "task", "initial_prompt", "use_vad", "vad_parameters",
+        "language_detection_segments", "feature_cache", "start_sample",
+        "enqueued_at", "done", "result", "error",
+    )
+
+    def __init__(self, audio, language=None, task="transcribe", initial_prompt=None,
+                 use_vad=True, vad_parameters=None, language_detection_segments=1,
+                 feature_cache=None, start_sample=0):
+        self.audio = audio
+        self.language = language
+        self.task = task
+        self.initial_prompt = initial_prompt
+        self.use_vad = use_vad
+        self.vad_parameters = vad_parameters
+        self.language_detection_segments = language_detection_segments
+        self.feature_cache = feature_cache
+        self.start_sample = start_sample
+        self.enqueued_at = None
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchedTranscriptionScheduler:
+    """
+    Collects requests from all client threads and runs them in batches.
+
+    A batch is closed as soon as ``max_batch_size`` requests are waiting or
+    ``max_wait_ms`` after its first request arrived, whichever comes first, so
+    a lone stream pays at most ``max_wait_ms`` of extra latency while busy
+    servers decode many streams per model call. Requests that queue up while
+    a batch is running are picked up together by the next one.
+
+    Args:
+        run_batch (callable): Maps a list of ``TranscriptionRequest`` to a list
+            of results in the same order.
+        max_batch_size (int): Maximum number of windows per model call.
+        max_wait_ms (float): How long to hold an open batch for more requests.
+    """
+
+    def __init__(self, run_batch: Callable[[List[TranscriptionRequest]], Sequence[TranscriptionResult]],
+                 max_batch_size: int = settings.BATCH_MAX_SIZE,
+                 max_wait_ms: float = settings.BATCH_MAX_WAIT_MS):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+
+        self.batches = 0
+        self.windows = 0
+        self.largest_batch = 0
+        self._latencies = deque(maxlen=1000)
+
+        self._thread = threading.Thread(target=self._run, name="fw-batch-scheduler", daemon=True)
+        self._thread.start()
+
+    def transcribe(self, request: TranscriptionRequest) -> TranscriptionResult:
+        """Submit a window and block until its batch has been decoded."""
+        request.enqueued_at = time.monotonic()
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stop(self):
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] if latencies else None
+        return {
+            "batches": self.batches,
+            "windows": self.windows,
+            "avg_batch_size": round(self.windows / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize(),
+            "p95_latency_s": round(p95, 4) if p95 is not None else None,
+        }
+
+    def _collect(self) -> List[TranscriptionRequest]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_s
+        while len(batch) < self.max_batch_size:
+            try:
+                # Drain whatever queued up while the previous batch was running
+                # before waiting for stragglers.
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if request is None:
+                self._stop.set()
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                results = self.run_batch(batch)
+                for request, result in zip(batch, results):
+                    request.result = result
+            except Exception as e:
+                logging.error(f"[BatchScheduler] Batch of {len(batch)} windows failed: {e}")
+                for request in batch:
+                    request.error = e
+            finished = time.monotonic()
+            self.batches += 1
+            self.windows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for request in batch:
+                self._latencies.append(finished - request.enqueued_at)
+                request.done.set()
+
+
+class FasterWhisperBatchRunner:
+    """
+    Decodes a batch of client windows with one shared ``WhisperModel``.
+
+    Every window is VAD-filtered on its own, then all windows that share a
+    language/task/prompt go through ``BatchedInferencePipeline.forward`` as a
+    single padded ``(batch, n_mels, 3000)`` feature tensor. Timestamps are
+    decoded so each window still yields several segments, and are mapped back
+    to the unfiltered audio just like ``WhisperModel.transcribe`` does.
+
+    Unlike the per-client path there is no temperature fallback: the batched
+    generate call decodes at ``temperatures[0]`` only. Windows whose speech
+    exceeds one 30s model window are transcribed individually.
+    """
+
+    def __init__(self, model: WhisperModel):
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model)
+        self.sampling_rate = model.feature_extractor.sampling_rate
+
+    def __call__(self, requests: List[TranscriptionRequest]) -> List[TranscriptionResult]:
+        results: List[TranscriptionResult] = [(None, None)] * len(requests)
+        groups = {}
+        for index, request in enumerate(requests):
+            prepared = self._prepare(request)
+            if prepared is None:
+                continue
+            if prepared is _OVERSIZED:
+                results[index] = self._transcribe_single(request)
+                continue
+            features, speech_chunks, vad_options, duration_after_vad = prepared
+            language, language_probability, all_language_probs = self._language(request, features)
+            key = (language, request.task, request.initial_prompt)
+            groups.setdefault(key, []).append(
+                (index, features, speech_chunks, vad_options, duration_after_vad,
+                 language_probability, all_language_probs)
+            )
+
+        for (language, task, initial_prompt), items in groups.items():
+            tokenizer = Tokenizer(
+                self.model.hf_tokenizer,
+                self.model.model.is_multilingual,
+                task=task,
+                language=language,
+            )
+            options = self._options(tokenizer, initial_prompt)
+            features = np.stack([pad_or_trim(item[1]) for item in items])
+            chunks_metadata = [{"start_time": 0.0, "end_time": item[4]} for item in items]
+            outputs = self.pipeline.forward(features, tokenizer, chunks_metadata, options)
+
+            for item, output in zip(items, outputs):
+                index, _, speech_chunks, vad_options, duration_after_vad, probability, all_probs = item
+                segments = [
+                    Segment(
+                        id=seg_idx,
+                        seek=segment["seek"],
+                        start=round(segment["start"], 3),
+                        end=round(segment["end"], 3),
+                        text=segment["text"],
+                        tokens=segment["tokens"],
+                        avg_logprob=segment["avg_logprob"],
+                        compression_ratio=segment["compression_ratio"],
+                        no_speech_prob=segment["no_speech_prob"],
+                        words=None,
+                        temperature=options.temperatures[0],
+                    )
+                    for seg_idx, segment in enumerate(output, start=1)
+                ]
+                if speech_chunks:
+                    segments = restore_speech_timestamps(segments, speech_chunks, self.sampling_rate)
+                info = TranscriptionInfo(
+                    language=language,
+                    language_probability=probability,
+                    duration=requests[index].audio.shape[0] / self.sampling_rate,
+                    duration_after_vad=duration_after_vad,
+                    all_language_probs=all_probs,
+                    transcription_options=options,
+                    vad_options=vad_options,
+                )
+                results[index] = (segments, info)
+        return results
+
+    def _prepare(self, request: TranscriptionRequest):
+        audio = request.audio
+        speech_chunks = None
+        vad_options = None
+        if request.use_vad:
+            vad_options = self._vad_options(request.vad_parameters)
+            speech_chunks = get_speech_timestamps(audio, vad_options)
+            audio_chunks, _ = collect_chunks(audio, speech_chunks)
+            audio = np.concatenate(audio_chunks, axis=0)
+        if audio.shape[0] == 0:
+            return None
+        if audio.shape[0] > self.model.feature_extractor.n_samples:
+            return _OVERSIZED
+        if request.feature_cache is not None and (speech_chunks is None or len(speech_chunks) == 1):
+            start_sample = request.start_sample + (speech_chunks[0]["start"] if speech_chunks else 0)
+            features = request.feature_cache(audio, start_sample)[..., :-1]
+        else:
+            features = self.model.feature_extractor(audio)[..., :-1]
+        return features, speech_chunks, vad_options, audio.shape[0] / self.sampling_rate
+
+    def _language(self, request: TranscriptionRequest, features):
+        if not self.model.model.is_multilingual:
+            return "en", 1, None
+        if request.language is not None:
+            return request.language, 1, None
+        return self.model.detect_language(
+            features=features,
+            language_detection_segments=request.language_detection_segments,
+        )
+
+    def _transcribe_single(self, request: TranscriptionRequest) -> TranscriptionResult:
+        return self.model.transcribe(
+            request.audio,
+            initial_prompt=request.initial_prompt,
+            language=request.language,
+            task=request.task,
+            vad_filter=request.use_vad,
+            vad_parameters=request.vad_parameters if request.use_vad else None,
+            language_detection_segments=request.language_detection_segments,
+            feature_cache=request.feature_cache,
+            audio_start_sample=request.start_sample,
+        )
+
+    def _vad_options(self, vad_parameters) -> VadOptions:
+        if isinstance(vad_parameters, VadOptions):
+            return vad_parameters
+        params = dict(vad_parameters or {})
+        params.setdefault(
+            "max_speech_duration_s",
+            settings.VAD_MAX_SPEECH_DURATION_S
+            if settings.VAD_MAX_SPEECH_DURATION_S is not None
+            else self.model.feature_extractor.chunk_length,
+        )
+        params.setdefault("min_silence_duration_ms", settings.VAD_MIN_SILENCE_DURATION_MS)
+        return VadOptions(**params)
+
+    def _options(self, tokenizer: Tokenizer, initial_prompt) -> TranscriptionOptions:
+        return TranscriptionOptions(
+            beam_size=settings.BEAM_SIZE,
+            best_of=5,
+            patience=1,
+            length_penalty=1,
+            repetition_penalty=1,
+            no_repeat_ngram_size=0,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            compression_ratio_threshold=2.4,
+            condition_on_previous_text=False,
+            prompt_reset_on_temperature=0.5,
+            temperatures=[0.0],
+            initial_prompt=initial_prompt,
+            prefix=None,
+            suppress_blank=True,
+            suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+            without_timestamps=False,
+            max_initial_timestamp=0.0,
+            word_timestamps=False,
+            prepend_punctuations="\"'“¿([{-",
+            append_punctuations="\"'.。,，!！?？:：”)]}、",
+            multilingual=False,
+            max_new_tokens=None,
+            clip_timestamps=[],
+            hallucination_silence_threshold=None,
+            hotwords=None,
+        )
@@ -0,0 +1,122 @@
+"""
+Incremental log-mel features for re-transcribed streaming windows.
+
+The realtime loop transcribes the whole window from ``timestamp_offset`` to
+the newest sample on every cycle, so ``FeatureExtractor`` recomputed the
+STFT/mel for the same leading seconds over and over. A log-mel frame only
+depends on the ``n_fft`` samples around its centre, so every frame that lies
+fully inside the stream can be computed once and reused while the window
+grows. Only the frames touching the window's reflect/zero padding at either
+edge, plus the newly arrived ones, are computed per call.
+
+The cache stores raw ``log10`` mel frames. The ``max - 8`` clamp and the
+rescaling that ``FeatureExtractor`` applies depend on the whole window, so
+they run on the assembled frames of every call.
+"""
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+
+class StreamingLogMelCache:
+    """
+    Rolling raw log-mel cache for one audio stream, keyed by absolute frame index.
+
+    Frame ``g`` is centred on absolute stream sample ``g * hop_length + phase``.
+    Windows that start on a different hop phase than the cached frames reset
+    the cache; windows that start later drop the frames before them.
+
+    Args:
+        feature_extractor (FeatureExtractor): The model's extractor; its STFT
+            parameters and mel filters are reused so results match ``__call__``.
+    """
+
+    def __init__(self, feature_extractor: FeatureExtractor):
+        self.feature_extractor = feature_extractor
+        self.hop = feature_extractor.hop_length
+        self.n_fft = feature_extractor.n_fft
+        self.half = self.n_fft // 2
+        self.window = np.hanning(self.n_fft + 1)[:-1].astype("float32")
+        self.n_mels = feature_extractor.mel_filters.shape[0]
+
+        self._phase = None
+        self._first = 0
+        self._frames = np.zeros((self.n_mels, 0), dtype=np.float32)
+
+        self.computed_frames = 0
+        self.reused_frames = 0
+
+    def __call__(self, audio: np.ndarray, start_sample: int, padding: int = 160) -> np.ndarray:
+        """
+        Log-mel features of ``audio``, equal to ``feature_extractor(audio, padding)``.
+
+        Args:
+            audio (np.ndarray): The window, starting at absolute stream sample ``start_sample``.
+            start_sample (int): Absolute index of ``audio[0]`` in the stream.
+            padding (int): Zero padding appended before the STFT, as in ``FeatureExtractor``.
+        """
+        audio = audio.astype(np.float32, copy=False)
+        length = audio.shape[0]
+        n_frames = (length + padding) // self.hop
+        # Local frames [first_inner, last_inner] only touch real samples of the window
+        first_inner = -(-self.half // self.hop)
+        last_inner = (length - self.half) // self.hop
+        if last_inner < first_inner:
+            return self.feature_extractor(audio, padding=padding)
+
+        phase = start_sample % self.hop
+        base = start_sample // self.hop
+        inner = self._inner_frames(audio, phase, base, first_inner, last_inner)
+
+        head = self._log_mel(np.pad(audio[: first_inner * self.hop + self.half], (self.half, 0), mode="reflect"))
+        head = head[:, :first_inner]
+        tail_start = (last_inner + 1) * self.hop - self.half
+        tail = np.pad(audio[tail_start:], (0, padding))
+        tail = np.pad(tail, (0, self.half), mode="reflect")
+        tail = self._log_mel(tail)[:, : n_frames - last_inner - 1]
+
+        log_spec = np.concatenate([head, inner, tail], axis=1)
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+    def reset(self):
+        self._phase = None
+        self._first = 0
+        self._frames = np.zeros((self.n_mels, 0), dtype=np.float32)
+
+    def stats(self) -> dict:
+        return {
+            "cached_frames": self._frames.shape[1],
+            "computed_frames": self.computed_frames,
+            "reused_frames": self.reused_frames,
+        }
+
+    def _inner_frames(self, audio, phase, base, first_inner, last_inner):
+        lo, hi = base + first_inner, base + last_inner
+        cached_end = self._first + self._frames.shape[1]
+        if phase != self._phase or lo < self._first or lo > cached_end:
+            self._phase = phase
+            self._first = lo
+            self._frames = np.zeros((self.n_mels, 0), dtype=np.float32)
+            cached_end = lo
+        elif lo > self._first:
+            self._frames = self._frames[:, lo - self._first:]
+            self._first = lo
+
+        if hi >= cached_end:
+            k_start = cached_end - base
+            segment = audio[k_start * self.hop - self.half: last_inner * self.hop + self.half]
+            new_frames = self._log_mel(segment)
+            self._frames = np.concatenate([self._frames, new_frames], axis=1)
+            self.computed_frames += new_frames.shape[1]
+        self.reused_frames += min(cached_end, hi + 1) - lo
+        return self._frames[:, : hi - lo + 1]
+
+    def _log_mel(self, segment: np.ndarray) -> np.ndarray:
+        """Raw log10 mel of every full ``n_fft`` frame in ``segment`` (no centre padding)."""
+        stft = FeatureExtractor.stft(
+            segment, self.n_fft, self.hop, window=self.window, center=False, return_complex=True,
+        ).astype("complex64")
+        magnitudes = np.abs(stft) ** 2
+        mel_spec = self.feature_extractor.mel_filters @ magnitudes
+        return np.log10(np.clip(mel_spec, a_min=1e-10, a_max=None))
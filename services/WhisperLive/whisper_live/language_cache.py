@@ -0,0 +1,95 @@
+"""
+Per-session language detection results for auto-language clients.
+
+A client that connects without a language used to detect it once and then
+pin it for the rest of the session, or - when detection was never confident -
+detect it again on every window. ``LanguageCache`` keeps the last detection
+per session and per active speaker instead. Its confidence decays with a
+half-life, so a cached language is used as a hint (skipping detection) while
+it is fresh and is re-verified by a new detection once it has gone stale.
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from whisper_live import settings
+
+
+class LanguageCache:
+    """
+    Decaying language hints for one session.
+
+    ``observe()`` records a detection for the session and, if known, for the
+    speaker that was active. ``lookup()`` returns the speaker's own entry when
+    there is one; otherwise the session entry is used with its confidence
+    scaled by ``speaker_fallback`` so that a new speaker is usually detected
+    once rather than assumed to speak the session language.
+
+    Args:
+        half_life_s (float): Seconds after which a cached confidence is halved.
+        speaker_fallback (float): Confidence factor when a speaker falls back
+            to the session entry.
+        min_confidence (float): Default decayed confidence below which
+            ``lookup()`` reports a miss.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(self, half_life_s: float = settings.LANGUAGE_CACHE_HALF_LIFE_S,
+                 speaker_fallback: float = settings.LANGUAGE_CACHE_SPEAKER_FALLBACK,
+                 min_confidence: float = settings.LANGUAGE_HINT_MIN_CONFIDENCE,
+                 clock=time.monotonic):
+        self.half_life_s = max(1e-3, float(half_life_s))
+        self.speaker_fallback = float(speaker_fallback)
+        self.min_confidence = float(min_confidence)
+        self.clock = clock
+        self._session: Optional[Tuple[str, float, float]] = None
+        self._speakers: Dict[Hashable, Tuple[str, float, float]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def observe(self, language: Optional[str], probability: Optional[float], speaker: Hashable = None):
+        """Record a detection result; a new result replaces the older one."""
+        if not language or probability is None:
+            return
+        entry = (language, float(probability), self.clock())
+        with self._lock:
+            self._session = entry
+            if speaker is not None:
+                self._speakers[speaker] = entry
+
+    def lookup(self, speaker: Hashable = None,
+               min_confidence: Optional[float] = None) -> Tuple[Optional[str], float]:
+        """
+        Return ``(language, decayed_confidence)``, or ``(None, 0.0)`` when nothing
+        is cached or the decayed confidence is below ``min_confidence``
+        (``self.min_confidence`` if not given).
+        """
+        if min_confidence is None:
+            min_confidence = self.min_confidence
+        now = self.clock()
+        with self._lock:
+            entry = self._speakers.get(speaker) if speaker is not None else None
+            factor = 1.0
+            if entry is None:
+                entry = self._session
+                if speaker is not None:
+                    factor = self.speaker_fallback
+        if entry is None:
+            self.misses += 1
+            return None, 0.0
+        language, probability, observed_at = entry
+        confidence = factor * probability * 0.5 ** ((now - observed_at) / self.half_life_s)
+        if confidence < min_confidence:
+            self.misses += 1
+            return None, 0.0
+        self.hits += 1
+        return language, confidence
+
+    def stats(self) -> dict:
+        with self._lock:
+            speakers = len(self._speakers)
+            session = self._session[0] if self._session else None
+        return {"language": session, "speakers": speakers, "hits": self.hits, "misses": self.misses}
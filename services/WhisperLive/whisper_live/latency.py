@@ -0,0 +1,33 @@
+"""
+Per-stage latency histograms for the live transcription path.
+
+A segment travels bot -> WhisperLive -> Redis stream -> transcription-collector
+-> Redis pub/sub -> api-gateway ``/ws``. Each hop records how long its own stage
+took, and the wall-clock times it needs downstream travel with the message in a
+``timing`` object:
+
+- ``ingest``: when the newest audio frame of the transcribed window arrived here;
+- ``sent``: when the segments were handed to the Redis stream.
+
+This module covers the WhisperLive stages:
+
+- ``buffer_wait``: frame ingest until the window is sent for transcription;
+- ``transcribe``: the transcription request itself;
+- ``collector_xadd``: the XADD to the collector stream.
+
+The histograms are served in the Prometheus text format on the health server
+(``:9091/metrics/prometheus``). The collector and the gateway export the stages
+after this one; ``shared_models.latency`` describes the whole path.
+"""
+
+try:
+    from shared_models.latency import StageLatency
+except ImportError:
+    # Images built from docker/ do not install shared-models
+    from whisper_live.stage_latency import StageLatency
+
+STAGE_BUFFER_WAIT = "buffer_wait"
+STAGE_TRANSCRIBE = "transcribe"
+STAGE_COLLECTOR_XADD = "collector_xadd"
+
+STAGES = StageLatency("whisperlive_stage_latency_seconds")
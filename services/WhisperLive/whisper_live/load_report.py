@@ -0,0 +1,134 @@
+"""
+Load reports for bot placement.
+
+Every server writes a small JSON snapshot of its load to Redis under
+``whisperlive:load:<server id>`` (with a TTL) and adds its id to the
+``whisperlive:instances`` set. bot-manager reads the set and picks the least
+loaded live instance for each new bot. The snapshot carries what the server
+already knows: connected sessions, its capacity and the audio queued in client
+buffers that has not been transcribed yet.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from whisper_live import settings
+
+LOAD_KEY_PREFIX = "whisperlive:load:"
+INSTANCES_KEY = "whisperlive:instances"
+
+
+def queued_audio_s(client) -> float:
+    """Seconds of received audio a client has not transcribed yet."""
+    frames_np = getattr(client, "frames_np", None)
+    if frames_np is None:
+        return 0.0
+    try:
+        rate = getattr(client, "RATE", 16000)
+        end_s = float(client.frames_offset) + len(frames_np) / float(rate)
+        return max(0.0, end_s - float(client.timestamp_offset))
+    except Exception:
+        return 0.0
+
+
+def snapshot(server_id: str, url: str, clients: Iterable[Any], max_clients: int,
+             healthy: bool = True, draining: bool = False) -> Dict[str, Any]:
+    """Build the load report for ``clients`` currently served by this instance."""
+    clients = [c for c in clients if c is not None]
+    return {
+        "id": server_id,
+        "url": url,
+        "sessions": len(clients),
+        "max_clients": int(max_clients),
+        "queued_audio_s": round(sum(queued_audio_s(c) for c in clients), 3),
+        "in_flight": sum(1 for c in clients if getattr(c, "transcription_in_flight", False)),
+        "healthy": bool(healthy),
+        "draining": bool(draining),
+        "ts": time.time(),
+    }
+
+
+class LoadReporter:
+    """
+    Publishes ``collect()`` to Redis every ``interval_s`` on a daemon thread.
+
+    Args:
+        redis_client: Synchronous redis client (``decode_responses`` not required).
+        server_id (str): Stable id of this instance.
+        collect (callable): Returns the current report dict.
+        interval_s (float): Seconds between reports.
+        ttl_s (float): Expiry of each report.
+    """
+
+    def __init__(self, redis_client, server_id: str, collect,
+                 interval_s: float = settings.LOAD_REPORT_INTERVAL_S,
+                 ttl_s: float = settings.LOAD_REPORT_TTL_S):
+        self.redis = redis_client
+        self.server_id = server_id
+        self.collect = collect
+        self.interval_s = float(interval_s)
+        self.ttl_s = max(1, int(ttl_s))
+        self.key = f"{LOAD_KEY_PREFIX}{server_id}"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self) -> Dict[str, Any]:
+        report = self.collect()
+        pipe = self.redis.pipeline()
+        pipe.set(self.key, json.dumps(report), ex=self.ttl_s)
+        pipe.sadd(INSTANCES_KEY, self.server_id)
+        pipe.execute()
+        return report
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.publish()
+            except Exception as e:
+                logging.warning(f"LOAD_REPORT: publish failed: {e}")
+            self._stop.wait(self.interval_s)
+
+    def start(self):
+        if self.interval_s <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logging.info(f"LOAD_REPORT: publishing {self.key} every {self.interval_s}s")
+
+    def stop(self, withdraw: bool = True):
+        """Stop publishing; ``withdraw`` removes this instance from placement right away."""
+        self._stop.set()
+        if not withdraw:
+            return
+        try:
+            pipe = self.redis.pipeline()
+            pipe.delete(self.key)
+            pipe.srem(INSTANCES_KEY, self.server_id)
+            pipe.execute()
+        except Exception as e:
+            logging.warning(f"LOAD_REPORT: withdraw failed: {e}")
+
+
+def pick_peer(redis_client, exclude_id: str) -> Optional[str]:
+    """URL of the least loaded other instance that accepts sessions, if any."""
+    server_ids = sorted(sid for sid in redis_client.smembers(INSTANCES_KEY) if sid != exclude_id)
+    if not server_ids:
+        return None
+    best = None
+    for raw in redis_client.mget([f"{LOAD_KEY_PREFIX}{sid}" for sid in server_ids]):
+        if not raw:
+            continue
+        report = json.loads(raw)
+        max_clients = int(report.get("max_clients") or 0)
+        sessions = int(report.get("sessions") or 0)
+        if not report.get("url") or not report.get("healthy", True) or report.get("draining"):
+            continue
+        if max_clients <= 0 or sessions >= max_clients:
+            continue
+        load = sessions / max_clients
+        if best is None or load < best[0]:
+            best = (load, report["url"])
+    return best[1] if best else None
@@ -0,0 +1,239 @@
+"""
+Silero VAD for many concurrent streams in one ONNX session.
+
+``VoiceActivityDetector`` runs every packet on its own: it copies the frame
+to torch, resets the recurrent state and calls ``session.run`` once per
+512-sample window with batch size 1. ``MultiStreamVAD`` keeps the Silero
+state and 64-sample context per stream instead, and on every tick stacks the
+next pending window of every active stream into a single batched
+``session.run`` call. Everything stays in NumPy.
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import onnxruntime
+
+SILERO_VAD_URL = "https://github.com/snakers4/silero-vad/raw/v5.0/files/silero_vad.onnx"
+
+
+def download_silero_vad(model_url=SILERO_VAD_URL):
+    """Return the cached Silero VAD ONNX model path, downloading it on first use."""
+    target_dir = os.path.expanduser("~/.cache/whisper-live/")
+    os.makedirs(target_dir, exist_ok=True)
+    model_filename = os.path.join(target_dir, "silero_vad.onnx")
+    if not os.path.exists(model_filename):
+        try:
+            subprocess.run(["wget", "-O", model_filename, model_url], check=True)
+        except subprocess.CalledProcessError:
+            print("Failed to download the model using wget.")
+    return model_filename
+
+
+class _Stream:
+    __slots__ = ("pending", "state", "context", "windows_fed", "windows_done", "probs", "speech")
+
+    def __init__(self, context_size):
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.state = np.zeros((2, 128), dtype=np.float32)
+        self.context = np.zeros(context_size, dtype=np.float32)
+        self.windows_fed = 0
+        self.windows_done = 0
+        self.probs: List[float] = []
+        self.speech = False
+
+
+class MultiStreamVAD:
+    """
+    Multi-stream voice activity detection with per-stream recurrent state.
+
+    Streams are fed audio of any length; complete 512-sample windows are
+    queued and the remainder carries over to the next packet. ``tick()`` runs
+    every queued window, one batched ONNX call per window position across all
+    streams that have one. ``is_speech()`` is the blocking per-packet API used
+    by connection threads: it feeds the packet, lets the background ticker
+    batch it with the other streams' packets and reports whether any of its
+    windows crossed the threshold.
+
+    Args:
+        threshold (float): Speech probability threshold.
+        sample_rate (int): 16000 (512-sample windows) or 8000 (256-sample windows).
+        max_batch_size (int): Maximum number of streams per ONNX call.
+        model_path (str, optional): Silero VAD v5 ONNX model; downloaded if not given.
+        session (optional): Pre-built inference session with the Silero v5 interface.
+    """
+
+    def __init__(self, threshold=0.5, sample_rate=16000, max_batch_size=512,
+                 model_path=None, session=None):
+        if sample_rate not in (8000, 16000):
+            raise ValueError("Supported sampling rates: [8000, 16000]")
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.window_size = 512 if sample_rate == 16000 else 256
+        self.context_size = 64 if sample_rate == 16000 else 32
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.session = session or self._create_session(model_path or download_silero_vad())
+        self._sr = np.array(sample_rate, dtype=np.int64)
+
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._work = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.ticks = 0
+        self.onnx_calls = 0
+        self.windows = 0
+
+    @staticmethod
+    def _create_session(path):
+        opts = onnxruntime.SessionOptions()
+        opts.log_severity_level = 3
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        return onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"], sess_options=opts)
+
+    # --- stream management ---
+    def add_stream(self, stream_id: Hashable):
+        with self._lock:
+            self._streams.setdefault(stream_id, _Stream(self.context_size))
+
+    def remove_stream(self, stream_id: Hashable):
+        with self._lock:
+            self._streams.pop(stream_id, None)
+            self._done.notify_all()
+
+    def reset_stream(self, stream_id: Hashable):
+        with self._lock:
+            if stream_id in self._streams:
+                self._streams[stream_id] = _Stream(self.context_size)
+
+    def feed(self, stream_id: Hashable, audio: np.ndarray) -> int:
+        """Queue audio for a stream; returns the stream's total number of complete windows so far."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                stream = self._streams[stream_id] = _Stream(self.context_size)
+            complete_before = stream.pending.shape[0] // self.window_size
+            stream.pending = np.concatenate((stream.pending, np.asarray(audio, dtype=np.float32).reshape(-1)))
+            stream.windows_fed += stream.pending.shape[0] // self.window_size - complete_before
+            target = stream.windows_fed
+        self._work.set()
+        return target
+
+    def speech_probs(self, stream_id: Hashable) -> np.ndarray:
+        """Pop the speech probabilities computed for a stream since the last call."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                return np.zeros(0, dtype=np.float32)
+            probs, stream.probs = stream.probs, []
+        return np.asarray(probs, dtype=np.float32)
+
+    # --- batched inference ---
+    def tick(self) -> Dict[Hashable, np.ndarray]:
+        """Run every complete pending window; returns the new probabilities per stream."""
+        with self._lock:
+            ready = []
+            for stream_id, stream in self._streams.items():
+                n = stream.pending.shape[0] // self.window_size
+                if n:
+                    windows = stream.pending[: n * self.window_size].reshape(n, self.window_size)
+                    stream.pending = stream.pending[n * self.window_size:]
+                    ready.append((stream_id, stream, windows))
+        if not ready:
+            return {}
+
+        new_probs: Dict[Hashable, List[float]] = {stream_id: [] for stream_id, _, _ in ready}
+        try:
+            for position in range(max(windows.shape[0] for _, _, windows in ready)):
+                row = [(stream_id, stream, windows[position]) for stream_id, stream, windows in ready
+                       if position < windows.shape[0]]
+                for i in range(0, len(row), self.max_batch_size):
+                    self._run_batch(row[i:i + self.max_batch_size], new_probs)
+        finally:
+            # Settle the taken windows even on failure so blocked callers are released
+            with self._lock:
+                for stream_id, stream, windows in ready:
+                    probs = new_probs[stream_id]
+                    stream.probs.extend(probs)
+                    stream.windows_done += windows.shape[0]
+                    stream.speech = bool(probs) and max(probs) > self.threshold
+                self.ticks += 1
+                self._done.notify_all()
+        return {stream_id: np.asarray(probs, dtype=np.float32) for stream_id, probs in new_probs.items()}
+
+    def _run_batch(self, batch, new_probs):
+        x = np.empty((len(batch), self.context_size + self.window_size), dtype=np.float32)
+        state = np.empty((2, len(batch), 128), dtype=np.float32)
+        for i, (_, stream, window) in enumerate(batch):
+            x[i, :self.context_size] = stream.context
+            x[i, self.context_size:] = window
+            state[:, i] = stream.state
+        out, new_state = self.session.run(None, {"input": x, "state": state, "sr": self._sr})
+        for i, (stream_id, stream, _) in enumerate(batch):
+            stream.state = new_state[:, i].copy()
+            stream.context = x[i, -self.context_size:].copy()
+            new_probs[stream_id].append(float(out[i, 0]))
+        self.onnx_calls += 1
+        self.windows += len(batch)
+
+    # --- background ticker for blocking callers ---
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="multi-stream-vad", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._work.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._work.wait()
+            self._work.clear()
+            try:
+                self.tick()
+            except Exception as e:
+                logging.error(f"[MultiStreamVAD] tick failed: {e}")
+
+    def is_speech(self, stream_id: Hashable, audio: np.ndarray, timeout: float = 1.0) -> bool:
+        """
+        Feed a packet and wait for its windows to be scored by the background ticker.
+
+        Returns True if any window completed by this packet is above the threshold.
+        A packet too short to complete a window keeps the stream's last decision.
+        """
+        self.start()
+        target = self.feed(stream_id, audio)
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            self._done.wait_for(
+                lambda: self._streams.get(stream_id) is not stream or stream.windows_done >= target,
+                timeout=timeout,
+            )
+            if self._streams.get(stream_id) is not stream:
+                return False
+            speech = stream.speech
+            stream.probs = []
+        return speech
+
+    def stats(self) -> dict:
+        with self._lock:
+            streams = len(self._streams)
+        return {
+            "streams": streams,
+            "ticks": self.ticks,
+            "onnx_calls": self.onnx_calls,
+            "windows": self.windows,
+            "avg_batch_size": round(self.windows / self.onnx_calls, 2) if self.onnx_calls else 0.0,
+        }
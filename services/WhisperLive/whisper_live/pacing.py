@@ -0,0 +1,168 @@
+"""
+Adaptive spacing of remote transcription requests.
+
+Every remote session sends at most one request at a time, and waits a minimum
+interval after its previous request. A fixed interval wastes GPU time when the
+transcription-service is idle and keeps every client hammering at the same
+cadence when it answers 503/429.
+
+``AIMDPacer`` adjusts that interval with additive increase / multiplicative
+decrease (AIMD), working on the request rate (``1 / interval``):
+
+- a fast response while the service reports spare capacity adds
+  ``increase_rps_per_s`` per second since the last adjustment;
+- a fast response without a load hint (e.g. from a third-party API) does the
+  same only while the interval is above the configured one, so a session
+  recovers from backoff but never sends more often than configured;
+- a load hint between ``load_low`` and ``load_high`` holds the rate;
+- a slow response, a load hint above ``load_high`` or a 503/429 multiplies the
+  rate by ``decrease_factor``, at most once per cooldown, so one burst of
+  rejections seen by many sessions counts as one congestion signal;
+- a 503/429 also holds every session until its ``Retry-After`` has passed,
+  plus a random share of one interval so the sessions don't retry together.
+
+One pacer is shared by all sessions of a tier in the process (``pacer_for``),
+so they converge on their fair share of the service together.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from whisper_live import settings
+
+
+class AIMDPacer:
+    """Thread-safe AIMD controller for the interval between requests."""
+
+    def __init__(
+        self,
+        initial_interval_s: float,
+        min_interval_s: float,
+        max_interval_s: float,
+        increase_rps_per_s: float = 0.1,
+        decrease_factor: float = 0.5,
+        target_latency_s: float = 2.0,
+        load_high: float = 0.9,
+        load_low: float = 0.6,
+        clock: Callable[[], float] = time.time,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.min_interval_s = max(0.01, float(min_interval_s))
+        self.max_interval_s = max(self.min_interval_s, float(max_interval_s))
+        self.increase_rps_per_s = float(increase_rps_per_s)
+        self.decrease_factor = min(max(float(decrease_factor), 0.05), 1.0)
+        self.target_latency_s = float(target_latency_s)
+        self.load_high = float(load_high)
+        self.load_low = float(load_low)
+        self.clock = clock
+        self.rng = rng
+
+        self._lock = threading.Lock()
+        self.initial_interval_s = self._clamp(initial_interval_s)
+        self._interval_s = self.initial_interval_s
+        now = self.clock()
+        self._last_adjust = now
+        self._last_decrease = float("-inf")
+        self._hold_until = 0.0
+
+        self.increases = 0
+        self.decreases = 0
+        self.overloads = 0
+
+    @property
+    def interval_s(self) -> float:
+        return self._interval_s
+
+    def _clamp(self, interval_s: float) -> float:
+        return min(self.max_interval_s, max(self.min_interval_s, float(interval_s)))
+
+    def _increase(self, now: float, floor_s: float):
+        # Grow by rate-per-second of good signal, but don't bank a long idle spell
+        elapsed = min(max(now - self._last_adjust, 0.0), self._interval_s * 2)
+        rate = 1.0 / self._interval_s + self.increase_rps_per_s * elapsed
+        self._interval_s = max(floor_s, self._clamp(1.0 / rate))
+        self._last_adjust = now
+        self.increases += 1
+
+    def _decrease(self, now: float):
+        self._last_adjust = now
+        if now - self._last_decrease < max(1.0, self._interval_s):
+            return
+        self._interval_s = self._clamp(self._interval_s / self.decrease_factor)
+        self._last_decrease = now
+        self.decreases += 1
+
+    def on_success(self, latency_s: float, load_hint: Optional[float] = None):
+        """Record a completed request with its latency and the service's load hint (0..1+)."""
+        with self._lock:
+            now = self.clock()
+            if latency_s > self.target_latency_s or (load_hint is not None and load_hint > self.load_high):
+                self._decrease(now)
+            elif load_hint is not None and load_hint < self.load_low:
+                self._increase(now, self.min_interval_s)
+            elif load_hint is None and self._interval_s > self.initial_interval_s:
+                self._increase(now, self.initial_interval_s)
+            else:
+                self._last_adjust = now
+
+    def on_overload(self, retry_after_s: float = 0.0):
+        """Record a 503/429 answer."""
+        with self._lock:
+            now = self.clock()
+            self.overloads += 1
+            self._decrease(now)
+            self._hold_until = max(self._hold_until, now + max(0.0, float(retry_after_s or 0.0)))
+
+    def delay_s(self, last_request_at: float) -> float:
+        """Seconds a session whose previous request finished at ``last_request_at`` should still wait."""
+        with self._lock:
+            now = self.clock()
+            ready_at = last_request_at + self._interval_s
+            if self._hold_until > now:
+                ready_at = max(ready_at, self._hold_until + self.rng() * self._interval_s)
+            return max(0.0, ready_at - now)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "interval_s": round(self._interval_s, 3),
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "overloads": self.overloads,
+                "hold_s": round(max(0.0, self._hold_until - self.clock()), 3),
+            }
+
+
+_pacers: Dict[str, AIMDPacer] = {}
+_pacers_lock = threading.Lock()
+
+
+def pacer_for(tier: str, initial_interval_s: float) -> Optional[AIMDPacer]:
+    """
+    The process-wide pacer of ``tier``, created on first use.
+
+    Realtime sessions may go down to ``PACING_MIN_INTERVAL_S`` when the
+    service sends load hints; deferred sessions never go below their
+    configured interval, they only back off.
+    Returns None when pacing is disabled.
+    """
+    if not settings.PACING_ENABLED:
+        return None
+    with _pacers_lock:
+        pacer = _pacers.get(tier)
+        if pacer is None:
+            initial = max(0.0, float(initial_interval_s))
+            min_interval = settings.PACING_MIN_INTERVAL_S if tier == "realtime" else initial
+            pacer = _pacers[tier] = AIMDPacer(
+                initial_interval_s=initial,
+                min_interval_s=min_interval,
+                max_interval_s=max(settings.PACING_MAX_INTERVAL_S, initial),
+                increase_rps_per_s=settings.PACING_INCREASE_RPS_PER_S,
+                decrease_factor=settings.PACING_DECREASE_FACTOR,
+                target_latency_s=settings.PACING_TARGET_LATENCY_S,
+                load_high=settings.PACING_LOAD_HIGH,
+                load_low=settings.PACING_LOAD_LOW,
+            )
+        return pacer
@@ -130,6 +130,7 @@ class RemoteTranscriber:
         vad_model: Optional[str] = None,
         timestamp_granularities: Optional[str] = None,
         sampling_rate: int = 16000,
+        pacer=None,
     ):
         """
         Initialize remote transcriber.
@@ -141,6 +142,8 @@ class RemoteTranscriber:
             temperature: Temperature parameter. If None, reads from REMOTE_TRANSCRIBER_TEMPERATURE env var, defaults to "0".
             vad_model: VAD model name. If None, reads from REMOTE_TRANSCRIBER_VAD_MODEL env var.
             sampling_rate: Audio sampling rate (default 16000 Hz).
+            pacer: Optional ``AIMDPacer`` fed with the latency, overloads and load
+                hint of every request.
         """
         self.api_url = api_url or os.getenv("REMOTE_TRANSCRIBER_URL")
         if not self.api_url:
@@ -171,6 +174,7 @@ class RemoteTranscriber:
         # Request only segment timestamps (no word-level precision needed)
         self.timestamp_granularities = "segment"
         self.sampling_rate = sampling_rate
+        self.pacer = pacer
         
         # Retry configuration
         self.max_retries = 3
@@ -254,6 +258,7 @@ class RemoteTranscriber:
         language: Optional[str] = None,
         prompt: Optional[str] = None,
         task: str = "transcribe",
+        language_hint_confidence: Optional[float] = None,
     ) -> dict:
         """
         Call remote HTTP API with retry logic.
@@ -261,6 +266,8 @@ class RemoteTranscriber:
         Args:
             audio_bytes: Audio file bytes (WAV format).
             language: Language code (ISO-639-1) or None for auto-detect.
+            language_hint_confidence: Confidence of a cached (not user-provided) language;
+                the service detects the language anyway if it is too low.
             prompt: Optional prompt for context/spelling.
             task: "transcribe" or "translate".
             
@@ -288,6 +295,8 @@ class RemoteTranscriber:
         
         if language:
             data["language"] = language
+            if language_hint_confidence is not None:
+                data["language_hint_confidence"] = f"{language_hint_confidence:.4f}"
         
         if prompt:
             data["prompt"] = prompt
@@ -310,12 +319,14 @@ class RemoteTranscriber:
                 # Use in-memory file upload for better performance
                 files = {"file": ("audio.wav", audio_bytes, "audio/wav")}
                 
+                request_start = time.time()
                 response = self.http_client.post(
                     self.api_url,
                     headers=headers,
                     files=files,
                     data=data,
                 )
+                latency_s = time.time() - request_start
                 
                 # IMPORTANT: Don't block inside this call on overload/busy.
                 # WhisperLive already buffers/coalesces audio; we want the caller to keep
@@ -326,6 +337,8 @@ class RemoteTranscriber:
                         retry_after = float(retry_after_raw)
                     except Exception:
                         retry_after = 1.0
+                    if self.pacer is not None:
+                        self.pacer.on_overload(retry_after)
                     raise RemoteTranscriberOverloaded(
                         status_code=response.status_code,
                         retry_after_s=retry_after,
@@ -333,6 +346,8 @@ class RemoteTranscriber:
                     )
                 
                 response.raise_for_status()
+                if self.pacer is not None:
+                    self.pacer.on_success(latency_s, _to_float(response.headers.get("X-Transcription-Load")))
                 
                 # Parse response
                 if self.response_format == "verbose_json" or self.response_format == "json":
@@ -555,6 +570,7 @@ class RemoteTranscriber:
         hotwords: Optional[str] = None,
         language_detection_threshold: Optional[float] = 0.5,
         language_detection_segments: int = 10,
+        language_hint_confidence: Optional[float] = None,
     ) -> Tuple[Iterable[Segment], TranscriptionInfo]:
         """
         Transcribe audio using remote HTTP API.
@@ -567,6 +583,8 @@ class RemoteTranscriber:
             language: Language code (ISO-639-1) or None for auto-detect.
             task: "transcribe" or "translate".
             initial_prompt: Optional prompt for context/spelling.
+            language_hint_confidence: Marks ``language`` as a cached hint with this
+                confidence rather than a user choice.
             Other parameters: Ignored (kept for compatibility).
             
         Returns:
@@ -629,6 +647,7 @@ class RemoteTranscriber:
             language=normalized_language,
             prompt=prompt_str,
             task=task,
+            language_hint_confidence=language_hint_confidence if normalized_language else None,
         )
         
         # Convert to segments
@@ -636,8 +655,15 @@ class RemoteTranscriber:
         
         # Extract language info and normalize to ISO code
         api_language = api_response.get("language")
-        detected_language = normalize_language_code(language or api_language or "en")
-        language_probability = 1.0  # Remote API may not provide probability
+        # A weak language hint may have been overridden by the service's own detection
+        if language_hint_confidence is not None:
+            detected_language = normalize_language_code(api_language or language or "en")
+        else:
+            detected_language = normalize_language_code(language or api_language or "en")
+        language_probability = api_response.get("language_probability")
+        if language_probability is None:
+            # Older services don't report it; an accepted hint keeps its own confidence
+            language_probability = language_hint_confidence if language_hint_confidence is not None and language else 1.0
         
         # Calculate duration
         duration = len(audio_array) / self.sampling_rate
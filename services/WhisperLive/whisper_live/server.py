@@ -18,8 +18,19 @@ import torch
 import numpy as np
 from websockets.sync.server import serve
 from websockets.exceptions import ConnectionClosed
-from whisper_live.vad import VoiceActivityDetector
+from whisper_live.multi_stream_vad import MultiStreamVAD
 from whisper_live.transcriber import WhisperModel
+from whisper_live.feature_cache import StreamingLogMelCache
+from whisper_live.language_cache import LanguageCache
+from whisper_live.load_report import LoadReporter, pick_peer, snapshot as load_snapshot
+from whisper_live import session_handoff, settings
+from whisper_live.latency import STAGES, STAGE_BUFFER_WAIT, STAGE_COLLECTOR_XADD, STAGE_TRANSCRIBE
+from whisper_live.pacing import pacer_for
+from whisper_live.batch_inference import (
+    BatchedTranscriptionScheduler,
+    FasterWhisperBatchRunner,
+    TranscriptionRequest,
+)
 try:
     from whisper_live.transcriber_tensorrt import WhisperTRTLLM
     TENSORRT_AVAILABLE = True
@@ -375,7 +386,7 @@ class TranscriptionCollectorClient:
             logging.error(f"Error publishing session_end for UID {session_uid} to {self.stream_key}: {e}")
             return False
 
-    def send_transcription(self, token, platform, meeting_id, segments, session_uid=None):
+    def send_transcription(self, token, platform, meeting_id, segments, session_uid=None, ingest_ts=None):
         """Send transcription segments to Redis stream (self.stream_key).
         
         Args:
@@ -384,6 +395,8 @@ class TranscriptionCollectorClient:
             meeting_id: Platform-specific meeting ID
             segments: List of transcription segments
             session_uid: Optional unique identifier for this session
+            ingest_ts: Wall time the newest audio of the transcribed window arrived;
+                carried downstream for end-to-end latency (see latency.py)
             
         Returns:
             Boolean indicating success or failure
@@ -431,15 +444,19 @@ class TranscriptionCollectorClient:
             except Exception:
                 payload_json = None
 
+            # Timing is added after the dedupe digest so it never defeats it
+            sent_ts = time.time()
+            payload["timing"] = {"ingest": ingest_ts, "sent": sent_ts}
             message = {
                 # Per current structure, the whole payload is JSON dumped into one field
-                "payload": payload_json or json.dumps(payload)
+                "payload": json.dumps(payload)
             }
             
             result = self.redis_client.xadd(
                 self.stream_key, 
                 message
             )
+            STAGES.observe(STAGE_COLLECTOR_XADD, time.time() - sent_ts)
             
             if result:
                 logging.debug(f"Published transcription with {len(segments)} segments for UID {session_uid} to {self.stream_key}")
@@ -583,9 +600,9 @@ class TranscriptionServer:
 
     def __init__(self):
         self.client_manager = None
-        self.no_voice_activity_chunks = 0
         self.use_vad = True
         self.single_model = False
+        self.vad_detector = None
         
         # Instantiate TranscriptionCollectorClient here
         self.collector_client: Optional[TranscriptionCollectorClient] = None
@@ -696,14 +713,21 @@ class TranscriptionServer:
         logging.info(f"🌐 WEBSOCKET URL CONFIGURED: {self._ws_url}")
         logging.info(f"🌐 WhisperLive WebSocket URL: {self._ws_url}")
         self._metric_stop_evt = threading.Event()
+
+        # Stable per ip:port to avoid duplicates across restarts
+        self._server_id = f"whisperlive-{self._pod_ip.replace('.', '-')}-{self._listen_port}"
+        # Load reports let bot-manager place new bots on the least loaded instance
+        self._advertise_url = os.getenv("WL_ADVERTISE_URL", self._ws_url)
+        self.load_reporter = LoadReporter(self._wl_redis, self._server_id, self._load_report)
+        # Drain: no new sessions, existing ones are served until they end or are handed off
+        self.draining = False
+        self._ws_server = None
         
         # Initialize Consul configuration
         self._consul_enabled = os.getenv("CONSUL_ENABLE", "false").strip().lower() in ("1", "true", "yes", "on")
         if self._consul_enabled:
             self._consul_http_addr = os.getenv("CONSUL_HTTP_ADDR", "http://consul:8500")
-            # Make service ID stable per ip:port to avoid duplicates across restarts
-            safe_ip = self._pod_ip.replace('.', '-')
-            self._consul_service_id = f"whisperlive-{safe_ip}-{self._listen_port}"
+            self._consul_service_id = self._server_id
             logging.info(f"🔍 CONSUL ENABLED: {self._consul_http_addr}, service_id={self._consul_service_id}")
         # Register OS signal handlers to gracefully deregister on shutdown
         try:
@@ -712,6 +736,14 @@ class TranscriptionServer:
             logging.warning(f"Failed to register shutdown handlers: {exc}")
         # --- End WL Scaling block ---
 
+    def _load_report(self):
+        """Current load of this instance, as published for bot placement."""
+        clients = list(self.client_manager.clients.values()) if self.client_manager else []
+        return load_snapshot(
+            self._server_id, self._advertise_url, clients, self.config_max_clients,
+            healthy=self.is_healthy, draining=self.draining,
+        )
+
     # --- Connection cleanup helper methods ---
     def _cleanup_stale_connections(self):
         """Remove stale WebSocket connections that are no longer active."""
@@ -773,11 +805,22 @@ class TranscriptionServer:
         signal.signal(signal.SIGINT, _handler)
 
     def _on_shutdown(self, signum):
+        """Drain on the first signal; a second signal (or no drain window) closes every session now."""
+        if not self.draining and settings.DRAIN_TIMEOUT_S > 0 and self._ws_server is not None:
+            self.begin_drain(settings.DRAIN_TIMEOUT_S)
+            return
+        self._close_all_sessions()
+        if self._ws_server is not None:
+            # serve_forever() runs on this (main) thread; shut it down from another one
+            threading.Thread(target=self._ws_server.shutdown, daemon=True).start()
+
+    def _close_all_sessions(self):
         """Gracefully clean up connections and deregister from Consul."""
         try:
             self._metric_stop_evt.set()
         except Exception:
             pass
+        self.load_reporter.stop()
         
         # Clean up any remaining connections
         try:
@@ -793,15 +836,86 @@ class TranscriptionServer:
         except Exception as exc:
             logging.warning(f"Failed to clean up connections on shutdown: {exc}")
 
+    # --- Drain and session handoff ---
+    def begin_drain(self, timeout_s):
+        """
+        Stop taking new sessions and keep serving the existing ones for up to
+        ``timeout_s`` seconds; whatever is left then is handed off to a peer.
+        """
+        if self.draining:
+            return
+        self.draining = True
+        remaining = len(self.client_manager.clients) if self.client_manager else 0
+        logging.info(f"DRAIN: started with {remaining} sessions, deadline {timeout_s}s")
+        # Leave placement and discovery right away; the report says draining until we exit
+        try:
+            self.load_reporter.publish()
+        except Exception as e:
+            logging.warning(f"DRAIN: load report failed: {e}")
+        self._consul_deregister_service()
+        threading.Thread(target=self._drain_worker, args=(time.monotonic() + timeout_s,), daemon=True).start()
+
+    def _drain_worker(self, deadline):
+        while time.monotonic() < deadline:
+            if not self.client_manager or not self.client_manager.clients:
+                break
+            time.sleep(0.5)
+        sessions = list(self.client_manager.clients.items()) if self.client_manager else []
+        if sessions:
+            logging.info(f"DRAIN: deadline reached, handing off {len(sessions)} sessions")
+            peer_url = self._peer_url()
+            for websocket, client in sessions:
+                self._handoff_session(websocket, client, peer_url)
+            # Let the connection handlers run their cleanup (final spool snapshot upload)
+            wait_until = time.monotonic() + settings.DRAIN_CLEANUP_S
+            while self.client_manager.clients and time.monotonic() < wait_until:
+                time.sleep(0.2)
+        logging.info("DRAIN: complete, shutting down")
+        self._close_all_sessions()
+        if self._ws_server is not None:
+            self._ws_server.shutdown()
+
+    def _peer_url(self):
+        try:
+            return pick_peer(self._wl_redis, self._server_id)
+        except Exception as e:
+            logging.warning(f"DRAIN: could not read peer load reports: {e}")
+            return None
+
+    def _handoff_session(self, websocket, client, peer_url):
+        """Export ``client`` for a peer and ask the bot to reconnect with ``resume_uid``."""
+        resume_uid = None
+        if settings.HANDOFF_ENABLED:
+            try:
+                session_handoff.store_state(self._wl_redis, session_handoff.export_state(client))
+                client.handed_off = True
+                resume_uid = client.client_uid
+            except Exception as e:
+                logging.warning(f"HANDOFF: export failed for {client.client_uid}: {e}")
+        try:
+            websocket.send(json.dumps({
+                "uid": client.client_uid,
+                "status": "RECONNECT",
+                "message": "Server draining",
+                "resume_uid": resume_uid,
+                "url": peer_url,
+            }))
+            websocket.close()
+        except Exception as e:
+            logging.info(f"HANDOFF: could not notify {client.client_uid}: {e}")
+        logging.info(f"HANDOFF: {client.client_uid} -> {peer_url or 'balancer'} (resumable={resume_uid is not None})")
+
     def initialize_client(
         self, websocket, options, faster_whisper_custom_model_path,
-        whisper_tensorrt_path, trt_multilingual
+        whisper_tensorrt_path, trt_multilingual, resume_state=None
     ):
         """
-        Initializes a client based on the backend type.
+        Initializes a client based on the backend type. ``resume_state`` is a
+        session handed off by a draining peer; it is continued under its uid.
         """
         if options is None:
             options = {}
+        server_options = dict(self.server_options, resumed=True) if resume_state else self.server_options
         transcription_tier = str(options.get("transcription_tier", "realtime")).strip().lower()
         if transcription_tier not in ("realtime", "deferred"):
             transcription_tier = "realtime"
@@ -824,7 +938,7 @@ class TranscriptionServer:
                 meeting_id=options.get("meeting_id"),
                 transcription_tier=transcription_tier,
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=server_options
             )
         # remote client
         elif backend.is_remote():
@@ -845,7 +959,7 @@ class TranscriptionServer:
                 meeting_id=options.get("meeting_id"),
                 transcription_tier=transcription_tier,
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=server_options
             )
         # faster-whisper client
         else:
@@ -865,8 +979,10 @@ class TranscriptionServer:
                 meeting_id=options.get("meeting_id"),
                 transcription_tier=transcription_tier,
                 collector_client_ref=self.collector_client,
-                server_options=self.server_options
+                server_options=server_options
             )
+        if resume_state:
+            session_handoff.restore_state(client, resume_state)
         self.client_manager.add_client(websocket, client)
         logging.info(f"Added client {client.client_uid}, total clients: {len(self.client_manager.clients)}")
 
@@ -1048,15 +1164,35 @@ class TranscriptionServer:
                 self.client_manager = ClientManager(max_clients, max_connection_time)
                 logging.info(f"CAPACITY: Initialized ClientManager with max_clients={max_clients}, max_connection_time={max_connection_time}")
 
+            if self.draining:
+                websocket.send(json.dumps({
+                    "uid": options["uid"], "status": "RECONNECT", "message": "Server draining",
+                    "resume_uid": options.get("resume_uid"), "url": self._peer_url(),
+                }))
+                websocket.close()
+                return False
+
+            resume_state = None
+            if options.get("resume_uid"):
+                resume_state = session_handoff.take_state(
+                    self._wl_redis, options["resume_uid"], meeting_id=options["meeting_id"]
+                )
+                if resume_state:
+                    options["uid"] = resume_state["uid"]
+
             self.use_vad = options.get('use_vad')
             if self.client_manager.is_server_full(websocket, options):
+                if resume_state:
+                    # Put it back for the bot's next attempt
+                    session_handoff.store_state(self._wl_redis, resume_state)
                 websocket.close()
                 return False  # Indicates that the connection should not continue
 
-            if self.backend and self.backend.is_tensorrt(): # Check if self.backend is not None
-                self.vad_detector = VoiceActivityDetector(frame_rate=self.RATE)
+            if self.backend and self.backend.is_tensorrt() and self.vad_detector is None:
+                # One detector for all connections; each websocket is its own stream
+                self.vad_detector = MultiStreamVAD(sample_rate=self.RATE)
             self.initialize_client(websocket, options, faster_whisper_custom_model_path,
-                                   whisper_tensorrt_path, trt_multilingual)
+                                   whisper_tensorrt_path, trt_multilingual, resume_state=resume_state)
             return True
         except json.JSONDecodeError:
             logging.error("Failed to decode JSON from client")
@@ -1084,9 +1220,6 @@ class TranscriptionServer:
 
         if self.backend.is_tensorrt():
             voice_active = self.voice_activity(websocket, frame_np)
-            if voice_active:
-                self.no_voice_activity_chunks = 0
-                client.set_eos(False)
             if self.use_vad and not voice_active:
                 return True
 
@@ -1177,6 +1310,7 @@ class TranscriptionServer:
             host,
             port
         ) as server:
+            self._ws_server = server
             self.is_healthy = True # WebSocket server is up
             logger.info(f"SERVER_RUNNING: WhisperLive server running on {host}:{port} with health check on {host}:9091/health and max_clients={self.config_max_clients}")
             
@@ -1190,6 +1324,7 @@ class TranscriptionServer:
                 self.self_monitor_thread.start()
                 logger.info(f"SELF_MONITOR: Started self-monitoring thread. Interval: {self.health_monitor_interval}s, Max Streak: {self.max_unhealthy_streak}")
 
+            self.load_reporter.start()
             server.serve_forever()
 
     # --- Consul helpers ---
@@ -1392,10 +1527,10 @@ class TranscriptionServer:
         """
         Evaluates the voice activity in a given audio frame and manages the state of voice activity detection.
 
-        This method uses the configured voice activity detection (VAD) model to assess whether the given audio frame
-        contains speech. If the VAD model detects no voice activity for more than three consecutive frames,
-        it sets an end-of-speech (EOS) flag for the associated client. This method aims to efficiently manage
-        speech detection to improve subsequent processing steps.
+        This method uses the shared streaming VAD, in which every websocket is its own stream with its own
+        Silero state, to assess whether the given audio frame contains speech. The silence count and the
+        end-of-speech (EOS) flag live on the client, so one client's speech or silence never affects another's.
+        Nothing here blocks the receive thread beyond the VAD call itself.
 
         Args:
             websocket: The websocket associated with the current client. Used to retrieve the client object
@@ -1405,19 +1540,14 @@ class TranscriptionServer:
 
         Returns:
             bool: True if voice activity is detected in the current frame, False otherwise. When returning False
-                after detecting no voice activity for more than three consecutive frames, it also triggers the
-                end-of-speech (EOS) flag for the client.
-        """
-        vad_result = self.vad_detector(frame_np)
-        if not vad_result:
-            self.no_voice_activity_chunks += 1
-            if self.no_voice_activity_chunks > 3:
-                client = self.client_manager.get_client(websocket)
-                if not client.eos:
-                    client.set_eos(True)
-                time.sleep(0.1)    # Sleep 100m; wait some voice activity.
-            return False
-        return True
+                after detecting no voice activity for more than three consecutive frames, the client's end-of-speech
+                (EOS) flag is set.
+        """
+        vad_result = self.vad_detector.is_speech(websocket, frame_np)
+        client = self.client_manager.get_client(websocket)
+        if client:
+            client.update_voice_activity(vad_result)
+        return vad_result
 
     def cleanup(self, websocket):
         """
@@ -1426,6 +1556,8 @@ class TranscriptionServer:
         Args:
             websocket: The websocket associated with the client to be cleaned up.
         """
+        if self.vad_detector is not None:
+            self.vad_detector.remove_stream(websocket)
         client = self.client_manager.get_client(websocket)
         if client:
             client_uid = client.client_uid if hasattr(client, 'client_uid') else 'unknown'
@@ -1449,6 +1581,15 @@ class TranscriptionServer:
                 super().__init__(*args, **kwargs)
             
             def do_GET(self):
+                if self.path == '/metrics/prometheus':
+                    # Stage latency histograms; /metrics stays JSON for load monitoring
+                    server_id = getattr(self.transcription_server_instance, '_server_id', 'unknown')
+                    self.send_response(200)
+                    self.send_header('Content-type', 'text/plain; version=0.0.4')
+                    self.end_headers()
+                    self.wfile.write(STAGES.render(f'server_id="{server_id}"').encode('utf-8'))
+                    return
+
                 server_websocket_healthy = self.transcription_server_instance.is_healthy
                 
                 redis_healthy = False
@@ -1492,6 +1633,15 @@ class TranscriptionServer:
                         self.end_headers()
                         self.wfile.write(f"Service Unavailable: {', '.join(unhealthy_reasons)}".encode('utf-8'))
                 
+                elif self.path == '/ready':
+                    # Readiness for routers: a draining server keeps its sessions but takes no new ones
+                    draining = getattr(self.transcription_server_instance, 'draining', False)
+                    ready = server_websocket_healthy and not draining
+                    self.send_response(200 if ready else 503)
+                    self.send_header('Content-type', 'text/plain')
+                    self.end_headers()
+                    self.wfile.write(b'OK' if ready else (b'Draining' if draining else b'Not ready'))
+
                 elif self.path == '/metrics':
                     # Provide JSON metrics for load monitoring
                     import json
@@ -1533,6 +1683,7 @@ class TranscriptionServer:
                         "max_clients": max_clients,
                         "load_percentage": (current_sessions / max_clients * 100) if max_clients > 0 else 0,
                         "server_healthy": server_websocket_healthy,
+                        "draining": bool(getattr(self.transcription_server_instance, 'draining', False)),
                         "redis_healthy": redis_healthy,
                         "server_id": server_id,
                         "active_uid_count": len([u for u in uid_list if u]),
@@ -1660,6 +1811,10 @@ class TranscriptionServer:
         else:
             logging.warning(f"Cannot forward speaker event for UID {uid_for_log}: collector_client not found for client {client.client_uid if client else 'N/A_CLIENT_FALLBACK'}.") # CORRECTED: changed from collector_client_ref to collector_client
 
+        participant = event_payload.get('participant_id_meet') or event_payload.get('participant_name')
+        if participant:
+            client.update_active_speaker(event_type, participant)
+
         # Update server-level last speaker-event timestamp
         try:
             self.last_speaker_event_ts = time.time()
@@ -1712,6 +1867,13 @@ class ServeClientBase(object):
         normalized_tier = str(transcription_tier or "realtime").strip().lower()
         self.transcription_tier = normalized_tier if normalized_tier in ("realtime", "deferred") else "realtime"
         self.collector_client = collector_client_ref # Store the passed collector client
+        # Continued from a draining peer / handed off to a peer (see session_handoff.py)
+        self.resumed = bool((server_options or {}).get("resumed"))
+        self.handed_off = False
+        # Wall time of the newest received frame, and of the newest frame in the
+        # window being transcribed (stage latency, see latency.py)
+        self.last_frame_ts = None
+        self.window_ingest_ts = None
         
         # Restore all the original instance variables that were deleted
         self.transcription_buffer = TranscriptionBuffer(self.client_uid)
@@ -1721,12 +1883,19 @@ class ServeClientBase(object):
         self.timestamp_offset = 0.0
         self.frames_np = None
         self.frames_offset = 0.0
+        # Absolute stream sample index of the last chunk returned for processing
+        self.chunk_start_sample = 0
         self.text = []
         self.current_out = ''
         self.prev_out = ''
         self.t_start = None
         self.exit = False
         self.same_output_count = 0
+        # Set whenever new audio arrives so transcription threads can wait instead of polling
+        self.audio_event = threading.Event()
+        # Detected languages for auto-language sessions, per session and per active speaker
+        self.language_cache = LanguageCache()
+        self.active_speaker = None
 
         server_options = server_options or {}
         self.max_buffer_s = server_options.get("max_buffer_s", 45)
@@ -1773,8 +1942,9 @@ class ServeClientBase(object):
         logging.info(f"Client {self.client_uid} connected. Sending SERVER_READY.")
         self.websocket.send(ready_message)
         
-        # Use the instance's self.collector_client
-        if self.collector_client and all([platform, meeting_url, token, meeting_id]):
+        # Use the instance's self.collector_client. A resumed session already
+        # started on the peer; a second session_start would reset its timeline.
+        if self.collector_client and not self.resumed and all([platform, meeting_url, token, meeting_id]):
             self.collector_client.publish_session_start_event(token, platform, meeting_id, self.client_uid)
             logging.info(f"Published session_start event for client {self.client_uid}")
         
@@ -1783,6 +1953,34 @@ class ServeClientBase(object):
 
     def speech_to_text(self):
         raise NotImplementedError
+
+    def request_language(self, min_confidence=None):
+        """
+        Language and confidence to transcribe the next window with.
+
+        An explicitly provided language always wins. Auto-language sessions use
+        the cached detection for the active speaker while its decayed confidence
+        is at least ``min_confidence``; otherwise ``(None, 0.0)`` asks the
+        transcriber to detect the language.
+        """
+        if self.language_provided:
+            return self.language, 1.0
+        return self.language_cache.lookup(self.active_speaker, min_confidence)
+
+    def _update_language(self, language, info):
+        """Record a fresh detection, or switch to the cached language the window was decoded with."""
+        if language is None:
+            if info is not None:
+                self.set_language(info)
+        else:
+            self.language = language
+
+    def update_active_speaker(self, event_type, participant):
+        """Track the speaker that detected languages are attributed to."""
+        if event_type == "SPEAKER_START":
+            self.active_speaker = participant
+        elif event_type == "SPEAKER_END" and self.active_speaker == participant:
+            self.active_speaker = None
     
     def _load_hallucinations(self):
         """Load hallucination strings from file if not already loaded."""
@@ -2138,7 +2336,9 @@ class ServeClientBase(object):
             self.frames_np = frame_np.copy()
         else:
             self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
+        self.last_frame_ts = time.time()
         self.lock.release()
+        self.audio_event.set()
         self._start_snapshot_upload_if_due()
 
     def clip_audio_if_no_valid_segment(self):
@@ -2169,6 +2369,7 @@ class ServeClientBase(object):
         with self.lock:
             samples_take = max(0, (self.timestamp_offset - self.frames_offset) * self.RATE)
             input_bytes = self.frames_np[int(samples_take):].copy()
+            self.chunk_start_sample = int(self.frames_offset * self.RATE) + int(samples_take)
         duration = input_bytes.shape[0] / self.RATE
         return input_bytes, duration
 
@@ -2239,7 +2440,8 @@ class ServeClientBase(object):
                     platform=self.platform,
                     meeting_id=self.meeting_id,
                     segments=segments,
-                    session_uid=self.client_uid
+                    session_uid=self.client_uid,
+                    ingest_ts=self.window_ingest_ts
                 )
             
             # Logging: summary by default; full text only if WL_LOG_TRANSCRIPTS=true
@@ -2308,7 +2510,8 @@ class ServeClientBase(object):
         """
         logging.info("Cleaning up.")
         self._finalize_recording_spool()
-        self._upload_recording_spool_to_bot_manager(is_final=True)
+        # A handed-off session is finished by the peer that resumed it
+        self._upload_recording_spool_to_bot_manager(is_final=not self.handed_off)
         self.exit = True
 
     def forward_to_collector(self, segments):
@@ -2320,7 +2523,8 @@ class ServeClientBase(object):
                 platform=self.platform,
                 meeting_id=self.meeting_id,
                 segments=segments,
-                session_uid=self.client_uid
+                session_uid=self.client_uid,
+                ingest_ts=self.window_ingest_ts
             )
 
 
@@ -2339,6 +2543,8 @@ class ServeClientTensorRT(ServeClientBase):
                          transcription_tier=transcription_tier,
                          collector_client_ref=collector_client_ref, server_options=server_options)
         self.eos = False
+        # Consecutive packets without voice activity (per client)
+        self.no_voice_activity_chunks = 0
         
         # Log the critical parameters
         logging.info(f"Initializing TensorRT client {client_uid} with platform={platform}, meeting_url={meeting_url}, token={token}")
@@ -2404,6 +2610,23 @@ class ServeClientTensorRT(ServeClientBase):
         self.lock.acquire()
         self.eos = eos
         self.lock.release()
+        self.audio_event.set()
+
+    def update_voice_activity(self, voice_active):
+        """
+        Tracks this client's VAD results and sets EOS after more than three consecutive silent packets.
+
+        Args:
+            voice_active (bool): Whether the latest packet contained speech.
+        """
+        if voice_active:
+            self.no_voice_activity_chunks = 0
+            if self.eos:
+                self.set_eos(False)
+            return
+        self.no_voice_activity_chunks += 1
+        if self.no_voice_activity_chunks > 3 and not self.eos:
+            self.set_eos(True)
 
     def handle_transcription_output(self, last_segment, duration):
         """
@@ -2486,20 +2709,28 @@ class ServeClientTensorRT(ServeClientBase):
             Exception: If there is an issue with audio processing or WebSocket communication.
 
         """
+        last_pass = None
         while True:
             if self.exit:
                 logging.info("Exiting speech to text thread")
                 break
 
+            # Cleared before reading so audio or EOS changes arriving meanwhile wake the wait below
+            self.audio_event.clear()
             if self.frames_np is None:
-                time.sleep(0.02)    # wait for any audio to arrive
+                self.audio_event.wait(timeout=0.5)    # wait for any audio to arrive
                 continue
 
             self.clip_audio_if_no_valid_segment()
 
             input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < 0.4:
+            current_pass = (self.chunk_start_sample, input_bytes.shape[0], self.eos)
+            if duration < 0.4 or current_pass == last_pass:
+                # Nothing new since the last pass (e.g. silent packets dropped by VAD):
+                # wait for audio or an EOS change instead of re-transcribing or spinning.
+                self.audio_event.wait(timeout=0.5)
                 continue
+            last_pass = current_pass
 
             try:
                 input_sample = input_bytes.copy()
@@ -2712,6 +2943,7 @@ class ServeClientFasterWhisper(ServeClientBase):
 
     SINGLE_MODEL = None
     SINGLE_MODEL_LOCK = threading.Lock()
+    BATCH_SCHEDULER = None
 
     def __init__(self, websocket, task="transcribe", device=None, language=None, 
                  client_uid=None, model="small.en", initial_prompt=None, 
@@ -2770,6 +3002,14 @@ class ServeClientFasterWhisper(ServeClientBase):
                     ServeClientFasterWhisper.SINGLE_MODEL = self.transcriber
                 else:
                     self.transcriber = ServeClientFasterWhisper.SINGLE_MODEL
+                # One scheduler per server: every client's windows go into the shared model's batches
+                if server_options.get("batch_inference") and ServeClientFasterWhisper.BATCH_SCHEDULER is None:
+                    ServeClientFasterWhisper.BATCH_SCHEDULER = BatchedTranscriptionScheduler(
+                        FasterWhisperBatchRunner(self.transcriber),
+                        max_batch_size=server_options.get("batch_max_size", 8),
+                        max_wait_ms=server_options.get("batch_max_wait_ms", 20.0),
+                    )
+                    logging.info(f"Batched inference enabled: {ServeClientFasterWhisper.BATCH_SCHEDULER.stats()}")
             else:
                 self.create_model(device)
         except Exception as e:
@@ -2783,6 +3023,8 @@ class ServeClientFasterWhisper(ServeClientBase):
             return
 
         self.use_vad = use_vad
+        # Per-stream log-mel cache: the growing window is re-transcribed every cycle
+        self.feature_cache = StreamingLogMelCache(self.transcriber.feature_extractor)
 
         # threading
         self.trans_thread = threading.Thread(target=self.speech_to_text)
@@ -2841,7 +3083,8 @@ class ServeClientFasterWhisper(ServeClientBase):
                         language, and `language_probability`, a float representing the confidence level
                         of the language detection.
         """
-        if info.language_probability > 0.5:
+        self.language_cache.observe(info.language, info.language_probability, self.active_speaker)
+        if info.language_probability > 0.5 and info.language != self.language:
             self.language = info.language
             logging.info(f"Detected language {self.language} with probability {info.language_probability}")
             
@@ -2859,8 +3102,9 @@ class ServeClientFasterWhisper(ServeClientBase):
         """
         Transcribes the provided audio sample using the configured transcriber instance.
 
-        If the language has not been set, it updates the session's language based on the transcription
-        information.
+        Auto-language sessions pass the cached language of the active speaker while it is
+        confident enough and otherwise let the transcriber detect it, updating the cache
+        from the transcription information.
 
         Args:
             input_sample (np.array): The audio chunk to be transcribed. This should be a NumPy
@@ -2871,24 +3115,41 @@ class ServeClientFasterWhisper(ServeClientBase):
             depends on the implementation of the `transcriber.transcribe` method but typically
             includes the transcribed text.
         """
-        if ServeClientFasterWhisper.SINGLE_MODEL:
-            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
         # Reduce language detection segments if language was not provided to speed up first transcription
         # Default is 10 segments (300 seconds), reduce to 1-2 segments (30-60 seconds) when auto-detecting
         language_detection_segments = 1 if not self.language_provided else int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10'))
+        language, _ = self.request_language()
+        if ServeClientFasterWhisper.BATCH_SCHEDULER is not None and self.transcriber is ServeClientFasterWhisper.SINGLE_MODEL:
+            result, info = ServeClientFasterWhisper.BATCH_SCHEDULER.transcribe(TranscriptionRequest(
+                input_sample,
+                language=language,
+                task=self.task,
+                initial_prompt=self.initial_prompt,
+                use_vad=self.use_vad,
+                vad_parameters=self.vad_parameters,
+                language_detection_segments=language_detection_segments,
+                feature_cache=self.feature_cache,
+                start_sample=self.chunk_start_sample,
+            ))
+            self._update_language(language, info)
+            return result
+
+        if ServeClientFasterWhisper.SINGLE_MODEL:
+            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
         result, info = self.transcriber.transcribe(
             input_sample,
             initial_prompt=self.initial_prompt,
-            language=self.language,
+            language=language,
             task=self.task,
             vad_filter=self.use_vad,
             vad_parameters=self.vad_parameters if self.use_vad else None,
-            language_detection_segments=language_detection_segments)
+            language_detection_segments=language_detection_segments,
+            feature_cache=self.feature_cache,
+            audio_start_sample=self.chunk_start_sample)
         if ServeClientFasterWhisper.SINGLE_MODEL:
             ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
 
-        if self.language is None and info is not None:
-            self.set_language(info)
+        self._update_language(language, info)
         return result
 
     def get_previous_output(self):
@@ -3312,6 +3573,7 @@ class ServeClientRemote(ServeClientBase):
             model=model,
             transcription_tier=self.transcription_tier,
             sampling_rate=self.RATE,
+            pacer=pacer_for(self.transcription_tier, self.min_time_between_requests),
         )
 
     def transcribe_audio(self, input_sample):
@@ -3331,16 +3593,20 @@ class ServeClientRemote(ServeClientBase):
         # Reduce language detection segments if language was not provided to speed up first transcription
         # Default is 10 segments (300 seconds), reduce to 1-2 segments (30-60 seconds) when auto-detecting
         language_detection_segments = 1 if not self.language_provided else int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10'))
+        # Send any cached language with its decayed confidence; the service decides
+        # whether the hint is strong enough to skip language detection.
+        language, confidence = self.request_language(min_confidence=0.0)
         result, info = self.transcriber.transcribe(
             input_sample,
             initial_prompt=self.initial_prompt,
-            language=self.language,
+            language=language,
+            language_hint_confidence=None if self.language_provided else confidence,
             task=self.task,
             vad_filter=self.use_vad,
             vad_parameters=self.vad_parameters if self.use_vad else None,
             language_detection_segments=language_detection_segments)
 
-        if self.language is None and info is not None:
+        if info is not None and not self.language_provided:
             self.set_language(info)
         return result
 
@@ -3429,6 +3695,15 @@ class ServeClientRemote(ServeClientBase):
             if self.t_start is None:
                 self.t_start = time.time()
 
+    def _pacing_delay(self):
+        """Seconds to wait before the next request: the shared pacer's, or the static interval's."""
+        pacer = getattr(self.transcriber, "pacer", None)
+        if pacer is not None:
+            return pacer.delay_s(self.last_transcription_time)
+        if self.min_time_between_requests <= 0:
+            return 0.0
+        return max(0.0, self.min_time_between_requests - (time.time() - self.last_transcription_time))
+
     def speech_to_text(self):
         """
         Process an audio stream in an infinite loop, continuously transcribing the speech.
@@ -3476,60 +3751,48 @@ class ServeClientRemote(ServeClientBase):
                 # Mark as in-flight (we'll get latest audio after rate limit wait)
                 self.transcription_in_flight = True
             
-            # Rate limiting: ensure we don't exceed max requests per second
-            # Simple check before making the request - wait if needed
-            if self.min_time_between_requests > 0:
-                current_time = time.time()
-                time_since_last = current_time - self.last_transcription_time
-                if time_since_last < self.min_time_between_requests:
-                    wait_time = self.min_time_between_requests - time_since_last
-                    logging.info(f"RATE_LIMIT: Waiting {wait_time:.3f}s before next transcription request (last was {time_since_last:.3f}s ago, min interval is {self.min_time_between_requests:.3f}s)")
-                    time.sleep(wait_time)
-                    
-                    # After waiting, re-fetch the LATEST audio from buffer (LIFO: always get freshest audio)
-                    # New audio may have accumulated during the wait
-                    with self.transcription_lock:
-                        self.clip_audio_if_no_valid_segment()
-                        latest_input_bytes, latest_duration = self.get_audio_chunk_for_processing()
-                        if latest_duration >= self.min_audio_s:
-                            current_chunk = latest_input_bytes.copy()
-                            current_duration = latest_duration
-                            logging.info(f"LIFO: After rate limit wait, processing latest audio chunk (duration={latest_duration:.2f}s)")
-                        else:
-                            # Not enough audio after wait, clear in-flight flag and continue
-                            logging.debug(f"LIFO: After rate limit wait, not enough audio (duration={latest_duration:.2f}s < min={self.min_audio_s:.2f}s)")
-                            self.transcription_in_flight = False
-                            continue
+            # Rate limiting: wait out the (adaptive) spacing since the last request
+            wait_time = self._pacing_delay()
+            if wait_time > 0:
+                logging.info(f"RATE_LIMIT: Waiting {wait_time:.3f}s before next transcription request")
+                time.sleep(wait_time)
+
+            # Re-fetch the LATEST audio from buffer (LIFO: always get freshest audio)
+            # New audio may have accumulated during the wait
+            with self.transcription_lock:
+                self.clip_audio_if_no_valid_segment()
+                latest_input_bytes, latest_duration = self.get_audio_chunk_for_processing()
+                if latest_duration >= self.min_audio_s:
+                    current_chunk = latest_input_bytes.copy()
+                    current_duration = latest_duration
+                    logging.info(f"LIFO: Processing latest audio chunk (duration={latest_duration:.2f}s)")
                 else:
-                    # No wait needed, use the audio we already fetched
-                    with self.transcription_lock:
-                        self.clip_audio_if_no_valid_segment()
-                        latest_input_bytes, latest_duration = self.get_audio_chunk_for_processing()
-                        if latest_duration >= self.min_audio_s:
-                            current_chunk = latest_input_bytes.copy()
-                            current_duration = latest_duration
-                            logging.info(f"LIFO: Processing latest audio chunk (duration={latest_duration:.2f}s)")
-                        else:
-                            # Not enough audio, clear in-flight flag and continue
-                            logging.debug(f"LIFO: Not enough audio (duration={latest_duration:.2f}s < min={self.min_audio_s:.2f}s)")
-                            self.transcription_in_flight = False
-                            continue
+                    # Not enough audio, clear in-flight flag and continue
+                    logging.debug(f"LIFO: Not enough audio (duration={latest_duration:.2f}s < min={self.min_audio_s:.2f}s)")
+                    self.transcription_in_flight = False
+                    continue
             
             # Process the chunk and wait for response
             try:
+                request_start = time.time()
+                window_ingest_ts = self.last_frame_ts
+                if window_ingest_ts is not None:
+                    STAGES.observe(STAGE_BUFFER_WAIT, request_start - window_ingest_ts)
                 result = self.transcribe_audio(current_chunk)
                 
                 # Update last request time when request completes
                 self.last_transcription_time = time.time()
+                STAGES.observe(STAGE_TRANSCRIBE, self.last_transcription_time - request_start)
+                self.window_ingest_ts = window_ingest_ts
 
                 # ALGORITHM A: VAD silence detection - cut buffer when no voice activity
-                # Only block on language detection if language was not provided initially
-                # If language was provided, we can send transcription immediately
-                if result is None or (not self.language_provided and self.language is None):
+                # The service detects the language of auto-language sessions in the same
+                # request, so a missing session language no longer means silence.
+                if result is None:
                     # VAD silence: cut buffer by current_duration
                     with self.lock:
                         self.timestamp_offset += current_duration
-                    logging.info(f"ALGORITHM_A: VAD silence detected (result=None or language=None), cutting buffer by {current_duration:.3f}s")
+                    logging.info(f"ALGORITHM_A: VAD silence detected (result=None), cutting buffer by {current_duration:.3f}s")
                     time.sleep(0.25)    # wait for voice activity, result is None when no voice activity
                 else:
                     # If the remote backend returns an empty list of segments, treat as "silence".
@@ -3573,7 +3836,11 @@ class ServeClientRemote(ServeClientBase):
                     logging.info(f"Remote transcriber overloaded; backing off {retry_after:.2f}s (HTTP {getattr(e, 'status_code', '??')})")
                     with self.transcription_lock:
                         self.transcription_in_flight = False
-                    time.sleep(min(float(retry_after), 2.0))
+                    if getattr(self.transcriber, "pacer", None) is None:
+                        time.sleep(min(float(retry_after), 2.0))
+                    else:
+                        # The shared pacer holds every session until Retry-After has passed
+                        self.last_transcription_time = time.time()
                 else:
                     logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
                     with self.transcription_lock:
@@ -3793,8 +4060,11 @@ class ServeClientRemote(ServeClientBase):
             info: TranscriptionInfo object containing language information.
         """
         if info and hasattr(info, 'language'):
-            self.language = info.language
             lang_prob = getattr(info, 'language_probability', 1.0)
+            self.language_cache.observe(info.language, lang_prob, self.active_speaker)
+            if info.language == self.language:
+                return
+            self.language = info.language
             self.websocket.send(json.dumps({
                 "uid": self.client_uid,
                 "language": self.language,
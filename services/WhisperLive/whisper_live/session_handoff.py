@@ -0,0 +1,161 @@
+"""
+Live session handoff between WhisperLive instances.
+
+When a draining server still holds sessions at its deadline, it exports each
+one with ``export_state()`` and stores the result in Redis under
+``whisperlive:handoff:<uid>``. It then tells the bot to reconnect, passing
+``resume_uid`` and a peer URL. The peer takes the state with ``take_state()``
+and continues the session under the same uid with ``restore_state()``. That
+way the collector sees one uninterrupted session rather than a new one whose
+start time resets the timeline.
+
+The exported state holds:
+
+- the stream offsets, and the audio that was received but not transcribed yet;
+- the committed transcript segments, which give context for the next window;
+- the session language when it was auto-detected;
+- the recording spool position: its directory, chunk manifest and chunk index.
+  The peer continues the spool only if it can see the same directory, which
+  needs ``WL_RECORDING_DIR`` on shared storage. Otherwise the draining server
+  uploads what it has as a non-final snapshot and the peer starts a new spool.
+"""
+
+import base64
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from whisper_live import settings
+
+HANDOFF_KEY = "whisperlive:handoff:{}"
+STATE_VERSION = 1
+
+
+def encode_audio(frames: Optional[np.ndarray]) -> str:
+    if frames is None or frames.size == 0:
+        return ""
+    return base64.b64encode(frames.astype(np.float32, copy=False).tobytes()).decode("ascii")
+
+
+def decode_audio(payload: str) -> Optional[np.ndarray]:
+    if not payload:
+        return None
+    return np.frombuffer(base64.b64decode(payload), dtype=np.float32).copy()
+
+
+def export_state(client, max_pending_s: float = settings.HANDOFF_MAX_PENDING_S) -> Dict[str, Any]:
+    """
+    Snapshot a live session for a peer and close its current spool chunk.
+
+    Audio that arrives after the snapshot is still spooled by this instance
+    but is not transcribed here any more.
+    """
+    rate = client.RATE
+    with client.lock:
+        pending = None
+        if client.frames_np is not None:
+            start = max(0, int((client.timestamp_offset - client.frames_offset) * rate))
+            pending = client.frames_np[start:]
+            if pending.shape[0] > max_pending_s * rate:
+                # Keep the newest audio; the oldest untranscribed part is dropped
+                pending = pending[-int(max_pending_s * rate):]
+        pending_s = 0.0 if pending is None else pending.shape[0] / rate
+        stream_end_s = client.frames_offset + (0 if client.frames_np is None else client.frames_np.shape[0] / rate)
+        transcript = list(client.transcript[-client.transcription_buffer.max_segments:])
+
+    spool = None
+    with client._recording_lock:
+        if client._recording_chunk_dir is not None:
+            if client._recording_chunk_handle is not None:
+                try:
+                    client._recording_chunk_handle.flush()
+                    client._recording_chunk_handle.close()
+                except Exception:
+                    pass
+                client._recording_chunk_handle = None
+            spool = {
+                "dir": str(client._recording_chunk_dir),
+                "manifest": list(client._recording_manifest),
+                "chunk_index": client._recording_chunk_index,
+            }
+
+    return {
+        "version": STATE_VERSION,
+        "uid": client.client_uid,
+        "meeting_id": client.meeting_id,
+        "platform": client.platform,
+        "transcription_tier": client.transcription_tier,
+        "language": None if client.language_provided else client.language,
+        # Transcription resumes from here; pending audio starts at this offset
+        "timestamp_offset": stream_end_s - pending_s,
+        "stream_end_s": stream_end_s,
+        "pending_audio": encode_audio(pending),
+        "transcript": transcript,
+        "completed_segments": list(client.transcription_buffer.completed_segments),
+        "spool": spool,
+        "exported_at": time.time(),
+    }
+
+
+def restore_state(client, state: Dict[str, Any], now: Optional[float] = None,
+                  max_gap_s: float = settings.HANDOFF_MAX_GAP_S) -> None:
+    """
+    Continue an exported session on a freshly created ``client``.
+
+    Audio lost while the bot reconnected is filled with silence (up to
+    ``max_gap_s``), so segment timestamps stay on the original timeline.
+    """
+    now = time.time() if now is None else now
+    rate = client.RATE
+    pending = decode_audio(state.get("pending_audio", ""))
+    gap_s = min(max(0.0, now - float(state.get("exported_at", now))), max_gap_s)
+    gap = np.zeros(int(gap_s * rate), dtype=np.float32)
+    frames = gap if pending is None else np.concatenate((pending, gap))
+
+    with client.lock:
+        client.timestamp_offset = float(state["timestamp_offset"])
+        client.frames_offset = client.timestamp_offset
+        client.frames_np = frames if frames.size else None
+        client.transcript = list(state.get("transcript") or [])
+        client.transcription_buffer.completed_segments = list(state.get("completed_segments") or [])
+        if hasattr(client, "_last_sent_completed_idx"):
+            # Segments committed before the handoff were already delivered
+            client._last_sent_completed_idx = len(client.transcript)
+    if state.get("language") and not client.language_provided:
+        client.language = state["language"]
+        client.language_cache.observe(state["language"], 1.0)
+
+    spool = state.get("spool")
+    if spool and client._recording_chunk_dir is not None and str(client._recording_chunk_dir) == spool["dir"]:
+        with client._recording_lock:
+            # This server's new chunk continues the exported manifest
+            client._recording_manifest = list(spool["manifest"]) + client._recording_manifest
+            client._recording_chunk_index = max(client._recording_chunk_index, int(spool["chunk_index"]) + 1)
+    elif spool:
+        logging.warning(f"HANDOFF: spool {spool['dir']} not shared with this instance; "
+                        f"recording for {client.client_uid} continues in a new spool")
+    if frames.size:
+        client.audio_event.set()
+    logging.info(f"HANDOFF: resumed {client.client_uid} at {client.timestamp_offset:.2f}s "
+                 f"(pending {0 if pending is None else pending.shape[0] / rate:.2f}s, gap {gap_s:.2f}s)")
+
+
+def store_state(redis_client, state: Dict[str, Any], ttl_s: float = settings.HANDOFF_TTL_S) -> None:
+    redis_client.set(HANDOFF_KEY.format(state["uid"]), json.dumps(state), ex=max(1, int(ttl_s)))
+
+
+def take_state(redis_client, uid: str, meeting_id=None) -> Optional[Dict[str, Any]]:
+    """Claim an exported session once; ``None`` if absent, expired or for another meeting."""
+    raw = redis_client.getdel(HANDOFF_KEY.format(uid))
+    if not raw:
+        return None
+    state = json.loads(raw)
+    if state.get("version") != STATE_VERSION:
+        return None
+    if meeting_id is not None and str(state.get("meeting_id")) != str(meeting_id):
+        logging.warning(f"HANDOFF: state for {uid} belongs to another meeting; ignoring")
+        return None
+    return state
@@ -144,3 +144,114 @@ ADD_PAUSE_THRESH_S = float(os.getenv("ADD_PAUSE_THRESH_S", "3"))
 # quality but slower processing. For real-time applications, beam_size=1 is
 # recommended for optimal performance.
 BEAM_SIZE = 1 # default 5
+
+
+# Batched Inference Settings
+# --------------------------
+# These settings control cross-client batching for the faster_whisper backend
+# (only used together with the shared single model).
+
+# When enabled, pending audio windows from all connected clients are decoded
+# together as one padded batch instead of one client at a time behind a lock.
+BATCH_INFERENCE = os.getenv("BATCH_INFERENCE", "false").strip().lower() in ("1", "true", "yes", "on")
+
+# Maximum number of client windows decoded in one model call.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+
+# How long (in milliseconds) a batch is held open for more client windows once
+# the first one arrived. Bounds the extra latency added to a lone stream.
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "20"))
+
+
+# Language Detection Cache Settings
+# ---------------------------------
+# These settings control how auto-language sessions (no language given by the
+# client) reuse earlier language detection results instead of detecting the
+# language again on every window.
+
+# Seconds after which the confidence of a cached detection is halved. A stale
+# language is re-detected once its decayed confidence drops below
+# LANGUAGE_HINT_MIN_CONFIDENCE.
+LANGUAGE_CACHE_HALF_LIFE_S = float(os.getenv("LANGUAGE_CACHE_HALF_LIFE_S", "300"))
+
+# Confidence factor applied when a speaker without a detection of their own
+# falls back to the session's language.
+LANGUAGE_CACHE_SPEAKER_FALLBACK = float(os.getenv("LANGUAGE_CACHE_SPEAKER_FALLBACK", "0.5"))
+
+# Minimum (decayed) confidence for a cached language to be used instead of
+# running language detection.
+LANGUAGE_HINT_MIN_CONFIDENCE = float(os.getenv("LANGUAGE_HINT_MIN_CONFIDENCE", "0.5"))
+
+
+# Load Report Settings
+# --------------------
+# Every server publishes its current load to Redis so that bot-manager can
+# place new bots on the least loaded instance instead of a static URL.
+
+# Seconds between load reports. Set to 0 to disable publishing.
+LOAD_REPORT_INTERVAL_S = float(os.getenv("WL_LOAD_REPORT_INTERVAL_S", "5"))
+
+# A report expires after this many seconds, so a crashed server drops out of
+# placement on its own.
+LOAD_REPORT_TTL_S = float(os.getenv("WL_LOAD_REPORT_TTL_S", "15"))
+
+
+# Drain and Session Handoff Settings
+# ----------------------------------
+# On SIGTERM the server stops accepting new sessions and keeps serving the
+# existing ones. Sessions still open at the deadline are handed off to a peer
+# instance instead of being dropped.
+
+# Seconds to keep serving existing sessions after SIGTERM. 0 restores the old
+# behaviour of closing every session immediately. The platform's grace period
+# before SIGKILL must cover this plus DRAIN_CLEANUP_S (docker-compose.yml sets
+# stop_grace_period; Docker's default is 10s, Kubernetes' 30s).
+DRAIN_TIMEOUT_S = float(os.getenv("WL_DRAIN_TIMEOUT_S", "25"))
+
+# Seconds the handed-off sessions get to finish their cleanup (final spool
+# snapshot upload) before the server exits.
+DRAIN_CLEANUP_S = 10.0
+
+# Whether sessions left at the drain deadline are exported for a peer.
+HANDOFF_ENABLED = os.getenv("WL_HANDOFF_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# Seconds an exported session waits in Redis for the bot to reconnect.
+HANDOFF_TTL_S = float(os.getenv("WL_HANDOFF_TTL_S", "120"))
+
+# Most untranscribed audio (in seconds) carried over to the peer.
+HANDOFF_MAX_PENDING_S = float(os.getenv("WL_HANDOFF_MAX_PENDING_S", "30"))
+
+# Longest reconnect gap (in seconds) filled with silence on the peer so that
+# timestamps stay on the session's timeline.
+HANDOFF_MAX_GAP_S = float(os.getenv("WL_HANDOFF_MAX_GAP_S", "10"))
+
+
+# Adaptive Request Pacing Settings
+# --------------------------------
+# Remote sessions space their transcription requests with an AIMD controller
+# shared by all sessions of a tier in the process: the interval shrinks while
+# the transcription-service answers quickly with spare capacity, and grows on
+# slow answers, high load hints and 503/429.
+
+# Set to false to keep the static MIN_TIME_BETWEEN_REQUESTS_S spacing.
+PACING_ENABLED = os.getenv("WL_PACING_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# Bounds of the interval (in seconds) between requests of a realtime session.
+# It only goes below the configured interval while the service reports spare
+# capacity in X-Transcription-Load. Deferred sessions never go below it.
+PACING_MIN_INTERVAL_S = float(os.getenv("WL_PACING_MIN_INTERVAL_S", "0.2"))
+PACING_MAX_INTERVAL_S = float(os.getenv("WL_PACING_MAX_INTERVAL_S", "5.0"))
+
+# Requests per second added to a session's rate per second of good responses.
+PACING_INCREASE_RPS_PER_S = float(os.getenv("WL_PACING_INCREASE_RPS_PER_S", "0.1"))
+
+# Factor the rate is multiplied by on congestion (at most once per interval).
+PACING_DECREASE_FACTOR = float(os.getenv("WL_PACING_DECREASE_FACTOR", "0.5"))
+
+# Responses slower than this (in seconds) count as congestion.
+PACING_TARGET_LATENCY_S = float(os.getenv("WL_PACING_TARGET_LATENCY_S", "2.0"))
+
+# Load hint (active + queued requests per slot, from X-Transcription-Load)
+# above which the rate is decreased, and below which it may increase.
+PACING_LOAD_HIGH = float(os.getenv("WL_PACING_LOAD_HIGH", "0.9"))
+PACING_LOAD_LOW = float(os.getenv("WL_PACING_LOAD_LOW", "0.6"))
@@ -0,0 +1,84 @@
+"""
+Copy of ``Histogram`` and ``StageLatency`` from ``shared_models.latency``.
+
+``whisper_live.latency`` imports them from shared-models when it is installed
+(``Dockerfile.cpu``, ``Dockerfile.project``). WhisperLive's own images
+(``docker/Dockerfile.*``) and ``requirements/server.txt`` do not install it,
+so they use this copy. Keep it identical; ``tests/test_latency.py`` at the
+repository root checks.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class StageLatency:
+    """Set of histograms, one per stage."""
+
+    def __init__(self, name: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self._stages: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: Optional[float]):
+        if seconds is None:
+            return
+        # Cross-host stages can come out slightly negative with clock skew
+        seconds = max(0.0, float(seconds))
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_since(self, stage: str, start_ts: Any, now: float):
+        """Observe ``now - start_ts`` when ``start_ts`` is a usable timestamp."""
+        try:
+            start = float(start_ts)
+        except (TypeError, ValueError):
+            return
+        self.observe(stage, now - start)
+
+    def render(self, labels: str = "") -> str:
+        lines = [
+            f"# HELP {self.name} Time spent in each stage of the live transcription path.",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._stages):
+                stage_labels = ",".join(part for part in (labels, f'stage="{stage}"') if part)
+                lines += self._stages[stage].render(self.name, stage_labels)
+        return "\n".join(lines) + "\n"
@@ -769,6 +769,8 @@ class WhisperModel:
         hotwords: Optional[str] = None,
         language_detection_threshold: Optional[float] = 0.5,
         language_detection_segments: int = int(os.getenv('LANGUAGE_DETECTION_SEGMENTS', '10')), 
+        feature_cache=None,
+        audio_start_sample: int = 0,
     ) -> Tuple[Iterable[Segment], TranscriptionInfo]:
         """Transcribes an input file.
 
@@ -838,6 +840,11 @@ class WhisperModel:
           language_detection_threshold: If the maximum probability of the language tokens is higher
            than this value, the language is detected.
           language_detection_segments: Number of segments to consider for the language detection.
+          feature_cache: Optional per-stream StreamingLogMelCache. When the audio (after VAD)
+            is a contiguous slice of the stream, its log-mel features are taken from the cache
+            so only newly arrived frames are computed.
+          audio_start_sample: Absolute index in the stream of the first sample of `audio`,
+            used to key `feature_cache`.
         Returns:
           A tuple with:
 
@@ -912,7 +919,12 @@ class WhisperModel:
             speech_chunks = None
         if audio.shape[0] == 0:
             return None, None
-        features = self.feature_extractor(audio, chunk_length=chunk_length)
+        if feature_cache is not None and chunk_length is None and (speech_chunks is None or len(speech_chunks) == 1):
+            # A single speech chunk is still a contiguous slice of the stream
+            start_sample = audio_start_sample + (speech_chunks[0]["start"] if speech_chunks else 0)
+            features = feature_cache(audio, start_sample)
+        else:
+            features = self.feature_extractor(audio, chunk_length=chunk_length)
 
         encoder_output = None
         all_language_probs = None
@@ -934,15 +946,33 @@ class WhisperModel:
                     if start_timestamp * self.frames_per_second < content_frames
                     else 0
                 )
-                (
-                    language,
-                    language_probability,
-                    all_language_probs,
-                ) = self.detect_language(
-                    features=features[..., seek:],
-                    language_detection_segments=language_detection_segments,
-                    language_detection_threshold=language_detection_threshold,
+                clip_count = (
+                    len(clip_timestamps.split(","))
+                    if isinstance(clip_timestamps, str)
+                    else len(clip_timestamps)
                 )
+                if seek == 0 and clip_count <= 1 and content_frames > 0:
+                    # Encode the first decoding window once: it is used for the
+                    # language detection here and reused by generate_segments.
+                    segment_size = min(self.feature_extractor.nb_max_frames, content_frames)
+                    encoder_output = self.encode(pad_or_trim(features[:, :segment_size]))
+                    results = self.model.detect_language(encoder_output)[0]
+                    all_language_probs = [(token[2:-2], prob) for (token, prob) in results]
+                    language, language_probability = all_language_probs[0]
+
+                if encoder_output is None or (
+                    language_probability <= language_detection_threshold
+                    and language_detection_segments > 1
+                ):
+                    (
+                        language,
+                        language_probability,
+                        all_language_probs,
+                    ) = self.detect_language(
+                        features=features[..., seek:],
+                        language_detection_segments=language_detection_segments,
+                        language_detection_threshold=language_detection_threshold,
+                    )
 
                 self.logger.info(
                     "Detected language '%s' with probability %.2f",
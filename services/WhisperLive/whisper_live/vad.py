@@ -1,10 +1,10 @@
-import os
-import subprocess
 import torch
 import numpy as np
 import onnxruntime
 import warnings
 
+from whisper_live.multi_stream_vad import SILERO_VAD_URL, download_silero_vad
+
 
 class VoiceActivityDetection():
 
@@ -109,23 +109,8 @@ class VoiceActivityDetection():
         return stacked.cpu()
 
     @staticmethod
-    def download(model_url="https://github.com/snakers4/silero-vad/raw/v5.0/files/silero_vad.onnx"):
-        target_dir = os.path.expanduser("~/.cache/whisper-live/")
-
-        # Ensure the target directory exists
-        os.makedirs(target_dir, exist_ok=True)
-
-        # Define the target file path
-        model_filename = os.path.join(target_dir, "silero_vad.onnx")
-
-        # Check if the model file already exists
-        if not os.path.exists(model_filename):
-            # If it doesn't exist, download the model using wget
-            try:
-                subprocess.run(["wget", "-O", model_filename, model_url], check=True)
-            except subprocess.CalledProcessError:
-                print("Failed to download the model using wget.")
-        return model_filename
+    def download(model_url=SILERO_VAD_URL):
+        return download_silero_vad(model_url)
 
 
 class VoiceActivityDetector:
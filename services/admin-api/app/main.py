@@ -8,20 +8,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload, attributes
 from typing import List, Optional  # Import List for response model
-from datetime import datetime # Import datetime
+from datetime import date, datetime # Import datetime
 from sqlalchemy import func
 from pydantic import BaseModel, Field, HttpUrl
+import redis.asyncio as aioredis
 
 # Import shared models and schemas
-from shared_models.models import User, APIToken, Base, Meeting, Transcription, MeetingSession # Import Base for init_db and Meeting
+from shared_models.models import User, APIToken, Base, Meeting, Transcription, MeetingSession, UserUsageStats, UserUsageDaily # Import Base for init_db and Meeting
 from shared_models.schemas import (UserCreate, UserResponse, TokenResponse, UserDetailResponse, UserBase, UserUpdate, MeetingResponse,
                                  UserTableResponse, MeetingTableResponse, MeetingSessionResponse, TranscriptionStats, 
                                  MeetingPerformanceMetrics, MeetingTelematicsResponse, UserMeetingStats, 
-                                 UserUsagePatterns, UserAnalyticsResponse) # Import analytics schemas
+                                 UserUsagePatterns, UserAnalyticsResponse, DailyUsageResponse) # Import analytics schemas
 
 # Database utilities (needs to be created)
 from shared_models.database import get_db, init_db  # New import
 from shared_models.webhook_url import validate_webhook_url
+from shared_models.partitions import transcription_partition_clause
+from shared_models.auth_cache import auth_cache, authenticate_token
 
 # Logging configuration
 logging.basicConfig(
@@ -49,6 +52,9 @@ class PaginatedMeetingUserStatResponse(BaseModel):
 API_KEY_HEADER = APIKeyHeader(name="X-Admin-API-Key", auto_error=False) # Use a distinct header
 USER_API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False) # For user-facing endpoints
 ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN") # Read from environment
+REDIS_URL = os.getenv("REDIS_URL")
+# Longest range served by /admin/analytics/usage/daily
+MAX_USAGE_RANGE_DAYS = int(os.getenv("MAX_USAGE_RANGE_DAYS", "366"))
 
 async def verify_admin_token(admin_api_key: str = Security(API_KEY_HEADER)):
     """Dependency to verify the admin API token."""
@@ -73,15 +79,13 @@ async def get_current_user(api_key: str = Security(USER_API_KEY_HEADER), db: Asy
     if not api_key:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing API Key")
 
-    result = await db.execute(
-        select(APIToken).where(APIToken.token == api_key).options(selectinload(APIToken.user))
-    )
-    db_token = result.scalars().first()
+    # Cached lookup (local TTL LRU + shared Redis tier); falls back to the DB on a miss
+    user = await authenticate_token(db, api_key)
 
-    if not db_token or not db_token.user:
+    if user is None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API Key")
-    
-    return db_token.user
+
+    return user
 
 # Router setup (all routes require admin token verification)
 admin_router = APIRouter(
@@ -102,6 +106,13 @@ def generate_secure_token(length=40):
     alphabet = string.ascii_letters + string.digits
     return ''.join(secrets.choice(alphabet) for i in range(length))
 
+def _paged_by_id(query, id_column, skip: int, limit: int, after_id: Optional[int]):
+    """Order ``query`` by id and page it by keyset (``after_id``) or, for old clients, by offset."""
+    query = query.order_by(id_column).limit(limit)
+    if after_id is not None:
+        return query.where(id_column > after_id)
+    return query.offset(skip)
+
 # --- User Endpoints ---
 @user_router.put("/webhook",
              response_model=UserResponse,
@@ -109,7 +120,7 @@ def generate_secure_token(length=40):
              description="Set a webhook URL for the authenticated user to receive notifications.")
 async def set_user_webhook(
     webhook_update: WebhookUpdate,
-    user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -125,6 +136,11 @@ async def set_user_webhook(
             detail=str(e)
         ) from e
 
+    # The authenticated user may come from the auth cache, detached from this session
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
     if user.data is None:
         user.data = {}
 
@@ -153,6 +169,7 @@ async def set_user_webhook(
         db.add(user)
         await db.commit()
 
+    await auth_cache.invalidate_user(user.id)
     logger.info(f"Updated webhook URL for user {user.email}")
 
     return UserResponse.model_validate(user)
@@ -212,8 +229,9 @@ async def create_user(user_in: UserCreate, response: Response, db: AsyncSession
 @admin_router.get("/users", 
             response_model=List[UserResponse], # Use List import
             summary="List all users")
-async def list_users(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User).offset(skip).limit(limit))
+async def list_users(skip: int = 0, limit: int = 100, after_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    """Lists users by id. Pass the last id of a page as `after_id` to get the next one; `skip` is kept for old clients."""
+    result = await db.execute(_paged_by_id(select(User), User.id, skip, limit, after_id))
     users = result.scalars().all()
     
     # Fix: Ensure created_at is never None before validation
@@ -352,6 +370,8 @@ async def update_user(user_id: int, user_update: UserUpdate, db: AsyncSession =
         try:
             await db.commit()
             await db.refresh(db_user)
+            # Other services cache the user (limits, data) behind its API tokens
+            await auth_cache.invalidate_user(user_id)
             logger.info(f"Admin updated user ID: {user_id}")
         except Exception as e: # Catch potential DB errors (e.g., constraints)
             await db.rollback()
@@ -409,8 +429,10 @@ async def delete_token(token_id: int, db: AsyncSession = Depends(get_db)):
         )
         
     # Delete the token
+    revoked_token = db_token.token
     await db.delete(db_token)
     await db.commit()
+    await auth_cache.invalidate_token(revoked_token)
     logger.info(f"Admin deleted token ID: {token_id}")
     # No body needed for 204 response
     return 
@@ -460,13 +482,15 @@ async def list_meetings_with_users(
 async def get_users_table(
     skip: int = 0, 
     limit: int = 1000,
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Returns user table data for analytics without exposing sensitive information.
     Excludes: data JSONB field, API tokens
+    Pages by id: pass the last id of a page as `after_id`.
     """
-    result = await db.execute(select(User).offset(skip).limit(limit))
+    result = await db.execute(_paged_by_id(select(User), User.id, skip, limit, after_id))
     users = result.scalars().all()
     
     # Fix: Ensure created_at is never None before validation
@@ -491,13 +515,15 @@ async def get_users_table(
 async def get_meetings_table(
     skip: int = 0,
     limit: int = 1000, 
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Returns meeting table data for analytics without exposing sensitive information.
     Excludes: data JSONB field, transcriptions content
+    Pages by id: pass the last id of a page as `after_id`.
     """
-    result = await db.execute(select(Meeting).offset(skip).limit(limit))
+    result = await db.execute(_paged_by_id(select(Meeting), Meeting.id, skip, limit, after_id))
     meetings = result.scalars().all()
     return [MeetingTableResponse.model_validate(m) for m in meetings]
 
@@ -535,21 +561,23 @@ async def get_meeting_telematics(
     # Calculate transcription stats if requested
     transcription_stats = None
     if include_transcriptions:
-        transcriptions_result = await db.execute(
-            select(Transcription).where(Transcription.meeting_id == meeting_id)
+        # Aggregated in SQL, from the meeting's partition only
+        stats_result = await db.execute(
+            select(
+                func.count(Transcription.id),
+                func.coalesce(func.sum(Transcription.end_time - Transcription.start_time), 0.0),
+                func.count(func.distinct(Transcription.speaker)).filter(Transcription.speaker != ''),
+                func.array_agg(func.distinct(Transcription.language)).filter(Transcription.language != ''),
+            ).where(transcription_partition_clause(meeting))
         )
-        transcriptions = transcriptions_result.scalars().all()
+        total_transcriptions, total_duration, unique_speakers, languages_detected = stats_result.one()
         
-        if transcriptions:
-            total_duration = sum(t.end_time - t.start_time for t in transcriptions)
-            unique_speakers = len(set(t.speaker for t in transcriptions if t.speaker))
-            languages_detected = list(set(t.language for t in transcriptions if t.language))
-            
+        if total_transcriptions:
             transcription_stats = TranscriptionStats(
-                total_transcriptions=len(transcriptions),
-                total_duration=total_duration,
+                total_transcriptions=total_transcriptions,
+                total_duration=float(total_duration),
                 unique_speakers=unique_speakers,
-                languages_detected=languages_detected
+                languages_detected=list(languages_detected or [])
             )
     
     # Calculate performance metrics
@@ -604,61 +632,37 @@ async def get_user_details(
         db.add(user)
         await db.commit()
     
-    # Calculate meeting stats
-    meetings_result = await db.execute(select(Meeting).where(Meeting.user_id == user_id))
-    meetings = meetings_result.scalars().all()
-    
-    total_meetings = len(meetings)
-    completed_meetings = len([m for m in meetings if m.status == 'completed'])
-    failed_meetings = len([m for m in meetings if m.status == 'failed'])
-    active_meetings = len([m for m in meetings if m.status in ['requested', 'joining', 'awaiting_admission', 'active']])
+    # Meeting stats and usage patterns come from the rollup maintained by the trg_user_usage trigger
+    usage = await db.get(UserUsageStats, user_id)
+    if usage is None:
+        usage = UserUsageStats(
+            user_id=user_id, total_meetings=0, completed_meetings=0, failed_meetings=0, active_meetings=0,
+            completed_duration_s=0.0, completed_with_duration=0, hour_counts=[0] * 24, platform_counts={},
+        )
     
-    # Calculate duration stats
-    completed_with_duration = [m for m in meetings if m.status == 'completed' and m.start_time and m.end_time]
-    total_duration = sum((m.end_time - m.start_time).total_seconds() for m in completed_with_duration) if completed_with_duration else None
-    average_duration = total_duration / len(completed_with_duration) if completed_with_duration else None
+    total_duration = usage.completed_duration_s if usage.completed_with_duration else None
+    average_duration = total_duration / usage.completed_with_duration if usage.completed_with_duration else None
     
     meeting_stats = UserMeetingStats(
-        total_meetings=total_meetings,
-        completed_meetings=completed_meetings,
-        failed_meetings=failed_meetings,
-        active_meetings=active_meetings,
+        total_meetings=usage.total_meetings,
+        completed_meetings=usage.completed_meetings,
+        failed_meetings=usage.failed_meetings,
+        active_meetings=usage.active_meetings,
         total_duration=total_duration,
         average_duration=average_duration
     )
     
-    # Calculate usage patterns
-    if meetings:
-        # Most used platform
-        platform_counts = {}
-        for meeting in meetings:
-            platform_counts[meeting.platform] = platform_counts.get(meeting.platform, 0) + 1
-        most_used_platform = max(platform_counts, key=platform_counts.get) if platform_counts else None
-        
-        # Meetings per day (based on creation date)
-        days_since_first = (datetime.utcnow() - min(m.created_at for m in meetings)).days + 1
-        meetings_per_day = total_meetings / days_since_first if days_since_first > 0 else 0
-        
-        # Peak usage hours
-        hour_counts = {}
-        for meeting in meetings:
-            hour = meeting.created_at.hour
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-        peak_usage_hours = sorted(hour_counts.keys(), key=lambda h: hour_counts[h], reverse=True)[:3]
-        
-        # Last activity
-        last_activity = max(m.created_at for m in meetings)
-    else:
-        most_used_platform = None
-        meetings_per_day = 0.0
-        peak_usage_hours = []
-        last_activity = None
+    # Meetings per day (based on creation date)
+    meetings_per_day = 0.0
+    if usage.total_meetings and usage.first_meeting_at:
+        days_since_first = (datetime.utcnow() - usage.first_meeting_at).days + 1
+        meetings_per_day = usage.total_meetings / days_since_first if days_since_first > 0 else 0
     
     usage_patterns = UserUsagePatterns(
-        most_used_platform=most_used_platform,
+        most_used_platform=usage.most_used_platform(),
         meetings_per_day=meetings_per_day,
-        peak_usage_hours=peak_usage_hours,
-        last_activity=last_activity
+        peak_usage_hours=usage.peak_hours(),
+        last_activity=usage.last_meeting_at if usage.total_meetings else None
     )
     
     return UserAnalyticsResponse(
@@ -668,10 +672,65 @@ async def get_user_details(
         api_tokens=[TokenResponse.model_validate(t) for t in user.api_tokens] if include_tokens else None
     )
 
+@admin_router.get("/analytics/usage/daily",
+                  response_model=List[DailyUsageResponse],
+                  summary="Get meeting usage per day from the usage rollup")
+async def get_daily_usage(
+    start: date,
+    end: date,
+    user_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Returns meetings, outcomes and completed duration per day (by meeting creation date)
+    between `start` and `end` inclusive, for one user or summed over all users.
+    Served from the user_usage_daily rollup; at most MAX_USAGE_RANGE_DAYS days.
+    """
+    if end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must not be before start")
+    if (end - start).days >= MAX_USAGE_RANGE_DAYS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Range is limited to {MAX_USAGE_RANGE_DAYS} days")
+    
+    query = (
+        select(
+            UserUsageDaily.day,
+            func.sum(UserUsageDaily.meetings),
+            func.sum(UserUsageDaily.completed_meetings),
+            func.sum(UserUsageDaily.failed_meetings),
+            func.sum(UserUsageDaily.completed_duration_s),
+        )
+        .where(UserUsageDaily.day >= start, UserUsageDaily.day <= end)
+        .group_by(UserUsageDaily.day)
+        .order_by(UserUsageDaily.day)
+    )
+    if user_id is not None:
+        query = query.where(UserUsageDaily.user_id == user_id)
+    result = await db.execute(query)
+    return [
+        DailyUsageResponse(
+            day=day,
+            meetings=meetings,
+            completed_meetings=completed,
+            failed_meetings=failed,
+            completed_duration=float(duration or 0.0),
+        )
+        for day, meetings, completed, failed, duration in result.all()
+    ]
+
 # App events
 @app.on_event("startup")
 async def startup_event():
     logger.info("Admin API starting up. Skipping automatic DB initialization.")
+    # Token revocations and user updates are broadcast to the other services'
+    # (and the other replicas') auth caches through Redis. Without it, their
+    # entries expire after AUTH_CACHE_TTL_SECONDS.
+    if REDIS_URL:
+        try:
+            client = aioredis.from_url(REDIS_URL, decode_responses=True)
+            await client.ping()
+            await auth_cache.attach_redis(client)
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis for auth cache invalidation: {e}")
     # The 'migrate-or-init' Makefile target is now responsible for all DB setup.
     # await init_db()
     pass
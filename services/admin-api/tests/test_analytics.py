@@ -0,0 +1,141 @@
+import os
+import unittest
+from datetime import date, datetime, timedelta
+
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "vexa",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "ADMIN_API_TOKEN": "test-admin-token",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app import main as admin_main
+from shared_models.models import User, UserUsageStats
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+class _Session:
+    """Answers queries in order from canned results and keeps the compiled SQL."""
+
+    def __init__(self, results, usage=()):
+        self.results = list(results)
+        self.usage = {u.user_id: u for u in usage}
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})))
+        return _Result(self.results.pop(0))
+
+    async def get(self, model, pk):
+        assert model is UserUsageStats
+        return self.usage.get(pk)
+
+
+def _user(user_id):
+    user = User(id=user_id, email=f"u{user_id}@example.com", name="U", max_concurrent_bots=1, data={},
+                created_at=datetime(2026, 1, 1))
+    user.api_tokens = []
+    return user
+
+
+class UserDetailsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_stats_and_patterns_come_from_the_rollup(self):
+        hours = [0] * 24
+        hours[9], hours[14] = 2, 5
+        usage = UserUsageStats(
+            user_id=7, total_meetings=7, completed_meetings=4, failed_meetings=1, active_meetings=2,
+            completed_duration_s=3600.0, completed_with_duration=3, hour_counts=hours,
+            platform_counts={"zoom": 0, "google_meet": 5, "teams": 2},
+            first_meeting_at=datetime.utcnow() - timedelta(days=6), last_meeting_at=datetime(2026, 10, 19, 14, 5),
+        )
+        db = _Session([[_user(7)]], usage=[usage])
+
+        details = await admin_main.get_user_details(7, db=db)
+
+        stats, patterns = details.meeting_stats, details.usage_patterns
+        self.assertEqual((stats.total_meetings, stats.completed_meetings, stats.failed_meetings, stats.active_meetings),
+                         (7, 4, 1, 2))
+        self.assertEqual(stats.total_duration, 3600.0)
+        self.assertEqual(stats.average_duration, 1200.0)
+        self.assertEqual(patterns.most_used_platform, "google_meet")
+        self.assertEqual(patterns.peak_usage_hours, [14, 9])
+        self.assertEqual(patterns.meetings_per_day, 1.0)
+        self.assertEqual(patterns.last_activity, datetime(2026, 10, 19, 14, 5))
+        self.assertIsNone(details.api_tokens)
+        self.assertIn("users.id = 7", db.statements[0])
+
+    async def test_user_without_meetings_gets_zeroes(self):
+        db = _Session([[_user(8)]])
+
+        details = await admin_main.get_user_details(8, db=db)
+
+        self.assertEqual(details.meeting_stats.total_meetings, 0)
+        self.assertIsNone(details.meeting_stats.average_duration)
+        self.assertIsNone(details.usage_patterns.most_used_platform)
+        self.assertEqual(details.usage_patterns.peak_usage_hours, [])
+        self.assertEqual(details.usage_patterns.meetings_per_day, 0.0)
+        self.assertIsNone(details.usage_patterns.last_activity)
+
+    async def test_unknown_user_is_404(self):
+        with self.assertRaises(HTTPException) as caught:
+            await admin_main.get_user_details(9, db=_Session([[]]))
+        self.assertEqual(caught.exception.status_code, 404)
+
+
+class DailyUsageTests(unittest.IsolatedAsyncioTestCase):
+    async def test_rejects_reversed_and_oversized_ranges(self):
+        start = date(2026, 1, 1)
+        for end in (start - timedelta(days=1), start + timedelta(days=admin_main.MAX_USAGE_RANGE_DAYS)):
+            with self.assertRaises(HTTPException) as caught:
+                await admin_main.get_daily_usage(start, end, db=_Session([]))
+            self.assertEqual(caught.exception.status_code, 400)
+
+    async def test_sums_days_for_one_user(self):
+        db = _Session([[(date(2026, 10, 18), 3, 2, 1, None), (date(2026, 10, 19), 1, 1, 0, 90.5)]])
+        last = date(2026, 1, 1) + timedelta(days=admin_main.MAX_USAGE_RANGE_DAYS - 1)
+
+        days = await admin_main.get_daily_usage(date(2026, 1, 1), last, user_id=7, db=db)
+
+        self.assertEqual([(d.day, d.meetings, d.completed_duration) for d in days],
+                         [(date(2026, 10, 18), 3, 0.0), (date(2026, 10, 19), 1, 90.5)])
+        self.assertIn("user_usage_daily.user_id = 7", db.statements[0])
+        self.assertIn("GROUP BY user_usage_daily.day", db.statements[0])
+
+
+class PagingTests(unittest.IsolatedAsyncioTestCase):
+    async def test_after_id_pages_by_keyset(self):
+        db = _Session([[_user(11), _user(12)]])
+
+        users = await admin_main.list_users(limit=2, after_id=10, db=db)
+
+        self.assertEqual([u.id for u in users], [11, 12])
+        self.assertIn("WHERE users.id > 10 ORDER BY users.id", db.statements[0])
+        self.assertNotIn("OFFSET", db.statements[0])
+
+    async def test_skip_still_pages_by_offset(self):
+        db = _Session([[]])
+
+        await admin_main.get_users_table(skip=20, limit=5, db=db)
+
+        self.assertIn("ORDER BY users.id", db.statements[0])
+        self.assertIn("LIMIT 5 OFFSET 20", db.statements[0])
+        self.assertNotIn("WHERE", db.statements[0])
@@ -1,5 +1,6 @@
 import uvicorn
 from fastapi import FastAPI, Request, Response, HTTPException, status, Depends, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from fastapi.security import APIKeyHeader
@@ -13,6 +14,7 @@ import asyncio
 import redis.asyncio as aioredis
 from datetime import datetime, timedelta, timezone
 import secrets
+import time
 
 # Import schemas for documentation
 from shared_models.schemas import (
@@ -24,9 +26,13 @@ from shared_models.schemas import (
     BotStatusResponse, # ADDED: Import response model for documentation
     SpeakRequest, ChatSendRequest, ChatMessagesResponse, ScreenContentRequest, # Voice agent schemas
 )
+from shared_models.latency import StageLatency
 
 load_dotenv()
 
+# Live-path stage latencies for the /ws fan-out, served on /metrics
+STAGES = StageLatency("api_gateway_stage_latency_seconds")
+
 # Configuration - Service endpoints are now mandatory environment variables
 ADMIN_API_URL = os.getenv("ADMIN_API_URL")
 BOT_MANAGER_URL = os.getenv("BOT_MANAGER_URL")
@@ -461,6 +467,36 @@ async def delete_recording_proxy(recording_id: int, request: Request):
     url = f"{BOT_MANAGER_URL}/recordings/{recording_id}"
     return await forward_request(app.state.http_client, "DELETE", url, request)
 
+@app.post("/recordings/{recording_id}/transcribe",
+          tags=["Recordings"],
+          summary="Re-transcribe a recording",
+          description="Queues the recording's audio as a deferred transcription job.",
+          dependencies=[Depends(api_key_scheme)])
+async def transcribe_recording_proxy(recording_id: int, request: Request):
+    """Forward request to Bot Manager to queue a transcription job."""
+    url = f"{BOT_MANAGER_URL}/recordings/{recording_id}/transcribe"
+    return await forward_request(app.state.http_client, "POST", url, request)
+
+@app.get("/transcription-jobs/{job_id}",
+         tags=["Recordings"],
+         summary="Get transcription job status",
+         description="Returns the status and progress of a recording transcription job.",
+         dependencies=[Depends(api_key_scheme)])
+async def get_transcription_job_proxy(job_id: int, request: Request):
+    """Forward request to Bot Manager to get a transcription job."""
+    url = f"{BOT_MANAGER_URL}/transcription-jobs/{job_id}"
+    return await forward_request(app.state.http_client, "GET", url, request)
+
+@app.get("/transcription-jobs/{job_id}/segments",
+         tags=["Recordings"],
+         summary="Get transcription job segments",
+         description="Returns the segments a recording transcription job has produced, ordered by start time.",
+         dependencies=[Depends(api_key_scheme)])
+async def get_transcription_job_segments_proxy(job_id: int, request: Request):
+    """Forward request to Bot Manager to get a transcription job's segments."""
+    url = f"{BOT_MANAGER_URL}/transcription-jobs/{job_id}/segments"
+    return await forward_request(app.state.http_client, "GET", url, request)
+
 @app.get("/recording-config",
          tags=["Recordings"],
          summary="Get recording configuration",
@@ -918,6 +954,24 @@ async def forward_mcp_path(request: Request, path: str):
 
 # --- Removed internal ID resolution and full transcript fetching from Gateway ---
 
+def _observe_fanout(data: str, received_at: float):
+    """Record the pub/sub, /ws send and end-to-end stages of one transcript update."""
+    sent_at = time.time()
+    try:
+        timing = json.loads(data).get("timing") or {}
+    except (ValueError, AttributeError):
+        return
+    STAGES.observe_since("pubsub", timing.get("published"), received_at)
+    STAGES.observe("ws_send", sent_at - received_at)
+    STAGES.observe_since("end_to_end", timing.get("ingest"), sent_at)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Live-path stage latency histograms in the Prometheus text format."""
+    return STAGES.render()
+
+
 # --- WebSocket Multiplex Endpoint ---
 @app.websocket("/ws")
 async def websocket_multiplex(ws: WebSocket):
@@ -957,10 +1011,13 @@ async def websocket_multiplex(ws: WebSocket):
                     if message.get("type") != "message":
                         continue
                     data = message.get("data")
+                    received_at = time.time()
                     try:
                         await ws.send_text(data)
                     except Exception:
                         break
+                    if str(message.get("channel", "")).endswith(":mutable"):
+                        _observe_fanout(data, received_at)
             finally:
                 try:
                     await pubsub.unsubscribe(*channel_names)
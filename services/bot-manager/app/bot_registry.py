@@ -0,0 +1,113 @@
+"""Live registry of running bots, kept in Redis.
+
+One hash per user (``bot_registry:user:{user_id}``), one field per meeting
+id, each value a JSON ``BotStatus`` dict. The registry is written from the
+bot lifecycle (launch, started/joining/awaiting_admission/status_change/
+exited callbacks, all of which go through ``update_meeting_status``) and
+rebuilt from orchestrator + DB state by the reconciliation task, so
+``GET /bots/status`` is a single HGETALL.
+"""
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from shared_models.models import Meeting
+from shared_models.schemas import MeetingStatus
+
+logger = logging.getLogger("bot_manager.bot_registry")
+
+REGISTRY_KEY = "bot_registry:user:{}"
+
+# Meeting status -> BotStatus.normalized_status for bots that are still live
+_NORMALIZED_STATUS = {
+    MeetingStatus.REQUESTED.value: "Requested",
+    MeetingStatus.JOINING.value: "Starting",
+    MeetingStatus.AWAITING_ADMISSION.value: "Starting",
+    MeetingStatus.ACTIVE.value: "Up",
+    MeetingStatus.STOPPING.value: "Stopping",
+}
+
+
+def is_live(meeting: Meeting) -> bool:
+    """A meeting has a live bot if a container was assigned and it is not terminal."""
+    return bool(meeting.bot_container_id) and meeting.status in _NORMALIZED_STATUS
+
+
+def entry_from_meeting(meeting: Meeting, container_name: Optional[str] = None) -> Dict[str, Any]:
+    created = meeting.start_time or meeting.created_at
+    return {
+        "container_id": meeting.bot_container_id,
+        "container_name": container_name,
+        "platform": meeting.platform,
+        "native_meeting_id": meeting.platform_specific_id,
+        "status": meeting.status,
+        "normalized_status": _NORMALIZED_STATUS.get(meeting.status),
+        "created_at": created.isoformat() if created else None,
+        "labels": {"vexa.user_id": str(meeting.user_id), "vexa.meeting_id": str(meeting.id)},
+        "meeting_id_from_name": str(meeting.id),
+        "updated_at": time.time(),
+    }
+
+
+async def sync_meeting(redis_client, meeting: Meeting) -> None:
+    """Upsert or remove the meeting's bot after a lifecycle change."""
+    key = REGISTRY_KEY.format(meeting.user_id)
+    field = str(meeting.id)
+    if not is_live(meeting):
+        await redis_client.hdel(key, field)
+        return
+    container_name = None
+    existing = await redis_client.hget(key, field)
+    if existing:
+        previous = json.loads(existing)
+        # Only the orchestrator knows the name; keep what reconciliation recorded.
+        if previous.get("container_id") == meeting.bot_container_id:
+            container_name = previous.get("container_name")
+    await redis_client.hset(key, field, json.dumps(entry_from_meeting(meeting, container_name)))
+
+
+async def list_user_bots(redis_client, user_id: int) -> List[Dict[str, Any]]:
+    raw = await redis_client.hgetall(REGISTRY_KEY.format(user_id))
+    bots = [json.loads(value) for value in raw.values()]
+    for bot in bots:
+        bot.pop("updated_at", None)
+    bots.sort(key=lambda bot: bot.get("created_at") or "")
+    return bots
+
+
+async def reconcile_user_bots(
+    redis_client,
+    user_id: int,
+    live_entries: Dict[str, Dict[str, Any]],
+    started_at: float,
+) -> None:
+    """Make the user's registry match what reconciliation observed.
+
+    ``live_entries`` maps meeting id -> entry for every running bot whose
+    meeting is non-terminal. Entries written by callbacks after
+    ``started_at`` are newer than the reconciliation snapshot and are kept.
+    """
+    key = REGISTRY_KEY.format(user_id)
+    current = await redis_client.hgetall(key)
+    stale: List[str] = []
+    for field, value in current.items():
+        if field in live_entries:
+            continue
+        if json.loads(value).get("updated_at", 0) < started_at:
+            stale.append(field)
+    fresh = {
+        field: json.dumps(entry)
+        for field, entry in live_entries.items()
+        if field not in current or json.loads(current[field]).get("updated_at", 0) < started_at
+    }
+    if not stale and not fresh:
+        return
+    async with redis_client.pipeline(transaction=True) as pipe:
+        if stale:
+            pipe.hdel(key, *stale)
+        if fresh:
+            pipe.hset(key, mapping=fresh)
+        await pipe.execute()
+    if stale:
+        logger.info(f"[Bot Registry] Reconciliation removed {len(stale)} stale bot(s) for user {user_id}")
@@ -0,0 +1,156 @@
+"""Asyncio-native Docker Engine API client over the unix socket.
+
+Used by the docker orchestrator (``app.orchestrator_utils``) so that
+container create/start/stop/list calls never block the FastAPI event loop.
+A single ``httpx.AsyncClient`` with a UDS transport is shared by all callers,
+which gives keep-alive connection reuse; a semaphore caps the number of
+in-flight Engine API calls so a launch storm cannot overwhelm dockerd.
+"""
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger("bot_manager.docker_engine")
+
+DOCKER_HOST = os.environ.get("DOCKER_HOST", "unix://var/run/docker.sock")
+
+# Engine API tuning knobs
+DOCKER_API_MAX_CONCURRENCY = int(os.getenv("DOCKER_API_MAX_CONCURRENCY", "32"))
+DOCKER_API_MAX_CONNECTIONS = int(os.getenv("DOCKER_API_MAX_CONNECTIONS", "32"))
+DOCKER_API_TIMEOUT_SECONDS = float(os.getenv("DOCKER_API_TIMEOUT_SECONDS", "30"))
+DOCKER_API_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DOCKER_API_CONNECT_TIMEOUT_SECONDS", "5"))
+
+
+class DockerEngineError(Exception):
+    """Raised when the Docker Engine API returns an unexpected response."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def socket_path_from_docker_host(docker_host: str = DOCKER_HOST) -> str:
+    """Return the absolute socket path for a ``unix://`` DOCKER_HOST value.
+
+    Accepts both ``unix:///var/run/docker.sock`` and the historical
+    ``unix://var/run/docker.sock`` form used in our compose files.
+    """
+    if not docker_host.startswith("unix://"):
+        raise DockerEngineError(f"Unsupported DOCKER_HOST (only unix:// sockets are supported): {docker_host}")
+    return "/" + docker_host.split("//", 1)[1].lstrip("/")
+
+
+class DockerEngineClient:
+    """Thin async wrapper around the Docker Engine REST API."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        max_concurrency: int = DOCKER_API_MAX_CONCURRENCY,
+        max_connections: int = DOCKER_API_MAX_CONNECTIONS,
+        timeout: float = DOCKER_API_TIMEOUT_SECONDS,
+        connect_timeout: float = DOCKER_API_CONNECT_TIMEOUT_SECONDS,
+    ):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        transport = httpx.AsyncHTTPTransport(
+            uds=socket_path,
+            limits=httpx.Limits(
+                max_connections=max(1, max_connections),
+                max_keepalive_connections=max(1, max_connections),
+            ),
+        )
+        # The host part is ignored by the UDS transport; "docker" keeps logs readable.
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            base_url="http://docker",
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        async with self._semaphore:
+            return await self._client.request(method, path, **kwargs)
+
+    async def version(self) -> Dict[str, Any]:
+        response = await self._request("GET", "/version")
+        if response.status_code != 200:
+            raise DockerEngineError(f"GET /version failed: {response.text}", response.status_code)
+        return response.json()
+
+    async def create_container(self, name: str, config: Dict[str, Any]) -> str:
+        """Create a container and return its ID."""
+        response = await self._request("POST", "/containers/create", params={"name": name}, json=config)
+        if response.status_code != 201:
+            raise DockerEngineError(
+                f"Failed to create container '{name}': {response.status_code} {response.text}",
+                response.status_code,
+            )
+        container_id = response.json().get("Id")
+        if not container_id:
+            raise DockerEngineError(f"No container ID in create response for '{name}': {response.text}")
+        return container_id
+
+    async def start_container(self, container_id: str) -> None:
+        response = await self._request("POST", f"/containers/{container_id}/start")
+        # 304 means the container was already started
+        if response.status_code not in (204, 304):
+            raise DockerEngineError(
+                f"Failed to start container {container_id}: {response.status_code} {response.text}",
+                response.status_code,
+            )
+
+    async def stop_container(self, container_id: str, stop_timeout: int = 10) -> bool:
+        """Stop a container. Returns True if it is stopped or already gone."""
+        # Docker blocks for up to ``stop_timeout`` seconds before killing, so
+        # the HTTP timeout has to outlast it.
+        response = await self._request(
+            "POST",
+            f"/containers/{container_id}/stop",
+            params={"t": stop_timeout},
+            timeout=self.timeout + stop_timeout,
+        )
+        if response.status_code in (204, 304, 404):
+            return True
+        raise DockerEngineError(
+            f"Failed to stop container {container_id}: {response.status_code} {response.text}",
+            response.status_code,
+        )
+
+    async def remove_container(self, container_id: str, force: bool = False) -> None:
+        response = await self._request(
+            "DELETE", f"/containers/{container_id}", params={"force": "true" if force else "false"}
+        )
+        if response.status_code not in (204, 404):
+            raise DockerEngineError(
+                f"Failed to remove container {container_id}: {response.status_code} {response.text}",
+                response.status_code,
+            )
+
+    async def list_containers(self, filters: Optional[Dict[str, List[str]]] = None, all: bool = False) -> List[Dict[str, Any]]:
+        params = {"all": "true" if all else "false"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+        response = await self._request("GET", "/containers/json", params=params)
+        if response.status_code != 200:
+            raise DockerEngineError(f"Failed to list containers: {response.status_code} {response.text}", response.status_code)
+        return response.json()
+
+    async def inspect_container(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Return the container's inspect document, or None if it does not exist."""
+        response = await self._request("GET", f"/containers/{container_id}/json")
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise DockerEngineError(
+                f"Failed to inspect container {container_id}: {response.status_code} {response.text}",
+                response.status_code,
+            )
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -4,12 +4,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import logging
 import os
+import time
 import base64
 from typing import Optional, List, Dict, Any
 import redis.asyncio as aioredis
 import asyncio
 import json
-import httpx
 import hmac
 import uuid as uuid_lib
 
@@ -22,21 +22,30 @@ from .config import BOT_IMAGE_NAME, REDIS_URL
 from app.orchestrators import (
     get_socket_session, close_docker_client, start_bot_container,
     stop_bot_container, _record_session_start, get_running_bots_status,
-    verify_container_running,
+    verify_container_running, start_warm_pool, stop_warm_pool,
 )
 # Note: get_running_bots_status and verify_container_running are abstracted
 # and work for both Docker containers and process orchestrator (Lite setup)
 from shared_models.database import init_db, get_db, async_session_local
-from shared_models.models import User, Meeting, MeetingSession, Transcription, Recording, MediaFile
+from shared_models.auth_cache import auth_cache
+from shared_models.webhook_outbox import webhook_outbox
+from shared_models.webhook_delivery import close_shared_client as close_webhook_client
+from shared_models.models import (
+    User, Meeting, MeetingSession, Transcription, Recording, MediaFile, TranscriptionJob, MeetingRecordingIndex,
+)
 from shared_models.schemas import (
     MeetingCreate, MeetingResponse, Platform, BotStatusResponse, MeetingConfigUpdate,
     MeetingStatus, MeetingCompletionReason, MeetingFailureStage,
     is_valid_status_transition, get_status_source,
     RecordingResponse, RecordingListResponse, RecordingStatus, RecordingSource,
-    MediaFileType, MediaFileResponse,
+    MediaFileType, MediaFileResponse, TranscriptionJobCreate, TranscriptionJobResponse,
+    TranscriptionJobSegmentsResponse, TranscriptionSegment,
 )
 from shared_models.storage import create_storage_client
+from shared_models.partitions import transcription_partition_clause
 from app.auth import get_user_and_token # MODIFIED
+from app.transcription_jobs import job_session_uid, recover_transcription_jobs, start_transcription_job
+from app.whisperlive_placement import choose_whisper_live_url
 from app.zoom_obf import (
     ZoomOBFError,
     get_zoom_oauth_client_credentials,
@@ -47,9 +56,9 @@ from app.zoom_obf import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, desc, func
-from sqlalchemy.orm import attributes
-from datetime import datetime # For start_time
+from sqlalchemy import and_, desc, func, tuple_
+from sqlalchemy.orm import attributes, selectinload
+from datetime import datetime, timedelta, timezone # For start_time
 
 # Delayed stop timeout for fallback container shutdown after stop command.
 # Keep this above typical recording upload time to avoid interrupting uploads.
@@ -184,10 +193,22 @@ async def update_meeting_status(
         raise
     
     await db.refresh(meeting)
+    await _sync_bot_registry(meeting)
     
     logger.info(f"Meeting {meeting.id} status updated from '{old_status}' to '{new_status.value}'")
     return True
 
+
+async def _sync_bot_registry(meeting: Meeting) -> None:
+    """Mirror the meeting's bot into the Redis live registry (best effort)."""
+    if redis_client is None:
+        return
+    try:
+        await bot_registry.sync_meeting(redis_client, meeting)
+    except Exception as e:
+        logger.warning(f"[Bot Registry] Failed to sync meeting {meeting.id}: {e}")
+
+from app import bot_registry
 from app.tasks.bot_exit_tasks import run_all_tasks
 from app.tasks.webhook_runner import run_status_webhook_task
 
@@ -271,8 +292,8 @@ async def schedule_status_webhook_task(
 
 async def send_event_webhook(user_id: int, event_type: str, payload: dict):
     """
-    Fire-and-forget webhook for recording/transcription events.
-    Looks up user's webhook_url and POSTs the event payload.
+    Queue a webhook for recording/transcription events on the webhook outbox.
+    Looks up user's webhook_url; delivery and retries happen in the outbox workers.
     """
     from shared_models.webhook_url import validate_webhook_url
 
@@ -288,19 +309,16 @@ async def send_event_webhook(user_id: int, event_type: str, payload: dict):
                 validate_webhook_url(webhook_url)
             except ValueError:
                 return
-
-            headers = {'Content-Type': 'application/json'}
             secret = user.data.get('webhook_secret')
-            if secret and isinstance(secret, str) and secret.strip():
-                headers['Authorization'] = f'Bearer {secret.strip()}'
-
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            await client.post(
-                webhook_url,
-                json={'event_type': event_type, **payload},
-                timeout=30.0,
-                headers=headers,
-            )
+
+        await webhook_outbox.enqueue(
+            webhook_url,
+            {'event_type': event_type, **payload},
+            webhook_secret=secret if isinstance(secret, str) else None,
+            timeout=30.0,
+            label=f"{event_type} user={user_id}",
+            batchable=True,
+        )
     except Exception as e:
         logging.getLogger("bot_manager").warning(f"Event webhook ({event_type}) failed for user {user_id}: {e}")
 
@@ -367,42 +385,108 @@ def _normalize_meeting_recording(recording: Dict[str, Any], meeting_id: int) ->
     return rec
 
 
+def _meeting_data_recording(meeting: Meeting, recording_id: int) -> Optional[Dict[str, Any]]:
+    if not isinstance(meeting.data, dict):
+        return None
+    for rec in (meeting.data.get("recordings") or []):
+        if isinstance(rec, dict) and str(rec.get("id")) == str(recording_id):
+            return _normalize_meeting_recording(rec, meeting.id)
+    return None
+
+
+def _encode_recording_cursor(created_at: Any, recording_id: int) -> str:
+    """Opaque keyset cursor for the recordings list: the last row's (created_at, id)."""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at or "", int(recording_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_recording_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, recording_id = json.loads(raw)
+        return str(created_at), int(recording_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 async def _list_meeting_data_recordings(
     db: AsyncSession,
     user_id: int,
     meeting_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    after: Optional[tuple[str, int]] = None,
 ) -> List[Dict[str, Any]]:
-    stmt = select(Meeting).where(Meeting.user_id == user_id)
+    """
+    Page through meeting.data recordings, newest first. The page is selected on
+    meeting_recording_index and only the meetings it touches are loaded. ``after``
+    is a decoded keyset cursor and takes precedence over ``offset``.
+    """
+    stmt = select(MeetingRecordingIndex.recording_id, MeetingRecordingIndex.meeting_id).where(
+        MeetingRecordingIndex.user_id == user_id
+    )
     if meeting_id is not None:
-        stmt = stmt.where(Meeting.id == meeting_id)
-    result = await db.execute(stmt)
-    meetings = result.scalars().all()
+        stmt = stmt.where(MeetingRecordingIndex.meeting_id == meeting_id)
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(MeetingRecordingIndex.created_at, MeetingRecordingIndex.recording_id) < tuple_(*after)
+        )
+    stmt = stmt.order_by(desc(MeetingRecordingIndex.created_at), desc(MeetingRecordingIndex.recording_id))
+    if after is None and offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    page = (await db.execute(stmt)).all()
+    if not page:
+        return []
+
+    meeting_ids = {mid for _, mid in page}
+    result = await db.execute(
+        select(Meeting).where(Meeting.id.in_(meeting_ids), Meeting.user_id == user_id)
+    )
+    meetings = {m.id: m for m in result.scalars().all()}
     recordings: List[Dict[str, Any]] = []
-    for meeting in meetings:
-        if not isinstance(meeting.data, dict):
-            continue
-        for rec in (meeting.data.get("recordings") or []):
-            if isinstance(rec, dict):
-                recordings.append(_normalize_meeting_recording(rec, meeting.id))
-    recordings.sort(key=lambda r: r.get("created_at") or "", reverse=True)
+    for recording_id, mid in page:
+        meeting = meetings.get(mid)
+        rec = _meeting_data_recording(meeting, recording_id) if meeting is not None else None
+        if rec is not None:
+            recordings.append(rec)
     return recordings
 
 
+async def _get_user_recording(db: AsyncSession, user_id: int, recording_id: int) -> Optional[Recording]:
+    """Load a recording owned by ``user_id`` together with its media files."""
+    result = await db.execute(
+        select(Recording)
+        .options(selectinload(Recording.media_files))
+        .where(Recording.id == recording_id, Recording.user_id == user_id)
+    )
+    return result.scalars().first()
+
+
 async def _find_meeting_data_recording(
     db: AsyncSession,
     user_id: int,
     recording_id: int,
 ) -> tuple[Optional[Meeting], Optional[Dict[str, Any]]]:
-    stmt = select(Meeting).where(Meeting.user_id == user_id)
-    result = await db.execute(stmt)
-    meetings = result.scalars().all()
-    for meeting in meetings:
-        if not isinstance(meeting.data, dict):
-            continue
-        for rec in (meeting.data.get("recordings") or []):
-            if isinstance(rec, dict) and int(rec.get("id", -1)) == recording_id:
-                return meeting, _normalize_meeting_recording(rec, meeting.id)
-    return None, None
+    result = await db.execute(
+        select(MeetingRecordingIndex.meeting_id).where(
+            MeetingRecordingIndex.recording_id == recording_id,
+            MeetingRecordingIndex.user_id == user_id,
+        )
+    )
+    meeting_id = result.scalar_one_or_none()
+    if meeting_id is None:
+        return None, None
+    meeting = await db.get(Meeting, meeting_id)
+    if meeting is None or meeting.user_id != user_id:
+        return None, None
+    rec = _meeting_data_recording(meeting, recording_id)
+    if rec is None:
+        return None, None
+    return meeting, rec
 # ----------------------------------
 
 class BotExitCallbackPayload(BaseModel):
@@ -452,6 +536,8 @@ async def startup_event():
         redis_client = await aioredis.from_url(REDIS_URL, encoding="utf-8", decode_responses=True)
         await redis_client.ping() # Verify connection
         logger.info("Successfully connected to Redis.")
+        await auth_cache.attach_redis(redis_client)
+        await webhook_outbox.start(redis_client)
     except Exception as e:
         logger.error(f"Failed to connect to Redis on startup: {e}", exc_info=True)
         redis_client = None # Ensure client is None if connection fails
@@ -464,12 +550,33 @@ async def startup_event():
     asyncio.create_task(start_reconciliation_scheduler())
     logger.info("[Startup] Reconciliation scheduler started")
 
+    # Restart recording transcription jobs interrupted by the previous shutdown
+    try:
+        await recover_transcription_jobs(get_storage_client)
+    except Exception as e:
+        logger.error(f"Failed to recover transcription jobs: {e}", exc_info=True)
+
+    # Pre-boot idle bot workers (no-op unless the orchestrator supports it and BOT_WARM_POOL_SIZE > 0)
+    try:
+        await start_warm_pool()
+    except Exception as e:
+        logger.error(f"Failed to start warm bot pool: {e}", exc_info=True)
+
 @app.on_event("shutdown")
 async def shutdown_event():
     global redis_client # <-- Add global reference
     logger.info("Shutting down Bot Manager...")
     # await close_redis() # Removed redis close if not used
 
+    try:
+        await stop_warm_pool()
+    except Exception as e:
+        logger.error(f"Error stopping warm bot pool: {e}", exc_info=True)
+
+    await auth_cache.detach_redis()
+    await webhook_outbox.stop()
+    await close_webhook_client()
+
     # --- ADD Redis Client Closing ---
     if redis_client:
         logger.info("Closing Redis connection...")
@@ -480,23 +587,33 @@ async def shutdown_event():
             logger.error(f"Error closing Redis connection: {e}", exc_info=True)
     # ---------------------------------
 
-    close_docker_client()
+    close_result = close_docker_client()
+    if asyncio.iscoroutine(close_result):
+        await close_result
     logger.info("Docker Client closed.")
 
+async def _stop_container(container_id: str) -> bool:
+    """Stop a bot container/process with whichever orchestrator is configured.
+
+    The docker orchestrator's stop_bot_container is a coroutine; the other
+    backends are synchronous and are run in a thread so they don't block the loop.
+    """
+    if asyncio.iscoroutinefunction(stop_bot_container):
+        return await stop_bot_container(container_id)
+    return await asyncio.to_thread(stop_bot_container, container_id)
+
 # --- ADDED: Delayed Stop Task ---
 async def _delayed_container_stop(container_id: str, meeting_id: int, delay_seconds: int = BOT_STOP_DELAY_SECONDS):
     """
-    Waits for a delay, then attempts to stop the container synchronously in a thread.
+    Waits for a delay, then attempts to stop the container without blocking the event loop.
     After stopping, checks if meeting is still ACTIVE and finalizes it if needed.
     This ensures meetings are always finalized when stop_bot is called, even if callbacks are missed.
     """
     logger.info(f"[Delayed Stop] Task started for container {container_id} (meeting {meeting_id}). Waiting {delay_seconds}s before stopping.")
     await asyncio.sleep(delay_seconds)
-    logger.info(f"[Delayed Stop] Delay finished for {container_id}. Attempting synchronous stop...")
+    logger.info(f"[Delayed Stop] Delay finished for {container_id}. Attempting stop...")
     try:
-        # Run the synchronous stop_bot_container in a separate thread
-        # to avoid blocking the async event loop.
-        await asyncio.to_thread(stop_bot_container, container_id)
+        await _stop_container(container_id)
         logger.info(f"[Delayed Stop] Successfully stopped container {container_id}.")
     except Exception as e:
         logger.error(f"[Delayed Stop] Error stopping container {container_id}: {e}", exc_info=True)
@@ -767,8 +884,10 @@ async def request_bot(
                             refreshed = await refresh_zoom_access_token(refresh_token, client_id, client_secret)
                             access_token = refreshed["access_token"]
 
-                            # Persist refreshed tokens into users.data
-                            user_data = dict(current_user.data) if isinstance(current_user.data, dict) else {}
+                            # Persist refreshed tokens into users.data. current_user may be a
+                            # cached (detached) copy, so write through a session-bound row.
+                            db_user = await db.get(User, current_user.id)
+                            user_data = dict(db_user.data) if isinstance(db_user.data, dict) else {}
                             zoom_data = dict(user_data.get("zoom") or {})
                             oauth_data = dict(zoom_data.get("oauth") or {})
                             oauth_data.update({
@@ -780,9 +899,10 @@ async def request_bot(
                                 oauth_data["scope"] = refreshed["scope"]
                             zoom_data["oauth"] = oauth_data
                             user_data["zoom"] = zoom_data
-                            current_user.data = user_data
+                            db_user.data = user_data
                             await db.commit()
-                            await db.refresh(current_user)
+                            current_user.data = user_data
+                            await auth_cache.invalidate_user(current_user.id)
                         else:
                             logger.warning(
                                 f"Zoom OAuth is not connected for user {current_user.id}; "
@@ -801,6 +921,10 @@ async def request_bot(
                         "Continuing without OBF token."
                     )
 
+        whisper_live_url = None
+        if req.transcribe_enabled is not False:
+            whisper_live_url = await choose_whisper_live_url(redis_client)
+
         logger.info(f"Attempting to start bot container for meeting {meeting_id} (native: {native_meeting_id})...")
         container_id, connection_id = await start_bot_container(
             user_id=current_user.id,
@@ -817,7 +941,8 @@ async def request_bot(
             transcribe_enabled=req.transcribe_enabled,
             zoom_obf_token=zoom_obf_token_to_use,
             voice_agent_enabled=req.voice_agent_enabled,
-            default_avatar_url=req.default_avatar_url
+            default_avatar_url=req.default_avatar_url,
+            whisper_live_url=whisper_live_url
         )
         container_start_time = datetime.utcnow()
         logger.info(f"Call to start_bot_container completed. Container ID: {container_id}, Connection ID: {connection_id}")
@@ -847,6 +972,7 @@ async def request_bot(
         # current_meeting_for_bot_launch.start_time = datetime.utcnow()  # REMOVED - handled by callback
         await db.commit()
         await db.refresh(current_meeting_for_bot_launch)
+        await _sync_bot_registry(current_meeting_for_bot_launch)
         logger.info(f"Successfully set container ID for meeting {meeting_id}. Status remains 'requested' until bot startup callback.")
 
         logger.info(f"Successfully started bot container {container_id} for meeting {meeting_id}")
@@ -863,6 +989,7 @@ async def request_bot(
                  if container_id: 
                      meeting_to_update.bot_container_id = container_id
                  await db.commit()
+                 await _sync_bot_registry(meeting_to_update)
                  await publish_meeting_status_change(meeting_id, MeetingStatus.FAILED.value, redis_client, req.platform.value, native_meeting_id, current_user.id)
             elif not meeting_to_update:
                 logger.error(f"Could not find meeting {meeting_id} to update status to error after HTTPException.")
@@ -880,6 +1007,7 @@ async def request_bot(
                  if container_id:
                      meeting_to_update.bot_container_id = container_id
                  await db.commit()
+                 await _sync_bot_registry(meeting_to_update)
                  await publish_meeting_status_change(meeting_id, MeetingStatus.FAILED.value, redis_client, req.platform.value, native_meeting_id, current_user.id)
             elif not meeting_to_update:
                 logger.error(f"Could not find meeting {meeting_id} to update status to error after unexpected exception.")
@@ -1122,15 +1250,22 @@ async def stop_bot(
 async def get_user_bots_status(
     auth_data: tuple[str, User] = Depends(get_user_and_token)
 ):
-    """Retrieves a list of currently running bot containers associated with the user's API key."""
+    """Retrieves a list of currently running bot containers associated with the user's API key.
+
+    Served from the Redis live bot registry (see app/bot_registry.py), which
+    lifecycle callbacks keep current and reconciliation corrects.
+    """
     user_token, current_user = auth_data
     user_id = current_user.id
     
-    logger.info(f"Fetching running bot status for user {user_id}")
+    logger.debug(f"Fetching running bot status for user {user_id}")
     
     try:
-        # Call the function from orchestrator_utils - ADD AWAIT HERE
-        running_bots_list = await get_running_bots_status(user_id)
+        if redis_client is not None:
+            running_bots_list = await bot_registry.list_user_bots(redis_client, user_id)
+        else:
+            # No Redis: fall back to asking the orchestrator directly
+            running_bots_list = await get_running_bots_status(user_id)
         # Wrap the list in the response model
         return BotStatusResponse(running_bots=running_bots_list)
     except Exception as e:
@@ -1342,6 +1477,7 @@ async def bot_startup_callback(
                 meeting.start_time = datetime.utcnow()
                 await db.commit()
                 await db.refresh(meeting)
+                await _sync_bot_registry(meeting)
                 logger.info(f"Bot startup callback: Meeting {meeting_id} status updated from '{old_status}' to 'active' with container {container_id}.")
                 # No manual transition writes here; update_meeting_status already recorded the transition
             else:
@@ -1352,6 +1488,7 @@ async def bot_startup_callback(
             meeting.bot_container_id = container_id
             await db.commit()
             await db.refresh(meeting)
+            await _sync_bot_registry(meeting)
             logger.info(f"Bot startup callback: Meeting {meeting_id} already active, updated container ID to {container_id}.")
         else:
             logger.warning(f"Bot startup callback: Meeting {meeting_id} has unexpected status '{meeting.status}', not updating.")
@@ -1643,11 +1780,13 @@ async def bot_status_change_callback(
                     meeting.start_time = datetime.utcnow()
                     await db.commit()
                     await db.refresh(meeting)
+                    await _sync_bot_registry(meeting)
             elif meeting.status == MeetingStatus.ACTIVE.value:
                 # Container restarted but meeting was already active
                 meeting.bot_container_id = payload.container_id
                 await db.commit()
                 await db.refresh(meeting)
+                await _sync_bot_registry(meeting)
                 logger.info(f"Bot status change callback: Meeting {meeting_id} already active, updated container ID to {payload.container_id}")
                 return {"status": "container_updated", "meeting_id": meeting.id, "meeting_status": meeting.status}
             else:
@@ -1710,6 +1849,18 @@ async def bot_status_change_callback(
             detail="An internal error occurred while processing the bot status change callback."
         )
 
+@app.get("/internal/webhooks/stats",
+         summary="Internal: webhook outbox delivery latency and backlog",
+         include_in_schema=False)
+async def webhook_outbox_stats():
+    return await webhook_outbox.stats()
+
+@app.get("/internal/auth-cache/stats",
+         summary="Internal: API-token auth cache hit-rate counters",
+         include_in_schema=False)
+async def auth_cache_stats():
+    return auth_cache.stats()
+
 # --- RECORDING ENDPOINTS ---
 
 @app.post("/internal/recordings/upload",
@@ -1872,7 +2023,7 @@ async def internal_upload_recording(
         attributes.flag_modified(meeting, "data")
         await db.commit()
         if is_final:
-            asyncio.create_task(send_event_webhook(user_id, "recording.completed", {"recording": recording_payload}))
+            await send_event_webhook(user_id, "recording.completed", {"recording": recording_payload})
         return {
             "recording_id": recording_payload["id"],
             "media_file_id": media_file_id,
@@ -1909,7 +2060,7 @@ async def internal_upload_recording(
     logger.info(f"Recording {recording.id} created with media file {media_file.id} for session {session_uid}")
 
     # Fire webhook for recording completion
-    asyncio.create_task(send_event_webhook(user_id, "recording.completed", {
+    await send_event_webhook(user_id, "recording.completed", {
         "recording": {
             "id": recording.id,
             "meeting_id": recording.meeting_id,
@@ -1920,7 +2071,7 @@ async def internal_upload_recording(
             "media_type": media_type,
             "media_format": media_format,
         }
-    }))
+    })
 
     return {
         "recording_id": recording.id,
@@ -1935,35 +2086,53 @@ async def internal_upload_recording(
          summary="List recordings for the authenticated user")
 async def list_recordings(
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    offset: int = Query(default=0, ge=0, description="Deprecated: use cursor"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
     meeting_id: Optional[int] = Query(default=None),
     auth: tuple = Depends(get_user_and_token),
     db: AsyncSession = Depends(get_db),
 ):
-    """List recordings owned by the authenticated user, with optional meeting_id filter."""
+    """
+    List recordings owned by the authenticated user, newest first, with optional
+    meeting_id filter. Pages are selected by keyset on (created_at, id); pass the
+    returned next_cursor to fetch the following page.
+    """
     token, user = auth
+    after = _decode_recording_cursor(cursor) if cursor else None
     if get_recording_metadata_mode() == "meeting_data":
-        recordings = await _list_meeting_data_recordings(db, user.id, meeting_id=meeting_id)
-        page = recordings[offset:offset + limit]
+        page = await _list_meeting_data_recordings(
+            db, user.id, meeting_id=meeting_id, limit=limit + 1, offset=offset, after=after
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
         return RecordingListResponse(
-            recordings=[RecordingResponse.model_validate(r) for r in page]
+            recordings=[RecordingResponse.model_validate(r) for r in page],
+            next_cursor=_encode_recording_cursor(page[-1].get("created_at"), page[-1]["id"]) if has_more else None,
         )
 
-    stmt = select(Recording).where(Recording.user_id == user.id)
+    # One query for the page plus one IN query for all of its media files
+    stmt = select(Recording).options(selectinload(Recording.media_files)).where(Recording.user_id == user.id)
     if meeting_id is not None:
         stmt = stmt.where(Recording.meeting_id == meeting_id)
-    stmt = stmt.order_by(desc(Recording.created_at)).offset(offset).limit(limit)
+    if after is not None:
+        try:
+            after_created_at = datetime.fromisoformat(after[0])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(Recording.created_at, Recording.id) < tuple_(after_created_at, after[1]))
+    elif offset:
+        stmt = stmt.offset(offset)
+    stmt = stmt.order_by(desc(Recording.created_at), desc(Recording.id)).limit(limit + 1)
 
     result = await db.execute(stmt)
     recordings = result.scalars().all()
+    has_more = len(recordings) > limit
+    recordings = recordings[:limit]
 
-    # Eagerly load media files for each recording
-    recording_responses = []
-    for rec in recordings:
-        await db.refresh(rec, ["media_files"])
-        recording_responses.append(RecordingResponse.model_validate(rec))
-
-    return RecordingListResponse(recordings=recording_responses)
+    return RecordingListResponse(
+        recordings=[RecordingResponse.model_validate(rec) for rec in recordings],
+        next_cursor=_encode_recording_cursor(recordings[-1].created_at, recordings[-1].id) if has_more else None,
+    )
 
 
 @app.get("/recordings/{recording_id}",
@@ -1982,13 +2151,9 @@ async def get_recording(
             raise HTTPException(status_code=404, detail="Recording not found")
         return RecordingResponse.model_validate(rec)
 
-    recording = await db.get(Recording, recording_id)
+    recording = await _get_user_recording(db, user.id, recording_id)
     if not recording:
         raise HTTPException(status_code=404, detail="Recording not found")
-    if recording.user_id != user.id:
-        raise HTTPException(status_code=404, detail="Recording not found")
-
-    await db.refresh(recording, ["media_files"])
     return RecordingResponse.model_validate(recording)
 
 
@@ -2261,12 +2426,10 @@ async def delete_recording(
         await db.commit()
         return {"status": "deleted", "recording_id": recording_id}
 
-    recording = await db.get(Recording, recording_id)
-    if not recording or recording.user_id != user.id:
+    recording = await _get_user_recording(db, user.id, recording_id)
+    if not recording:
         raise HTTPException(status_code=404, detail="Recording not found")
 
-    await db.refresh(recording, ["media_files"])
-
     # Delete files from object storage
     storage = get_storage_client()
     for mf in recording.media_files:
@@ -2282,6 +2445,124 @@ async def delete_recording(
     return {"status": "deleted", "recording_id": recording_id}
 
 
+@app.post("/recordings/{recording_id}/transcribe",
+          response_model=TranscriptionJobResponse,
+          status_code=status.HTTP_202_ACCEPTED,
+          summary="Re-transcribe a finished recording as a deferred batch job")
+async def transcribe_recording(
+    recording_id: int,
+    req: TranscriptionJobCreate,
+    auth: tuple = Depends(get_user_and_token),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue the recording's audio on the transcription service's deferred tier.
+    Segments are stored under the job's own session_uid; poll
+    GET /transcription-jobs/{job_id} for progress and read the result from
+    GET /transcription-jobs/{job_id}/segments.
+    """
+    token, user = auth
+    if get_recording_metadata_mode() == "meeting_data":
+        raise HTTPException(
+            status_code=409,
+            detail="Transcription jobs are not available when RECORDING_METADATA_MODE=meeting_data",
+        )
+
+    recording = await db.get(Recording, recording_id)
+    if not recording or recording.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    if recording.status != RecordingStatus.COMPLETED.value:
+        raise HTTPException(status_code=409, detail=f"Recording is {recording.status}, not completed")
+    if recording.meeting_id is None:
+        raise HTTPException(status_code=409, detail="Recording is not attached to a meeting")
+
+    job = TranscriptionJob(
+        recording_id=recording.id,
+        meeting_id=recording.meeting_id,
+        user_id=user.id,
+        language=req.language,
+        task=req.task,
+        status="pending",
+    )
+    db.add(job)
+    await db.flush()
+    job.session_uid = job_session_uid(recording, job.id)
+    await db.commit()
+    await db.refresh(job)
+
+    start_transcription_job(job.id, get_storage_client())
+    logger.info(f"Queued transcription job {job.id} for recording {recording_id}")
+    return TranscriptionJobResponse.model_validate(job)
+
+
+@app.get("/transcription-jobs/{job_id}",
+         response_model=TranscriptionJobResponse,
+         summary="Get the status of a recording transcription job")
+async def get_transcription_job(
+    job_id: int,
+    auth: tuple = Depends(get_user_and_token),
+    db: AsyncSession = Depends(get_db),
+):
+    token, user = auth
+    job = await db.get(TranscriptionJob, job_id)
+    if not job or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Transcription job not found")
+    return TranscriptionJobResponse.model_validate(job)
+
+
+@app.get("/transcription-jobs/{job_id}/segments",
+         response_model=TranscriptionJobSegmentsResponse,
+         summary="Get the segments of a recording transcription job")
+async def get_transcription_job_segments(
+    job_id: int,
+    auth: tuple = Depends(get_user_and_token),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Segments stored so far, ordered by start time. Absolute times are set
+    when the recording's meeting session is known.
+    """
+    token, user = auth
+    job = await db.get(TranscriptionJob, job_id)
+    if not job or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Transcription job not found")
+    recording = await db.get(Recording, job.recording_id)
+    meeting = await db.get(Meeting, job.meeting_id) if job.meeting_id else None
+    if recording is None or meeting is None:
+        return TranscriptionJobSegmentsResponse(job_id=job.id, status=job.status)
+
+    session_start = None
+    if recording.session_uid:
+        session = (await db.execute(
+            select(MeetingSession).where(MeetingSession.session_uid == recording.session_uid)
+        )).scalars().first()
+        if session and session.session_start_time:
+            session_start = session.session_start_time
+            if session_start.tzinfo is None:
+                session_start = session_start.replace(tzinfo=timezone.utc)
+
+    result = await db.execute(
+        select(Transcription)
+        .where(transcription_partition_clause(meeting), Transcription.session_uid == job_session_uid(recording, job.id))
+        .order_by(Transcription.start_time)
+    )
+    segments = [
+        TranscriptionSegment(
+            start_time=row.start_time,
+            end_time=row.end_time,
+            text=row.text,
+            language=row.language,
+            speaker=row.speaker,
+            created_at=row.created_at,
+            completed=True,
+            absolute_start_time=session_start + timedelta(seconds=row.start_time) if session_start else None,
+            absolute_end_time=session_start + timedelta(seconds=row.end_time) if session_start else None,
+        )
+        for row in result.scalars().all()
+    ]
+    return TranscriptionJobSegmentsResponse(job_id=job.id, status=job.status, segments=segments)
+
+
 # --- RECORDING CONFIG ENDPOINTS ---
 
 class RecordingConfigUpdate(BaseModel):
@@ -2317,7 +2598,9 @@ async def update_recording_config(
     db: AsyncSession = Depends(get_db),
 ):
     """Update the user's recording configuration. Only provided fields are updated."""
-    token, user = auth
+    token, auth_user = auth
+    # The auth dependency may return a cached (detached) user; write through the session.
+    user = await db.get(User, auth_user.id)
 
     if not user.data:
         user.data = {}
@@ -2343,6 +2626,7 @@ async def update_recording_config(
 
     await db.commit()
     await db.refresh(user)
+    await auth_cache.invalidate_user(user.id)
 
     return {
         "enabled": recording_config.get("enabled", False),
@@ -2364,6 +2648,7 @@ async def reconcile_meetings_and_containers():
     logger.info("[Reconciliation] Starting reconciliation task...")
     zombie_meetings_fixed = 0
     orphan_containers_killed = 0
+    registry_snapshot_started = time.time()
     
     try:
         async with async_session_local() as db:
@@ -2465,6 +2750,8 @@ async def reconcile_meetings_and_containers():
             # Get all running bots using the abstracted orchestrator function
             # This works for both Docker containers and process orchestrator (Lite setup)
             all_running_bots = []
+            user_ids = []
+            listed_user_ids = set()
             try:
                 # Get all unique user IDs from ALL meetings (not just non-terminal)
                 # This ensures we catch orphan containers/processes even if user has no active meetings
@@ -2480,6 +2767,7 @@ async def reconcile_meetings_and_containers():
                     try:
                         user_bots = await get_running_bots_status(user_id)
                         all_running_bots.extend(user_bots)
+                        listed_user_ids.add(user_id)
                     except Exception as e:
                         logger.error(f"[Reconciliation] Error getting running bots for user {user_id}: {e}", exc_info=True)
             except Exception as e:
@@ -2487,7 +2775,8 @@ async def reconcile_meetings_and_containers():
             
             logger.info(f"[Reconciliation] Found {len(all_running_bots)} running bots to check")
             
-            # Check each bot's meeting status
+            # Check each bot's meeting status; live bots also rebuild the Redis registry
+            live_registry_entries: Dict[int, Dict[str, Dict[str, Any]]] = {}
             async with async_session_local() as db2:
                 for bot_info in all_running_bots:
                     container_id = bot_info.get('container_id')
@@ -2508,7 +2797,7 @@ async def reconcile_meetings_and_containers():
                         # Container has meeting_id label but meeting doesn't exist - kill container
                         logger.warning(f"[Reconciliation] ORPHAN CONTAINER detected: Container {container_id} has meeting_id {meeting_id} but meeting doesn't exist. Killing container...")
                         try:
-                            stop_bot_container(container_id)
+                            await _stop_container(container_id)
                             orphan_containers_killed += 1
                             logger.info(f"[Reconciliation] Killed orphan container {container_id}")
                         except Exception as e:
@@ -2520,11 +2809,25 @@ async def reconcile_meetings_and_containers():
                     if meeting.status in terminal_states:
                         logger.warning(f"[Reconciliation] ORPHAN CONTAINER detected: Container {container_id} is running but meeting {meeting_id} is {meeting.status}. Killing container...")
                         try:
-                            stop_bot_container(container_id)
+                            await _stop_container(container_id)
                             orphan_containers_killed += 1
                             logger.info(f"[Reconciliation] Killed orphan container {container_id} for terminal meeting {meeting_id}")
                         except Exception as e:
                             logger.error(f"[Reconciliation] Failed to kill orphan container {container_id}: {e}")
+                    elif bot_registry.is_live(meeting):
+                        live_registry_entries.setdefault(meeting.user_id, {})[str(meeting.id)] = (
+                            bot_registry.entry_from_meeting(meeting, bot_info.get('container_name'))
+                        )
+
+            # Rebuild the live bot registry for every user the orchestrator answered for
+            if redis_client is not None:
+                for user_id in listed_user_ids:
+                    try:
+                        await bot_registry.reconcile_user_bots(
+                            redis_client, user_id, live_registry_entries.get(user_id, {}), registry_snapshot_started
+                        )
+                    except Exception as e:
+                        logger.error(f"[Reconciliation] Failed to reconcile bot registry for user {user_id}: {e}")
             
             logger.info(f"[Reconciliation] Reconciliation complete: {zombie_meetings_fixed} zombie meetings fixed, {orphan_containers_killed} orphan containers killed")
     except Exception as e:
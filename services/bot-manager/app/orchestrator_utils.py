@@ -1,10 +1,7 @@
-import requests_unixsocket
-import requests  # Make sure standard requests is imported
 import logging
 import json
 import uuid
 import os
-import time
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 import asyncio
@@ -12,10 +9,8 @@ from contextlib import asynccontextmanager
 import aiodocker
 # from app.auth import get_current_user_ws # This function does not exist
 from app.config import REDIS_URL # Import from the single source of truth
-from requests.exceptions import RequestException, Timeout, ConnectionError
-
-# Explicitly import the exceptions from requests
-from requests.exceptions import RequestException, ConnectionError, HTTPError
+from app.docker.engine import DockerEngineClient, DockerEngineError, socket_path_from_docker_host
+import httpx
 
 # Import the Platform class from shared models
 from shared_models.schemas import Platform
@@ -46,81 +41,38 @@ DEVICE_TYPE = os.environ.get("DEVICE_TYPE", "cuda").lower()
 
 logger = logging.getLogger("bot_manager.orchestrator_utils")
 
-# Global session for requests_unixsocket
-unix_socket_session = None
+# Global async Docker Engine API client (shared connection pool)
+docker_engine_client: Optional[DockerEngineClient] = None
 
 # Define a local exception
 class DockerConnectionError(Exception):
     pass
 
-def get_socket_session(max_retries=3, delay=2):
-    """Initializes and returns a requests_unixsocket session with retries."""
-    global unix_socket_session
-    if unix_socket_session is None:
-        logger.info(f"Attempting to initialize requests_unixsocket session for {DOCKER_HOST}...")
-        retries = 0
-        # Extract socket path correctly AND ensure it's absolute
-        socket_path_relative = DOCKER_HOST.split('//', 1)[1]
-        socket_path_abs = f"/{socket_path_relative}" # Prepend slash for absolute path
-
-        # URL encode path separately using the absolute path
-        # The http+unix scheme requires the encoded absolute path
-        socket_path_encoded = socket_path_abs.replace("/", "%2F")
-        socket_url = f'http+unix://{socket_path_encoded}'
-
-        while retries < max_retries:
-            try:
-                # Check socket file exists before attempting connection using the absolute path
-                logger.debug(f"Checking for socket file at absolute path: {socket_path_abs}") # Added debug log
-                if not os.path.exists(socket_path_abs):
-                     # Ensure the error message shows the absolute path being checked
-                     raise FileNotFoundError(f"Docker socket file not found at: {socket_path_abs}")
-
-                logger.debug(f"Attempt {retries+1}/{max_retries}: Creating session.")
-                temp_session = requests_unixsocket.Session()
-
-                # Test connection by getting Docker version via the correctly formed URL
-                logger.debug(f"Attempt {retries+1}/{max_retries}: Getting Docker version via {socket_url}/version")
-                response = temp_session.get(f'{socket_url}/version')
-                response.raise_for_status() # Raise HTTPError for bad responses
-                version_data = response.json()
-                api_version = version_data.get('ApiVersion')
-                logger.info(f"requests_unixsocket session initialized. Docker API version: {api_version}")
-                unix_socket_session = temp_session # Assign only on success
-                return unix_socket_session
-
-            except FileNotFoundError as e:
-                 # Log the actual exception message which now includes the absolute path
-                 logger.warning(f"Attempt {retries+1}/{max_retries}: {e}. Retrying in {delay}s...")
-            except ConnectionError as e:
-                 logger.warning(f"Attempt {retries+1}/{max_retries}: Socket connection error ({e}). Is Docker running? Retrying in {delay}s...")
-            except HTTPError as e:
-                logger.error(f"Attempt {retries+1}/{max_retries}: HTTP error communicating with Docker socket: {e}", exc_info=True)
-                 # Don't retry on HTTP errors like 4xx/5xx immediately, might be persistent issue
-                break
-            except Exception as e:
-                logger.error(f"Attempt {retries+1}/{max_retries}: Failed to initialize requests_unixsocket session: {e}", exc_info=True)
-
-            retries += 1
-            if retries < max_retries:
-                time.sleep(delay)
-            else:
-                logger.error(f"Failed to connect to Docker socket at {DOCKER_HOST} after {max_retries} attempts.")
-                unix_socket_session = None
-                raise DockerConnectionError(f"Could not connect to Docker socket after {max_retries} attempts.")
-
-    return unix_socket_session
-
-def close_docker_client(): # Keep name for compatibility in main.py
-    """Closes the requests_unixsocket session."""
-    global unix_socket_session
-    if unix_socket_session:
-        logger.info("Closing requests_unixsocket session.")
+def get_socket_session() -> DockerEngineClient:
+    """Returns the shared async Docker Engine API client, creating it on first use.
+
+    Construction is cheap and does not perform I/O beyond checking that the
+    socket file exists; the first API call opens the connection.
+    """
+    global docker_engine_client
+    if docker_engine_client is None:
+        socket_path = socket_path_from_docker_host(DOCKER_HOST)
+        if not os.path.exists(socket_path):
+            raise DockerConnectionError(f"Docker socket file not found at: {socket_path}")
+        docker_engine_client = DockerEngineClient(socket_path)
+        logger.info(f"Docker Engine API client initialized for {socket_path}")
+    return docker_engine_client
+
+async def close_docker_client(): # Keep name for compatibility in main.py
+    """Closes the shared Docker Engine API client."""
+    global docker_engine_client
+    if docker_engine_client:
+        logger.info("Closing Docker Engine API client.")
         try:
-            unix_socket_session.close()
+            await docker_engine_client.aclose()
         except Exception as e:
-            logger.warning(f"Error closing requests_unixsocket session: {e}")
-        unix_socket_session = None
+            logger.warning(f"Error closing Docker Engine API client: {e}")
+        docker_engine_client = None
 
 # Helper async function to record session start
 async def _record_session_start(meeting_id: int, session_uid: str):
@@ -154,10 +106,11 @@ async def start_bot_container(
     transcribe_enabled: Optional[bool] = None,
     zoom_obf_token: Optional[str] = None,
     voice_agent_enabled: Optional[bool] = None,
-    default_avatar_url: Optional[str] = None
+    default_avatar_url: Optional[str] = None,
+    whisper_live_url: Optional[str] = None
 ) -> Optional[tuple[str, str]]:
     """
-    Starts a vexa-bot container via requests_unixsocket AFTER checking user limit.
+    Starts a vexa-bot container via the async Docker Engine API client.
 
     Args:
         user_id: The ID of the user requesting the bot.
@@ -175,11 +128,7 @@ async def start_bot_container(
     """
     # Concurrency limit is now checked in request_bot (fast-fail). Keep minimal here.
 
-    # --- Original start_bot_container logic (using requests_unixsocket) --- 
-    session = get_socket_session()
-    if not session:
-        logger.error("Cannot start bot container, requests_unixsocket session not available.")
-        return None, None
+    docker_client = get_socket_session()
 
     container_name = f"vexa-bot-{meeting_id}-{uuid.uuid4().hex[:8]}"
     if not bot_name:
@@ -223,6 +172,7 @@ async def start_bot_container(
         "language": language,
         "task": task,
         "transcriptionTier": (transcription_tier or "realtime"),
+        "whisperLiveUrl": whisper_live_url,
         "obfToken": zoom_obf_token if platform == "zoom" else None,
         "redisUrl": REDIS_URL,
         "container_name": container_name,  # ADDED: Container name for identification
@@ -251,7 +201,7 @@ async def start_bot_container(
 
     # Get the WhisperLive URL from bot-manager's own environment.
     # This is set in docker-compose.yml to ws://whisperlive.internal/ws to go through Traefik.
-    whisper_live_url_for_bot = os.getenv('WHISPER_LIVE_URL')
+    whisper_live_url_for_bot = whisper_live_url or os.getenv('WHISPER_LIVE_URL')
 
     if not whisper_live_url_for_bot:
         # This should ideally not happen if docker-compose.yml is correctly configured.
@@ -291,12 +241,6 @@ async def start_bot_container(
         ])
         logger.info("Added Zoom SDK credentials to bot environment")
 
-    # Ensure absolute path for URL encoding here as well
-    socket_path_relative = DOCKER_HOST.split('//', 1)[1]
-    socket_path_abs = f"/{socket_path_relative}"
-    socket_path_encoded = socket_path_abs.replace("/", "%2F")
-    socket_url_base = f'http+unix://{socket_path_encoded}'
-
     # Docker API payload for creating a container
     create_payload = {
         "Image": BOT_IMAGE_NAME,
@@ -308,135 +252,68 @@ async def start_bot_container(
         },
     }
 
-    create_url = f'{socket_url_base}/containers/create?name={container_name}'
-    start_url_template = f'{socket_url_base}/containers/{{}}/start'
-
     container_id = None # Initialize container_id
     try:
-        logger.info(f"Attempting to create bot container '{container_name}' ({BOT_IMAGE_NAME}) via socket ({socket_url_base})...")
-        response = session.post(create_url, json=create_payload)
-        response.raise_for_status()
-        container_info = response.json()
-        container_id = container_info.get('Id')
-
-        if not container_id:
-            logger.error(f"Failed to create container: No ID in response: {container_info}")
-            return None, None
+        logger.info(f"Attempting to create bot container '{container_name}' ({BOT_IMAGE_NAME}) via socket ({docker_client.socket_path})...")
+        container_id = await docker_client.create_container(container_name, create_payload)
 
         logger.info(f"Container {container_id} created. Starting...")
-
-        start_url = start_url_template.format(container_id)
-        response = session.post(start_url)
-
-        if response.status_code != 204:
-            logger.error(f"Failed to start container {container_id}. Status: {response.status_code}, Response: {response.text}")
-            # Consider removing the created container if start fails?
-            return None, None
+        await docker_client.start_container(container_id)
 
         logger.info(f"Successfully started container {container_id} for meeting: {meeting_id}")
-        
-        # *** REMOVED Session Recording Call - To be handled by caller ***
-        # try:
-        #     asyncio.run(_record_session_start(meeting_id, connection_id))
-        # except RuntimeError as e:
-        #     logger.error(f"Error running async session recording: {e}. Session start NOT recorded.")
-
         return container_id, connection_id # Return both values
 
-    except RequestException as e:
-        logger.error(f"HTTP error communicating with Docker socket: {e}", exc_info=True)
+    except (DockerEngineError, httpx.HTTPError) as e:
+        logger.error(f"Error communicating with Docker socket: {e}", exc_info=True)
     except Exception as e:
         logger.error(f"Unexpected error starting container via socket: {e}", exc_info=True)
 
-    # Clean up created container if start failed or exception occurred before returning container_id
-    # This requires careful handling to avoid race conditions if another process is managing it.
-    # For now, relying on AutoRemove=True might be sufficient if start fails cleanly.
-    # If an exception happens between create and start success logging, container might linger.
+    # AutoRemove=True only cleans up containers that ran; a container that was
+    # created but failed to start would otherwise linger with its unique name.
+    if container_id:
+        try:
+            await docker_client.remove_container(container_id, force=True)
+        except Exception as cleanup_err:
+            logger.warning(f"Failed to clean up container {container_id} after start failure: {cleanup_err}")
 
     return None, None # Return None for both if error occurs
 
-def stop_bot_container(container_id: str) -> bool:
-    """Stops a container using its ID via requests_unixsocket."""
-    session = get_socket_session()
-    if not session:
-        logger.error(f"Cannot stop container {container_id}, requests_unixsocket session not available.")
-        return False
-
-    # Ensure absolute path for URL encoding here as well
-    socket_path_relative = DOCKER_HOST.split('//', 1)[1]
-    socket_path_abs = f"/{socket_path_relative}"
-    socket_path_encoded = socket_path_abs.replace("/", "%2F")
-    socket_url_base = f'http+unix://{socket_path_encoded}'
-    
-    stop_url = f'{socket_url_base}/containers/{container_id}/stop'
-    # Since AutoRemove=True, we don't need a separate remove call
-
+async def stop_bot_container(container_id: str) -> bool:
+    """Stops a container using its ID via the async Docker Engine API client."""
     try:
-        logger.info(f"Attempting to stop container {container_id} via socket ({stop_url})...") # Log stop URL
-        # Send POST request to stop the container. Docker waits for it to stop.
-        # Timeout can be added via query param `t` (e.g., ?t=10 for 10 seconds)
-        response = session.post(f"{stop_url}?t=10") 
-        
-        # Check status code: 204 No Content (success), 304 Not Modified (already stopped), 404 Not Found
-        if response.status_code == 204:
-            logger.info(f"Successfully sent stop command to container {container_id}.")
-            return True
-        elif response.status_code == 304:
-            logger.warning(f"Container {container_id} was already stopped.")
-            return True
-        elif response.status_code == 404:
-            logger.warning(f"Container {container_id} not found, assuming already stopped/removed.")
-            return True 
-        else:
-            # Raise exception for other errors (like 500)
-            logger.error(f"Error stopping container {container_id}. Status: {response.status_code}, Body: {response.text}")
-            response.raise_for_status()
-            return False # Should not be reached if raise_for_status() works
-
-    except RequestException as e:
-        # Handle 404 specifically if raise_for_status() doesn't catch it as expected
-        if hasattr(e, 'response') and e.response is not None and e.response.status_code == 404:
-            logger.warning(f"Container {container_id} not found (exception check), assuming already stopped/removed.")
-            return True
-        logger.error(f"HTTP error stopping container {container_id}: {e}", exc_info=True)
+        docker_client = get_socket_session()
+        logger.info(f"Attempting to stop container {container_id} via socket ({docker_client.socket_path})...")
+        # Docker waits up to t=10 seconds for the bot to exit before killing it.
+        # 304 (already stopped) and 404 (already removed) are treated as success;
+        # since AutoRemove=True, we don't need a separate remove call.
+        await docker_client.stop_container(container_id, stop_timeout=10)
+        logger.info(f"Successfully sent stop command to container {container_id}.")
+        return True
+    except (DockerEngineError, httpx.HTTPError) as e:
+        logger.error(f"Error stopping container {container_id}: {e}", exc_info=True)
         return False
     except Exception as e:
         logger.error(f"Unexpected error stopping container {container_id}: {e}", exc_info=True)
-        return False 
+        return False
 
 # --- ADDED: Get Running Bot Status --- 
 # Make the function async
 async def get_running_bots_status(user_id: int) -> List[Dict[str, Any]]:
     """Gets status of RUNNING bot containers for a user using labels via socket API, including DB lookup for meeting details."""
-    session = get_socket_session()
-    if not session:
-        logger.error("[Bot Status] Cannot get status, requests_unixsocket session not available.")
-        return [] 
-        
     bots_status = []
     running_containers = [] # Initialize
     try:
+        docker_client = get_socket_session()
         # Construct filters for Docker API
-        filters = json.dumps({
+        filters = {
             "label": [f"vexa.user_id={user_id}"],
             "status": ["running"]
-        })
-        
-        # Make request to list containers endpoint
-        socket_path_relative = DOCKER_HOST.split('//', 1)[1]
-        socket_path_abs = f"/{socket_path_relative}"
-        socket_path_encoded = socket_path_abs.replace("/", "%2F")
-        socket_url_base = f'http+unix://{socket_path_encoded}'
-        list_url = f'{socket_url_base}/containers/json'
-        
-        logger.debug(f"[Bot Status] Querying {list_url} with filters: {filters}")
-        response = session.get(list_url, params={"filters": filters, "all": "false"})
-        response.raise_for_status()
-        
-        running_containers = response.json()
+        }
+        logger.debug(f"[Bot Status] Listing containers with filters: {filters}")
+        running_containers = await docker_client.list_containers(filters=filters)
         logger.info(f"[Bot Status] Found {len(running_containers)} running containers for user {user_id}")
 
-    except RequestException as sock_err:
+    except (DockerEngineError, httpx.HTTPError) as sock_err:
         logger.error(f"[Bot Status] Failed to list containers via socket API for user {user_id}: {sock_err}", exc_info=True)
         return [] # Return empty on error listing containers
     except Exception as e:
@@ -513,49 +390,19 @@ async def get_running_bots_status(user_id: int) -> List[Dict[str, Any]]:
 
 async def verify_container_running(container_id: str) -> bool:
     """Verify if a container exists and is running via the Docker socket API."""
-    session = get_socket_session() # Assumes get_socket_session() is defined in this file
-    if not session:
-        logger.error(f"[Verify Container] Cannot verify container {container_id}, requests_unixsocket session not available.")
-        return False # Or raise an exception, depending on desired error handling
-
-    # Construct the correct base URL for socket requests
-    # This logic should mirror how other Docker API calls are made in this file
-    # For example, if DOCKER_HOST is 'unix:///var/run/docker.sock'
-    socket_path_relative = DOCKER_HOST.split('//', 1)[1] 
-    socket_path_abs = f"/{socket_path_relative}"
-    socket_path_encoded = socket_path_abs.replace("/", "%2F")
-    socket_url_base = f'http+unix://{socket_path_encoded}'
-    
-    inspect_url = f'{socket_url_base}/containers/{container_id}/json'
-    
     try:
-        logger.debug(f"[Verify Container] Inspecting container {container_id} via URL: {inspect_url}")
-        # Make the request asynchronously. Requires session to be an AIOHTTP client or similar.
-        # If get_socket_session() returns a synchronous requests.Session, this needs to run in a thread.
-        # Assuming for now that session can handle async requests or this will be wrapped.
-        # For a synchronous session, it would be:
-        # response = await asyncio.to_thread(session.get, inspect_url)
-        
-        # If get_socket_session() returns a regular requests.Session:
-        import asyncio
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, session.get, inspect_url)
-
-        if response.status_code == 404:
+        docker_client = get_socket_session()
+        logger.debug(f"[Verify Container] Inspecting container {container_id}")
+        container_info = await docker_client.inspect_container(container_id)
+        if container_info is None:
             logger.info(f"[Verify Container] Container {container_id} not found (404).")
             return False
-        
-        response.raise_for_status() # Raise an exception for other bad status codes (500, etc.)
-        
-        container_info = response.json()
+
         is_running = container_info.get('State', {}).get('Running', False)
         logger.info(f"[Verify Container] Container {container_id} found. Running: {is_running}")
         return is_running
-        
-    except requests.exceptions.RequestException as e: # Catching requests-specific exceptions
-        if hasattr(e, 'response') and e.response is not None and e.response.status_code == 404:
-             logger.warning(f"[Verify Container] Container {container_id} not found during request (exception check).")
-             return False
+
+    except (DockerEngineError, httpx.HTTPError) as e:
         logger.error(f"[Verify Container] HTTP error inspecting container {container_id}: {e}", exc_info=True)
         return False # Treat HTTP errors (other than 404) as "not verifiable" or "not running"
     except Exception as e:
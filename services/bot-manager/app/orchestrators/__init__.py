@@ -39,4 +39,10 @@ start_bot_container = mod.start_bot_container  # type: ignore
 stop_bot_container = getattr(mod, "stop_bot_container", lambda *args, **kwargs: None)
 _record_session_start = getattr(mod, "_record_session_start", lambda *args, **kwargs: None)
 get_running_bots_status = getattr(mod, "get_running_bots_status", lambda *args, **kwargs: {})
-verify_container_running = getattr(mod, "verify_container_running", lambda *args, **kwargs: False) 
\ No newline at end of file
+verify_container_running = getattr(mod, "verify_container_running", lambda *args, **kwargs: False)
+
+async def _noop_async(*_args, **_kwargs):
+    return None
+
+start_warm_pool = getattr(mod, "start_warm_pool", _noop_async)
+stop_warm_pool = getattr(mod, "stop_warm_pool", _noop_async)
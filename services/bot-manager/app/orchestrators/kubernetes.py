@@ -114,6 +114,7 @@ async def start_bot_container(
     zoom_obf_token: Optional[str] = None,
     voice_agent_enabled: Optional[bool] = None,
     default_avatar_url: Optional[str] = None,
+    whisper_live_url: Optional[str] = None,
 ) -> Optional[Tuple[str, str]]:
     """Start a bot as a Kubernetes Pod.
 
@@ -167,6 +168,7 @@ async def start_bot_container(
         "task": task or "transcribe",
         "transcribeEnabled": True if transcribe_enabled is None else bool(transcribe_enabled),
         "transcriptionTier": transcription_tier or "realtime",
+        "whisperLiveUrl": whisper_live_url,
         "recordingEnabled": user_recording_config.get("enabled", os.getenv("RECORDING_ENABLED", "true").lower() == "true"),
         "captureModes": user_recording_config.get("capture_modes", os.getenv("CAPTURE_MODES", "audio").split(",")),
         "obfToken": zoom_obf_token if platform == "zoom" else None,
@@ -192,7 +194,7 @@ async def start_bot_container(
     # Build environment variables for the bot container
     env_vars = [
         client.V1EnvVar(name="BOT_CONFIG", value=json.dumps(bot_config)),
-        client.V1EnvVar(name="WHISPER_LIVE_URL", value=WHISPER_LIVE_URL),
+        client.V1EnvVar(name="WHISPER_LIVE_URL", value=whisper_live_url or WHISPER_LIVE_URL),
         client.V1EnvVar(name="LOG_LEVEL", value=os.getenv("LOG_LEVEL", "INFO")),
         client.V1EnvVar(name="DISPLAY", value=":99"),
     ]
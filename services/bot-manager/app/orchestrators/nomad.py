@@ -60,7 +60,8 @@ async def start_bot_container(
     recording_enabled: Optional[bool] = None,
     transcribe_enabled: Optional[bool] = None,
     zoom_obf_token: Optional[str] = None,
-    voice_agent_enabled: Optional[bool] = None
+    voice_agent_enabled: Optional[bool] = None,
+    whisper_live_url: Optional[str] = None,
 ) -> Optional[Tuple[str, str]]:
     """Dispatch a parameterised *vexa-bot* Nomad job.
 
@@ -101,6 +102,8 @@ async def start_bot_container(
         "zoom_obf_token": (zoom_obf_token or "") if platform == "zoom" else "",
         "voice_agent_enabled": str(bool(voice_agent_enabled)).lower() if voice_agent_enabled is not None else "",
     }
+    # whisper_live_url is not forwarded: the parameterized job only accepts the
+    # meta keys its spec declares, so Nomad bots keep using the static URL.
 
     # Nomad job dispatch endpoint
     url = f"{NOMAD_ADDR}/v1/job/{BOT_JOB_NAME}/dispatch"
@@ -12,6 +12,11 @@ orchestrators, implementing the same interface:
 - stop_bot_container() -> terminates the process
 - get_running_bots_status() -> lists active processes
 - verify_container_running() -> checks if process is alive
+
+Optionally keeps a warm pool of idle bot processes (BOT_WARM_POOL_SIZE > 0).
+Warm workers boot without a BOT_CONFIG and wait on a per-worker Redis channel;
+start_bot_container() claims one and publishes the meeting config to it, so
+Node startup and module loading are off the time-to-join path.
 """
 from __future__ import annotations
 
@@ -27,6 +32,8 @@ from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, Tuple, Dict, Any, List
 
+import redis.asyncio as aioredis
+
 from app.orchestrators.common import enforce_user_concurrency_limit, count_user_active_bots
 
 logger = logging.getLogger("bot_manager.process_orchestrator")
@@ -56,6 +63,15 @@ DISPLAY = os.getenv("DISPLAY", ":99")
 # Bot manager callback URL (localhost in Lite mode)
 BOT_CALLBACK_BASE_URL = os.getenv("BOT_CALLBACK_BASE_URL", "http://localhost:8080")
 
+# Number of idle pre-booted bot processes to keep ready (0 disables the pool)
+BOT_WARM_POOL_SIZE = int(os.getenv("BOT_WARM_POOL_SIZE", "0"))
+
+# How often the pool is checked for dead workers when nothing else wakes it
+BOT_WARM_POOL_CHECK_INTERVAL = float(os.getenv("BOT_WARM_POOL_CHECK_INTERVAL", "10"))
+
+# Redis channel prefix warm workers listen on for their assignment
+WARM_POOL_CHANNEL_PREFIX = "bot_commands:pool:"
+
 # ---------------------------------------------------------------------------
 # Process Registry
 # ---------------------------------------------------------------------------
@@ -67,6 +83,12 @@ _active_processes: Dict[str, Dict[str, Any]] = {}
 # Lock for thread-safe access to the registry
 _registry_lock = asyncio.Lock()
 
+# Idle warm workers, oldest first. Key: worker_id, Value: process metadata dict
+_warm_pool: Dict[str, Dict[str, Any]] = {}
+_warm_pool_task: Optional[asyncio.Task] = None
+_warm_pool_wakeup: Optional[asyncio.Event] = None
+_warm_pool_redis: Optional[aioredis.Redis] = None
+
 
 # ---------------------------------------------------------------------------
 # Compatibility Stubs (Docker-specific concepts not applicable here)
@@ -139,6 +161,43 @@ def _terminate_process_group(pid: int, timeout: int = 10) -> bool:
         return False
 
 
+def _bot_process_env() -> Dict[str, str]:
+    """Environment shared by cold-started and warm bot processes."""
+    env = os.environ.copy()
+    env["WHISPER_LIVE_URL"] = WHISPER_LIVE_URL
+    env["REDIS_URL"] = REDIS_URL
+    env["DISPLAY"] = DISPLAY
+    env["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
+    # Ensure Node.js can find modules
+    env["NODE_PATH"] = os.path.join(BOT_WORKING_DIR, "node_modules")
+    return env
+
+
+def _spawn_bot_process(log_name: str, env: Dict[str, str]) -> Tuple[subprocess.Popen, Any, Path]:
+    """Spawn the bot entry point in its own process group, logging to ``log_name``."""
+    logs_path = Path(PROCESS_LOGS_DIR)
+    try:
+        logs_path.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        logger.warning(f"Could not create logs directory: {e}")
+
+    log_file = logs_path / f"{log_name}.log"
+    log_handle = open(log_file, "w")
+    try:
+        proc = subprocess.Popen(
+            ["node", BOT_SCRIPT_PATH],
+            env=env,
+            stdout=log_handle,
+            stderr=subprocess.STDOUT,
+            cwd=BOT_WORKING_DIR,
+            preexec_fn=os.setsid  # Create new process group for clean termination
+        )
+    except Exception:
+        log_handle.close()
+        raise
+    return proc, log_handle, log_file
+
+
 async def _cleanup_dead_processes() -> None:
     """Remove dead processes from the registry."""
     async with _registry_lock:
@@ -172,7 +231,8 @@ async def start_bot_container(
     transcribe_enabled: Optional[bool] = None,
     zoom_obf_token: Optional[str] = None,
     voice_agent_enabled: Optional[bool] = None,
-    default_avatar_url: Optional[str] = None
+    default_avatar_url: Optional[str] = None,
+    whisper_live_url: Optional[str] = None
 ) -> Optional[Tuple[str, str]]:
     """Start a bot as a Node.js child process.
 
@@ -229,6 +289,7 @@ async def start_bot_container(
         "task": task or "transcribe",
         "transcribeEnabled": True if transcribe_enabled is None else bool(transcribe_enabled),
         "transcriptionTier": transcription_tier or "realtime",
+        "whisperLiveUrl": whisper_live_url,
         "obfToken": zoom_obf_token if platform == "zoom" else None,
         "redisUrl": REDIS_URL,
         "container_name": process_name,
@@ -251,42 +312,25 @@ async def start_bot_container(
 
     logger.debug(f"Bot config prepared for {process_name}")
 
-    # Prepare environment for the bot process
-    env = os.environ.copy()
-    env["BOT_CONFIG"] = json.dumps(bot_config)
-    env["WHISPER_LIVE_URL"] = WHISPER_LIVE_URL
-    env["DISPLAY"] = DISPLAY
-    env["LOG_LEVEL"] = os.getenv("LOG_LEVEL", "INFO")
-    # Ensure Node.js can find modules
-    env["NODE_PATH"] = os.path.join(BOT_WORKING_DIR, "node_modules")
-
-    # Ensure logs directory exists
-    logs_path = Path(PROCESS_LOGS_DIR)
-    try:
-        logs_path.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        logger.warning(f"Could not create logs directory: {e}")
-
-    log_file = logs_path / f"{process_name}.log"
+    # Prefer a pre-booted warm worker; fall back to a cold start
+    warm_worker = await _claim_warm_worker(bot_config)
+    if warm_worker is not None:
+        proc = warm_worker["process"]
+        log_handle = warm_worker["log_handle"]
+        log_file = warm_worker["log_file"]
+        logger.info(f"Assigned meeting {meeting_id} to warm bot process PID={proc.pid}")
 
     # Verify bot script exists
-    if not Path(BOT_SCRIPT_PATH).exists():
+    elif not Path(BOT_SCRIPT_PATH).exists():
         logger.error(f"Bot script not found at {BOT_SCRIPT_PATH}")
         return None, None
 
     try:
-        # Open log file for the bot process
-        log_handle = open(log_file, "w")
-
-        # Spawn the bot process
-        proc = subprocess.Popen(
-            ["node", BOT_SCRIPT_PATH],
-            env=env,
-            stdout=log_handle,
-            stderr=subprocess.STDOUT,
-            cwd=BOT_WORKING_DIR,
-            preexec_fn=os.setsid  # Create new process group for clean termination
-        )
+        if warm_worker is None:
+            # Prepare environment for the bot process
+            env = _bot_process_env()
+            env["BOT_CONFIG"] = json.dumps(bot_config)
+            proc, log_handle, log_file = _spawn_bot_process(process_name, env)
 
         process_id = str(proc.pid)
 
@@ -527,6 +571,149 @@ async def verify_container_running(container_id: str) -> bool:
         return False
 
 
+# ---------------------------------------------------------------------------
+# Warm Pool
+# ---------------------------------------------------------------------------
+
+def _get_warm_pool_redis() -> aioredis.Redis:
+    global _warm_pool_redis
+    if _warm_pool_redis is None:
+        _warm_pool_redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+    return _warm_pool_redis
+
+
+def _discard_warm_worker(worker: Dict[str, Any]) -> None:
+    """Terminate an idle warm worker and release its log handle."""
+    proc: subprocess.Popen = worker["process"]
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=5)
+    except ProcessLookupError:
+        pass
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+    except Exception as e:
+        logger.warning(f"Error terminating warm bot process {worker['worker_id']}: {e}")
+    try:
+        worker["log_handle"].close()
+    except Exception:
+        pass
+
+
+def _spawn_warm_worker() -> Optional[Dict[str, Any]]:
+    """Boot one idle bot process that waits for its config on a pool channel."""
+    worker_id = uuid.uuid4().hex[:12]
+    env = _bot_process_env()
+    env.pop("BOT_CONFIG", None)
+    env["BOT_POOL_CHANNEL"] = f"{WARM_POOL_CHANNEL_PREFIX}{worker_id}"
+    try:
+        proc, log_handle, log_file = _spawn_bot_process(f"vexa-bot-pool-{worker_id}", env)
+    except Exception as e:
+        logger.error(f"Failed to spawn warm bot process: {e}")
+        return None
+    logger.info(f"Spawned warm bot process {worker_id} (PID={proc.pid})")
+    return {
+        "worker_id": worker_id,
+        "channel": env["BOT_POOL_CHANNEL"],
+        "process": proc,
+        "log_handle": log_handle,
+        "log_file": log_file,
+        "spawned_at": time.monotonic(),
+    }
+
+
+async def _claim_warm_worker(bot_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Hand ``bot_config`` to an idle warm worker.
+
+    Returns the claimed worker, or None when the pool is disabled, empty, or no
+    worker is subscribed yet (still booting) - the caller then cold-starts.
+    """
+    if BOT_WARM_POOL_SIZE <= 0:
+        return None
+
+    message = json.dumps({"action": "assign", "config": bot_config})
+    claimed = None
+    async with _registry_lock:
+        for worker_id in list(_warm_pool):
+            worker = _warm_pool[worker_id]
+            if not _process_is_alive(worker["process"]):
+                del _warm_pool[worker_id]
+                _discard_warm_worker(worker)
+                continue
+            try:
+                receivers = await _get_warm_pool_redis().publish(worker["channel"], message)
+            except Exception as e:
+                logger.warning(f"Warm pool unavailable, falling back to cold start: {e}")
+                break
+            if receivers:
+                claimed = _warm_pool.pop(worker_id)
+                break
+            # Oldest workers subscribe first; if this one is not listening yet,
+            # the younger ones are not either.
+            break
+
+    if _warm_pool_wakeup is not None:
+        _warm_pool_wakeup.set()
+    return claimed
+
+
+async def _replenish_warm_pool() -> None:
+    """Keep BOT_WARM_POOL_SIZE idle workers alive until cancelled."""
+    while True:
+        # Clear before counting: a claim during the spawns below sets it again
+        _warm_pool_wakeup.clear()
+        async with _registry_lock:
+            for worker_id in [w for w, info in _warm_pool.items() if not _process_is_alive(info["process"])]:
+                logger.warning(f"Warm bot process {worker_id} exited while idle")
+                _discard_warm_worker(_warm_pool.pop(worker_id))
+            missing = BOT_WARM_POOL_SIZE - len(_warm_pool)
+        for _ in range(max(0, missing)):
+            worker = await asyncio.to_thread(_spawn_warm_worker)
+            if worker is None:
+                break
+            async with _registry_lock:
+                _warm_pool[worker["worker_id"]] = worker
+
+        try:
+            await asyncio.wait_for(_warm_pool_wakeup.wait(), timeout=BOT_WARM_POOL_CHECK_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_warm_pool() -> None:
+    """Start the background task that keeps the warm pool filled."""
+    global _warm_pool_task, _warm_pool_wakeup
+    if BOT_WARM_POOL_SIZE <= 0 or _warm_pool_task is not None:
+        return
+    if not Path(BOT_SCRIPT_PATH).exists():
+        logger.error(f"Bot script not found at {BOT_SCRIPT_PATH}; warm pool disabled")
+        return
+    _warm_pool_wakeup = asyncio.Event()
+    _warm_pool_task = asyncio.create_task(_replenish_warm_pool())
+    logger.info(f"Warm bot pool started (size={BOT_WARM_POOL_SIZE})")
+
+
+async def stop_warm_pool() -> None:
+    """Stop replenishing and terminate all idle warm workers."""
+    global _warm_pool_task, _warm_pool_redis
+    if _warm_pool_task is not None:
+        _warm_pool_task.cancel()
+        try:
+            await _warm_pool_task
+        except asyncio.CancelledError:
+            pass
+        _warm_pool_task = None
+    async with _registry_lock:
+        workers = list(_warm_pool.values())
+        _warm_pool.clear()
+    for worker in workers:
+        await asyncio.to_thread(_discard_warm_worker, worker)
+    if _warm_pool_redis is not None:
+        await _warm_pool_redis.aclose()
+        _warm_pool_redis = None
+
+
 # ---------------------------------------------------------------------------
 # Session Recording (shared with other orchestrators)
 # ---------------------------------------------------------------------------
@@ -548,4 +735,6 @@ __all__ = [
     "_record_session_start",
     "get_running_bots_status",
     "verify_container_running",
+    "start_warm_pool",
+    "stop_warm_pool",
 ]
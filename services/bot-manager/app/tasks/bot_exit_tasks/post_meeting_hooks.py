@@ -2,7 +2,7 @@ import logging
 import os
 from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.models import Meeting
-from shared_models.webhook_delivery import deliver
+from shared_models.webhook_outbox import webhook_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +61,7 @@ async def run(meeting: Meeting, db: AsyncSession):
     }
 
     for hook_url in POST_MEETING_HOOKS:
-        await deliver(
+        await webhook_outbox.enqueue(
             url=hook_url,
             payload=payload,
             timeout=10.0,
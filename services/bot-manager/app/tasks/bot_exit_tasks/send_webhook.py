@@ -2,7 +2,7 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.models import Meeting, User
 from shared_models.webhook_url import validate_webhook_url
-from shared_models.webhook_delivery import deliver
+from shared_models.webhook_outbox import webhook_outbox
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -11,7 +11,8 @@ logger = logging.getLogger(__name__)
 async def run(meeting: Meeting, db: AsyncSession):
     """
     Sends a webhook with the completed meeting details to a user-configured URL.
-    Uses exponential backoff retry and HMAC signing when webhook_secret is set.
+    Queued on the durable webhook outbox (retries with backoff, HMAC signing
+    when webhook_secret is set).
     """
     logger.info(f"Executing send_webhook task for meeting {meeting.id}")
 
@@ -52,7 +53,7 @@ async def run(meeting: Meeting, db: AsyncSession):
             'updated_at': meeting.updated_at.isoformat() if meeting.updated_at else None,
         }
 
-        await deliver(
+        await webhook_outbox.enqueue(
             url=webhook_url,
             payload=payload,
             webhook_secret=webhook_secret,
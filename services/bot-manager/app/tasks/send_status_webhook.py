@@ -2,7 +2,7 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.models import Meeting, User
 from shared_models.webhook_url import validate_webhook_url
-from shared_models.webhook_delivery import deliver
+from shared_models.webhook_outbox import webhook_outbox
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -11,7 +11,8 @@ logger = logging.getLogger(__name__)
 async def run(meeting: Meeting, db: AsyncSession, status_change_info: Optional[Dict[str, Any]] = None):
     """
     Sends a webhook for ANY meeting status change, not just completion.
-    Uses exponential backoff retry and HMAC signing when webhook_secret is set.
+    Queued on the durable webhook outbox (retries with backoff, HMAC signing
+    when webhook_secret is set).
 
     Args:
         meeting: Meeting object with current status
@@ -73,12 +74,13 @@ async def run(meeting: Meeting, db: AsyncSession, status_change_info: Optional[D
                 'transition_source': status_change_info.get('transition_source')
             }
 
-        await deliver(
+        await webhook_outbox.enqueue(
             url=webhook_url,
             payload=payload,
             webhook_secret=webhook_secret,
             timeout=30.0,
             label=f"status-webhook meeting={meeting.id} status={meeting.status}",
+            batchable=True,
         )
 
     except Exception as e:
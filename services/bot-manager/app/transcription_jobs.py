@@ -0,0 +1,213 @@
+"""
+Deferred-tier re-transcription of finished recordings.
+
+A ``TranscriptionJob`` row tracks one pass of a recording's audio through the
+transcription-service job endpoint (``/v1/audio/transcriptions/jobs``), which
+VAD-splits the whole file, decodes the chunks in batches and streams the
+segments back as newline-delimited JSON while they complete. Segments are
+stored as ``Transcription`` rows under the job's own ``session_uid`` so they
+never mix with the realtime transcript of the same meeting.
+
+Jobs run as tasks of the bot-manager process (``start_transcription_job``).
+A job still ``pending`` or ``processing`` at startup was interrupted by a
+restart; ``recover_transcription_jobs`` drops its partial segments and runs
+it again.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from sqlalchemy import delete, select
+
+from shared_models.database import async_session_local
+from shared_models.models import JOB_SESSION_UID_MARKER, MediaFile, Recording, Transcription, TranscriptionJob
+from shared_models.partitions import MISSING_KEY, meeting_partition_keys
+
+logger = logging.getLogger("bot_manager.transcription_jobs")
+
+_remote_url = os.getenv("REMOTE_TRANSCRIBER_URL", "").rstrip("/")
+TRANSCRIPTION_JOBS_URL = os.getenv("TRANSCRIPTION_JOBS_URL") or (f"{_remote_url}/jobs" if _remote_url else "")
+TRANSCRIPTION_JOBS_API_KEY = os.getenv("TRANSCRIPTION_JOBS_API_KEY") or os.getenv("REMOTE_TRANSCRIBER_API_KEY", "")
+# Attempts when the service answers 503 (deferred tier busy); waits its Retry-After in between
+TRANSCRIPTION_JOB_MAX_ATTEMPTS = int(os.getenv("TRANSCRIPTION_JOB_MAX_ATTEMPTS", "5"))
+# Segments inserted per commit; progress is updated at the same time
+TRANSCRIPTION_JOB_COMMIT_EVERY = int(os.getenv("TRANSCRIPTION_JOB_COMMIT_EVERY", "50"))
+TRANSCRIPTION_JOB_URL_TTL_S = int(os.getenv("TRANSCRIPTION_JOB_URL_TTL_S", "3600"))
+
+
+# Jobs running in this process, referenced until they finish
+_running_jobs: Dict[int, asyncio.Task] = {}
+
+
+class TranscriptionJobError(Exception):
+    pass
+
+
+def job_session_uid(recording: Recording, job_id: int) -> str:
+    return f"{recording.session_uid or f'recording-{recording.id}'}{JOB_SESSION_UID_MARKER}{job_id}"
+
+
+async def stream_job_events(
+    client: httpx.AsyncClient,
+    *,
+    audio_url: Optional[str] = None,
+    audio_bytes: Optional[bytes] = None,
+    language: Optional[str] = None,
+    task: str = "transcribe",
+    url: str = TRANSCRIPTION_JOBS_URL,
+    api_key: str = TRANSCRIPTION_JOBS_API_KEY,
+    max_attempts: int = TRANSCRIPTION_JOB_MAX_ATTEMPTS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Submit a recording to the transcription-service and yield its streamed events."""
+    if not url:
+        raise TranscriptionJobError("TRANSCRIPTION_JOBS_URL is not configured")
+    data = {"task": task}
+    if language:
+        data["language"] = language
+    if audio_url:
+        data["audio_url"] = audio_url
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    for attempt in range(1, max_attempts + 1):
+        files = {"file": ("recording.wav", audio_bytes, "audio/wav")} if audio_bytes is not None else None
+        async with client.stream("POST", url, data=data, files=files, headers=headers) as response:
+            if response.status_code == 503 and attempt < max_attempts:
+                retry_after = float(response.headers.get("Retry-After", "5"))
+                logger.info(f"Transcription service busy, retrying job in {retry_after:.0f}s (attempt {attempt})")
+                await asyncio.sleep(retry_after)
+                continue
+            if response.status_code != 200:
+                body = (await response.aread()).decode(errors="replace")[:500]
+                raise TranscriptionJobError(f"Transcription service returned {response.status_code}: {body}")
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.get("type") == "error":
+                    raise TranscriptionJobError(event.get("detail") or "Transcription failed")
+                yield event
+                if event.get("type") == "done":
+                    return
+            raise TranscriptionJobError("Transcription stream ended before completion")
+
+
+async def run_transcription_job(job_id: int, storage) -> None:
+    """Run a pending job to completion, persisting segments and progress as they stream in."""
+    async with async_session_local() as db:
+        job = await db.get(TranscriptionJob, job_id)
+        if job is None:
+            logger.warning(f"Transcription job {job_id} disappeared before it started")
+            return
+        recording = await db.get(Recording, job.recording_id)
+        await db.refresh(recording, ["media_files"])
+        partition_keys = await meeting_partition_keys(db, [job.meeting_id])
+        meeting_created_at = partition_keys.get(job.meeting_id, MISSING_KEY)
+        job.status = "processing"
+        job.started_at = datetime.utcnow()
+        job.progress = 0.0
+        await db.commit()
+
+        try:
+            audio: Optional[MediaFile] = next((mf for mf in recording.media_files if mf.type == "audio"), None)
+            if audio is None:
+                raise TranscriptionJobError("Recording has no audio media file")
+            audio_url = audio_bytes = None
+            if audio.storage_backend == "local":
+                audio_bytes = await asyncio.to_thread(storage.download_file, audio.storage_path)
+            else:
+                audio_url = await asyncio.to_thread(
+                    storage.get_presigned_url, audio.storage_path, TRANSCRIPTION_JOB_URL_TTL_S
+                )
+
+            duration = audio.duration_seconds
+            language = job.language
+            count = 0
+            timeout = httpx.Timeout(30.0, read=None)
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                async for event in stream_job_events(
+                    client, audio_url=audio_url, audio_bytes=audio_bytes, language=job.language, task=job.task
+                ):
+                    if event["type"] == "info":
+                        duration = event.get("duration") or duration
+                        language = event.get("language") or language
+                    elif event["type"] == "segment":
+                        db.add(Transcription(
+                            meeting_id=job.meeting_id,
+                            meeting_created_at=meeting_created_at,
+                            start_time=event["start"],
+                            end_time=event["end"],
+                            text=event["text"].strip(),
+                            language=language,
+                            session_uid=job.session_uid,
+                        ))
+                        count += 1
+                        if count % TRANSCRIPTION_JOB_COMMIT_EVERY == 0:
+                            job.segments_count = count
+                            if duration:
+                                job.progress = min(1.0, event["end"] / duration)
+                            await db.commit()
+
+            job.segments_count = count
+            job.progress = 1.0
+            job.status = "completed"
+            job.completed_at = datetime.utcnow()
+            if not job.language and language:
+                job.language = language[:10]
+            await db.commit()
+            logger.info(f"Transcription job {job_id} completed with {count} segments")
+        except Exception as e:
+            logger.error(f"Transcription job {job_id} failed: {e}", exc_info=True)
+            await db.rollback()
+            # Drop the partial transcript so a rerun starts from a clean slate
+            await db.execute(delete(Transcription).where(
+                Transcription.meeting_created_at == meeting_created_at,
+                Transcription.session_uid == job.session_uid,
+            ))
+            job = await db.get(TranscriptionJob, job_id)
+            job.status = "failed"
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            await db.commit()
+
+
+def start_transcription_job(job_id: int, storage) -> asyncio.Task:
+    """Run a job in the background of this process."""
+    task = asyncio.create_task(run_transcription_job(job_id, storage))
+    _running_jobs[job_id] = task
+    task.add_done_callback(lambda _: _running_jobs.pop(job_id, None))
+    return task
+
+
+async def recover_transcription_jobs(get_storage) -> List[int]:
+    """Restart the jobs a previous bot-manager process left pending or processing."""
+    async with async_session_local() as db:
+        result = await db.execute(
+            select(TranscriptionJob)
+            .where(TranscriptionJob.status.in_(("pending", "processing")))
+            .order_by(TranscriptionJob.id)
+        )
+        jobs = [job for job in result.scalars().all() if job.id not in _running_jobs]
+        if not jobs:
+            return []
+        partition_keys = await meeting_partition_keys(db, [job.meeting_id for job in jobs])
+        for job in jobs:
+            await db.execute(delete(Transcription).where(
+                Transcription.meeting_created_at == partition_keys.get(job.meeting_id, MISSING_KEY),
+                Transcription.session_uid == job.session_uid,
+            ))
+            job.status = "pending"
+            job.progress = None
+            job.segments_count = None
+        await db.commit()
+
+    job_ids = [job.id for job in jobs]
+    storage = get_storage()
+    for job_id in job_ids:
+        start_transcription_job(job_id, storage)
+    logger.info(f"Requeued {len(job_ids)} interrupted transcription job(s): {job_ids}")
+    return job_ids
@@ -0,0 +1,108 @@
+"""Load-aware WhisperLive placement for newly launched bots.
+
+Every WhisperLive server publishes a JSON load report to
+``whisperlive:load:{server_id}`` (with a TTL) and keeps its id in the
+``whisperlive:instances`` set; see ``whisper_live/load_report.py``. When a
+bot is launched, ``choose_whisper_live_url`` reads those reports, drops
+instances that are gone, unhealthy, draining or full, and returns the URL of
+the least loaded one. The bot gets it as ``whisperLiveUrl`` in its config;
+when no report is usable the caller falls back to the static
+``WHISPER_LIVE_URL``.
+
+A bot takes a while to start and connect, so a just-placed bot is not in the
+next report yet. Each placement is therefore recorded as a short-lived
+reservation (``whisperlive:reserved:{server_id}``, a ZSET scored by expiry)
+and counted as a session until it expires.
+"""
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("bot_manager.whisperlive_placement")
+
+LOAD_KEY = "whisperlive:load:{}"
+INSTANCES_KEY = "whisperlive:instances"
+RESERVED_KEY = "whisperlive:reserved:{}"
+
+# "load" places bots from load reports; "static" always uses WHISPER_LIVE_URL
+PLACEMENT_MODE = os.getenv("WHISPER_LIVE_PLACEMENT", "load").strip().lower()
+RESERVATION_TTL_S = float(os.getenv("WHISPER_LIVE_RESERVATION_TTL_S", "90"))
+# Seconds of untranscribed audio per session that weigh as much as a full instance
+QUEUE_LAG_SCALE_S = float(os.getenv("WHISPER_LIVE_QUEUE_LAG_SCALE_S", "10"))
+
+
+def score(report: Dict[str, Any], reserved: int) -> Optional[float]:
+    """Lower is better; ``None`` if the instance cannot take another bot."""
+    if not report.get("url") or not report.get("healthy", True) or report.get("draining"):
+        return None
+    max_clients = int(report.get("max_clients") or 0)
+    sessions = int(report.get("sessions") or 0)
+    occupied = sessions + reserved
+    if max_clients <= 0 or occupied >= max_clients:
+        return None
+    lag_per_session = float(report.get("queued_audio_s") or 0.0) / max(1, sessions)
+    return occupied / max_clients + lag_per_session / QUEUE_LAG_SCALE_S
+
+
+def pick(candidates: List[Tuple[Dict[str, Any], int]]) -> Optional[Dict[str, Any]]:
+    """Least loaded report among ``(report, reserved)`` pairs; ties are broken at random."""
+    best = None
+    for report, reserved in candidates:
+        value = score(report, reserved)
+        if value is None:
+            continue
+        key = (value, random.random())
+        if best is None or key < best[0]:
+            best = (key, report)
+    return best[1] if best else None
+
+
+async def choose_whisper_live_url(redis_client) -> Optional[str]:
+    """Pick a WhisperLive URL for a new bot and reserve a slot on it."""
+    if PLACEMENT_MODE != "load" or redis_client is None:
+        return None
+    try:
+        server_ids = sorted(await redis_client.smembers(INSTANCES_KEY))
+        if not server_ids:
+            return None
+        now = time.time()
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.mget([LOAD_KEY.format(sid) for sid in server_ids])
+        for sid in server_ids:
+            pipe.zremrangebyscore(RESERVED_KEY.format(sid), "-inf", now)
+            pipe.zcard(RESERVED_KEY.format(sid))
+        results = await pipe.execute()
+
+        raw_reports, reserved_counts = results[0], results[2::2]
+        candidates = []
+        expired = []
+        for sid, raw, reserved in zip(server_ids, raw_reports, reserved_counts):
+            if raw is None:
+                expired.append(sid)
+                continue
+            candidates.append((json.loads(raw), int(reserved)))
+        if expired:
+            # Report TTL ran out: the instance crashed or was withdrawn
+            await redis_client.srem(INSTANCES_KEY, *expired)
+
+        chosen = pick(candidates)
+        if chosen is None:
+            logger.warning(f"No WhisperLive instance has capacity ({len(candidates)} reporting); using static URL")
+            return None
+        reserved_key = RESERVED_KEY.format(chosen["id"])
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zadd(reserved_key, {uuid.uuid4().hex: now + RESERVATION_TTL_S})
+        pipe.expire(reserved_key, int(RESERVATION_TTL_S) + 1)
+        await pipe.execute()
+        logger.info(
+            f"Placed bot on WhisperLive {chosen['id']} ({chosen.get('sessions')}/{chosen.get('max_clients')} sessions, "
+            f"queued {chosen.get('queued_audio_s')}s)"
+        )
+        return chosen["url"]
+    except Exception as e:
+        logger.warning(f"WhisperLive placement failed, using static URL: {e}")
+        return None
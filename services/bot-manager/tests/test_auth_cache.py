@@ -0,0 +1,130 @@
+import asyncio
+import os
+import unittest
+import uuid
+from datetime import datetime
+
+import redis.asyncio as aioredis
+
+from shared_models.auth_cache import AuthCache, authenticate_token, hash_token
+from shared_models.models import User
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _CountingSession:
+    """Answers the token JOIN user query from a dict and counts round trips."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        token = stmt.compile().params["token_1"]
+        return _Result(self.tokens.get(token))
+
+
+def _user(user_id=1, max_bots=2):
+    return User(
+        id=user_id, email=f"user{user_id}@test", name="Test", image_url=None,
+        created_at=datetime(2025, 1, 1), max_concurrent_bots=max_bots, data={"webhook_url": "https://x"},
+    )
+
+
+async def _redis_available():
+    client = aioredis.from_url(REDIS_URL)
+    try:
+        await client.ping()
+        return True
+    except Exception:
+        return False
+    finally:
+        await client.aclose()
+
+
+class AuthCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_hit_skips_database_and_returns_detached_copy(self):
+        cache = AuthCache(ttl_seconds=60, max_entries=10)
+        db = _CountingSession({"tok": (7, _user())})
+
+        first = await authenticate_token(db, "tok", cache)
+        second = await authenticate_token(db, "tok", cache)
+        second.data["webhook_url"] = "mutated"
+        third = await authenticate_token(db, "tok", cache)
+
+        self.assertEqual(db.queries, 1)
+        self.assertEqual((first.id, third.max_concurrent_bots), (1, 2))
+        self.assertEqual(third.data["webhook_url"], "https://x")
+        self.assertEqual(third.created_at, datetime(2025, 1, 1))
+        self.assertEqual(cache.stats()["hit_rate"], round(2 / 3, 4))
+
+    async def test_unknown_token_is_not_cached(self):
+        cache = AuthCache()
+        db = _CountingSession({})
+        self.assertIsNone(await authenticate_token(db, "nope", cache))
+        db.tokens["nope"] = (1, _user())
+        self.assertIsNotNone(await authenticate_token(db, "nope", cache))
+
+    async def test_ttl_expiry_and_lru_eviction(self):
+        cache = AuthCache(ttl_seconds=0.05, max_entries=2)
+        db = _CountingSession({f"t{i}": (i, _user(i)) for i in range(3)})
+        for token in ("t0", "t1", "t2"):
+            await authenticate_token(db, token, cache)
+        self.assertEqual(cache.stats()["entries"], 2)
+        await authenticate_token(db, "t0", cache)  # evicted -> DB
+        self.assertEqual(db.queries, 4)
+        await asyncio.sleep(0.06)
+        await authenticate_token(db, "t2", cache)  # expired -> DB
+        self.assertEqual(db.queries, 5)
+
+    async def test_invalidate_user_drops_all_tokens(self):
+        cache = AuthCache()
+        db = _CountingSession({"a": (1, _user(1)), "b": (2, _user(1)), "c": (3, _user(2))})
+        for token in ("a", "b", "c"):
+            await authenticate_token(db, token, cache)
+        await cache.invalidate_user(1)
+        self.assertIsNone(await cache.get("a"))
+        self.assertIsNone(await cache.get("b"))
+        self.assertIsNotNone(await cache.get("c"))
+
+    async def test_redis_tier_shared_and_invalidation_broadcast(self):
+        if not await _redis_available():
+            self.skipTest("Redis not reachable")
+        token = f"tok-{uuid.uuid4().hex}"
+        service_a, service_b, admin = AuthCache(), AuthCache(), AuthCache()
+        clients = [aioredis.from_url(REDIS_URL, decode_responses=True) for _ in range(3)]
+        await service_a.attach_redis(clients[0])
+        await service_b.attach_redis(clients[1])
+        await admin.attach_redis(clients[2], listen=False)
+        try:
+            await asyncio.sleep(0.1)  # let the listeners subscribe
+            db = _CountingSession({token: (9, _user(42))})
+            await authenticate_token(db, token, service_a)
+            await authenticate_token(db, token, service_b)  # served from Redis
+            self.assertEqual(db.queries, 1)
+            self.assertEqual(service_b.stats()["redis_hits"], 1)
+            self.assertFalse(await clients[0].exists(f"auth_cache:token:{token}"))
+            self.assertTrue(await clients[0].exists(f"auth_cache:token:{hash_token(token)}"))
+
+            await admin.invalidate_user(42)
+            await asyncio.sleep(0.1)
+            self.assertIsNone(await service_a.get(token))
+            self.assertIsNone(await service_b.get(token))
+        finally:
+            for cache in (service_a, service_b, admin):
+                await cache.detach_redis()
+            for client in clients:
+                await client.aclose()
+
+
+if __name__ == "__main__":
+    unittest.main()
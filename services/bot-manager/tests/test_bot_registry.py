@@ -0,0 +1,196 @@
+import os
+import time
+import unittest
+import uuid
+from datetime import datetime
+
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "vexa",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ADMIN_TOKEN": "test-admin-token",
+    "ORCHESTRATOR": "docker",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx
+import redis.asyncio as aioredis
+
+from app import bot_registry
+from app import main as bot_manager_main
+from app.auth import get_user_and_token
+from shared_models.models import Meeting, User
+from shared_models.schemas import MeetingStatus
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _MeetingStore:
+    """In-memory stand-in for the meetings table, shared by all sessions."""
+
+    def __init__(self, meetings):
+        self.meetings = {m.id: m for m in meetings}
+
+    def session(self):
+        return _Session(self)
+
+
+class _Session:
+    def __init__(self, store):
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        columns = [c.get("name") for c in stmt.column_descriptions]
+        if columns == ["user_id"]:
+            return _Result([(uid,) for uid in sorted({m.user_id for m in self.store.meetings.values()})])
+        statuses = stmt.whereclause.right.value
+        return _Result([m for m in self.store.meetings.values() if m.status in statuses])
+
+    async def get(self, model, pk):
+        return self.store.meetings.get(pk)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def refresh(self, obj, *args):
+        pass
+
+
+def _meeting(meeting_id, user_id, status, container_id):
+    return Meeting(
+        id=meeting_id, user_id=user_id, platform="google_meet", platform_specific_id=f"abc-defg-{meeting_id:03d}",
+        status=status, bot_container_id=container_id, data={}, created_at=datetime(2025, 1, 1, 12, 0, meeting_id),
+    )
+
+
+class BotRegistryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.redis = aioredis.from_url(os.environ["REDIS_URL"], decode_responses=True)
+        try:
+            await self.redis.ping()
+        except Exception:
+            await self.redis.aclose()
+            self.skipTest("Redis not reachable")
+        # Unique user ids so runs do not collide with other registry data.
+        self.user_a, self.user_b = (uuid.uuid4().int % 10**8 for _ in range(2))
+        self._patch(bot_manager_main, "redis_client", self.redis)
+
+    async def asyncTearDown(self):
+        for user_id in (self.user_a, self.user_b):
+            await self.redis.delete(bot_registry.REGISTRY_KEY.format(user_id))
+        await self.redis.aclose()
+
+    def _patch(self, obj, name, value):
+        original = getattr(obj, name)
+        setattr(obj, name, value)
+        self.addCleanup(setattr, obj, name, original)
+
+    async def _status_endpoint(self, user_id):
+        app = bot_manager_main.app
+        app.dependency_overrides[get_user_and_token] = lambda: ("token", User(id=user_id, email="u@test", data={}))
+        self.addCleanup(app.dependency_overrides.clear)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bot-manager") as client:
+            response = await client.get("/bots/status")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["running_bots"]
+
+    async def test_lifecycle_callbacks_drive_status_endpoint(self):
+        meeting = _meeting(1, self.user_a, MeetingStatus.REQUESTED.value, "9001")
+        await bot_manager_main._sync_bot_registry(meeting)
+        self.assertEqual([b["normalized_status"] for b in await self._status_endpoint(self.user_a)], ["Requested"])
+
+        store = _MeetingStore([meeting])
+        for new_status, expected in [
+            (MeetingStatus.JOINING, ["Starting"]),
+            (MeetingStatus.ACTIVE, ["Up"]),
+            (MeetingStatus.STOPPING, ["Stopping"]),
+            (MeetingStatus.COMPLETED, []),
+        ]:
+            self.assertTrue(await bot_manager_main.update_meeting_status(meeting, new_status, store.session()))
+            bots = await self._status_endpoint(self.user_a)
+            self.assertEqual([b["normalized_status"] for b in bots], expected)
+
+    async def test_registry_matches_reconciliation_view(self):
+        meetings = [
+            _meeting(10, self.user_a, MeetingStatus.ACTIVE.value, "9010"),      # running, registry missed it
+            _meeting(11, self.user_a, MeetingStatus.ACTIVE.value, "9011"),      # zombie: container gone
+            _meeting(12, self.user_a, MeetingStatus.COMPLETED.value, "9012"),   # orphan container
+            _meeting(13, self.user_b, MeetingStatus.JOINING.value, "9013"),     # consistent already
+        ]
+        store = _MeetingStore(meetings)
+        running = {"9010": (self.user_a, 10), "9012": (self.user_a, 12), "9013": (self.user_b, 13)}
+        stopped = []
+
+        async def _running_bots(user_id):
+            return [
+                {"container_id": cid, "container_name": f"vexa-bot-{mid}-x", "labels": {}, "meeting_id_from_name": str(mid)}
+                for cid, (uid, mid) in running.items() if uid == user_id
+            ]
+
+        async def _verify(container_id):
+            return container_id in running
+
+        async def _stop(container_id):
+            stopped.append(container_id)
+            running.pop(container_id, None)
+            return True
+
+        self._patch(bot_manager_main, "async_session_local", store.session)
+        self._patch(bot_manager_main, "get_running_bots_status", _running_bots)
+        self._patch(bot_manager_main, "verify_container_running", _verify)
+        self._patch(bot_manager_main, "_stop_container", _stop)
+
+        # Drifted registry: stale zombie/orphan entries, a missing entry for 10.
+        for meeting_id in (11, 12, 13):
+            stale = _meeting(meeting_id, store.meetings[meeting_id].user_id, MeetingStatus.ACTIVE.value, str(9000 + meeting_id))
+            await bot_registry.sync_meeting(self.redis, stale)
+        # Backdate them so they predate the reconciliation snapshot.
+        for user_id in (self.user_a, self.user_b):
+            key = bot_registry.REGISTRY_KEY.format(user_id)
+            for field, value in (await self.redis.hgetall(key)).items():
+                await self.redis.hset(key, field, value.replace('"updated_at": ', '"updated_at": -'))
+
+        await bot_manager_main.reconcile_meetings_and_containers()
+
+        self.assertEqual(stopped, ["9012"])
+        self.assertEqual(store.meetings[11].status, MeetingStatus.COMPLETED.value)
+        # The registry now equals "running containers whose meeting is live".
+        for user_id in (self.user_a, self.user_b):
+            expected = sorted(
+                (cid, f"vexa-bot-{mid}-x") for cid, (uid, mid) in running.items()
+                if uid == user_id and bot_registry.is_live(store.meetings[mid])
+            )
+            bots = await self._status_endpoint(user_id)
+            self.assertEqual(sorted((b["container_id"], b["container_name"]) for b in bots), expected)
+
+    async def test_reconciliation_keeps_entries_written_after_its_snapshot(self):
+        started_at = time.time()
+        late = _meeting(20, self.user_a, MeetingStatus.REQUESTED.value, "9020")
+        await bot_registry.sync_meeting(self.redis, late)  # launched mid-reconciliation
+        await bot_registry.reconcile_user_bots(self.redis, self.user_a, {}, started_at)
+        self.assertEqual([b["container_id"] for b in await self._status_endpoint(self.user_a)], ["9020"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import asyncio
+import itertools
+import json
+import os
+import tempfile
+import time
+import unittest
+import uuid
+from datetime import datetime
+
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "vexa",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ADMIN_TOKEN": "test-admin-token",
+    "ORCHESTRATOR": "docker",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx
+
+from app import main as bot_manager_main
+from app import orchestrator_utils
+from app.auth import get_user_and_token
+from app.docker.engine import DockerEngineClient, DockerEngineError, socket_path_from_docker_host
+from shared_models.database import get_db
+from shared_models.models import Meeting, User
+
+
+class _StubDockerEngine:
+    """Minimal Docker Engine API over a unix socket (HTTP/1.1 keep-alive)."""
+
+    def __init__(self, socket_path, latency=0.01):
+        self.socket_path = socket_path
+        self.latency = latency
+        self.containers = {}
+        self.requests = []
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(self.latency)
+                    status, payload = self._route(method, target, body)
+                finally:
+                    self.in_flight -= 1
+
+                data = json.dumps(payload).encode() if payload is not None else b""
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method, target, body):
+        path, _, query = target.partition("?")
+        self.requests.append((method, path))
+        parts = path.strip("/").split("/")
+        if method == "GET" and path == "/version":
+            return 200, {"ApiVersion": "1.43"}
+        if method == "POST" and path == "/containers/create":
+            container_id = uuid.uuid4().hex
+            self.containers[container_id] = {"config": json.loads(body), "running": False}
+            return 201, {"Id": container_id, "Warnings": []}
+        if method == "GET" and path == "/containers/json":
+            return 200, [
+                {"Id": cid, "Names": ["/vexa-bot-1-abc"], "Status": "Up 1 second", "Labels": c["config"]["Labels"]}
+                for cid, c in self.containers.items()
+                if c["running"]
+            ]
+        if len(parts) >= 2 and parts[0] == "containers":
+            container = self.containers.get(parts[1])
+            if container is None:
+                return 404, {"message": "No such container"}
+            action = parts[2] if len(parts) > 2 else None
+            if method == "POST" and action == "start":
+                container["running"] = True
+                return 204, None
+            if method == "POST" and action == "stop":
+                container["running"] = False
+                return 204, None
+            if method == "GET" and action == "json":
+                return 200, {"Id": parts[1], "State": {"Running": container["running"]}}
+            if method == "DELETE" and action is None:
+                del self.containers[parts[1]]
+                return 204, None
+        return 500, {"message": f"unexpected {method} {path}"}
+
+
+class _FakeResult:
+    def __init__(self, value=None):
+        self._value = value
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return None
+
+    def scalar(self):
+        return self._value
+
+
+class _FakeSession:
+    """Just enough of AsyncSession for the POST /bots happy path."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, store):
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, stmt):
+        await asyncio.sleep(0)  # yield like a real DB round trip
+        return _FakeResult(0)
+
+    def add(self, obj):
+        if getattr(obj, "id", None) is None:
+            obj.id = next(self._ids)
+        if isinstance(obj, Meeting):
+            obj.created_at = obj.updated_at = datetime.utcnow()
+            self.store[obj.id] = obj
+
+    async def commit(self):
+        await asyncio.sleep(0)
+
+    async def refresh(self, obj, *args):
+        pass
+
+    async def get(self, model, pk):
+        return self.store.get(pk) if model is Meeting else None
+
+    async def close(self):
+        pass
+
+
+def _meet_code(i):
+    suffix = "".join(chr(ord("a") + (i // 26 ** k) % 26) for k in range(3))
+    return f"abc-defg-{suffix}"
+
+
+class DockerEngineClientTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # IsolatedAsyncioTestCase runs in debug mode, which captures a traceback
+        # per callback and dwarfs the timings measured below.
+        asyncio.get_running_loop().set_debug(False)
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self._tmpdir.name, "docker.sock")
+        self.engine = _StubDockerEngine(self.socket_path, latency=0.05)
+        await self.engine.start()
+
+    async def asyncTearDown(self):
+        await orchestrator_utils.close_docker_client()
+        await self.engine.stop()
+        self._tmpdir.cleanup()
+
+    def test_socket_path_from_docker_host(self):
+        self.assertEqual(socket_path_from_docker_host("unix://var/run/docker.sock"), "/var/run/docker.sock")
+        self.assertEqual(socket_path_from_docker_host("unix:///var/run/docker.sock"), "/var/run/docker.sock")
+        with self.assertRaises(DockerEngineError):
+            socket_path_from_docker_host("tcp://localhost:2375")
+
+    async def test_container_lifecycle(self):
+        client = DockerEngineClient(self.socket_path)
+        try:
+            self.assertEqual((await client.version())["ApiVersion"], "1.43")
+            container_id = await client.create_container("vexa-bot-1-abc", {"Image": "x", "Labels": {}})
+            await client.start_container(container_id)
+            self.assertTrue((await client.inspect_container(container_id))["State"]["Running"])
+            self.assertEqual(len(await client.list_containers(filters={"status": ["running"]})), 1)
+            self.assertTrue(await client.stop_container(container_id))
+            self.assertIsNone(await client.inspect_container("missing"))
+            self.assertTrue(await client.stop_container("missing"))
+            with self.assertRaises(DockerEngineError):
+                await client.start_container("missing")
+        finally:
+            await client.aclose()
+
+    async def test_post_bots_storm_does_not_block_event_loop(self):
+        concurrency_limit = 16
+        orchestrator_utils.docker_engine_client = DockerEngineClient(
+            self.socket_path, max_concurrency=concurrency_limit, max_connections=concurrency_limit
+        )
+        store = {}
+        original_session_factory = orchestrator_utils.async_session_local
+        orchestrator_utils.async_session_local = lambda: _FakeSession(store)
+        self.addCleanup(setattr, orchestrator_utils, "async_session_local", original_session_factory)
+        user = User(id=1, email="load@test", max_concurrent_bots=1000, data={})
+
+        async def _fake_db():
+            yield _FakeSession(store)
+
+        app = bot_manager_main.app
+        app.dependency_overrides[get_user_and_token] = lambda: ("token", user)
+        app.dependency_overrides[get_db] = _fake_db
+        self.addCleanup(app.dependency_overrides.clear)
+
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bot-manager") as client:
+            responses = await asyncio.gather(*[
+                client.post("/bots", json={"platform": "google_meet", "native_meeting_id": _meet_code(i)})
+                for i in range(200)
+            ])
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([r.status_code for r in responses], [201] * 200)
+        self.assertEqual(len({r.json()["bot_container_id"] for r in responses}), 200)
+        self.assertEqual(sum(1 for m, p in self.engine.requests if p == "/containers/create"), 200)
+        self.assertLessEqual(self.engine.peak_in_flight, concurrency_limit)
+        # Keep-alive reuse: a handful of pooled connections, not one per call.
+        self.assertLess(self.engine.connections, 2 * concurrency_limit)
+        # 400 create/start calls would take 400 * latency if each blocked the loop.
+        self.assertLess(elapsed, 400 * self.engine.latency / 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "vexa",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "ADMIN_TOKEN": "test-admin-token",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from sqlalchemy.dialects import postgresql
+
+from app import main as bot_manager_main
+from shared_models.models import MediaFile, Meeting, Recording
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def scalars(self):
+        return self
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class _Session:
+    """Answers queries in order from canned results and keeps the compiled SQL."""
+
+    def __init__(self, results, meetings=()):
+        self.results = list(results)
+        self.meetings = {m.id: m for m in meetings}
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        return _Result(self.results.pop(0))
+
+    async def get(self, model, pk):
+        return self.meetings.get(pk)
+
+
+def _meeting(meeting_id, user_id, recording_ids):
+    recordings = [
+        {"id": rid, "user_id": user_id, "session_uid": f"s-{rid}", "created_at": f"2026-01-{rid:02d}T00:00:00", "media_files": []}
+        for rid in recording_ids
+    ]
+    return Meeting(id=meeting_id, user_id=user_id, platform="google_meet", platform_specific_id="abc-defg-hij",
+                   status="completed", data={"recordings": recordings}, created_at=datetime(2026, 1, 1))
+
+
+class RecordingIndexTests(unittest.IsolatedAsyncioTestCase):
+    async def test_list_pages_in_sql_and_loads_only_page_meetings(self):
+        m1, m2 = _meeting(1, 7, [3, 1]), _meeting(2, 7, [2])
+        db = _Session([[(3, 1), (2, 2)], [m1, m2]])
+
+        page = await bot_manager_main._list_meeting_data_recordings(db, 7, limit=2, offset=0)
+
+        self.assertEqual([r["id"] for r in page], [3, 2])
+        self.assertEqual(page[1]["meeting_id"], 2)
+        index_sql, meetings_sql = (str(s) for s in db.statements)
+        self.assertIn("FROM meeting_recording_index", index_sql)
+        self.assertIn("ORDER BY meeting_recording_index.created_at DESC", index_sql)
+        self.assertIn("LIMIT 2", index_sql)
+        self.assertIn("meetings.id IN (1, 2)", meetings_sql)
+
+    async def test_find_by_id_uses_index_and_checks_owner(self):
+        meeting = _meeting(5, 7, [11, 12])
+        db = _Session([[5]], meetings=[meeting])
+        found_meeting, rec = await bot_manager_main._find_meeting_data_recording(db, 7, 12)
+        self.assertIs(found_meeting, meeting)
+        self.assertEqual(rec["session_uid"], "s-12")
+        self.assertIn("meeting_recording_index.recording_id = 12", str(db.statements[0]))
+
+        missing = await bot_manager_main._find_meeting_data_recording(_Session([[]]), 7, 99)
+        self.assertEqual(missing, (None, None))
+
+    async def test_meeting_data_list_follows_keyset_cursor(self):
+        m1 = _meeting(1, 7, [3, 2, 1])
+        db = _Session([[(3, 1), (2, 1), (1, 1)], [m1]])
+        with mock.patch.dict(os.environ, {"RECORDING_METADATA_MODE": "meeting_data"}):
+            first = await bot_manager_main.list_recordings(
+                limit=2, offset=0, cursor=None, meeting_id=None, auth=("t", SimpleNamespace(id=7)), db=db
+            )
+            self.assertEqual([r.id for r in first.recordings], [3, 2])
+            self.assertIn("LIMIT 3", str(db.statements[0]))
+
+            db = _Session([[(1, 1)], [m1]])
+            second = await bot_manager_main.list_recordings(
+                limit=2, offset=0, cursor=first.next_cursor, meeting_id=None, auth=("t", SimpleNamespace(id=7)), db=db
+            )
+        self.assertEqual([r.id for r in second.recordings], [1])
+        self.assertIsNone(second.next_cursor)
+        self.assertIn(
+            "(meeting_recording_index.created_at, meeting_recording_index.recording_id) < ('2026-01-02T00:00:00', 2)",
+            str(db.statements[0]),
+        )
+        self.assertNotIn("OFFSET", str(db.statements[0]))
+
+
+class RecordingTableListTests(unittest.IsolatedAsyncioTestCase):
+    def _recording(self, rid, day):
+        rec = Recording(id=rid, user_id=7, meeting_id=1, session_uid=f"s-{rid}", source="bot",
+                        status="completed", created_at=datetime(2026, 1, day))
+        rec.media_files = [MediaFile(id=rid * 10, recording_id=rid, type="audio", format="wav",
+                                     storage_path=f"p/{rid}.wav", storage_backend="minio", extra_metadata={},
+                                     created_at=datetime(2026, 1, day))]
+        return rec
+
+    async def test_list_loads_media_in_batch_and_pages_by_keyset(self):
+        rows = [self._recording(3, 3), self._recording(2, 2), self._recording(1, 1)]
+        db = _Session([rows])
+        db.refresh = mock.AsyncMock()
+        auth = ("t", SimpleNamespace(id=7))
+        with mock.patch.dict(os.environ, {"RECORDING_METADATA_MODE": "tables"}):
+            page = await bot_manager_main.list_recordings(
+                limit=2, offset=0, cursor=None, meeting_id=None, auth=auth, db=db
+            )
+            self.assertEqual([r.id for r in page.recordings], [3, 2])
+            self.assertEqual(page.recordings[0].media_files[0].id, 30)
+            db.refresh.assert_not_awaited()
+            first_sql = db.statements[0].statement
+            self.assertTrue(first_sql._with_options, "media_files must be eager-loaded")
+
+            db = _Session([[rows[2]]])
+            nxt = await bot_manager_main.list_recordings(
+                limit=2, offset=0, cursor=page.next_cursor, meeting_id=None, auth=auth, db=db
+            )
+        self.assertEqual([r.id for r in nxt.recordings], [1])
+        self.assertIsNone(nxt.next_cursor)
+        sql = str(db.statements[0])
+        self.assertIn("(recordings.created_at, recordings.id) < ('2026-01-02 00:00:00', 2)", sql)
+        self.assertIn("ORDER BY recordings.created_at DESC, recordings.id DESC", sql)
+
+    async def test_rejects_malformed_cursor(self):
+        with self.assertRaises(bot_manager_main.HTTPException) as ctx:
+            await bot_manager_main.list_recordings(
+                limit=2, offset=0, cursor="not-a-cursor", meeting_id=None,
+                auth=("t", SimpleNamespace(id=7)), db=_Session([]),
+            )
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
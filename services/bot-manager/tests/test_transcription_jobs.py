@@ -0,0 +1,99 @@
+import json
+import os
+import unittest
+
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "vexa",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import httpx
+
+from app import transcription_jobs
+from app.transcription_jobs import TranscriptionJobError, stream_job_events
+
+JOBS_URL = "http://transcription.test/v1/audio/transcriptions/jobs"
+
+
+def _ndjson(*events):
+    return "".join(json.dumps(e) + "\n" for e in events).encode()
+
+
+class TestStreamJobEvents(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sleeps = []
+        self._sleep = transcription_jobs.asyncio.sleep
+
+        async def _no_sleep(delay):
+            self.sleeps.append(delay)
+
+        transcription_jobs.asyncio.sleep = _no_sleep
+
+    async def asyncTearDown(self):
+        transcription_jobs.asyncio.sleep = self._sleep
+
+    async def _collect(self, handler, **kwargs):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [e async for e in stream_job_events(client, url=JOBS_URL, api_key="k", **kwargs)]
+
+    async def test_retries_busy_service_after_retry_after_then_streams(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if len(requests) == 1:
+                return httpx.Response(503, headers={"Retry-After": "7"}, json={"detail": "busy"})
+            return httpx.Response(200, content=_ndjson(
+                {"type": "info", "language": "en", "duration": 3.0},
+                {"type": "segment", "start": 0.0, "end": 1.5, "text": " hi"},
+                {"type": "done", "segments": 1},
+            ))
+
+        events = await self._collect(handler, audio_url="http://minio/rec.wav")
+
+        self.assertEqual([e["type"] for e in events], ["info", "segment", "done"])
+        self.assertEqual(self.sleeps, [7.0])
+        self.assertEqual(requests[1].headers["Authorization"], "Bearer k")
+        self.assertIn(b"audio_url", requests[1].content)
+
+    async def test_error_event_and_truncated_stream_raise(self):
+        def failing(request):
+            return httpx.Response(200, content=_ndjson({"type": "info"}, {"type": "error", "detail": "boom"}))
+
+        with self.assertRaisesRegex(TranscriptionJobError, "boom"):
+            await self._collect(failing, audio_bytes=b"RIFF")
+
+        def truncated(request):
+            return httpx.Response(200, content=_ndjson({"type": "info"}))
+
+        with self.assertRaisesRegex(TranscriptionJobError, "before completion"):
+            await self._collect(truncated, audio_bytes=b"RIFF")
+
+
+
+class TestStartTranscriptionJob(unittest.IsolatedAsyncioTestCase):
+    async def test_keeps_a_reference_until_the_job_finishes(self):
+        release = transcription_jobs.asyncio.Event()
+        original = transcription_jobs.run_transcription_job
+
+        async def _run(job_id, storage):
+            await release.wait()
+
+        transcription_jobs.run_transcription_job = _run
+        try:
+            task = transcription_jobs.start_transcription_job(42, storage=None)
+            self.assertIs(transcription_jobs._running_jobs[42], task)
+            release.set()
+            await task
+            await transcription_jobs.asyncio.sleep(0)
+            self.assertNotIn(42, transcription_jobs._running_jobs)
+        finally:
+            transcription_jobs.run_transcription_job = original
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import os
+import unittest
+import uuid
+
+import redis.asyncio as aioredis
+
+from shared_models.webhook_delivery import close_shared_client
+from shared_models.webhook_outbox import WebhookOutbox
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+
+class _WebhookReceiver:
+    """HTTP/1.1 keep-alive endpoint that fails the first ``fail_first`` requests."""
+
+    def __init__(self, fail_first=0, fail_status=503, latency=0.0):
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.latency = latency
+        self.bodies = []
+        self.headers = []
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/hook"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                if not await reader.readline():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                await asyncio.sleep(self.latency)
+                self.in_flight -= 1
+                if self.fail_first > 0:
+                    self.fail_first -= 1
+                    status = self.fail_status
+                else:
+                    status = 200
+                    self.bodies.append(json.loads(body))
+                    self.headers.append(headers)
+                writer.write(f"HTTP/1.1 {status} X\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class WebhookOutboxTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.redis = aioredis.from_url(REDIS_URL, decode_responses=True)
+        try:
+            await self.redis.ping()
+        except Exception:
+            await self.redis.aclose()
+            self.skipTest("Redis not reachable")
+        self.stream = f"test_webhook_outbox_{uuid.uuid4().hex[:8]}"
+        self.outbox = None
+
+    async def asyncTearDown(self):
+        if self.outbox is not None:
+            await self.outbox.stop()
+        await close_shared_client()
+        await self.redis.delete(self.stream, f"{self.stream}:scheduled", f"{self.stream}:dead")
+        await self.redis.aclose()
+
+    async def _wait_for(self, predicate, timeout=5.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not predicate():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("condition not reached")
+            await asyncio.sleep(0.02)
+
+    async def test_retries_with_backoff_then_delivers(self):
+        receiver = _WebhookReceiver(fail_first=2)
+        await receiver.start()
+        self.addAsyncCleanup(receiver.stop)
+        self.outbox = WebhookOutbox(stream=self.stream, retry_base_delay=0.05, poll_interval=0.05)
+        await self.outbox.start(self.redis)
+
+        await self.outbox.enqueue(receiver.url, {"event_type": "x", "n": 1}, webhook_secret="s3cret")
+        await self._wait_for(lambda: self.outbox.delivered == 1)
+
+        self.assertEqual(receiver.bodies, [{"event_type": "x", "n": 1}])
+        self.assertTrue(receiver.headers[0]["x-webhook-signature"].startswith("sha256="))
+        stats = await self.outbox.stats()
+        self.assertEqual(stats["failed_attempts"], 2)
+        self.assertEqual(stats["delivery_latency_seconds"]["samples"], 1)
+        self.assertEqual(stats["backlog"], {"stream": 0, "in_flight": 0, "scheduled_retries": 0, "dead_letter": 0})
+
+    async def test_non_retryable_and_exhausted_jobs_are_dead_lettered(self):
+        receiver = _WebhookReceiver(fail_first=100, fail_status=404)
+        await receiver.start()
+        self.addAsyncCleanup(receiver.stop)
+        self.outbox = WebhookOutbox(stream=self.stream, max_attempts=3, retry_base_delay=0.05, poll_interval=0.05)
+        await self.outbox.start(self.redis)
+
+        await self.outbox.enqueue(receiver.url, {"n": 1})
+        await self._wait_for(lambda: self.outbox.dead_lettered == 1)
+        receiver.fail_status = 503
+        await self.outbox.enqueue(receiver.url, {"n": 2})
+        await self._wait_for(lambda: self.outbox.dead_lettered == 2)
+
+        dead = [json.loads(m) for m in await self.redis.zrange(f"{self.stream}:dead", 0, -1)]
+        self.assertEqual(sorted(job["attempts"] for job in dead), [1, 3])
+        self.assertEqual(self.outbox.failed_attempts, 4)
+
+    async def test_burst_is_batched_and_uses_pooled_connections(self):
+        receiver = _WebhookReceiver(latency=0.01)
+        await receiver.start()
+        self.addAsyncCleanup(receiver.stop)
+        producer = WebhookOutbox(stream=self.stream)
+        await producer.start(self.redis, consume=False)
+        for i in range(50):
+            await producer.enqueue(receiver.url, {"n": i}, batchable=True)
+        await producer.enqueue(receiver.url, {"single": True})
+
+        self.outbox = WebhookOutbox(stream=self.stream, batch_max_events=10, per_destination_concurrency=2,
+                                    poll_interval=0.05)
+        await self.outbox.start(self.redis)
+        await self._wait_for(lambda: self.outbox.delivered == 51)
+
+        events = [e["n"] for body in receiver.bodies if "events" in body for e in body["events"]]
+        self.assertEqual(sorted(events), list(range(50)))
+        self.assertIn({"single": True}, receiver.bodies)
+        self.assertLessEqual(len(receiver.bodies), 10)
+        self.assertLessEqual(receiver.peak_in_flight, 2)
+        self.assertLessEqual(receiver.connections, 2)
+
+    async def test_deliveries_pending_on_a_dead_consumer_are_reclaimed(self):
+        receiver = _WebhookReceiver()
+        await receiver.start()
+        self.addAsyncCleanup(receiver.stop)
+        producer = WebhookOutbox(stream=self.stream)
+        await producer.start(self.redis, consume=False)
+        await producer.enqueue(receiver.url, {"n": 1})
+        # A replica read the job and died before acknowledging it.
+        await self.redis.xreadgroup(producer.group, "crashed-replica", {self.stream: ">"}, count=10)
+
+        self.outbox = WebhookOutbox(stream=self.stream, claim_idle_ms=50, poll_interval=0.05)
+        await asyncio.sleep(0.06)
+        await self.outbox.start(self.redis)
+        await self._wait_for(lambda: self.outbox.delivered == 1)
+        self.assertEqual(receiver.bodies, [{"n": 1}])
+
+
+    async def test_own_queued_deliveries_are_not_reclaimed(self):
+        receiver = _WebhookReceiver(latency=0.2)
+        await receiver.start()
+        self.addAsyncCleanup(receiver.stop)
+        # One request at a time to a slow host: the later jobs idle in the local queue
+        self.outbox = WebhookOutbox(stream=self.stream, per_destination_concurrency=1, claim_idle_ms=50,
+                                    poll_interval=0.05)
+        await self.outbox.start(self.redis)
+        for i in range(3):
+            await self.outbox.enqueue(receiver.url, {"n": i})
+
+        await self._wait_for(lambda: self.outbox.delivered == 3)
+        await asyncio.sleep(0.3)
+        self.assertEqual(sorted(body["n"] for body in receiver.bodies), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
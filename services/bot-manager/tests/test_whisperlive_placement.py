@@ -0,0 +1,79 @@
+import json
+import os
+import time
+import unittest
+
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+import redis.asyncio as aioredis
+
+from app import whisperlive_placement as placement
+
+
+def _report(server_id, sessions, max_clients=10, queued_audio_s=0.0, **extra):
+    return {
+        "id": server_id, "url": f"ws://{server_id}:9090/ws", "sessions": sessions, "max_clients": max_clients,
+        "queued_audio_s": queued_audio_s, "healthy": True, "draining": False, "ts": time.time(), **extra,
+    }
+
+
+class ScoreTests(unittest.TestCase):
+    def test_prefers_fewer_sessions_and_less_queued_audio(self):
+        idle, busy, lagging = _report("a", 2), _report("b", 6), _report("c", 2, queued_audio_s=40)
+        self.assertIs(placement.pick([(busy, 0), (idle, 0), (lagging, 0)]), idle)
+        # Reservations count as sessions until the placed bots show up in a report
+        self.assertIs(placement.pick([(idle, 5), (busy, 0)]), busy)
+
+    def test_skips_full_unhealthy_and_draining_instances(self):
+        self.assertIsNone(placement.score(_report("a", 9), reserved=1))
+        self.assertIsNone(placement.score(_report("a", 0, healthy=False), reserved=0))
+        self.assertIsNone(placement.score(_report("a", 0, draining=True), reserved=0))
+        self.assertIsNone(placement.pick([]))
+
+
+class ChooseUrlTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.redis = aioredis.from_url(os.environ["REDIS_URL"], decode_responses=True)
+        try:
+            await self.redis.ping()
+        except Exception:
+            await self.redis.aclose()
+            self.skipTest("Redis not reachable")
+        self.ids = ["wl-test-a", "wl-test-b", "wl-test-gone"]
+        await self._clear()
+
+    async def asyncTearDown(self):
+        await self._clear()
+        await self.redis.aclose()
+
+    async def _clear(self):
+        await self.redis.srem(placement.INSTANCES_KEY, *self.ids)
+        for sid in self.ids:
+            await self.redis.delete(placement.LOAD_KEY.format(sid), placement.RESERVED_KEY.format(sid))
+
+    async def test_spreads_a_burst_and_drops_expired_instances(self):
+        await self.redis.set(placement.LOAD_KEY.format("wl-test-a"), json.dumps(_report("wl-test-a", 1, max_clients=4)))
+        await self.redis.set(placement.LOAD_KEY.format("wl-test-b"), json.dumps(_report("wl-test-b", 2, max_clients=4)))
+        await self.redis.sadd(placement.INSTANCES_KEY, *self.ids)
+
+        urls = [await placement.choose_whisper_live_url(self.redis) for _ in range(6)]
+
+        self.assertEqual(urls[0], "ws://wl-test-a:9090/ws")
+        # a: 1 + 3 reserved, b: 2 + 2 reserved -> both full, the sixth bot falls back
+        self.assertEqual(urls.count("ws://wl-test-a:9090/ws"), 3)
+        self.assertEqual(urls.count("ws://wl-test-b:9090/ws"), 2)
+        self.assertIsNone(urls[-1])
+        self.assertFalse(await self.redis.sismember(placement.INSTANCES_KEY, "wl-test-gone"))
+
+    async def test_static_mode_and_missing_redis_fall_back(self):
+        self.assertIsNone(await placement.choose_whisper_live_url(None))
+        original = placement.PLACEMENT_MODE
+        placement.PLACEMENT_MODE = "static"
+        try:
+            self.assertIsNone(await placement.choose_whisper_live_url(self.redis))
+        finally:
+            placement.PLACEMENT_MODE = original
+
+
+if __name__ == "__main__":
+    unittest.main()
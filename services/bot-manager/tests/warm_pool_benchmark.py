@@ -0,0 +1,170 @@
+"""Launch-to-"joining" latency benchmark for the process orchestrator warm pool.
+
+Spawns a stub bot (plain Node, no browser) that simulates the entry point's
+boot cost, then reports "joining" to a local callback receiver the same way
+the real bot does. Compares cold starts against claims from a warm pool.
+
+Requires ``node`` on PATH and a reachable Redis (REDIS_URL, default
+redis://localhost:6379/0). Run from services/bot-manager:
+
+    python tests/warm_pool_benchmark.py --launches 10 --boot-delay-ms 1500
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Stand-in for dist/docker.js: burns BOOT_DELAY_MS (module loading, Playwright
+# import, Redis connect) before it can act on a config, either from BOT_CONFIG
+# or from an assignment published on BOT_POOL_CHANNEL.
+STUB_BOT_JS = r"""
+const net = require('net');
+const http = require('http');
+
+function reportJoining(config) {
+  const url = new URL(config.botManagerCallbackUrl.replace('/exited', '/status_change'));
+  const body = JSON.stringify({connection_id: config.connectionId, container_id: config.container_name, status: 'joining'});
+  const req = http.request({hostname: url.hostname, port: url.port, path: url.pathname, method: 'POST',
+    headers: {'Content-Type': 'application/json', 'Content-Length': Buffer.byteLength(body)}});
+  req.on('error', () => {});
+  req.end(body);
+  setInterval(() => {}, 1 << 30);  // stay alive like a bot in a meeting
+}
+
+function standby(channel, redisUrl) {
+  const url = new URL(redisUrl);
+  const sock = net.connect(Number(url.port || 6379), url.hostname);
+  let buf = '';
+  sock.write(`*2\r\n$9\r\nSUBSCRIBE\r\n$${Buffer.byteLength(channel)}\r\n${channel}\r\n`);
+  sock.on('data', (chunk) => {
+    buf += chunk.toString();
+    const start = buf.indexOf('{"action"');
+    if (start < 0) return;
+    const end = buf.indexOf('\r\n', start);
+    if (end < 0) return;
+    sock.destroy();
+    reportJoining(JSON.parse(buf.slice(start, end)).config);
+  });
+}
+
+const until = Date.now() + Number(process.env.BOOT_DELAY_MS || 0);
+while (Date.now() < until) {}
+
+if (process.env.BOT_CONFIG) {
+  reportJoining(JSON.parse(process.env.BOT_CONFIG));
+} else {
+  standby(process.env.BOT_POOL_CHANNEL, process.env.REDIS_URL);
+}
+"""
+
+
+class _CallbackReceiver(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _CallbackHandler)
+        self.joined = {}
+        self.events = {}
+
+    def expect(self, connection_id):
+        self.events[connection_id] = threading.Event()
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if payload.get("status") == "joining":
+            self.server.joined[payload["connection_id"]] = time.perf_counter()
+            event = self.server.events.get(payload["connection_id"])
+            if event:
+                event.set()
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *_args):
+        pass
+
+
+async def _launch(process_mod, receiver, meeting_id):
+    started = time.perf_counter()
+    pid, connection_id = await process_mod.start_bot_container(
+        user_id=1, meeting_id=meeting_id, meeting_url="https://meet.google.com/abc-defg-hij",
+        platform="google_meet", bot_name="bench", user_token="token",
+        native_meeting_id="abc-defg-hij", language=None, task=None,
+    )
+    if pid is None:
+        raise RuntimeError("start_bot_container failed")
+    receiver.expect(connection_id)
+    if connection_id not in receiver.joined:
+        await asyncio.to_thread(receiver.events[connection_id].wait, 30)
+    latency = receiver.joined[connection_id] - started
+    # Bypass stop_bot_container's graceful-shutdown wait; the stub holds no state.
+    info = process_mod._active_processes.pop(pid)
+    info["process"].kill()
+    info["process"].wait()
+    info["log_handle"].close()
+    return latency
+
+
+async def _run(args, receiver, workdir):
+    from app import main as bot_manager_main
+    from app.orchestrators import process as process_mod
+
+    bot_manager_main.mint_meeting_token = lambda **_kwargs: "meeting-token"
+    process_mod.BOT_SCRIPT_PATH = os.path.join(workdir, "bot.js")
+    process_mod.BOT_WORKING_DIR = workdir
+    process_mod.PROCESS_LOGS_DIR = os.path.join(workdir, "logs")
+    process_mod.BOT_CALLBACK_BASE_URL = f"http://127.0.0.1:{receiver.server_address[1]}"
+
+    results = {}
+    for mode in ("cold", "pooled"):
+        process_mod.BOT_WARM_POOL_SIZE = args.pool_size if mode == "pooled" else 0
+        await process_mod.start_warm_pool()
+        latencies = []
+        for i in range(args.launches):
+            if mode == "pooled":
+                # Give the replenisher time to refill, as between real bot requests.
+                await asyncio.sleep(args.boot_delay_ms / 1000 + 0.5)
+            latencies.append(await _launch(process_mod, receiver, meeting_id=i + 1))
+        await process_mod.stop_warm_pool()
+        results[mode] = latencies
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--launches", type=int, default=10)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--boot-delay-ms", type=int, default=1500)
+    args = parser.parse_args()
+
+    for key, value in {
+        "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "vexa", "DB_USER": "postgres",
+        "DB_PASSWORD": "postgres", "ADMIN_TOKEN": "bench", "ORCHESTRATOR": "process",
+        "REDIS_URL": "redis://localhost:6379/0",
+    }.items():
+        os.environ.setdefault(key, value)
+    os.environ["BOOT_DELAY_MS"] = str(args.boot_delay_ms)
+
+    receiver = _CallbackReceiver()
+    threading.Thread(target=receiver.serve_forever, daemon=True).start()
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "bot.js"), "w") as f:
+            f.write(STUB_BOT_JS)
+        results = asyncio.run(_run(args, receiver, workdir))
+    receiver.shutdown()
+
+    print(f"launch -> joining callback, {args.launches} launches, simulated boot {args.boot_delay_ms} ms")
+    for mode, latencies in results.items():
+        ms = sorted(x * 1000 for x in latencies)
+        print(f"  {mode:>6}: median {statistics.median(ms):7.1f} ms   max {ms[-1]:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import asyncio
 import json
 import os
 import re
+from contextlib import asynccontextmanager
 from urllib.parse import urlparse, parse_qs
 from fastapi import FastAPI, Header, HTTPException, Depends, Response
 from fastapi_mcp import FastApiMCP
@@ -10,9 +12,40 @@ import httpx
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import mcp.types as mcp_types
 
-app = FastAPI()
-
 BASE_URL = os.getenv("API_GATEWAY_URL", "http://api-gateway:8000")
+# Connection pool to the gateway, shared by all tool calls
+HTTP_MAX_CONNECTIONS = int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "50"))
+HTTP_TIMEOUT_S = float(os.getenv("MCP_HTTP_TIMEOUT_S", "10"))
+# Upper bound on concurrent sub-requests a single tool call fans out to
+FANOUT_CONCURRENCY = int(os.getenv("MCP_FANOUT_CONCURRENCY", "8"))
+
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_S,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            ),
+        )
+    return http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    get_http_client()
+    yield
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Standard bearer-token auth parsing. We treat the token value as the Vexa API key.
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -185,18 +218,17 @@ async def make_request(
     params: Optional[dict] = None,
 ):
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.request(
-                method,
-                url,
-                headers=get_headers(api_key),
-                params=params,
-                json=payload,
-            )
-            response.raise_for_status()
-            if not response.content:
-                return {}
-            return response.json()
+        response = await get_http_client().request(
+            method,
+            url,
+            headers=get_headers(api_key),
+            params=params,
+            json=payload,
+        )
+        response.raise_for_status()
+        if not response.content:
+            return {}
+        return response.json()
     except httpx.HTTPStatusError as http_err:
         # Allow MCP transport to mark tool calls as errors (isError=true) when appropriate.
         detail: Any
@@ -212,6 +244,17 @@ async def make_request(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
 
+
+async def gather_bounded(coros, limit: int = FANOUT_CONCURRENCY, return_exceptions: bool = False) -> List[Any]:
+    """asyncio.gather with at most `limit` of the awaitables running at once; results keep their order."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros), return_exceptions=return_exceptions)
+
 _TEAMS_ENTERPRISE_HOSTS = {
     "teams.microsoft.com",
     "gov.teams.microsoft.us",
@@ -553,10 +596,35 @@ async def get_meeting_bundle(
     - Post-meeting: fetch notes + recording links, then create a share URL for the transcript.
     - Meeting prep: quickly confirm meeting identity and existing metadata.
     """
-    transcript = await make_request(
-        "GET",
-        f"{BASE_URL}/transcripts/{data.meeting_platform}/{data.meeting_id}",
-        api_key,
+    async def create_share_link() -> Dict[str, Any]:
+        share_args: Dict[str, Any] = {}
+        if data.share_ttl_seconds is not None:
+            share_args["ttl_seconds"] = data.share_ttl_seconds
+        # Best-effort: if share link creation fails, return the rest of the bundle.
+        try:
+            share = await make_request(
+                "POST",
+                f"{BASE_URL}/transcripts/{data.meeting_platform}/{data.meeting_id}/share",
+                api_key,
+                params=share_args or None,
+            )
+            return {"share_link": share}
+        except Exception as e:
+            return {"share_link_error": str(e)}
+
+    async def no_share_link() -> Dict[str, Any]:
+        return {}
+
+    # The share link does not depend on the transcript: fetch both at once.
+    # Without segments the collector skips loading them altogether.
+    transcript, share_result = await asyncio.gather(
+        make_request(
+            "GET",
+            f"{BASE_URL}/transcripts/{data.meeting_platform}/{data.meeting_id}",
+            api_key,
+            params=None if data.include_segments else {"include_segments": "false"},
+        ),
+        create_share_link() if data.include_share_link else no_share_link(),
     )
 
     result: Dict[str, Any] = dict(transcript) if isinstance(transcript, dict) else {"transcript": transcript}
@@ -568,6 +636,7 @@ async def get_meeting_bundle(
         result.pop("recordings", None)
 
     if data.include_media_download_urls and isinstance(result, dict):
+        targets = []
         recs = result.get("recordings")
         if isinstance(recs, list):
             for rec in recs:
@@ -583,23 +652,14 @@ async def get_meeting_bundle(
                     mf_id = mf.get("id")
                     if not mf_id:
                         continue
-                    mf["download"] = await get_recording_media_download(int(rid), int(mf_id), api_key)
+                    targets.append((mf, int(rid), int(mf_id)))
+        downloads = await gather_bounded(
+            get_recording_media_download(rid, mf_id, api_key) for _, rid, mf_id in targets
+        )
+        for (mf, _, _), download in zip(targets, downloads):
+            mf["download"] = download
 
-    if data.include_share_link:
-        share_args: Dict[str, Any] = {}
-        if data.share_ttl_seconds is not None:
-            share_args["ttl_seconds"] = data.share_ttl_seconds
-        # Best-effort: if share link creation fails, return the rest of the bundle.
-        try:
-            share = await make_request(
-                "POST",
-                f"{BASE_URL}/transcripts/{data.meeting_platform}/{data.meeting_id}/share",
-                api_key,
-                params=share_args or None,
-            )
-            result["share_link"] = share
-        except Exception as e:
-            result["share_link_error"] = str(e)
+    result.update(share_result)
 
     return result
 
@@ -0,0 +1,89 @@
+"""
+Unit tests for get_meeting_bundle fan-out against a mocked API gateway.
+
+Run with: pytest services/mcp/test_meeting_bundle.py -v
+"""
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+import main
+from main import MeetingBundleRequest, gather_bounded
+
+
+def _transcript(recordings: int, files: int):
+    return {
+        "id": 1,
+        "status": "completed",
+        "segments": [],
+        "recordings": [
+            {"id": r, "media_files": [{"id": r * 100 + f} for f in range(files)]} for r in range(1, recordings + 1)
+        ],
+    }
+
+
+def _run_bundle(request: MeetingBundleRequest, handler):
+    async def scenario():
+        main.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await main.get_meeting_bundle(request, api_key="key")
+        finally:
+            await main.http_client.aclose()
+            main.http_client = None
+
+    return asyncio.run(scenario())
+
+
+def test_bundle_projects_out_segments_and_resolves_downloads_concurrently():
+    seen = []
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request: httpx.Request):
+        seen.append((request.method, request.url.path, dict(request.url.params)))
+        if request.url.path.endswith("/download"):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200, json={"download_url": f"/raw{request.url.path}"})
+        if request.url.path.endswith("/share"):
+            return httpx.Response(200, json={"url": "https://share"})
+        return httpx.Response(200, json=_transcript(recordings=3, files=4))
+
+    bundle = _run_bundle(
+        MeetingBundleRequest(meeting_platform="google_meet", meeting_id="abc-defg-hij", include_media_download_urls=True),
+        handler,
+    )
+
+    transcript_calls = [params for method, path, params in seen if path == "/transcripts/google_meet/abc-defg-hij"]
+    assert transcript_calls == [{"include_segments": "false"}]
+    assert "segments" not in bundle
+    assert bundle["share_link"] == {"url": "https://share"}
+    downloads = [mf["download"]["download_url"] for rec in bundle["recordings"] for mf in rec["media_files"]]
+    assert len(downloads) == 12 and downloads[0].startswith(main.BASE_URL)
+    assert 1 < in_flight["max"] <= main.FANOUT_CONCURRENCY
+
+
+def test_bundle_keeps_share_link_failure_best_effort():
+    def handler(request: httpx.Request):
+        if request.url.path.endswith("/share"):
+            return httpx.Response(500, json={"detail": "boom"})
+        return httpx.Response(200, json=_transcript(recordings=0, files=0))
+
+    bundle = _run_bundle(
+        MeetingBundleRequest(meeting_platform="google_meet", meeting_id="abc-defg-hij", include_segments=True),
+        handler,
+    )
+    assert "share_link_error" in bundle and bundle["segments"] == []
+
+
+def test_gather_bounded_keeps_order():
+    async def value(i):
+        await asyncio.sleep(0.001 * (5 - i))
+        return i
+
+    assert asyncio.run(gather_bounded((value(i) for i in range(5)), limit=2)) == [0, 1, 2, 3, 4]
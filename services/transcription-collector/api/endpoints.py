@@ -6,13 +6,16 @@ from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-from sqlalchemy import select, and_, func, distinct, text
+from sqlalchemy import select, and_, or_, func, distinct, text
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as aioredis
 
 from shared_models.database import get_db, async_session_local
-from shared_models.models import User, Meeting, Transcription, MeetingSession, Recording
+from shared_models.auth_cache import auth_cache
+from shared_models.models import JOB_SESSION_UID_MARKER, User, Meeting, Transcription, MeetingSession, Recording
+from shared_models.partitions import transcription_partition_clause
 from shared_models.storage import create_storage_client
 from shared_models.schemas import (
     HealthResponse,
@@ -29,6 +32,7 @@ from shared_models.schemas import (
 from config import IMMUTABILITY_THRESHOLD
 from filters import TranscriptionFilter
 from api.auth import get_current_user
+from streaming.processors import STAGES
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -149,13 +153,14 @@ class WsAuthorizeSubscribeResponse(BaseModel):
 
 
 async def _get_full_transcript_segments(
-    internal_meeting_id: int,
+    meeting: Meeting,
     db: AsyncSession,
     redis_c: aioredis.Redis
 ) -> List[TranscriptionSegment]:
     """
     Core logic to fetch and merge transcript segments from PG and Redis.
     """
+    internal_meeting_id = meeting.id
     logger.debug(f"[_get_full_transcript_segments] Fetching for meeting ID {internal_meeting_id}")
     
     # 1. Fetch session start times for this meeting
@@ -166,8 +171,12 @@ async def _get_full_transcript_segments(
     if not session_times:
         logger.warning(f"[_get_full_transcript_segments] No session start times found in DB for meeting {internal_meeting_id}.")
 
-    # 2. Fetch transcript segments from PostgreSQL (immutable segments)
-    stmt_transcripts = select(Transcription).where(Transcription.meeting_id == internal_meeting_id)
+    # 2. Fetch transcript segments from PostgreSQL (immutable segments), from the meeting's partition only.
+    #    Segments of recording transcription jobs are served by bot-manager (/transcription-jobs/{id}/segments).
+    stmt_transcripts = select(Transcription).where(
+        transcription_partition_clause(meeting),
+        or_(Transcription.session_uid.is_(None), Transcription.session_uid.notlike(f"%{JOB_SESSION_UID_MARKER}%")),
+    )
     result_transcripts = await db.execute(stmt_transcripts)
     db_segments = result_transcripts.scalars().all()
 
@@ -408,6 +417,16 @@ async def health_check(request: Request, db: AsyncSession = Depends(get_db)):
         timestamp=datetime.now().isoformat()
     )
 
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Live-path stage latency histograms in the Prometheus text format."""
+    return STAGES.render()
+
+@router.get("/internal/auth-cache/stats", include_in_schema=False)
+async def auth_cache_stats():
+    """API-token auth cache hit-rate counters for this replica."""
+    return auth_cache.stats()
+
 @router.get("/meetings", 
             response_model=MeetingListResponse,
             summary="Get list of all meetings for the current user",
@@ -431,6 +450,7 @@ async def get_transcript_by_native_id(
     native_meeting_id: str,
     request: Request, # Added for redis_client access
     meeting_id: Optional[int] = Query(None, description="Optional specific database meeting ID. If provided, returns that exact meeting. If not provided, returns the latest meeting for the platform/native_meeting_id combination."),
+    include_segments: bool = Query(True, description="If false, segments are not loaded and an empty list is returned (meeting details, notes and recordings only)."),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -484,9 +504,11 @@ async def get_transcript_by_native_id(
     internal_meeting_id = meeting.id
     logger.debug(f"[API] Found meeting record ID {internal_meeting_id}, fetching segments...")
 
-    sorted_segments = await _get_full_transcript_segments(internal_meeting_id, db, redis_c)
-    
-    logger.info(f"[API Meet {internal_meeting_id}] Merged and sorted into {len(sorted_segments)} total segments.")
+    if include_segments:
+        sorted_segments = await _get_full_transcript_segments(meeting, db, redis_c)
+        logger.info(f"[API Meet {internal_meeting_id}] Merged and sorted into {len(sorted_segments)} total segments.")
+    else:
+        sorted_segments = []
     
     meeting_details = MeetingResponse.model_validate(meeting)
     response_data = meeting_details.model_dump()
@@ -570,7 +592,7 @@ async def get_transcript_internal(
             detail=f"Meeting with ID {meeting_id} not found."
         )
         
-    segments = await _get_full_transcript_segments(meeting_id, db, redis_c)
+    segments = await _get_full_transcript_segments(meeting, db, redis_c)
     return segments
 
 @router.patch("/meetings/{platform}/{native_meeting_id}",
@@ -722,7 +744,7 @@ async def delete_meeting(
     logger.info(f"[API] User {current_user.id} purging transcripts/recordings and anonymizing meeting {internal_meeting_id}")
     
     # Delete transcripts from PostgreSQL
-    stmt_transcripts = select(Transcription).where(Transcription.meeting_id == internal_meeting_id)
+    stmt_transcripts = select(Transcription).where(transcription_partition_clause(meeting))
     result_transcripts = await db.execute(stmt_transcripts)
     transcripts = result_transcripts.scalars().all()
     
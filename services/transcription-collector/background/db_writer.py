@@ -9,8 +9,16 @@ import redis.asyncio as aioredis
 
 from shared_models.database import async_session_local
 from shared_models.models import Transcription, Meeting
+from shared_models.partitions import MISSING_KEY, ensure_transcription_partitions, meeting_partition_keys
+from shared_models.database import engine
 # No schemas needed directly by these functions as they create Transcription objects
-from config import BACKGROUND_TASK_INTERVAL, IMMUTABILITY_THRESHOLD, REDIS_SPEAKER_EVENT_KEY_PREFIX
+from config import (
+    BACKGROUND_TASK_INTERVAL,
+    IMMUTABILITY_THRESHOLD,
+    REDIS_SPEAKER_EVENT_KEY_PREFIX,
+    TRANSCRIPTION_PARTITION_CHECK_INTERVAL_S,
+    TRANSCRIPTION_PARTITION_MONTHS_AHEAD,
+)
 from filters import TranscriptionFilter
 # Speaker re-mapping before persistence
 from mapping.speaker_mapper import (
@@ -25,10 +33,11 @@ from mapping.speaker_mapper import (
 logger = logging.getLogger(__name__)
 
 # This helper is used by process_redis_to_postgres
-def create_transcription_object(meeting_id: int, start: float, end: float, text: str, language: Optional[str], session_uid: Optional[str], mapped_speaker_name: Optional[str]) -> Transcription:
+def create_transcription_object(meeting_id: int, start: float, end: float, text: str, language: Optional[str], session_uid: Optional[str], mapped_speaker_name: Optional[str], meeting_created_at: datetime = MISSING_KEY) -> Transcription:
     """Creates a Transcription ORM object without adding/committing."""
     return Transcription(
         meeting_id=meeting_id,
+        meeting_created_at=meeting_created_at,
         start_time=start,
         end_time=end,
         text=text,
@@ -65,6 +74,8 @@ async def process_redis_to_postgres(redis_c: aioredis.Redis, local_transcription
             segments_to_delete_from_redis: Dict[int, Set[str]] = {}  
             
             async with async_session_local() as db:
+                # Partition key of every active meeting, in one query
+                partition_keys = await meeting_partition_keys(db, [int(mid) for mid in meeting_ids if str(mid).isdigit()])
                 for meeting_id_str in meeting_ids:
                     try:
                         meeting_id = int(meeting_id_str)
@@ -168,7 +179,8 @@ async def process_redis_to_postgres(redis_c: aioredis.Redis, local_transcription
                                             text=segment_data['text'],
                                             language=segment_data.get('language'),
                                             session_uid=segment_session_uid,
-                                            mapped_speaker_name=mapped_speaker_name
+                                            mapped_speaker_name=mapped_speaker_name,
+                                            meeting_created_at=partition_keys.get(meeting_id, MISSING_KEY),
                                         )
                                         batch_to_store.append(new_transcription)
                                     segments_to_delete_from_redis.setdefault(meeting_id, set()).add(start_time_str)
@@ -230,4 +242,19 @@ async def process_redis_to_postgres(redis_c: aioredis.Redis, local_transcription
              await asyncio.sleep(5) 
         except Exception as e:
             logger.error(f"Unhandled error in Redis-to-PostgreSQL processor: {e}", exc_info=True)
-            await asyncio.sleep(BACKGROUND_TASK_INTERVAL) 
\ No newline at end of file
+            await asyncio.sleep(BACKGROUND_TASK_INTERVAL)
+
+
+async def maintain_transcription_partitions():
+    """Background task that keeps the monthly transcriptions partitions created ahead of time."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                created = await ensure_transcription_partitions(conn, months_ahead=TRANSCRIPTION_PARTITION_MONTHS_AHEAD)
+            logger.info(f"Transcription partitions ensured: {', '.join(created)}")
+        except asyncio.CancelledError:
+            logger.info("Transcription partition maintenance task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error ensuring transcription partitions: {e}", exc_info=True)
+        await asyncio.sleep(TRANSCRIPTION_PARTITION_CHECK_INTERVAL_S)
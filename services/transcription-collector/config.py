@@ -7,18 +7,26 @@ REDIS_STREAM_READ_COUNT = int(os.environ.get("REDIS_STREAM_READ_COUNT", "10"))
 REDIS_STREAM_BLOCK_MS = int(os.environ.get("REDIS_STREAM_BLOCK_MS", "2000"))  # 2 seconds
 # Use a fixed consumer name, potentially add hostname later if scaling replicas
 CONSUMER_NAME = os.environ.get("POD_NAME", "collector-main")  # Get POD_NAME from env if avail (k8s), else fixed
-PENDING_MSG_TIMEOUT_MS = 60000  # Milliseconds: Timeout after which pending messages are considered stale (e.g., 1 minute)
+PENDING_MSG_TIMEOUT_MS = int(os.environ.get("PENDING_MSG_TIMEOUT_MS", "60000"))  # Milliseconds: Timeout after which pending messages are considered stale (e.g., 1 minute)
 
 # Configuration for Speaker Events Stream (NEW)
 REDIS_SPEAKER_EVENTS_STREAM_NAME = os.environ.get("REDIS_SPEAKER_EVENTS_STREAM_NAME", "speaker_events_relative")
 REDIS_SPEAKER_EVENTS_CONSUMER_GROUP = os.environ.get("REDIS_SPEAKER_EVENTS_CONSUMER_GROUP", "collector_speaker_group")
 REDIS_SPEAKER_EVENT_KEY_PREFIX = os.environ.get("REDIS_SPEAKER_EVENT_KEY_PREFIX", "speaker_events") # For sorted sets
 REDIS_SPEAKER_EVENT_TTL = int(os.environ.get("REDIS_SPEAKER_EVENT_TTL", "86400")) # 24 hours default TTL for speaker events sorted sets
+REDIS_SPEAKER_EVENT_SESSIONS_KEY = os.environ.get("REDIS_SPEAKER_EVENT_SESSIONS_KEY", "speaker_event_sessions")  # Set of session uids with a speaker events sorted set
+SPEAKER_EVENT_LOOKBACK_MS = int(os.environ.get("SPEAKER_EVENT_LOOKBACK_MS", "600000"))  # Closed speaker turns older than this (behind the session's latest event) are pruned
+
+# Stream maintenance: stale reclaim for both streams, trimming of acknowledged entries
+STREAM_MAINTENANCE_INTERVAL_S = int(os.environ.get("STREAM_MAINTENANCE_INTERVAL_S", "30"))  # seconds
+STREAM_MAXLEN = int(os.environ.get("STREAM_MAXLEN", "0"))  # Approximate hard cap on stream length, 0 = trim acknowledged entries only
 
 # Configuration for background processing
 BACKGROUND_TASK_INTERVAL = int(os.environ.get("BACKGROUND_TASK_INTERVAL", "10"))  # seconds
 IMMUTABILITY_THRESHOLD = int(os.environ.get("IMMUTABILITY_THRESHOLD", "30"))  # seconds
 REDIS_SEGMENT_TTL = int(os.environ.get("REDIS_SEGMENT_TTL", "3600"))  # 1 hour default TTL for Redis segments
+TRANSCRIPTION_PARTITION_MONTHS_AHEAD = int(os.environ.get("TRANSCRIPTION_PARTITION_MONTHS_AHEAD", "2"))  # monthly transcriptions partitions kept created ahead
+TRANSCRIPTION_PARTITION_CHECK_INTERVAL_S = int(os.environ.get("TRANSCRIPTION_PARTITION_CHECK_INTERVAL_S", "86400"))  # seconds
 
 # Logging configuration
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
@@ -10,6 +10,7 @@ from typing import Optional
 
 from shared_models.database import get_db, init_db
 from shared_models.models import Meeting
+from shared_models.auth_cache import auth_cache
 from filters import TranscriptionFilter
 from config import (
     REDIS_STREAM_NAME,
@@ -25,11 +26,13 @@ from config import (
     REDIS_PORT,
     REDIS_PASSWORD,
     REDIS_SPEAKER_EVENTS_STREAM_NAME,
-    REDIS_SPEAKER_EVENTS_CONSUMER_GROUP
+    REDIS_SPEAKER_EVENTS_CONSUMER_GROUP,
+    STREAM_MAINTENANCE_INTERVAL_S
 )
 from api.endpoints import router as api_router
 from streaming.consumer import claim_stale_messages, consume_redis_stream, consume_speaker_events_stream
-from background.db_writer import process_redis_to_postgres
+from background.db_writer import maintain_transcription_partitions, process_redis_to_postgres
+from streaming.maintenance import maintain_redis_streams
 
 app = FastAPI(
     title="Transcription Collector",
@@ -54,10 +57,12 @@ transcription_filter = TranscriptionFilter()
 redis_to_pg_task = None
 stream_consumer_task = None
 speaker_stream_consumer_task = None
+partition_task = None
+stream_maintenance_task = None
 
 @app.on_event("startup")
 async def startup():
-    global redis_client, redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task, transcription_filter
+    global redis_client, redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task, partition_task, stream_maintenance_task, transcription_filter
     
     logger.info(f"Connecting to Redis at {REDIS_HOST}:{REDIS_PORT}")
     temp_redis_client = aioredis.Redis(
@@ -71,6 +76,7 @@ async def startup():
     redis_client = temp_redis_client
     app.state.redis_client = redis_client
     logger.info("Redis connection successful.")
+    await auth_cache.attach_redis(redis_client)
     
     try:
         logger.info(f"Ensuring Redis Stream group '{REDIS_CONSUMER_GROUP}' exists for stream '{REDIS_STREAM_NAME}'...")
@@ -109,6 +115,8 @@ async def startup():
     
     await claim_stale_messages(redis_client)
     
+    partition_task = asyncio.create_task(maintain_transcription_partitions())
+    
     redis_to_pg_task = asyncio.create_task(process_redis_to_postgres(redis_client, transcription_filter))
     logger.info(f"Redis-to-PostgreSQL task started (Interval: {BACKGROUND_TASK_INTERVAL}s, Threshold: {IMMUTABILITY_THRESHOLD}s)")
     
@@ -119,11 +127,14 @@ async def startup():
     speaker_stream_consumer_task = asyncio.create_task(consume_speaker_events_stream(redis_client))
     logger.info(f"Speaker Events Redis Stream consumer task started (Stream: {REDIS_SPEAKER_EVENTS_STREAM_NAME}, Group: {REDIS_SPEAKER_EVENTS_CONSUMER_GROUP}, Consumer: {CONSUMER_NAME + '-speaker'})")
 
+    stream_maintenance_task = asyncio.create_task(maintain_redis_streams(redis_client))
+    logger.info(f"Redis stream maintenance task started (Interval: {STREAM_MAINTENANCE_INTERVAL_S}s)")
+
 @app.on_event("shutdown")
 async def shutdown():
     logger.info("Application shutting down...")
     # Cancel background tasks
-    tasks_to_cancel = [redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task]
+    tasks_to_cancel = [redis_to_pg_task, stream_consumer_task, speaker_stream_consumer_task, partition_task, stream_maintenance_task]
     for i, task in enumerate(tasks_to_cancel):
         if task and not task.done():
             task.cancel()
@@ -134,6 +145,8 @@ async def shutdown():
             except Exception as e:
                 logger.error(f"Error during background task {i+1} cancellation: {e}", exc_info=True)
     
+    await auth_cache.detach_redis()
+
     # Close Redis connection
     if redis_client:
         await redis_client.close()
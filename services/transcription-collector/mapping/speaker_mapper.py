@@ -226,6 +226,34 @@ def map_speaker_to_segment(
         "status": mapping_status
     } 
 
+def prunable_speaker_events(speaker_events: List[Tuple[str, float]]) -> List[str]:
+    """
+    Members of a chronologically sorted (JSON string, timestamp_ms) event list
+    that can be dropped without changing any later mapping.
+
+    ``map_speaker_to_segment`` only keeps the latest SPEAKER_START of each
+    participant that no SPEAKER_END has closed, so a closed turn makes no
+    difference to segments after it. Everything but the still-open STARTs is
+    prunable; unparsable events are too.
+    """
+    open_starts: List[Dict[str, Any]] = []
+    prunable: List[str] = []
+    for event_json, _ in speaker_events:
+        try:
+            event = json.loads(event_json)
+        except json.JSONDecodeError:
+            prunable.append(event_json)
+            continue
+        matching = [entry for entry in open_starts if _events_match_participant(entry["event"], event)]
+        for entry in matching:
+            open_starts.remove(entry)
+            prunable.append(entry["json"])
+        if event.get("event_type") == "SPEAKER_START":
+            open_starts.append({"event": event, "json": event_json})
+        else:
+            prunable.append(event_json)
+    return prunable
+
 # NEW Utility function to centralize fetching and mapping logic
 async def get_speaker_mapping_for_segment(
     redis_c: 'aioredis.Redis', # Forward reference for type hint
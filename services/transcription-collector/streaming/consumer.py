@@ -2,7 +2,7 @@ import logging
 import asyncio
 import redis.asyncio as aioredis
 import redis # For redis.exceptions
-from typing import Dict, Any # For message_data type hint if being very specific
+from typing import Any, Awaitable, Callable, Dict
 
 from config import (
     REDIS_STREAM_NAME,
@@ -18,93 +18,112 @@ from streaming.processors import process_stream_message, process_speaker_event_m
 
 logger = logging.getLogger(__name__)
 
-async def claim_stale_messages(redis_c: aioredis.Redis):
-    """Claims and processes stale messages from the Redis Stream for the current consumer."""
+SPEAKER_CONSUMER_NAME = f"{CONSUMER_NAME}-speaker"
+STALE_CLAIM_BATCH = 100
+
+async def claim_stale_messages(
+    redis_c: aioredis.Redis,
+    stream: str = REDIS_STREAM_NAME,
+    group: str = REDIS_CONSUMER_GROUP,
+    consumer: str = CONSUMER_NAME,
+    processor: Callable[[str, Dict[str, Any], aioredis.Redis], Awaitable[bool]] = process_stream_message,
+):
+    """
+    Claims and processes the stream's messages that have been pending longer
+    than PENDING_MSG_TIMEOUT_MS, e.g. those of a consumer that died.
+
+    Walks the whole pending list of the group with XAUTOCLAIM, one batch at a
+    time. Entries trimmed from the stream while pending are acknowledged.
+    """
     messages_claimed_total = 0
     processed_claim_count = 0
     acked_claim_count = 0
     error_claim_count = 0
 
-    logger.info(f"Starting stale message check (consumer: {CONSUMER_NAME}, idle > {PENDING_MSG_TIMEOUT_MS}ms).")
+    logger.debug(f"Starting stale message check on '{stream}' (consumer: {consumer}, idle > {PENDING_MSG_TIMEOUT_MS}ms).")
 
     try:
+        cursor = '0-0'
+        trimmed_pending = False
         while True:
-            pending_details = await redis_c.xpending_range(
-                name=REDIS_STREAM_NAME,
-                groupname=REDIS_CONSUMER_GROUP,
-                min='-',
-                max='+',
-                count=100 
+            response = await redis_c.xautoclaim(
+                name=stream,
+                groupname=group,
+                consumername=consumer,
+                min_idle_time=PENDING_MSG_TIMEOUT_MS,
+                start_id=cursor,
+                count=STALE_CLAIM_BATCH,
             )
-
-            if not pending_details:
-                logger.debug("No more pending messages found for the group during stale check.")
-                break
-
-            stale_candidates = [
-                msg for msg in pending_details
-                if msg.get('idle', 0) > PENDING_MSG_TIMEOUT_MS
-            ]
-
-            if not stale_candidates:
-                logger.debug("No messages found exceeding idle time in the current pending batch.")
-                if len(pending_details) < 100:
-                    break 
-                else:
-                    logger.debug("Checked 100 pending messages, none were stale enough. More might exist but stopping check for this run to avoid long loops on very busy streams.")
-                    break
-            
-            stale_message_ids = [msg['message_id'] for msg in stale_candidates]
-            logger.info(f"Found {len(stale_message_ids)} potentially stale message(s) to claim: {stale_message_ids}")
-
-            if stale_message_ids:
-                claimed_messages = await redis_c.xclaim(
-                    name=REDIS_STREAM_NAME,
-                    groupname=REDIS_CONSUMER_GROUP,
-                    consumername=CONSUMER_NAME,
-                    min_idle_time=PENDING_MSG_TIMEOUT_MS, 
-                    message_ids=stale_message_ids,
-                )
-                
-                messages_claimed_now = len(claimed_messages)
-                messages_claimed_total += messages_claimed_now
-                if messages_claimed_now > 0:
-                    logger.info(f"Successfully claimed {messages_claimed_now} stale message(s): {[msg[0].decode('utf-8') for msg in claimed_messages]}")
-
-                for message_id_bytes, message_data_bytes in claimed_messages:
-                    message_id_str = message_id_bytes.decode('utf-8') if isinstance(message_id_bytes, bytes) else message_id_bytes
-                    message_data_decoded: Dict[str, Any] = {}
-                    if isinstance(message_data_bytes, dict):
-                        # Already decoded
-                        message_data_decoded = {k: v for k, v in message_data_bytes.items()}
+            cursor, claimed_messages = response[0], response[1]
+            # Redis 7 lists the IDs of deleted entries separately and drops them from the PEL
+            deleted_ids = list(response[2]) if len(response) > 2 else []
+
+            ids_to_ack = []
+            for message_id, message_data in claimed_messages:
+                messages_claimed_total += 1
+                if not message_data:
+                    # Redis 6.2 returns trimmed entries as nil, without their ID
+                    trimmed_pending = True
+                    continue
+                message_id_str = message_id.decode('utf-8') if isinstance(message_id, bytes) else message_id
+                message_data_decoded: Dict[str, Any] = {
+                    k.decode('utf-8') if isinstance(k, bytes) else k: v.decode('utf-8') if isinstance(v, bytes) else v
+                    for k, v in message_data.items()
+                }
+
+                logger.info(f"Processing claimed stale message {message_id_str} from '{stream}'...")
+                processed_claim_count += 1
+                try:
+                    if await processor(message_id_str, message_data_decoded, redis_c):
+                        ids_to_ack.append(message_id_str)
                     else:
-                        # Need to decode
-                        message_data_decoded = {k.decode('utf-8'): v.decode('utf-8') for k, v in message_data_bytes.items()}
-                    
-                    logger.info(f"Processing claimed stale message {message_id_str}...")
-                    processed_claim_count += 1
-                    try:
-                        success = await process_stream_message(message_id_str, message_data_decoded, redis_c)
-                        if success:
-                            logger.info(f"Successfully processed claimed stale message {message_id_str}. Acknowledging.")
-                            await redis_c.xack(REDIS_STREAM_NAME, REDIS_CONSUMER_GROUP, message_id_str)
-                            acked_claim_count += 1
-                        else:
-                            logger.warning(f"Processing failed for claimed stale message {message_id_str}. Not acknowledging.")
-                            error_claim_count += 1
-                    except Exception as e:
-                        logger.error(f"Error processing claimed stale message {message_id_str}: {e}", exc_info=True)
+                        logger.warning(f"Processing failed for claimed stale message {message_id_str}. Not acknowledging.")
                         error_claim_count += 1
-            
-            if not stale_candidates or len(pending_details) < 100: # Break if no stale candidates or if we didn't get a full batch of pending messages
+                except Exception as e:
+                    logger.error(f"Error processing claimed stale message {message_id_str}: {e}", exc_info=True)
+                    error_claim_count += 1
+
+            ids_to_ack.extend(deleted_ids)
+            if ids_to_ack:
+                await redis_c.xack(stream, group, *ids_to_ack)
+                acked_claim_count += len(ids_to_ack)
+
+            cursor = cursor.decode('utf-8') if isinstance(cursor, bytes) else cursor
+            if cursor == '0-0':
                 break
 
+        if trimmed_pending:
+            acked_claim_count += await _ack_trimmed_pending(redis_c, stream, group)
+
     except redis.exceptions.RedisError as e:
-        logger.error(f"Redis error during stale message claiming: {e}", exc_info=True)
+        logger.error(f"Redis error during stale message claiming on '{stream}': {e}", exc_info=True)
     except Exception as e:
-        logger.error(f"Unexpected error during stale message claiming: {e}", exc_info=True)
+        logger.error(f"Unexpected error during stale message claiming on '{stream}': {e}", exc_info=True)
 
-    logger.info(f"Stale message check finished. Total claimed: {messages_claimed_total}, Processed: {processed_claim_count}, Acked: {acked_claim_count}, Errors: {error_claim_count}")
+    if messages_claimed_total:
+        logger.info(f"Stale message check on '{stream}' finished. Total claimed: {messages_claimed_total}, Processed: {processed_claim_count}, Acked: {acked_claim_count}, Errors: {error_claim_count}")
+
+async def _ack_trimmed_pending(redis_c: aioredis.Redis, stream: str, group: str) -> int:
+    """Acknowledges the group's pending entries that are no longer in the stream."""
+    first = await redis_c.xrange(stream, count=1)
+    # Exclusive range end: everything before the oldest remaining entry
+    upper = f"({first[0][0]}" if first else '+'
+    acked = 0
+    while True:
+        pending = await redis_c.xpending_range(stream, group, min='-', max=upper, count=STALE_CLAIM_BATCH)
+        if not pending:
+            return acked
+        acked += await redis_c.xack(stream, group, *[msg['message_id'] for msg in pending])
+
+async def claim_stale_speaker_events(redis_c: aioredis.Redis):
+    """Claims and processes stale messages of the speaker events stream."""
+    await claim_stale_messages(
+        redis_c,
+        stream=REDIS_SPEAKER_EVENTS_STREAM_NAME,
+        group=REDIS_SPEAKER_EVENTS_CONSUMER_GROUP,
+        consumer=SPEAKER_CONSUMER_NAME,
+        processor=process_speaker_event_message,
+    )
 
 async def consume_redis_stream(redis_c: aioredis.Redis):
     """Background task to consume transcription segments from Redis Stream."""
@@ -168,9 +187,8 @@ async def consume_redis_stream(redis_c: aioredis.Redis):
 
 async def consume_speaker_events_stream(redis_c: aioredis.Redis):
     """Background task to consume speaker events from Redis Stream."""
-    # Note: Using CONSUMER_NAME + '-speaker' to differentiate if needed, or could be shared if logic allows.
-    # Stale message claiming for this stream is not implemented here, but could be added similarly to claim_stale_messages.
-    consumer_name_speaker = f"{CONSUMER_NAME}-speaker"
+    # Stale messages of this stream are reclaimed by streaming.maintenance (claim_stale_speaker_events)
+    consumer_name_speaker = SPEAKER_CONSUMER_NAME
     last_processed_id = '>' 
     logger.info(f"Starting speaker event consumer loop for '{consumer_name_speaker}', reading new messages ('>')...")
 
@@ -0,0 +1,129 @@
+"""
+Keeps the collector's Redis footprint bounded while meetings run.
+
+Every STREAM_MAINTENANCE_INTERVAL_S seconds ``maintain_redis_streams``:
+
+- reclaims and processes messages of both streams that a consumer read but
+  never acknowledged (e.g. because its replica died);
+- trims each stream up to the oldest entry some consumer group still needs,
+  i.e. the oldest pending entry or, with none pending, the last delivered
+  one. Trimming is approximate (``MINID ~``) so Redis only drops whole
+  macro nodes. STREAM_MAXLEN, when set, additionally caps the length for
+  the case of a group that stopped reading altogether;
+- prunes each active session's speaker events sorted set of the turns that
+  closed more than SPEAKER_EVENT_LOOKBACK_MS before the session's latest
+  event. Speakers who are still talking keep their SPEAKER_START, so the
+  mapping of later segments does not change.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from config import (
+    BACKGROUND_TASK_INTERVAL,
+    IMMUTABILITY_THRESHOLD,
+    REDIS_SPEAKER_EVENT_KEY_PREFIX,
+    REDIS_SPEAKER_EVENT_SESSIONS_KEY,
+    REDIS_SPEAKER_EVENTS_STREAM_NAME,
+    REDIS_STREAM_NAME,
+    SPEAKER_EVENT_LOOKBACK_MS,
+    STREAM_MAINTENANCE_INTERVAL_S,
+    STREAM_MAXLEN,
+)
+from mapping.speaker_mapper import prunable_speaker_events
+from streaming.consumer import claim_stale_messages, claim_stale_speaker_events
+
+logger = logging.getLogger(__name__)
+
+# Segments are mapped again when they become immutable, so never prune what that pass may still read
+MIN_SPEAKER_EVENT_LOOKBACK_MS = 2 * (IMMUTABILITY_THRESHOLD + BACKGROUND_TASK_INTERVAL) * 1000
+
+
+def _stream_id_key(stream_id: str):
+    ms, _, seq = stream_id.partition('-')
+    return int(ms), int(seq or 0)
+
+
+async def acknowledged_offset(redis_c: aioredis.Redis, stream: str) -> Optional[str]:
+    """
+    ID below which every entry of ``stream`` has been acknowledged by every
+    consumer group, or None if the stream has no group.
+    """
+    groups = await redis_c.xinfo_groups(stream)
+    if not groups:
+        return None
+    offsets = []
+    for group in groups:
+        if group.get('pending'):
+            summary = await redis_c.xpending(stream, group['name'])
+            offsets.append(summary['min'])
+        else:
+            offsets.append(group['last-delivered-id'])
+    return min(offsets, key=_stream_id_key)
+
+
+async def trim_stream(redis_c: aioredis.Redis, stream: str) -> int:
+    """Drops the acknowledged head of ``stream``; returns the number of entries removed."""
+    offset = await acknowledged_offset(redis_c, stream)
+    if offset is None:
+        logger.debug(f"Stream '{stream}' has no consumer group; not trimming.")
+        return 0
+    removed = await redis_c.xtrim(stream, minid=offset, approximate=True)
+    if STREAM_MAXLEN > 0:
+        capped = await redis_c.xtrim(stream, maxlen=STREAM_MAXLEN, approximate=True)
+        if capped:
+            logger.warning(f"Stream '{stream}' exceeded STREAM_MAXLEN={STREAM_MAXLEN}; dropped {capped} entries not acknowledged by every group.")
+        removed += capped
+    return removed
+
+
+async def prune_speaker_events(redis_c: aioredis.Redis, session_uid: str, lookback_ms: float) -> int:
+    """Removes the closed turns of a session's speaker events older than ``lookback_ms``."""
+    key = f"{REDIS_SPEAKER_EVENT_KEY_PREFIX}:{session_uid}"
+    latest = await redis_c.zrange(key, -1, -1, withscores=True)
+    if not latest:
+        # Expired or deleted on session_end
+        await redis_c.srem(REDIS_SPEAKER_EVENT_SESSIONS_KEY, session_uid)
+        return 0
+    cutoff = latest[0][1] - lookback_ms
+    if cutoff <= 0:
+        return 0
+    old_events = await redis_c.zrangebyscore(key, '-inf', f'({cutoff}', withscores=True)
+    prunable = prunable_speaker_events(old_events)
+    if prunable:
+        await redis_c.zrem(key, *prunable)
+    return len(prunable)
+
+
+async def prune_speaker_event_sessions(redis_c: aioredis.Redis) -> int:
+    lookback_ms = max(SPEAKER_EVENT_LOOKBACK_MS, MIN_SPEAKER_EVENT_LOOKBACK_MS)
+    pruned = 0
+    async for session_uid in redis_c.sscan_iter(REDIS_SPEAKER_EVENT_SESSIONS_KEY):
+        pruned += await prune_speaker_events(redis_c, session_uid, lookback_ms)
+    return pruned
+
+
+async def maintain_redis_streams(redis_c: aioredis.Redis):
+    """Background task: stale reclaim and trimming of both streams, pruning of speaker events."""
+    while True:
+        try:
+            await claim_stale_messages(redis_c)
+            await claim_stale_speaker_events(redis_c)
+            trimmed = {
+                stream: await trim_stream(redis_c, stream)
+                for stream in (REDIS_STREAM_NAME, REDIS_SPEAKER_EVENTS_STREAM_NAME)
+            }
+            pruned = await prune_speaker_event_sessions(redis_c)
+            if any(trimmed.values()) or pruned:
+                logger.info(f"Redis maintenance: trimmed {trimmed}, pruned {pruned} speaker events")
+        except asyncio.CancelledError:
+            logger.info("Redis stream maintenance task cancelled")
+            break
+        except redis.exceptions.RedisError as e:
+            logger.error(f"Redis error during stream maintenance: {e}", exc_info=True)
+        except Exception as e:
+            logger.error(f"Unexpected error during stream maintenance: {e}", exc_info=True)
+        await asyncio.sleep(STREAM_MAINTENANCE_INTERVAL_S)
@@ -3,6 +3,7 @@ import json
 import uuid
 import os
 import hmac
+import time
 import base64
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List, Tuple
@@ -16,12 +17,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from shared_models.database import async_session_local # For DB sessions
 from shared_models.models import User, Meeting, MeetingSession, APIToken
 from shared_models.schemas import Platform # WhisperLiveData not directly used by these functions from snippet
-from config import REDIS_SEGMENT_TTL, REDIS_SPEAKER_EVENT_KEY_PREFIX, REDIS_SPEAKER_EVENT_TTL # Added new configs (NEW)
+from shared_models.latency import StageLatency
+from config import REDIS_SEGMENT_TTL, REDIS_SPEAKER_EVENT_KEY_PREFIX, REDIS_SPEAKER_EVENT_TTL, REDIS_SPEAKER_EVENT_SESSIONS_KEY # Added new configs (NEW)
 # MODIFIED: Import the new utility function and only necessary statuses/base mapper if still needed elsewhere
 from mapping.speaker_mapper import get_speaker_mapping_for_segment, STATUS_UNKNOWN, STATUS_ERROR # Removed direct map_speaker_to_segment and other statuses if not directly used by this file
 
 logger = logging.getLogger(__name__)
 
+# Live-path stage latencies, served on /metrics (see shared_models/latency.py)
+STAGES = StageLatency("transcription_collector_stage_latency_seconds")
+
 def _b64url_encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
@@ -142,6 +147,7 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
     False if a potentially recoverable error occurred (should not be ACKed).
     """
     payload_json = "" 
+    received_at = time.time()
     try:
         if 'payload' not in message_data:
             logger.warning(f"Message {message_id} missing 'payload' field. Skipping.")
@@ -188,6 +194,7 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
                     session_start_cache_key = f"meeting_session:{session_uid}:start"
                     try:
                         deleted_count = await redis_c.delete(speaker_event_key, session_start_cache_key)
+                        await redis_c.srem(REDIS_SPEAKER_EVENT_SESSIONS_KEY, session_uid)
                         logger.info(f"Processed session_end for UID '{session_uid}'. Deleted speaker events and session start cache from Redis (count: {deleted_count}).")
                         # Note: MeetingSession.session_end_utc is not updated here due to no DB model changes allowed.
                     except redis.exceptions.RedisError as e_redis:
@@ -212,6 +219,10 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
                  logger.warning(f"Transcription message {message_id} payload missing 'segments' field. Skipping. Payload: {payload_json[:200]}...")
                  return True
 
+            timing = stream_data.get("timing") or {}
+            # WhisperLive XADD until this consumer picked the message up
+            STAGES.observe_since("stream_wait", timing.get("sent"), received_at)
+
             segment_count = 0
             hash_key = f"meeting:{internal_meeting_id}:segments"
             segments_to_store = {}
@@ -393,7 +404,9 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
                         pipe.expire(hash_key, REDIS_SEGMENT_TTL)
                         if segments_to_store:
                             pipe.hset(hash_key, mapping=segments_to_store)
+                        write_started = time.time()
                         results = await pipe.execute()
+                        STAGES.observe("hash_write", time.time() - write_started)
                         if any(res is None for res in results): # Simplified critical failure check
                             logger.error(f"Redis pipeline command failed critically for message {message_id}. Results: {results}")
                             return False
@@ -412,10 +425,13 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
                             "type": "transcript.mutable",
                             "meeting": {"id": internal_meeting_id},
                             "payload": {"segments": changed_segments},
-                            "ts": datetime.now(timezone.utc).isoformat()
+                            "ts": datetime.now(timezone.utc).isoformat(),
+                            # Carried to the gateway for its pub/sub and end-to-end stages
+                            "timing": {"ingest": timing.get("ingest"), "published": time.time()},
                         }
                         channel = f"tc:meeting:{internal_meeting_id}:mutable"
                         await redis_c.publish(channel, json.dumps(event_payload))
+                        STAGES.observe("publish", time.time() - event_payload["timing"]["published"])
                         logger.info(f"Published {len(changed_segments)} changed segments to {channel}")
                     except Exception as pub_err:
                         logger.error(f"Failed to publish mutable transcript update for meeting {internal_meeting_id}: {pub_err}")
@@ -423,6 +439,7 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
                     logger.debug(f"No changed segments to publish for meeting {internal_meeting_id} from message {message_id}")
             else:
                 logger.info(f"No valid segments found in message {message_id} for meeting {internal_meeting_id} to store in Redis.")
+            STAGES.observe("process", time.time() - received_at)
             return True
 
     except json.JSONDecodeError as e:
@@ -434,7 +451,8 @@ async def process_stream_message(message_id: str, message_data: Dict[str, Any],
 
 async def process_speaker_event_message(message_id: str, event_data: Dict[str, Any], redis_c: aioredis.Redis) -> bool:
     """Processes a single speaker event message from the Redis stream.
-    Stores the event in a Redis Sorted Set keyed by session_uid.
+    Stores the event in a Redis Sorted Set keyed by session_uid, and records
+    the session in REDIS_SPEAKER_EVENT_SESSIONS_KEY.
     Returns True if processing is considered complete (can be ACKed),
     False if a potentially recoverable error occurred (should not be ACKed).
     """
@@ -462,6 +480,8 @@ async def process_speaker_event_message(message_id: str, event_data: Dict[str, A
         async with redis_c.pipeline(transaction=True) as pipe:
             pipe.zadd(sorted_set_key, {event_payload_json: relative_timestamp_ms})
             pipe.expire(sorted_set_key, REDIS_SPEAKER_EVENT_TTL)
+            # Sessions whose sorted set streaming.maintenance prunes
+            pipe.sadd(REDIS_SPEAKER_EVENT_SESSIONS_KEY, session_uid)
             results = await pipe.execute()
 
         # Check pipeline results (optional, zadd returns num added, expire returns 1 or 0)
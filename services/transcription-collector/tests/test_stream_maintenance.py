@@ -0,0 +1,254 @@
+"""Tests for the collector's stream reclaim/trim and speaker event pruning, against fakeredis."""
+import asyncio
+import json
+import os
+
+for _key, _value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "vexa",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import fakeredis
+
+from config import REDIS_SPEAKER_EVENT_KEY_PREFIX, REDIS_SPEAKER_EVENT_SESSIONS_KEY
+from mapping.speaker_mapper import prunable_speaker_events
+from streaming import consumer, maintenance
+
+STREAM = "segments"
+GROUP = "collector"
+
+
+def _redis(version=(7,)):
+    return fakeredis.FakeAsyncRedis(decode_responses=True, version=version)
+
+
+async def _stream(r, entries=500, group=GROUP):
+    await r.xgroup_create(STREAM, group, id="0", mkstream=True)
+    return [await r.xadd(STREAM, {"payload": str(i)}) for i in range(entries)]
+
+
+async def _deliver(r, count, group=GROUP, consumer_name="dead"):
+    response = await r.xreadgroup(group, consumer_name, {STREAM: ">"}, count=count)
+    return [message_id for message_id, _ in response[0][1]]
+
+
+def _event(name, event_type):
+    return json.dumps({"participant_name": name, "event_type": event_type})
+
+
+# --- acknowledged_offset / trim_stream ----------------------------------------------
+
+def test_acknowledged_offset_without_groups_is_none():
+    async def run():
+        r = _redis()
+        await r.xadd(STREAM, {"payload": "x"})
+        return await maintenance.acknowledged_offset(r, STREAM)
+
+    assert asyncio.run(run()) is None
+
+
+def test_acknowledged_offset_is_last_delivered_id_when_nothing_is_pending():
+    async def run():
+        r = _redis()
+        ids = await _stream(r, 10)
+        delivered = await _deliver(r, 4)
+        await r.xack(STREAM, GROUP, *delivered)
+        return ids, await maintenance.acknowledged_offset(r, STREAM)
+
+    ids, offset = asyncio.run(run())
+    assert offset == ids[3]
+
+
+def test_acknowledged_offset_is_oldest_pending_entry():
+    async def run():
+        r = _redis()
+        ids = await _stream(r, 10)
+        delivered = await _deliver(r, 8)
+        await r.xack(STREAM, GROUP, *delivered[:2], *delivered[5:])
+        return ids, await maintenance.acknowledged_offset(r, STREAM)
+
+    ids, offset = asyncio.run(run())
+    assert offset == ids[2]
+
+
+def test_acknowledged_offset_waits_for_the_lagging_group():
+    async def run():
+        r = _redis()
+        ids = await _stream(r, 10)
+        await r.xgroup_create(STREAM, "lagging", id="0")
+        await r.xack(STREAM, GROUP, *await _deliver(r, 9))
+        await r.xack(STREAM, "lagging", *await _deliver(r, 3, group="lagging"))
+        return ids, await maintenance.acknowledged_offset(r, STREAM)
+
+    ids, offset = asyncio.run(run())
+    assert offset == ids[2]
+
+
+def test_trim_stream_never_removes_unacknowledged_entries():
+    async def run():
+        r = _redis()
+        ids = await _stream(r, 500)
+        await r.xgroup_create(STREAM, "lagging", id="0")
+        delivered = await _deliver(r, 300)
+        await r.xack(STREAM, GROUP, *delivered[:250])
+        await r.xack(STREAM, "lagging", *await _deliver(r, 280, group="lagging"))
+        removed = await maintenance.trim_stream(r, STREAM)
+        remaining = {message_id for message_id, _ in await r.xrange(STREAM)}
+        pending = await r.xpending_range(STREAM, GROUP, min="-", max="+", count=1000)
+        return ids, removed, remaining, [p["message_id"] for p in pending]
+
+    ids, removed, remaining, pending = asyncio.run(run())
+    assert 0 < removed <= 250
+    assert set(ids[250:]) <= remaining
+    assert set(pending) <= remaining
+
+
+def test_trim_stream_leaves_streams_without_groups_alone():
+    async def run():
+        r = _redis()
+        for i in range(200):
+            await r.xadd(STREAM, {"payload": str(i)})
+        return await maintenance.trim_stream(r, STREAM), await r.xlen(STREAM)
+
+    assert asyncio.run(run()) == (0, 200)
+
+
+# --- speaker events ----------------------------------------------------------------
+
+def test_prunable_speaker_events_keeps_open_starts():
+    events = [
+        (_event("A", "SPEAKER_START"), 0),
+        (_event("B", "SPEAKER_START"), 5),
+        (_event("A", "SPEAKER_END"), 10),
+        (_event("A", "SPEAKER_START"), 20),
+        (_event("B", "SPEAKER_START"), 30),
+        ("not json", 35),
+    ]
+    assert prunable_speaker_events(events) == [
+        _event("A", "SPEAKER_START"),
+        _event("A", "SPEAKER_END"),
+        _event("B", "SPEAKER_START"),
+        "not json",
+    ]
+
+
+def test_prunable_speaker_events_drops_every_closed_turn():
+    events = [(_event("A", "SPEAKER_START"), 0), (_event("A", "SPEAKER_END"), 10)]
+    assert prunable_speaker_events(events) == [events[0][0], events[1][0]]
+
+
+def test_prune_speaker_events_keeps_recent_events_and_open_starts():
+    async def run():
+        r = _redis()
+        key = f"{REDIS_SPEAKER_EVENT_KEY_PREFIX}:s1"
+        events = {
+            json.dumps({"participant_name": "A", "event_type": "SPEAKER_START", "n": 1}): 0,
+            json.dumps({"participant_name": "A", "event_type": "SPEAKER_END", "n": 2}): 1_000,
+            json.dumps({"participant_name": "B", "event_type": "SPEAKER_START", "n": 3}): 2_000,
+            json.dumps({"participant_name": "A", "event_type": "SPEAKER_START", "n": 4}): 9_500,
+            json.dumps({"participant_name": "A", "event_type": "SPEAKER_END", "n": 5}): 10_000,
+        }
+        await r.zadd(key, events)
+        await r.sadd(REDIS_SPEAKER_EVENT_SESSIONS_KEY, "s1")
+        pruned = await maintenance.prune_speaker_events(r, "s1", lookback_ms=5_000)
+        kept = [json.loads(member)["n"] for member in await r.zrange(key, 0, -1)]
+        return pruned, kept
+
+    pruned, kept = asyncio.run(run())
+    assert pruned == 2
+    # B is still talking; A's last turn is inside the horizon
+    assert kept == [3, 4, 5]
+
+
+def test_prune_speaker_event_sessions_forgets_finished_sessions():
+    async def run():
+        r = _redis()
+        await r.sadd(REDIS_SPEAKER_EVENT_SESSIONS_KEY, "gone")
+        pruned = await maintenance.prune_speaker_event_sessions(r)
+        return pruned, await r.smembers(REDIS_SPEAKER_EVENT_SESSIONS_KEY)
+
+    assert asyncio.run(run()) == (0, set())
+
+
+# --- stale reclaim -----------------------------------------------------------------
+
+def _claim(r, processed, fail=()):
+    async def processor(message_id, data, redis_c):
+        processed.append(data["payload"])
+        return data["payload"] not in fail
+
+    return consumer.claim_stale_messages(r, stream=STREAM, group=GROUP, consumer="live", processor=processor)
+
+
+def test_claim_stale_messages_processes_and_acks_a_dead_consumers_messages(monkeypatch):
+    monkeypatch.setattr(consumer, "PENDING_MSG_TIMEOUT_MS", 0)
+    monkeypatch.setattr(consumer, "STALE_CLAIM_BATCH", 7)
+    processed = []
+
+    async def run():
+        r = _redis()
+        await _stream(r, 30)
+        await _deliver(r, 20)
+        await _claim(r, processed, fail={"3"})
+        return await r.xpending_range(STREAM, GROUP, min="-", max="+", count=100)
+
+    pending = asyncio.run(run())
+    assert processed == [str(i) for i in range(20)]
+    # A failed message stays pending, now owned by the live consumer
+    assert [(p["consumer"], p["times_delivered"]) for p in pending] == [("live", 2)]
+
+
+def test_claim_stale_messages_acks_trimmed_entries_reported_by_redis_7(monkeypatch):
+    monkeypatch.setattr(consumer, "PENDING_MSG_TIMEOUT_MS", 0)
+    processed = []
+
+    async def run():
+        r = _redis(version=(7,))
+        await _stream(r, 20)
+        await _deliver(r, 10)
+        await r.xtrim(STREAM, maxlen=15, approximate=False)
+        await _claim(r, processed)
+        return (await r.xpending(STREAM, GROUP))["pending"]
+
+    assert asyncio.run(run()) == 0
+    assert processed == [str(i) for i in range(5, 10)]
+
+
+def test_claim_stale_messages_acks_trimmed_entries_on_redis_6_2(monkeypatch):
+    monkeypatch.setattr(consumer, "PENDING_MSG_TIMEOUT_MS", 0)
+
+    async def run():
+        r = _redis()
+        ids = await _stream(r, 20)
+        await _deliver(r, 10)
+        # Redis 6.2 keeps trimmed entries in the PEL and XAUTOCLAIM returns them as nil
+        await r.xdel(STREAM, *ids[:10])
+        nil_entries = [(None, None)] * 10
+
+        async def xautoclaim(*args, **kwargs):
+            return ["0-0", nil_entries]
+
+        r.xautoclaim = xautoclaim
+        await _claim(r, [])
+        return (await r.xpending(STREAM, GROUP))["pending"]
+
+    assert asyncio.run(run()) == 0
+
+
+def test_ack_trimmed_pending_keeps_entries_still_in_the_stream():
+    async def run():
+        r = _redis()
+        ids = await _stream(r, 20)
+        await _deliver(r, 15)
+        await r.xdel(STREAM, *ids[:10])
+        acked = await consumer._ack_trimmed_pending(r, STREAM, GROUP)
+        pending = await r.xpending_range(STREAM, GROUP, min="-", max="+", count=100)
+        return ids, acked, [p["message_id"] for p in pending]
+
+    ids, acked, pending = asyncio.run(run())
+    assert acked == 10
+    assert pending == ids[10:15]
@@ -8,16 +8,22 @@ import time
 import logging
 import asyncio
 import json
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 import numpy as np
 import soundfile as sf
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
 import uvicorn
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.audio import decode_audio
+from model_pool import ModelPool, ModelReplica, ReplicaSpec, parse_replica_specs
+from scheduler import AdmissionScheduler, SchedulerRejected
 # faster-whisper uses CTranslate2 internally (no PyTorch needed)
 
 # Logging
@@ -89,6 +95,10 @@ VAD_FILTER = _env_bool("VAD_FILTER", True)
 VAD_FILTER_THRESHOLD = _env_float("VAD_FILTER_THRESHOLD", 0.5)
 VAD_MIN_SILENCE_DURATION_MS = _env_int("VAD_MIN_SILENCE_DURATION_MS", 160)
 
+# Language hints: callers may send a cached language with `language_hint_confidence`.
+# Hints below this confidence are ignored and the language is detected instead.
+LANGUAGE_HINT_MIN_CONFIDENCE = _env_float("LANGUAGE_HINT_MIN_CONFIDENCE", 0.5)
+
 # Temperature fallback chain
 USE_TEMPERATURE_FALLBACK = _env_bool("USE_TEMPERATURE_FALLBACK", False)
 TEMPERATURE_FALLBACK_CHAIN = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
@@ -151,8 +161,27 @@ app = FastAPI(
     version="1.0.0"
 )
 
-# Global model instance
-model: Optional[WhisperModel] = None
+# Recording jobs: VAD chunks decoded together per batched model call
+JOB_BATCH_SIZE = _env_int("JOB_BATCH_SIZE", 16)
+JOB_DOWNLOAD_TIMEOUT_S = _env_float("JOB_DOWNLOAD_TIMEOUT_S", 60.0)
+
+
+def _audio_url_hosts() -> set:
+    """Object-storage hosts (``host`` or ``host:port``) a job's audio_url may point at."""
+    hosts = set()
+    for entry in [os.getenv("JOB_AUDIO_URL_HOSTS", ""), os.getenv("MINIO_ENDPOINT", ""), os.getenv("S3_ENDPOINT", "")]:
+        for host in entry.split(","):
+            host = host.strip().lower()
+            if "://" in host:
+                host = urllib.parse.urlsplit(host).netloc
+            if host:
+                hosts.add(host)
+    return hosts
+
+
+# Recording jobs: audio_url must be an http(s) URL on the storage endpoint (a presigned URL
+# from bot-manager); with none configured, only uploaded files are accepted
+JOB_AUDIO_URL_HOSTS = _audio_url_hosts()
 
 # Load management: Global concurrency limit and bounded queue
 # These settings control how many transcription requests can be processed concurrently.
@@ -164,27 +193,78 @@ MAX_CONCURRENT_TRANSCRIPTIONS = _env_int("MAX_ACTIVE_REQUESTS", _env_int("MAX_CO
 MAX_QUEUE_SIZE = _env_int("MAX_QUEUE_SIZE", 10)  # Max requests waiting in queue
 
 # Backpressure strategy:
-# - If FAIL_FAST_WHEN_BUSY=true, we do NOT wait in a queue; we immediately return 503 so callers
+# Requests wait in per-tier priority queues (scheduler.py). A request is only admitted if its
+# estimated queue wait (audio seconds queued ahead / measured service rate) fits its tier's budget;
+# otherwise it gets a 503 whose Retry-After is derived from the same estimate.
+# - If FAIL_FAST_WHEN_BUSY=true, realtime requests do NOT wait in a queue (zero wait budget) so callers
 #   (e.g. WhisperLive) can keep buffering and submit a newer/larger window later.
 FAIL_FAST_WHEN_BUSY = _env_bool("FAIL_FAST_WHEN_BUSY", True)
-BUSY_RETRY_AFTER_S = _env_int("BUSY_RETRY_AFTER_S", 1)
+REALTIME_MAX_WAIT_S = _env_float("REALTIME_MAX_WAIT_S", 0.0 if FAIL_FAST_WHEN_BUSY else 2.0)
+DEFERRED_MAX_WAIT_S = _env_float("DEFERRED_MAX_WAIT_S", 120.0)
+# A deferred request queued this long is served ahead of realtime work once (no starvation).
+DEFERRED_AGING_S = _env_float("DEFERRED_AGING_S", 10.0)
+# Assumed audio seconds transcribed per second until the service rate has been measured.
+INITIAL_SERVICE_RATE = _env_float("INITIAL_SERVICE_RATE", 10.0)
+BUSY_RETRY_AFTER_S = _env_int("BUSY_RETRY_AFTER_S", 1)  # Minimum Retry-After on 503
 REALTIME_RESERVED_SLOTS = _env_int("REALTIME_RESERVED_SLOTS", 1)
 
-# Semaphore to limit concurrent transcriptions (protects GPU/CPU from overload)
-transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
-
-# Thread pool for running blocking transcription calls
-transcription_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TRANSCRIPTIONS)
+# Model replicas hosted by this process (see model_pool.py for the format).
+# Unset: one replica of MODEL_SIZE on DEVICE serving both tiers with MAX_CONCURRENT_TRANSCRIPTIONS slots.
+# e.g. "model=large-v3-turbo,device=cuda:0,tiers=realtime;model=large-v3,device=cuda:1,tiers=deferred"
+MODEL_REPLICAS = os.getenv("MODEL_REPLICAS", "")
+# Failed model calls in a row after which a replica stops receiving traffic, and for how long
+REPLICA_MAX_CONSECUTIVE_ERRORS = _env_int("REPLICA_MAX_CONSECUTIVE_ERRORS", 3)
+REPLICA_UNHEALTHY_COOLDOWN_S = _env_float("REPLICA_UNHEALTHY_COOLDOWN_S", 30.0)
+
+
+def _load_replica_model(spec: ReplicaSpec) -> Tuple[WhisperModel, BatchedInferencePipeline]:
+    """Load one replica's model; runs on the replica's (possibly core-pinned) executor thread."""
+    model_kwargs = {
+        "model_size_or_path": spec.model,
+        "device": spec.device,
+        "device_index": spec.device_index,
+        "compute_type": spec.compute_type,
+        "num_workers": spec.workers,
+        "download_root": "/app/models"
+    }
+    # Add CPU threads for CPU mode (optimization from research)
+    if spec.device == "cpu" and spec.cpu_threads > 0:
+        model_kwargs["cpu_threads"] = spec.cpu_threads
+    model = WhisperModel(**model_kwargs)
+    return model, BatchedInferencePipeline(model=model)
+
+
+def _build_pool() -> ModelPool:
+    defaults = ReplicaSpec(
+        model=MODEL_SIZE,
+        device=DEVICE,
+        compute_type=COMPUTE_TYPE,
+        slots=MAX_CONCURRENT_TRANSCRIPTIONS,
+        cpu_threads=CPU_THREADS if DEVICE == "cpu" else 0,
+    )
+    replicas = []
+    for i, spec in enumerate(parse_replica_specs(MODEL_REPLICAS, defaults)):
+        # Admission control and priority scheduling of the replica's slots (protects GPU/CPU from overload).
+        # Slots are only reserved for realtime work on replicas that also take deferred work.
+        scheduler = AdmissionScheduler(
+            max_active=spec.slots,
+            realtime_reserved=REALTIME_RESERVED_SLOTS if "realtime" in spec.tiers else 0,
+            max_queue_size=MAX_QUEUE_SIZE,
+            realtime_max_wait_s=REALTIME_MAX_WAIT_S,
+            deferred_max_wait_s=DEFERRED_MAX_WAIT_S,
+            deferred_aging_s=DEFERRED_AGING_S,
+            initial_service_rate=INITIAL_SERVICE_RATE,
+            min_retry_after_s=BUSY_RETRY_AFTER_S,
+        )
+        replicas.append(ModelReplica(
+            f"r{i}", spec, scheduler, _load_replica_model,
+            max_consecutive_errors=REPLICA_MAX_CONSECUTIVE_ERRORS,
+            unhealthy_cooldown_s=REPLICA_UNHEALTHY_COOLDOWN_S,
+        ))
+    return ModelPool(replicas)
 
-# Queue to track waiting requests (for 429/503 responses when full)
-# We use a simple counter since FastAPI doesn't have a built-in queue
-waiting_requests = 0
-waiting_requests_lock = asyncio.Lock()
 
-# Active in-flight counters per tier for admission decisions.
-active_realtime_requests = 0
-active_deferred_requests = 0
-active_requests_lock = asyncio.Lock()
+pool = _build_pool()
 
 
 def _normalize_transcription_tier(raw: Optional[str]) -> str:
@@ -192,18 +272,25 @@ def _normalize_transcription_tier(raw: Optional[str]) -> str:
     return tier if tier in ("realtime", "deferred") else "realtime"
 
 
-def _deferred_capacity_available(active_rt: int, active_df: int) -> bool:
-    deferred_limit = max(0, MAX_CONCURRENT_TRANSCRIPTIONS - REALTIME_RESERVED_SLOTS)
-    total_active = active_rt + active_df
-    return deferred_limit > 0 and active_df < deferred_limit and total_active < MAX_CONCURRENT_TRANSCRIPTIONS
+def _parse_deadline_s(raw: Optional[str]) -> Optional[float]:
+    """Relative deadline (X-Request-Deadline-Ms) used to order realtime windows."""
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw) / 1000.0)
+    except ValueError:
+        return None
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize Whisper model on startup"""
-    global model
+    """Load the model replicas on startup"""
     logger.info(f"Worker {WORKER_ID} starting up...")
-    logger.info(f"Device: {DEVICE}, Model: {MODEL_SIZE}, Compute: {COMPUTE_TYPE}")
+    for replica in pool.replicas:
+        logger.info(
+            f"Replica {replica.name}: {replica.spec.label}, compute: {replica.spec.compute_type}, "
+            f"tiers: {'+'.join(replica.spec.tiers)}, slots: {replica.spec.slots}"
+        )
     logger.info(
         "Quality params - "
         f"beam_size={BEAM_SIZE}, best_of={BEST_OF}, "
@@ -215,20 +302,7 @@ async def startup_event():
     )
     
     try:
-        # Build model initialization parameters
-        model_kwargs = {
-            "model_size_or_path": MODEL_SIZE,
-            "device": DEVICE,
-            "compute_type": COMPUTE_TYPE,
-            "download_root": "/app/models"
-        }
-        
-        # Add CPU threads for CPU mode (optimization from research)
-        if DEVICE == "cpu" and CPU_THREADS > 0:
-            model_kwargs["cpu_threads"] = CPU_THREADS
-            logger.info(f"Worker {WORKER_ID} using {CPU_THREADS} CPU threads")
-        
-        model = WhisperModel(**model_kwargs)
+        await pool.load()
         logger.info(f"Worker {WORKER_ID} ready - Model loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
@@ -238,8 +312,9 @@ async def startup_event():
 @app.get("/health")
 async def health_check():
     """Health check endpoint for load balancer"""
+    healthy = any(r.healthy for r in pool.replicas)
     health_status = {
-        "status": "healthy" if model is not None else "unhealthy",
+        "status": "healthy" if healthy else "unhealthy",
         "worker_id": WORKER_ID,
         "timestamp": datetime.utcnow().isoformat(),
         "model": MODEL_SIZE,
@@ -250,8 +325,10 @@ async def health_check():
     if DEVICE == "cuda":
         # CTranslate2 (via faster-whisper) handles GPU automatically
         health_status["compute_type"] = COMPUTE_TYPE
+    # Per-replica state, error counts and scheduler queues
+    health_status["replicas"] = pool.stats()
     
-    if model is None:
+    if not healthy:
         return JSONResponse(content=health_status, status_code=503)
     
     return health_status
@@ -260,10 +337,12 @@ async def health_check():
 @app.post("/v1/audio/transcriptions")
 async def transcribe_audio(
     request: Request,
+    http_response: Response,
     file: UploadFile = File(...),
     requested_model: str = Form(..., alias="model"),
     temperature: str = Form("0"),
     language: Optional[str] = Form(None),
+    language_hint_confidence: Optional[float] = Form(None),
     prompt: Optional[str] = Form(None),
     response_format: str = Form("verbose_json"),
     timestamp_granularities: str = Form("segment"),
@@ -278,100 +357,74 @@ async def transcribe_audio(
     - Accepts multipart/form-data with audio file
     - Returns verbose_json format with segments
     - Includes timing, language, and segment details
+    - `language_hint_confidence` marks `language` as a cached hint: it is used (and
+      language detection skipped) only at LANGUAGE_HINT_MIN_CONFIDENCE or above
     
     Load management:
-    - Limits concurrent transcriptions to prevent GPU/CPU overload
-    - Returns 429/503 when queue is full to signal backpressure
+    - Routes to the least-loaded healthy replica serving the tier (preferring
+      replicas of `model` when that names a loaded model)
+    - Queues requests per tier (realtime earliest-deadline-first, deferred FIFO)
+      in front of the replica's model slots
+    - Returns 503 with a measured Retry-After when the estimated wait exceeds the tier's budget
+    - Reports the replica's load (requests in flight or queued per slot) in
+      `X-Transcription-Load` on answered requests so that clients can adapt
+      their request spacing; a 503 carries only Retry-After
     """
     if not requested_model:
         raise HTTPException(status_code=400, detail="Model parameter is required")
-    global waiting_requests, active_realtime_requests, active_deferred_requests
-
     tier_from_header = request.headers.get("X-Transcription-Tier")
     transcription_tier = _normalize_transcription_tier(transcription_tier_form or tier_from_header)
+    deadline_s = _parse_deadline_s(request.headers.get("X-Request-Deadline-Ms"))
 
-    semaphore_acquired = False
-    waiting_counted = False
-    active_counted = False
+    logger.info(
+        f"Worker {WORKER_ID} received transcription request - "
+        f"tier={transcription_tier}, filename: {file.filename}, content_type: {file.content_type}"
+    )
+    # Read and decode the audio first: admission is priced in audio seconds
+    audio_bytes = await file.read()
+    logger.info(f"Worker {WORKER_ID} read {len(audio_bytes)} bytes of audio data")
     
-    # Load management: Check queue size before accepting request
-    async with waiting_requests_lock:
-        async with active_requests_lock:
-            current_active_rt = active_realtime_requests
-            current_active_df = active_deferred_requests
-
-        if transcription_tier == "deferred":
-            if not _deferred_capacity_available(current_active_rt, current_active_df):
-                raise HTTPException(
-                    status_code=503,
-                    detail="Deferred tier is out of capacity. Please retry later.",
-                    headers={"Retry-After": str(max(1, BUSY_RETRY_AFTER_S))},
-                )
-        # Fail-fast mode: don't accept work we can't start immediately.
-        # This avoids "processing the first chunk" (small/old) and lets upstream buffer/coalesce.
-        if FAIL_FAST_WHEN_BUSY and (transcription_semaphore.locked() or waiting_requests > 0):
-            raise HTTPException(
-                status_code=503,
-                detail="Service busy. Please retry later.",
-                headers={"Retry-After": str(max(1, BUSY_RETRY_AFTER_S))},
-            )
-        if waiting_requests >= MAX_QUEUE_SIZE:
-            logger.warning(
-                f"Worker {WORKER_ID} queue full ({waiting_requests}/{MAX_QUEUE_SIZE}). "
-                f"Rejecting request with 503."
-            )
-            raise HTTPException(
-                status_code=503,
-                detail="Service temporarily overloaded. Please retry later.",
-                headers={"Retry-After": str(max(1, BUSY_RETRY_AFTER_S))}
-            )
-        waiting_requests += 1
-        waiting_counted = True
+    # Convert to format suitable for faster-whisper
+    # Use soundfile to properly decode audio formats (WAV, MP3, etc.)
+    audio_io = io.BytesIO(audio_bytes)
+    try:
+        audio_array, sample_rate = sf.read(audio_io, dtype=np.float32)
+        logger.info(f"Worker {WORKER_ID} decoded audio - shape: {audio_array.shape}, sample_rate: {sample_rate}")
+    except Exception as e:
+        logger.error(f"Worker {WORKER_ID} failed to decode audio with soundfile: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to decode audio file: {e}")
     
+    # Ensure mono audio (convert stereo to mono if needed)
+    if len(audio_array.shape) > 1:
+        audio_array = np.mean(audio_array, axis=1)
+        logger.info(f"Worker {WORKER_ID} converted to mono - shape: {audio_array.shape}")
+    
+    # Ensure audio is contiguous array
+    audio_array = np.ascontiguousarray(audio_array, dtype=np.float32)
+    audio_seconds = audio_array.shape[0] / sample_rate if sample_rate else 0.0
+
+    # Load management: admit into the tier's queue or reject with a measured Retry-After
     try:
-        # Acquire semaphore (blocks if MAX_CONCURRENT_TRANSCRIPTIONS is reached)
-        await transcription_semaphore.acquire()
-        semaphore_acquired = True
-        
-        async with waiting_requests_lock:
-            if waiting_counted:
-                waiting_requests -= 1
-                waiting_counted = False
-
-        async with active_requests_lock:
-            if transcription_tier == "deferred":
-                active_deferred_requests += 1
-            else:
-                active_realtime_requests += 1
-            active_counted = True
-        
-        start_time = time.time()
-        logger.info(
-            f"Worker {WORKER_ID} received transcription request - "
-            f"tier={transcription_tier}, filename: {file.filename}, content_type: {file.content_type}"
+        replica, ticket = await pool.acquire(transcription_tier, audio_seconds, deadline_s, model=requested_model)
+    except SchedulerRejected as e:
+        logger.warning(f"Worker {WORKER_ID} rejected {transcription_tier} request ({audio_seconds:.1f}s audio): {e.detail}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"{e.detail} Please retry later.",
+            headers={"Retry-After": str(e.retry_after_s)},
         )
-        # Read audio file
-        audio_bytes = await file.read()
-        logger.info(f"Worker {WORKER_ID} read {len(audio_bytes)} bytes of audio data")
-        
-        # Convert to format suitable for faster-whisper
-        # Use soundfile to properly decode audio formats (WAV, MP3, etc.)
-        audio_io = io.BytesIO(audio_bytes)
-        try:
-            audio_array, sample_rate = sf.read(audio_io, dtype=np.float32)
-            logger.info(f"Worker {WORKER_ID} decoded audio - shape: {audio_array.shape}, sample_rate: {sample_rate}")
-        except Exception as e:
-            logger.error(f"Worker {WORKER_ID} failed to decode audio with soundfile: {e}")
-            raise HTTPException(status_code=400, detail=f"Failed to decode audio file: {e}")
-        
-        # Ensure mono audio (convert stereo to mono if needed)
-        if len(audio_array.shape) > 1:
-            audio_array = np.mean(audio_array, axis=1)
-            logger.info(f"Worker {WORKER_ID} converted to mono - shape: {audio_array.shape}")
-        
-        # Ensure audio is contiguous array
-        audio_array = np.ascontiguousarray(audio_array, dtype=np.float32)
-        
+
+    try:
+        start_time = time.time()
+        # A confident hint skips language detection; a weak one is detected again.
+        # The hint confidence is echoed back so callers can keep decaying it.
+        hint_accepted = False
+        if language and language_hint_confidence is not None:
+            if language_hint_confidence >= LANGUAGE_HINT_MIN_CONFIDENCE:
+                hint_accepted = True
+            else:
+                language = None
+
         # Transcribe (with optional temperature fallback)
         requested_temp = float(temperature) if temperature else 0.0
         temps = TEMPERATURE_FALLBACK_CHAIN if USE_TEMPERATURE_FALLBACK else [requested_temp]
@@ -381,6 +434,7 @@ async def transcribe_audio(
             f"temps: {temps}, language: {language}, task: {task}, vad_filter: {VAD_FILTER}"
         )
 
+        language_probability = language_hint_confidence if hint_accepted else 1.0
         best: Optional[Tuple[str, str, float, List[Dict[str, Any]]]] = None
         last_info = None
         last_segments: List[Dict[str, Any]] = []
@@ -388,7 +442,7 @@ async def transcribe_audio(
         for t in temps:
             # Run blocking transcription in thread pool to avoid blocking event loop
             def _transcribe_sync():
-                return model.transcribe(
+                segments_iter, info = replica.model.transcribe(
                     audio_array,
                     language=language,
                     task=task,
@@ -408,13 +462,16 @@ async def transcribe_audio(
                     },
                     word_timestamps=False,
                 )
+                # Decoding happens while the generator is consumed; keep it on the replica's thread
+                return list(segments_iter), info
             
-            segments_list, info = await asyncio.get_event_loop().run_in_executor(
-                transcription_executor, _transcribe_sync
-            )
+            segments_list, info = await replica.run(_transcribe_sync)
             last_info = info
+            if language is None and info is not None:
+                # Detect once; fallback temperatures decode in the same language
+                language = info.language
+                language_probability = info.language_probability
 
-            # Convert segments to list (faster-whisper returns generator)
             segments: List[Dict[str, Any]] = []
             for idx, segment in enumerate(segments_list):
                 segments.append({
@@ -459,7 +516,7 @@ async def transcribe_audio(
             best = (full_text, info.language if info else (language or "unknown"), duration, segments)
 
         full_text, detected_language, duration, segments = best
-        logger.info(f"Worker {WORKER_ID} transcription completed - language: {detected_language}")
+        logger.info(f"Worker {WORKER_ID} transcription completed on {replica.name} - language: {detected_language}")
         
         processing_time = time.time() - start_time
         logger.info(
@@ -471,6 +528,7 @@ async def transcribe_audio(
         response = {
             "text": full_text,
             "language": detected_language,
+            "language_probability": language_probability,
             "duration": duration,
             "segments": segments,
         }
@@ -486,22 +544,174 @@ async def transcribe_audio(
         logger.error(f"Worker {WORKER_ID} transcription failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        # Keep counters and semaphore balanced even on early failures.
-        if active_counted:
-            async with active_requests_lock:
-                if transcription_tier == "deferred":
-                    active_deferred_requests = max(0, active_deferred_requests - 1)
-                else:
-                    active_realtime_requests = max(0, active_realtime_requests - 1)
-            active_counted = False
+        pool.release(replica, ticket)
+        # Load left behind by this request, so clients can pace themselves
+        http_response.headers["X-Transcription-Load"] = f"{replica.scheduler.load():.3f}"
+
+
+def _check_audio_url(url: str) -> None:
+    """Reject job audio URLs that are not http(s) on a configured storage host."""
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise HTTPException(status_code=400, detail="audio_url must be an http(s) URL")
+    host = parts.hostname.lower()
+    netloc = f"{host}:{parts.port}" if parts.port else host
+    if host not in JOB_AUDIO_URL_HOSTS and netloc not in JOB_AUDIO_URL_HOSTS:
+        raise HTTPException(status_code=400, detail="audio_url host is not an allowed storage endpoint")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # A redirect could lead away from the storage host that was checked
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        raise urllib.error.HTTPError(req.full_url, code, f"Redirect to {newurl} refused", headers, fp)
+
+
+_download_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def _download_audio(url: str) -> bytes:
+    with _download_opener.open(url, timeout=JOB_DOWNLOAD_TIMEOUT_S) as response:
+        return response.read()
+
+
+def _segment_event(segment) -> Dict[str, Any]:
+    return {
+        "type": "segment",
+        "id": segment.id,
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "avg_logprob": segment.avg_logprob,
+        "compression_ratio": segment.compression_ratio,
+        "no_speech_prob": segment.no_speech_prob,
+    }
+
+
+@app.post("/v1/audio/transcriptions/jobs")
+async def transcribe_recording(
+    request: Request,
+    file: Optional[UploadFile] = File(None),
+    audio_url: Optional[str] = Form(None),
+    language: Optional[str] = Form(None),
+    prompt: Optional[str] = Form(None),
+    task: str = Form("transcribe"),
+    _: bool = Depends(verify_api_token)
+):
+    """
+    Transcribe a whole recording in one deferred-tier pass.
+
+    The audio comes either as an uploaded `file` or as an `audio_url`: a presigned URL
+    on the object-storage endpoint (MINIO_ENDPOINT, S3_ENDPOINT or JOB_AUDIO_URL_HOSTS).
+    Any other URL, scheme or redirect is refused. It is VAD-split into chunks of at most
+    30s which are decoded JOB_BATCH_SIZE at a time through the batched pipeline.
+
+    Streams newline-delimited JSON events as chunks complete:
+    - `{"type": "info", "language", "language_probability", "duration", "duration_after_vad"}`
+    - `{"type": "segment", "id", "start", "end", "text", ...}` (one per segment)
+    - `{"type": "done", "segments": n}` or `{"type": "error", "detail": ...}`
+    """
+    if file is None and not audio_url:
+        raise HTTPException(status_code=400, detail="Either file or audio_url is required")
+    if file is None:
+        _check_audio_url(audio_url)
+    if not pool.ready:
+        raise HTTPException(status_code=503, detail="Model is not loaded yet. Please retry later.")
+
+    loop = asyncio.get_event_loop()
+    try:
+        if file is not None:
+            audio_bytes = await file.read()
+        else:
+            audio_bytes = await loop.run_in_executor(None, _download_audio, audio_url)
+        # decode_audio resamples to 16 kHz mono, recordings may come in any rate
+        audio_array = await loop.run_in_executor(None, decode_audio, io.BytesIO(audio_bytes))
+    except Exception as e:
+        logger.error(f"Worker {WORKER_ID} failed to load recording audio: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to load audio: {e}")
+    audio_seconds = audio_array.shape[0] / 16000
+
+    try:
+        replica, ticket = await pool.acquire("deferred", audio_seconds)
+    except SchedulerRejected as e:
+        logger.warning(f"Worker {WORKER_ID} rejected recording job ({audio_seconds:.1f}s audio): {e.detail}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"{e.detail} Please retry later.",
+            headers={"Retry-After": str(e.retry_after_s)},
+        )
+
+    logger.info(
+        f"Worker {WORKER_ID} starting recording job on {replica.name} - "
+        f"duration: {audio_seconds:.1f}s, language: {language}"
+    )
+    events: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+
+    def _emit(event: Dict[str, Any]):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    def _transcribe_sync():
+        try:
+            segments, info = replica.batched_model.transcribe(
+                audio_array,
+                language=language,
+                task=task,
+                initial_prompt=prompt,
+                beam_size=BEAM_SIZE,
+                best_of=BEST_OF,
+                compression_ratio_threshold=COMPRESSION_RATIO_THRESHOLD,
+                log_prob_threshold=LOG_PROB_THRESHOLD,
+                no_speech_threshold=NO_SPEECH_THRESHOLD,
+                without_timestamps=False,
+                vad_filter=True,
+                vad_parameters={
+                    "threshold": VAD_FILTER_THRESHOLD,
+                    "min_silence_duration_ms": VAD_MIN_SILENCE_DURATION_MS,
+                },
+                batch_size=JOB_BATCH_SIZE,
+            )
+            _emit({
+                "type": "info",
+                "language": info.language,
+                "language_probability": info.language_probability,
+                "duration": info.duration,
+                "duration_after_vad": info.duration_after_vad,
+            })
+            count = 0
+            # The generator decodes one batch of chunks at a time
+            for segment in segments:
+                if stopped.is_set():
+                    return
+                _emit(_segment_event(segment))
+                count += 1
+            replica.record_success()
+            _emit({"type": "done", "segments": count})
+        except Exception as e:
+            logger.error(f"Worker {WORKER_ID} recording job failed: {e}", exc_info=True)
+            replica.record_failure(e)
+            _emit({"type": "error", "detail": str(e)})
+
+    job = loop.run_in_executor(replica.executor, _transcribe_sync)
+    # Hold the slot until the model work has really stopped, even if the client left
+    job.add_done_callback(lambda _: pool.release(replica, ticket))
+
+    async def _stream():
+        try:
+            while True:
+                event = await events.get()
+                yield json.dumps(event) + "\n"
+                if event["type"] in ("done", "error"):
+                    return
+        finally:
+            stopped.set()
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
 
-        if waiting_counted:
-            async with waiting_requests_lock:
-                waiting_requests = max(0, waiting_requests - 1)
-            waiting_counted = False
 
-        if semaphore_acquired:
-            transcription_semaphore.release()
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-replica, per-tier queue-wait and service-time histograms in the Prometheus text format."""
+    return pool.render_metrics(f'worker="{WORKER_ID}"')
 
 
 @app.get("/")
@@ -512,10 +722,13 @@ async def root():
         "worker_id": WORKER_ID,
         "model": MODEL_SIZE,
         "device": DEVICE,
-        "status": "ready" if model is not None else "initializing",
+        "status": "ready" if pool.ready else "initializing",
+        "replicas": [r.spec.label for r in pool.replicas],
         "endpoints": {
             "transcribe": "/v1/audio/transcriptions",
-            "health": "/health"
+            "transcribe_recording": "/v1/audio/transcriptions/jobs",
+            "health": "/health",
+            "metrics": "/metrics"
         }
     }
 
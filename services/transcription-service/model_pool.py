@@ -0,0 +1,284 @@
+"""
+A pool of Whisper model replicas hosted by one process.
+
+Each replica is one ``WhisperModel`` on one device (a GPU, or a group of CPU
+cores) with its own thread pool and its own ``AdmissionScheduler``, and it
+serves a subset of the tiers, so a host can for example keep a turbo model on
+one GPU for realtime windows and large-v3 on another for recordings. Requests
+are routed to the healthy replica serving their tier with the lowest
+estimated queue wait.
+
+Replicas are configured with ``MODEL_REPLICAS``: ``;``-separated entries of
+``key=value`` pairs separated by ``,``::
+
+    model=large-v3-turbo,device=cuda:0,tiers=realtime;model=large-v3,device=cuda:1,tiers=deferred
+    model=medium,device=cpu,cpu_cores=0-7;model=medium,device=cpu,cpu_cores=8-15
+
+Keys: ``model``, ``device`` (``cuda``, ``cuda:<index>`` or ``cpu``),
+``compute_type``, ``tiers`` (``+``-separated), ``slots`` (concurrent
+requests), ``workers`` (CTranslate2 workers, i.e. parallel model calls),
+``cpu_threads`` and ``cpu_cores`` (e.g. ``0-7`` or ``0,2,4`` written as
+``0+2+4``). A replica with ``cpu_cores`` is pinned to them: its model is
+loaded on an executor thread bound to those cores, so the CTranslate2 threads
+it spawns inherit the affinity.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from scheduler import TIERS, AdmissionScheduler, SchedulerRejected, Ticket, render_metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplicaSpec:
+    model: str
+    device: str = "cuda"
+    device_index: int = 0
+    compute_type: str = "int8"
+    tiers: Tuple[str, ...] = TIERS
+    slots: int = 1
+    workers: int = 1
+    cpu_threads: int = 0
+    cpu_cores: Tuple[int, ...] = field(default_factory=tuple)
+
+    @property
+    def label(self) -> str:
+        device = self.device if self.device == "cpu" else f"{self.device}:{self.device_index}"
+        if self.cpu_cores:
+            device += f"[{self.cpu_cores[0]}-{self.cpu_cores[-1]}]"
+        return f"{self.model}@{device}"
+
+
+def _parse_cores(raw: str) -> Tuple[int, ...]:
+    cores: List[int] = []
+    for part in raw.split("+"):
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cores.extend(range(int(first), int(last) + 1))
+        elif part:
+            cores.append(int(part))
+    return tuple(sorted(set(cores)))
+
+
+def parse_replica_specs(raw: str, defaults: ReplicaSpec) -> List[ReplicaSpec]:
+    """Parse ``MODEL_REPLICAS``; an empty value yields the single ``defaults`` replica."""
+    if not raw or not raw.strip():
+        return [defaults]
+    specs = []
+    for entry in raw.split(";"):
+        if not entry.strip():
+            continue
+        options: Dict[str, str] = {}
+        for pair in entry.split(","):
+            key, sep, value = pair.partition("=")
+            if not sep:
+                raise ValueError(f"Invalid MODEL_REPLICAS entry {entry!r}: expected key=value pairs")
+            options[key.strip().lower()] = value.strip()
+
+        device, _, index = options.pop("device", defaults.device).partition(":")
+        tiers = tuple(t for t in options.pop("tiers", "+".join(defaults.tiers)).split("+") if t)
+        unknown_tiers = set(tiers) - set(TIERS)
+        if not tiers or unknown_tiers:
+            raise ValueError(f"Invalid tiers in MODEL_REPLICAS entry {entry!r}")
+        spec = ReplicaSpec(
+            model=options.pop("model", defaults.model),
+            device=device,
+            device_index=int(index) if index else 0,
+            compute_type=options.pop("compute_type", defaults.compute_type),
+            tiers=tiers,
+            slots=int(options.pop("slots", defaults.slots)),
+            workers=int(options.pop("workers", defaults.workers)),
+            cpu_threads=int(options.pop("cpu_threads", 0)),
+            cpu_cores=_parse_cores(options.pop("cpu_cores", "")),
+        )
+        if options:
+            raise ValueError(f"Unknown keys {sorted(options)} in MODEL_REPLICAS entry {entry!r}")
+        if spec.cpu_cores and not spec.cpu_threads:
+            spec.cpu_threads = len(spec.cpu_cores)
+        specs.append(spec)
+    return specs
+
+
+class ModelReplica:
+    """
+    One loaded model with its own executor, scheduler and health.
+
+    Args:
+        name (str): Short identifier used in metrics and logs.
+        spec (ReplicaSpec): Model, device and capacity of the replica.
+        scheduler (AdmissionScheduler): Admission control of the replica's slots.
+        model_factory (callable): Builds ``(model, batched_model)`` from the spec;
+            called on the replica's executor thread.
+        max_consecutive_errors (int): Failed model calls after which the replica
+            stops receiving traffic.
+        unhealthy_cooldown_s (float): Time before an unhealthy replica is tried again.
+    """
+
+    def __init__(self, name: str, spec: ReplicaSpec, scheduler: AdmissionScheduler,
+                 model_factory: Callable[[ReplicaSpec], Tuple[Any, Any]],
+                 max_consecutive_errors: int = 3, unhealthy_cooldown_s: float = 30.0, clock=time.monotonic):
+        self.name = name
+        self.spec = spec
+        self.scheduler = scheduler
+        self.model_factory = model_factory
+        self.max_consecutive_errors = max(1, max_consecutive_errors)
+        self.unhealthy_cooldown_s = unhealthy_cooldown_s
+        self.clock = clock
+
+        self.model = None
+        self.batched_model = None
+        self.state = "loading"
+        self.consecutive_errors = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, spec.slots),
+            thread_name_prefix=f"replica-{name}",
+            initializer=self._pin_thread,
+        )
+
+    def _pin_thread(self):
+        if self.spec.cpu_cores and hasattr(os, "sched_setaffinity"):
+            # pid 0 is the calling thread; threads it creates inherit the mask
+            os.sched_setaffinity(0, self.spec.cpu_cores)
+
+    async def load(self):
+        loop = asyncio.get_running_loop()
+        try:
+            self.model, self.batched_model = await loop.run_in_executor(self.executor, self.model_factory, self.spec)
+        except Exception as e:
+            self.state = "failed"
+            self.last_error = str(e)
+            raise
+        self.state = "ready"
+
+    @property
+    def healthy(self) -> bool:
+        if self.state != "ready":
+            return False
+        if self.consecutive_errors < self.max_consecutive_errors:
+            return True
+        # Let one request probe the replica again after the cooldown
+        return self.clock() - (self.last_error_at or 0.0) >= self.unhealthy_cooldown_s
+
+    async def run(self, fn: Callable, *args):
+        """Run a blocking model call on the replica's executor, tracking its health."""
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def record_success(self):
+        self.consecutive_errors = 0
+
+    def record_failure(self, error: Exception):
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.last_error = str(error)
+        self.last_error_at = self.clock()
+        if self.consecutive_errors == self.max_consecutive_errors:
+            logger.error(f"Replica {self.name} ({self.spec.label}) marked unhealthy: {error}")
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "model": self.spec.model,
+            "device": self.spec.label.split("@", 1)[1],
+            "compute_type": self.spec.compute_type,
+            "tiers": list(self.spec.tiers),
+            "slots": self.spec.slots,
+            "state": self.state,
+            "healthy": self.healthy,
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "last_error": self.last_error,
+            "scheduler": self.scheduler.stats(),
+        }
+
+
+class ModelPool:
+    """Routes requests by tier and load over a set of ``ModelReplica``."""
+
+    def __init__(self, replicas: Sequence[ModelReplica]):
+        if not replicas:
+            raise ValueError("ModelPool needs at least one replica")
+        self.replicas = list(replicas)
+
+    async def load(self):
+        """Load the replicas one after another; fails only if none of them loads."""
+        for replica in self.replicas:
+            started = time.time()
+            try:
+                await replica.load()
+                logger.info(f"Replica {replica.name} ({replica.spec.label}) loaded in {time.time() - started:.1f}s")
+            except Exception as e:
+                logger.error(f"Replica {replica.name} ({replica.spec.label}) failed to load: {e}")
+        if not self.ready:
+            raise RuntimeError("No model replica could be loaded")
+        for tier in TIERS:
+            if not any(tier in r.spec.tiers and r.state == "ready" for r in self.replicas):
+                logger.warning(f"No loaded replica serves the {tier} tier")
+
+    @property
+    def ready(self) -> bool:
+        return any(r.state == "ready" for r in self.replicas)
+
+    def candidates(self, tier: str, model: Optional[str] = None) -> List[ModelReplica]:
+        serving = [r for r in self.replicas if tier in r.spec.tiers and r.healthy]
+        if model:
+            # Honour an explicit model name when some replica has it; clients
+            # that send an alias such as "whisper-1" get any replica.
+            named = [r for r in serving if r.spec.model == model]
+            if named:
+                return named
+        return serving
+
+    async def acquire(self, tier: str, audio_s: float, deadline_s: Optional[float] = None,
+                      model: Optional[str] = None) -> Tuple[ModelReplica, Ticket]:
+        """Admit a request on the least-loaded replica serving ``tier``."""
+        candidates = self.candidates(tier, model)
+        if not candidates:
+            raise SchedulerRejected(f"No healthy replica serves the {tier} tier.",
+                                    min(r.scheduler.min_retry_after_s for r in self.replicas))
+
+        def _load(replica: ModelReplica):
+            active = sum(t["active"] for t in replica.scheduler.stats()["tiers"].values())
+            return replica.scheduler.estimate_wait(tier), active / replica.scheduler.max_active
+
+        replica = min(candidates, key=_load)
+        return replica, await replica.scheduler.acquire(tier, audio_s, deadline_s)
+
+    def release(self, replica: ModelReplica, ticket: Ticket):
+        replica.scheduler.release(ticket)
+
+    def stats(self) -> List[dict]:
+        return [r.stats() for r in self.replicas]
+
+    def render_metrics(self, labels: str = "") -> str:
+        prefix = f"{labels}," if labels else ""
+        entries = [
+            (f'{prefix}replica="{r.name}",model="{r.spec.model}"', r.scheduler) for r in self.replicas
+        ]
+        lines = [
+            "# HELP transcription_replica_up Whether the replica is loaded and healthy.",
+            "# TYPE transcription_replica_up gauge",
+        ]
+        for (replica_labels, _), replica in zip(entries, self.replicas):
+            lines.append(f"transcription_replica_up{{{replica_labels}}} {int(replica.healthy)}")
+        lines += [
+            "# HELP transcription_replica_errors_total Failed model calls per replica.",
+            "# TYPE transcription_replica_errors_total counter",
+        ]
+        for (replica_labels, _), replica in zip(entries, self.replicas):
+            lines.append(f"transcription_replica_errors_total{{{replica_labels}}} {replica.errors}")
+        return render_metrics(entries) + "\n".join(lines) + "\n"
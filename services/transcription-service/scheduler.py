@@ -0,0 +1,305 @@
+"""
+Priority-aware admission control for transcription requests.
+
+Every request declares a tier (``realtime`` or ``deferred``) and its audio
+length. The scheduler keeps one queue per tier: realtime windows are served
+earliest-deadline-first, deferred work in arrival order. Free model slots go
+to realtime first, a deferred request that has waited longer than
+``deferred_aging_s`` is promoted once so bursts of realtime traffic cannot
+starve it, and ``realtime_reserved`` slots are never given to deferred work.
+
+Admission is cost-aware: the audio seconds queued ahead of a request are
+divided by the measured service rate (audio seconds transcribed per wall
+second) to estimate its queue wait. A request whose estimate exceeds its
+tier's wait budget is rejected with a ``Retry-After`` derived from the same
+estimate instead of a fixed constant.
+
+All methods must be called from the event loop thread.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TIERS = ("realtime", "deferred")
+
+QUEUE_WAIT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SERVICE_TIME_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0)
+
+
+class SchedulerRejected(Exception):
+    """Raised when a request is not admitted; carries the suggested retry delay."""
+
+    def __init__(self, detail: str, retry_after_s: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after_s = retry_after_s
+
+
+# Copy of shared_models.latency.Histogram: this image is built from its own directory
+# and cannot install libs/shared-models. Keep the two identical
+# (tests/test_latency.py at the repo root checks it).
+class Histogram:
+    """Cumulative fixed-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class Ticket:
+    """One admitted request; pass it back to ``release()`` when done."""
+
+    __slots__ = ("tier", "audio_s", "deadline", "enqueued_at", "started_at", "future", "cancelled")
+
+    def __init__(self, tier: str, audio_s: float, deadline: float, enqueued_at: float):
+        self.tier = tier
+        self.audio_s = audio_s
+        self.deadline = deadline
+        self.enqueued_at = enqueued_at
+        self.started_at: Optional[float] = None
+        self.future: Optional[asyncio.Future] = None
+        self.cancelled = False
+
+
+class AdmissionScheduler:
+    """
+    Per-tier priority queues in front of ``max_active`` model slots.
+
+    Args:
+        max_active (int): Concurrent transcriptions (model slots).
+        realtime_reserved (int): Slots deferred work may never occupy.
+        max_queue_size (int): Maximum number of queued requests across tiers.
+        realtime_max_wait_s (float): Queue-wait budget of realtime requests;
+            0 admits realtime work only if it can start immediately.
+        deferred_max_wait_s (float): Queue-wait budget of deferred requests.
+        deferred_aging_s (float): Queue wait after which the oldest deferred
+            request is served ahead of realtime work.
+        initial_service_rate (float): Audio seconds per second assumed until measured.
+        min_retry_after_s (int): Lower bound of the ``Retry-After`` returned on rejection.
+        rate_alpha (float): EWMA weight of a new service rate sample.
+    """
+
+    def __init__(self, max_active: int, realtime_reserved: int = 1, max_queue_size: int = 10,
+                 realtime_max_wait_s: float = 0.0, deferred_max_wait_s: float = 120.0,
+                 deferred_aging_s: float = 10.0, initial_service_rate: float = 10.0,
+                 min_retry_after_s: int = 1, rate_alpha: float = 0.2, clock=time.monotonic):
+        self.max_active = max(1, int(max_active))
+        self.deferred_limit = max(0, self.max_active - max(0, int(realtime_reserved)))
+        self.max_queue_size = max(0, int(max_queue_size))
+        self.max_wait_s = {"realtime": max(0.0, realtime_max_wait_s), "deferred": max(0.0, deferred_max_wait_s)}
+        self.deferred_aging_s = deferred_aging_s
+        self.service_rate = max(1e-3, float(initial_service_rate))
+        self.min_retry_after_s = max(1, int(min_retry_after_s))
+        self.rate_alpha = rate_alpha
+        self.clock = clock
+
+        self._seq = itertools.count()
+        self._queues: Dict[str, list] = {tier: [] for tier in TIERS}
+        self._queued_audio_s = {tier: 0.0 for tier in TIERS}
+        self._active = {tier: 0 for tier in TIERS}
+        self._active_audio_s = 0.0
+
+        self.admitted = {tier: 0 for tier in TIERS}
+        self.rejected = {tier: 0 for tier in TIERS}
+        self.queue_wait = {tier: Histogram(QUEUE_WAIT_BUCKETS) for tier in TIERS}
+        self.service_time = {tier: Histogram(SERVICE_TIME_BUCKETS) for tier in TIERS}
+
+    # --- admission ---
+    async def acquire(self, tier: str, audio_s: float, deadline_s: Optional[float] = None) -> Ticket:
+        """
+        Admit a request and wait for its slot.
+
+        Raises ``SchedulerRejected`` if the request cannot start within its
+        tier's wait budget. ``deadline_s`` (relative) orders realtime requests;
+        it defaults to the realtime wait budget.
+        """
+        now = self.clock()
+        if tier == "deferred" and self.deferred_limit == 0:
+            self.rejected[tier] += 1
+            raise SchedulerRejected("Deferred tier is disabled on this worker.", self.min_retry_after_s)
+
+        wait_s = self.estimate_wait(tier)
+        budget_s = self.max_wait_s[tier]
+        queued = sum(self._queued(t) for t in TIERS)
+        must_queue = not self._can_start(tier) or self._head(tier) is not None
+        if must_queue and (queued >= self.max_queue_size or wait_s > budget_s or budget_s == 0):
+            self.rejected[tier] += 1
+            retry_after = max(self.min_retry_after_s, math.ceil(max(wait_s - budget_s, 0.0)))
+            raise SchedulerRejected(f"{tier.capitalize()} tier is busy (estimated wait {wait_s:.1f}s).", retry_after)
+
+        if deadline_s is None:
+            deadline_s = budget_s
+        ticket = Ticket(tier, max(0.0, audio_s), now + deadline_s, now)
+        self.admitted[tier] += 1
+        if not must_queue:
+            self._start(ticket, now)
+            return ticket
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        key = ticket.deadline if tier == "realtime" else ticket.enqueued_at
+        heapq.heappush(self._queues[tier], (key, next(self._seq), ticket))
+        self._queued_audio_s[tier] += ticket.audio_s
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.started_at is not None:
+                self.release(ticket)
+            elif not ticket.cancelled:
+                ticket.cancelled = True
+                self._queued_audio_s[tier] -= ticket.audio_s
+            raise
+        return ticket
+
+    def release(self, ticket: Ticket):
+        """Return a slot and record the request's service time."""
+        if ticket.started_at is None:
+            return
+        now = self.clock()
+        service_s = now - ticket.started_at
+        concurrent = sum(self._active.values())
+        self._active[ticket.tier] -= 1
+        self._active_audio_s = max(0.0, self._active_audio_s - ticket.audio_s)
+        ticket.started_at = None
+        self.service_time[ticket.tier].observe(service_s)
+        if ticket.audio_s > 0 and service_s > 0:
+            # Requests share the model, so one request's rate times the number
+            # in flight approximates the worker's throughput.
+            sample = ticket.audio_s * concurrent / service_s
+            self.service_rate += self.rate_alpha * (sample - self.service_rate)
+        self._dispatch()
+
+    def estimate_wait(self, tier: str) -> float:
+        """Seconds until a new request of ``tier`` would start, from the audio queued ahead of it."""
+        ahead_s = self._queued_audio_s["realtime"]
+        if tier == "deferred":
+            ahead_s += self._queued_audio_s["deferred"]
+        if not self._can_start(tier):
+            # On average the requests in flight are half done
+            ahead_s += self._active_audio_s / 2
+        return ahead_s / self.service_rate
+
+    def load(self) -> float:
+        """Requests in flight or queued per slot; above 1.0 requests are waiting."""
+        queued = sum(self._queued(tier) for tier in TIERS)
+        return (sum(self._active.values()) + queued) / self.max_active
+
+    # --- dispatch ---
+    def _can_start(self, tier: str) -> bool:
+        if sum(self._active.values()) >= self.max_active:
+            return False
+        return tier == "realtime" or self._active["deferred"] < self.deferred_limit
+
+    def _start(self, ticket: Ticket, now: float):
+        ticket.started_at = now
+        self._active[ticket.tier] += 1
+        self._active_audio_s += ticket.audio_s
+        self.queue_wait[ticket.tier].observe(now - ticket.enqueued_at)
+
+    def _queued(self, tier: str) -> int:
+        # Cancelled tickets stay in the heap until they reach its head
+        return sum(1 for _, _, ticket in self._queues[tier] if not ticket.cancelled)
+
+    def _head(self, tier: str) -> Optional[Ticket]:
+        queue = self._queues[tier]
+        while queue and queue[0][2].cancelled:
+            heapq.heappop(queue)
+        return queue[0][2] if queue else None
+
+    def _dispatch(self):
+        now = self.clock()
+        while True:
+            realtime, deferred = self._head("realtime"), self._head("deferred")
+            deferred_ready = deferred is not None and self._can_start("deferred")
+            if deferred_ready and (realtime is None or now - deferred.enqueued_at >= self.deferred_aging_s):
+                tier = "deferred"
+            elif realtime is not None and self._can_start("realtime"):
+                tier = "realtime"
+            else:
+                return
+            _, _, ticket = heapq.heappop(self._queues[tier])
+            self._queued_audio_s[tier] -= ticket.audio_s
+            self._start(ticket, now)
+            ticket.future.set_result(True)
+
+    # --- reporting ---
+    def stats(self) -> dict:
+        return {
+            "service_rate_audio_s_per_s": round(self.service_rate, 3),
+            "tiers": {
+                tier: {
+                    "active": self._active[tier],
+                    "queued": self._queued(tier),
+                    "queued_audio_s": round(self._queued_audio_s[tier], 2),
+                    "admitted": self.admitted[tier],
+                    "rejected": self.rejected[tier],
+                    "estimated_wait_s": round(self.estimate_wait(tier), 3),
+                }
+                for tier in TIERS
+            },
+        }
+
+    def render_metrics(self, labels: str = "") -> str:
+        return render_metrics([(labels, self)])
+
+
+def render_metrics(entries: Sequence[Tuple[str, "AdmissionScheduler"]]) -> str:
+    """Render the metrics of one or more schedulers, each tagged with its own ``labels``."""
+    def _labels(labels: str, extra: str = "") -> str:
+        return ",".join(part for part in (labels, extra) if part)
+
+    lines = [
+        "# HELP transcription_queue_wait_seconds Time from admission to model slot.",
+        "# TYPE transcription_queue_wait_seconds histogram",
+    ]
+    for labels, scheduler in entries:
+        for tier in TIERS:
+            lines += scheduler.queue_wait[tier].render("transcription_queue_wait_seconds", _labels(labels, f'tier="{tier}"'))
+    lines += [
+        "# HELP transcription_service_time_seconds Time a request held a model slot.",
+        "# TYPE transcription_service_time_seconds histogram",
+    ]
+    for labels, scheduler in entries:
+        for tier in TIERS:
+            lines += scheduler.service_time[tier].render("transcription_service_time_seconds", _labels(labels, f'tier="{tier}"'))
+    lines += [
+        "# HELP transcription_requests_rejected_total Requests refused by admission control.",
+        "# TYPE transcription_requests_rejected_total counter",
+    ]
+    for labels, scheduler in entries:
+        for tier in TIERS:
+            tier_labels = _labels(labels, f'tier="{tier}"')
+            lines.append(f"transcription_requests_rejected_total{{{tier_labels}}} {scheduler.rejected[tier]}")
+    lines += [
+        "# HELP transcription_service_rate Measured audio seconds transcribed per second.",
+        "# TYPE transcription_service_rate gauge",
+    ]
+    for labels, scheduler in entries:
+        lines.append(f"transcription_service_rate{{{labels}}} {scheduler.service_rate:.6f}" if labels
+                     else f"transcription_service_rate {scheduler.service_rate:.6f}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from model_pool import ModelPool, ModelReplica, ReplicaSpec, parse_replica_specs
+from scheduler import AdmissionScheduler, SchedulerRejected
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _replica(name, model="turbo", tiers=("realtime", "deferred"), slots=2, clock=None):
+    spec = ReplicaSpec(model=model, tiers=tiers, slots=slots)
+    scheduler = AdmissionScheduler(max_active=slots, realtime_reserved=0, realtime_max_wait_s=5.0)
+    replica = ModelReplica(name, spec, scheduler, model_factory=lambda s: (object(), object()),
+                           max_consecutive_errors=2, unhealthy_cooldown_s=30.0, clock=clock or _Clock())
+    replica.state = "ready"
+    return replica
+
+
+def test_parse_replica_specs():
+    defaults = ReplicaSpec(model="large-v3-turbo", device="cuda", compute_type="int8", slots=20)
+    assert parse_replica_specs("", defaults) == [defaults]
+
+    realtime, deferred, cpu = parse_replica_specs(
+        "model=large-v3-turbo,device=cuda:0,tiers=realtime;"
+        "model=large-v3,device=cuda:1,tiers=deferred,slots=4,compute_type=float16;"
+        "device=cpu,cpu_cores=0-3+8",
+        defaults,
+    )
+    assert (realtime.tiers, realtime.device_index, realtime.slots) == (("realtime",), 0, 20)
+    assert (deferred.model, deferred.device_index, deferred.slots, deferred.compute_type) == ("large-v3", 1, 4, "float16")
+    assert (cpu.model, cpu.device, cpu.cpu_cores, cpu.cpu_threads) == ("large-v3-turbo", "cpu", (0, 1, 2, 3, 8), 5)
+
+    with pytest.raises(ValueError):
+        parse_replica_specs("model=x,tiers=batch", defaults)
+    with pytest.raises(ValueError):
+        parse_replica_specs("model=x,gpu=1", defaults)
+
+
+def test_routes_by_tier_and_load_and_requested_model():
+    async def scenario():
+        fast = _replica("r0", tiers=("realtime",))
+        big = _replica("r1", model="large-v3", tiers=("deferred",))
+        spare = _replica("r2", tiers=("realtime", "deferred"))
+        pool = ModelPool([fast, big, spare])
+
+        first, _ = await pool.acquire("realtime", 1.0)
+        second, _ = await pool.acquire("realtime", 1.0)
+        deferred, _ = await pool.acquire("deferred", 1.0, model="large-v3")
+        aliased, _ = await pool.acquire("deferred", 1.0, model="whisper-1")
+        return first.name, second.name, deferred.name, aliased.name
+
+    # r0 takes the first window, the now less loaded r2 the second;
+    # an unknown model name falls back to any replica of the tier
+    assert asyncio.run(scenario()) == ("r0", "r2", "r1", "r1")
+
+
+def test_failing_replica_is_skipped_until_cooldown():
+    async def scenario():
+        clock = _Clock()
+        broken = _replica("r0", clock=clock)
+        healthy = _replica("r1", clock=clock)
+        pool = ModelPool([broken, healthy])
+
+        def _fail():
+            raise RuntimeError("CUDA error: out of memory")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await broken.run(_fail)
+        routed = [(await pool.acquire("realtime", 1.0))[0].name for _ in range(2)]
+        stats = pool.stats()[0]
+        clock.now = 31.0
+        return routed, stats["healthy"], stats["errors"], broken.healthy
+
+    routed, healthy_before, errors, healthy_after = asyncio.run(scenario())
+    assert routed == ["r1", "r1"]
+    assert (healthy_before, errors, healthy_after) == (False, 2, True)
+
+
+def test_rejects_when_no_replica_serves_tier():
+    async def scenario():
+        pool = ModelPool([_replica("r0", tiers=("realtime",))])
+        with pytest.raises(SchedulerRejected):
+            await pool.acquire("deferred", 1.0)
+        return pool.render_metrics('worker="1"')
+
+    metrics = asyncio.run(scenario())
+    assert 'transcription_replica_up{worker="1",replica="r0",model="turbo"} 1' in metrics
+    assert metrics.count("# TYPE transcription_queue_wait_seconds histogram") == 1
@@ -0,0 +1,89 @@
+import io
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+from fastapi.testclient import TestClient
+
+import main
+from model_pool import ModelPool, ModelReplica, ReplicaSpec
+from scheduler import AdmissionScheduler
+
+
+class _FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio.shape[0], kwargs))
+        info = SimpleNamespace(language="en", language_probability=0.97, duration=audio.shape[0] / 16000,
+                               duration_after_vad=2.0)
+
+        def segments():
+            for i, (start, end) in enumerate([(0.0, 1.5), (1.5, 3.0)], start=1):
+                yield SimpleNamespace(id=i, start=start, end=end, text=f" part {i}", avg_logprob=-0.2,
+                                      compression_ratio=1.1, no_speech_prob=0.01)
+
+        return segments(), info
+
+
+def _wav(seconds=3.0, sample_rate=16000):
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(int(seconds * sample_rate), dtype=np.float32), sample_rate, format="WAV")
+    return buffer.getvalue()
+
+
+def _pool(pipeline):
+    replica = ModelReplica("r0", ReplicaSpec(model="fake", slots=2), AdmissionScheduler(max_active=2),
+                           model_factory=lambda spec: (None, pipeline))
+    replica.model, replica.batched_model, replica.state = None, pipeline, "ready"
+    return ModelPool([replica])
+
+
+def test_recording_job_streams_info_segments_and_done(monkeypatch):
+    pipeline = _FakePipeline()
+    pool = _pool(pipeline)
+    monkeypatch.setattr(main, "pool", pool)
+
+    response = TestClient(main.app).post(
+        "/v1/audio/transcriptions/jobs",
+        files={"file": ("recording.wav", _wav(), "audio/wav")},
+        data={"language": "en"},
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["type"] for e in events] == ["info", "segment", "segment", "done"]
+    assert events[0]["language"] == "en"
+    assert events[2]["text"] == " part 2"
+    assert events[-1]["segments"] == 2
+    samples, kwargs = pipeline.calls[0]
+    assert samples == 48000
+    assert kwargs["batch_size"] == main.JOB_BATCH_SIZE and kwargs["without_timestamps"] is False
+    assert pool.replicas[0].scheduler.stats()["tiers"]["deferred"]["active"] == 0
+
+
+def test_recording_job_requires_audio():
+    response = TestClient(main.app).post("/v1/audio/transcriptions/jobs", data={"language": "en"})
+    assert response.status_code == 400
+
+
+def test_recording_job_audio_url_must_be_on_storage_host(monkeypatch):
+    pool = _pool(_FakePipeline())
+    monkeypatch.setattr(main, "pool", pool)
+    monkeypatch.setattr(main, "JOB_AUDIO_URL_HOSTS", {"minio:9000"})
+    fetched = []
+    monkeypatch.setattr(main, "_download_audio", lambda url: fetched.append(url) or _wav())
+    client = TestClient(main.app)
+
+    for url in ("file:///etc/passwd", "http://169.254.169.254/latest/meta-data", "http://minio/recordings/a.wav",
+                "ftp://minio:9000/a.wav"):
+        response = client.post("/v1/audio/transcriptions/jobs", data={"audio_url": url})
+        assert response.status_code == 400, url
+    assert fetched == []
+
+    url = "http://minio:9000/recordings/a.wav?X-Amz-Signature=abc"
+    response = client.post("/v1/audio/transcriptions/jobs", data={"audio_url": url})
+    assert response.status_code == 200
+    assert fetched == [url]
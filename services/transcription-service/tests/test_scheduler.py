@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from scheduler import AdmissionScheduler, SchedulerRejected
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_realtime_is_served_before_deferred_and_by_earliest_deadline():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=1, realtime_reserved=0, realtime_max_wait_s=5.0,
+                                       initial_service_rate=1.0, clock=clock)
+        running = await scheduler.acquire("deferred", 1.0)
+        order = []
+
+        async def request(tier, deadline_s, name):
+            ticket = await scheduler.acquire(tier, 0.5, deadline_s)
+            order.append(name)
+            scheduler.release(ticket)
+
+        tasks = [
+            asyncio.create_task(request("deferred", None, "deferred")),
+            asyncio.create_task(request("realtime", 3.0, "late")),
+            asyncio.create_task(request("realtime", 1.0, "early")),
+        ]
+        await asyncio.sleep(0)
+        scheduler.release(running)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["early", "late", "deferred"]
+
+
+def test_aged_deferred_request_is_promoted_over_realtime():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=1, realtime_reserved=0, realtime_max_wait_s=5.0,
+                                       initial_service_rate=1.0, clock=clock)
+        running = await scheduler.acquire("realtime", 1.0)
+        order = []
+
+        async def request(tier, name):
+            ticket = await scheduler.acquire(tier, 0.5)
+            order.append(name)
+            scheduler.release(ticket)
+
+        deferred = asyncio.create_task(request("deferred", "deferred"))
+        await asyncio.sleep(0)
+        clock.now = 11.0
+        realtime = asyncio.create_task(request("realtime", "realtime"))
+        await asyncio.sleep(0)
+        scheduler.release(running)
+        await asyncio.gather(deferred, realtime)
+        return order
+
+    assert asyncio.run(scenario()) == ["deferred", "realtime"]
+
+
+def test_fail_fast_realtime_is_rejected_with_retry_after_from_service_rate():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=1, realtime_reserved=0, realtime_max_wait_s=0.0,
+                                       initial_service_rate=2.0, clock=clock)
+        await scheduler.acquire("realtime", 10.0)
+        with pytest.raises(SchedulerRejected) as rejected:
+            await scheduler.acquire("realtime", 1.0)
+        return rejected.value.retry_after_s, scheduler.rejected["realtime"]
+
+    # 10s of audio in flight, half done on average, at 2 audio-s/s -> 2.5s
+    assert asyncio.run(scenario()) == (3, 1)
+
+
+def test_deferred_never_takes_reserved_realtime_slots():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=2, realtime_reserved=1, realtime_max_wait_s=5.0,
+                                       initial_service_rate=1.0, clock=clock)
+        await scheduler.acquire("deferred", 1.0)
+        waiting = asyncio.create_task(scheduler.acquire("deferred", 1.0))
+        await asyncio.sleep(0)
+        realtime = await scheduler.acquire("realtime", 1.0)
+        stats = scheduler.stats()["tiers"]
+        waiting.cancel()
+        return realtime.started_at is not None, stats["deferred"]["queued"]
+
+    assert asyncio.run(scenario()) == (True, 1)
+
+
+def test_service_time_updates_rate_and_histograms():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=1, realtime_reserved=0, realtime_max_wait_s=5.0,
+                                       initial_service_rate=1.0, clock=clock)
+        ticket = await scheduler.acquire("realtime", 8.0)
+        clock.now = 2.0
+        scheduler.release(ticket)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    # sample = 8s audio / 2s = 4 audio-s/s; EWMA with alpha 0.2 from 1.0
+    assert scheduler.service_rate == pytest.approx(1.6)
+    metrics = scheduler.render_metrics('worker="1"')
+    assert 'transcription_service_time_seconds_bucket{worker="1",tier="realtime",le="2.0"} 1' in metrics
+    assert 'transcription_queue_wait_seconds_count{worker="1",tier="realtime"} 1' in metrics
+
+
+def test_load_counts_active_and_queued_requests_per_slot():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=2, realtime_reserved=0, realtime_max_wait_s=5.0,
+                                       initial_service_rate=1.0, clock=clock)
+        assert scheduler.load() == 0.0
+        first = await scheduler.acquire("realtime", 1.0)
+        await scheduler.acquire("realtime", 1.0)
+        waiting = asyncio.ensure_future(scheduler.acquire("realtime", 1.0))
+        await asyncio.sleep(0)
+        assert scheduler.load() == 1.5
+        scheduler.release(first)
+        await waiting
+        assert scheduler.load() == 1.0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_queued_requests_do_not_count_against_the_queue():
+    async def scenario():
+        clock = _Clock()
+        scheduler = AdmissionScheduler(max_active=1, realtime_reserved=0, max_queue_size=1, realtime_max_wait_s=5.0,
+                                       initial_service_rate=1.0, clock=clock)
+        await scheduler.acquire("realtime", 1.0)
+        gone = asyncio.ensure_future(scheduler.acquire("realtime", 1.0))
+        await asyncio.sleep(0)
+        gone.cancel()
+        await asyncio.gather(gone, return_exceptions=True)
+        waiting = asyncio.ensure_future(scheduler.acquire("realtime", 1.0))
+        await asyncio.sleep(0)
+        queued = scheduler.stats()["tiers"]["realtime"]["queued"]
+        waiting.cancel()
+        return queued, scheduler.rejected["realtime"]
+
+    assert asyncio.run(scenario()) == (1, 0)
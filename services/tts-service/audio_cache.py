@@ -0,0 +1,163 @@
+"""
+Content-addressed cache of synthesized audio.
+
+Entries are keyed by a hash of (model, voice, format, normalized text) and
+stored as files on local disk, evicted least-recently-used once the cache
+exceeds ``max_bytes``. An optional Redis client adds a second tier shared by
+all replicas of the service: disk misses are looked up there and written
+back to disk.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Fold Unicode forms and whitespace, which do not change the synthesized speech."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def cache_key(model: str, voice: str, response_format: str, text: str) -> str:
+    material = json.dumps([model, voice, response_format, normalize_text(text)], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Disk LRU cache of audio blobs with an optional Redis tier.
+
+    Args:
+        directory (str): Where cached files live; existing files are adopted on start.
+        max_bytes (int): Disk budget; least recently used files are evicted above it.
+        max_item_bytes (int): Larger blobs are never cached.
+        redis: Optional ``redis.asyncio`` client for the shared tier.
+        redis_ttl_s (int): Expiry of Redis entries.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_item_bytes: int,
+                 redis=None, redis_ttl_s: int = 86400):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.redis = redis
+        self.redis_ttl_s = redis_ttl_s
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits = {"disk": 0, "redis": 0}
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._adopt_existing()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _adopt_existing(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.startswith("."):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._bytes += size
+        self._evict()
+        if files:
+            logger.info(f"[TTS cache] Adopted {len(self._entries)} cached files ({self._bytes} bytes)")
+
+    def _evict(self):
+        with self._lock:
+            victims = []
+            while self._bytes > self.max_bytes and self._entries:
+                key, size = self._entries.popitem(last=False)
+                self._bytes -= size
+                victims.append(key)
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open a disk entry and mark it recently used; None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            # The open handle stays readable even if the entry is evicted meanwhile
+            handle = open(self._path(key), "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self._bytes -= self._entries.pop(key, 0)
+            return None
+        os.utime(handle.fileno())
+        return handle
+
+    def put(self, key: str, data: bytes):
+        """Write an entry to disk atomically (blocking)."""
+        if not data or len(data) > self.max_item_bytes:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+        self._evict()
+
+    async def lookup(self, key: str) -> Optional[BinaryIO]:
+        handle = self.open(key)
+        if handle is not None:
+            self.hits["disk"] += 1
+            return handle
+        if self.redis is not None:
+            try:
+                data = await self.redis.get(f"tts:audio:{key}")
+            except Exception as e:
+                logger.warning(f"[TTS cache] Redis lookup failed: {e}")
+                data = None
+            if data:
+                self.hits["redis"] += 1
+                await asyncio.to_thread(self.put, key, data)
+                return io.BytesIO(data)
+        self.misses += 1
+        return None
+
+    async def store(self, key: str, data: bytes):
+        if not data or len(data) > self.max_item_bytes:
+            return
+        await asyncio.to_thread(self.put, key, data)
+        if self.redis is not None:
+            try:
+                await self.redis.set(f"tts:audio:{key}", data, ex=self.redis_ttl_s)
+            except Exception as e:
+                logger.warning(f"[TTS cache] Redis store failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "redis": self.redis is not None,
+        }
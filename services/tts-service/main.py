@@ -3,16 +3,26 @@ Vexa TTS Service
 
 Text-to-speech service using OpenAI TTS API.
 Exposes OpenAI-compatible /v1/audio/speech endpoint for use by the vexa-bot.
+
+Synthesized audio is cached by (model, voice, format, normalized text), so the
+short phrases a voice agent repeats are served from disk. Long PCM/MP3 input
+can be split into sentences that are synthesized concurrently and streamed in
+order, which brings the first audio forward.
 """
 import os
+import re
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, BinaryIO, List, Optional
 
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
 import httpx
 
+from audio_cache import AudioCache, cache_key
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -23,12 +33,58 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "").strip()
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com")
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Upstream connection pool, shared by all requests
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("TTS_UPSTREAM_MAX_CONNECTIONS", "20"))
+UPSTREAM_TIMEOUT_S = float(os.getenv("TTS_UPSTREAM_TIMEOUT_S", "30"))
+
+# Audio cache: local disk LRU, optionally backed by Redis shared between replicas
+CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+CACHE_DIR = os.getenv("TTS_CACHE_DIR", "/app/cache")
+CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_MAX_ITEM_BYTES = int(os.getenv("TTS_CACHE_MAX_ITEM_BYTES", str(4 * 1024 * 1024)))
+CACHE_MAX_TEXT_CHARS = int(os.getenv("TTS_CACHE_MAX_TEXT_CHARS", "500"))  # Longer text rarely repeats
+CACHE_REDIS_URL = os.getenv("TTS_CACHE_REDIS_URL", "").strip()
+CACHE_REDIS_TTL_S = int(os.getenv("TTS_CACHE_REDIS_TTL_S", "86400"))
+
+# Sentence pipelining changes sentence boundaries and prosody, so it is off unless a request
+# asks for it; operators can turn it on for input at least this long (0 = only on request)
+SENTENCE_PIPELINE_MIN_CHARS = int(os.getenv("TTS_SENTENCE_PIPELINE_MIN_CHARS", "0"))
+SENTENCE_MIN_CHARS = int(os.getenv("TTS_SENTENCE_MIN_CHARS", "40"))  # Shorter sentences join the next one
+SENTENCE_CONCURRENCY = int(os.getenv("TTS_SENTENCE_CONCURRENCY", "3"))
+# Formats whose streams can be concatenated
+PIPELINE_FORMATS = ("pcm", "mp3")
+
+CHUNK_SIZE = 8192
+
+http_client: Optional[httpx.AsyncClient] = None
+audio_cache: Optional[AudioCache] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global http_client, audio_cache
     if not OPENAI_API_KEY:
         logger.warning("OPENAI_API_KEY not set - TTS synthesis will fail")
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(UPSTREAM_TIMEOUT_S, read=None),
+        limits=httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_CONNECTIONS,
+        ),
+    )
+    redis_client = None
+    if CACHE_ENABLED:
+        if CACHE_REDIS_URL:
+            import redis.asyncio as aioredis
+            redis_client = aioredis.from_url(CACHE_REDIS_URL)
+        audio_cache = AudioCache(
+            CACHE_DIR, CACHE_MAX_BYTES, CACHE_MAX_ITEM_BYTES,
+            redis=redis_client, redis_ttl_s=CACHE_REDIS_TTL_S,
+        )
     yield
+    await http_client.aclose()
+    if redis_client is not None:
+        await redis_client.aclose()
 
 
 app = FastAPI(
@@ -49,7 +105,136 @@ async def verify_api_key(api_key: str = Depends(API_KEY_HEADER)):
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "service": "tts-service"}
+    status = {"status": "ok", "service": "tts-service"}
+    if audio_cache is not None:
+        status["cache"] = audio_cache.stats()
+    return status
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;…。！？])\s+|\n+")
+
+
+def split_sentences(text: str, min_chars: int = SENTENCE_MIN_CHARS) -> List[str]:
+    """Split text at sentence ends, joining fragments shorter than min_chars to the next one."""
+    sentences: List[str] = []
+    pending = ""
+    for part in _SENTENCE_END.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences and len(pending) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+async def _stream_file(handle: BinaryIO) -> AsyncIterator[bytes]:
+    try:
+        while True:
+            chunk = await asyncio.to_thread(handle.read, CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        handle.close()
+
+
+async def _stream_upstream(resp: httpx.Response, key: Optional[str]) -> AsyncIterator[bytes]:
+    buffer: Optional[bytearray] = bytearray() if key else None
+    try:
+        async for chunk in resp.aiter_bytes(chunk_size=CHUNK_SIZE):
+            if buffer is not None:
+                buffer.extend(chunk)
+                if len(buffer) > CACHE_MAX_ITEM_BYTES:
+                    buffer = None
+            yield chunk
+    finally:
+        await resp.aclose()
+    # Only reached when the whole stream was read: partial audio is never cached
+    if buffer:
+        await audio_cache.store(key, bytes(buffer))
+
+
+async def _open_audio(model: str, voice: str, response_format: str, text: str) -> AsyncIterator[bytes]:
+    """
+    Open the audio of one utterance: a cache hit streams from disk, a miss from
+    the upstream API while filling the cache. Upstream errors are raised here,
+    before the caller starts streaming.
+    """
+    key = None
+    if audio_cache is not None and len(text) <= CACHE_MAX_TEXT_CHARS:
+        key = cache_key(model, voice, response_format, text)
+        handle = await audio_cache.lookup(key)
+        if handle is not None:
+            return _stream_file(handle)
+
+    url = f"{OPENAI_BASE_URL.rstrip('/')}/v1/audio/speech"
+    headers = {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    payload = {
+        "model": model,
+        "input": text,
+        "voice": voice,
+        "response_format": response_format,
+    }
+    resp = await http_client.send(http_client.build_request("POST", url, json=payload, headers=headers), stream=True)
+    if resp.status_code != 200:
+        err_body = await resp.aread()
+        await resp.aclose()
+        raise HTTPException(
+            status_code=502,
+            detail=f"OpenAI TTS error {resp.status_code}: {err_body.decode()[:200]}",
+        )
+    return _stream_upstream(resp, key)
+
+
+async def _stream_sentences(model: str, voice: str, response_format: str, sentences: List[str]) -> AsyncIterator[bytes]:
+    """
+    Synthesize sentences concurrently (at most SENTENCE_CONCURRENCY at a time)
+    and yield their audio in order. The first sentence is opened before the
+    response starts so that upstream errors still map to a 502.
+    """
+    first = await _open_audio(model, voice, response_format, sentences[0])
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in sentences]
+    semaphore = asyncio.Semaphore(max(1, SENTENCE_CONCURRENCY))
+
+    async def produce(index: int, source: Optional[AsyncIterator[bytes]] = None):
+        try:
+            async with semaphore:
+                if source is None:
+                    source = await _open_audio(model, voice, response_format, sentences[index])
+                async with aclosing(source):
+                    async for chunk in source:
+                        queues[index].put_nowait(chunk)
+            queues[index].put_nowait(None)
+        except Exception as e:
+            queues[index].put_nowait(e)
+
+    async def stream():
+        tasks = [asyncio.create_task(produce(0, first))]
+        tasks += [asyncio.create_task(produce(i)) for i in range(1, len(sentences))]
+        try:
+            for queue in queues:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return stream()
 
 
 @app.post("/v1/audio/speech")
@@ -61,6 +246,10 @@ async def speech(
     Synthesize text to speech. OpenAI-compatible API.
     Request body: {"model": "tts-1", "input": "text", "voice": "nova", "response_format": "pcm"}
     Returns: raw PCM audio (Int16LE, 24kHz, mono)
+
+    Optional "stream_sentences" (bool) turns sentence pipelining of PCM/MP3 output on or
+    off. Without it, pipelining is used only when TTS_SENTENCE_PIPELINE_MIN_CHARS is set
+    and the input is at least that long.
     """
     if not OPENAI_API_KEY:
         raise HTTPException(
@@ -88,31 +277,19 @@ async def speech(
     if response_format not in ("pcm", "mp3", "opus", "aac", "wav", "flac"):
         response_format = "pcm"
 
-    logger.info(f"[TTS] Synthesizing: model={model}, voice={voice}, len={len(text)}")
+    pipelined = body.get("stream_sentences")
+    if pipelined is None:
+        pipelined = SENTENCE_PIPELINE_MIN_CHARS > 0 and len(text) >= SENTENCE_PIPELINE_MIN_CHARS
+    sentences = split_sentences(text) if pipelined and response_format in PIPELINE_FORMATS else [text]
 
-    url = f"{OPENAI_BASE_URL.rstrip('/')}/v1/audio/speech"
-    headers = {
-        "Authorization": f"Bearer {OPENAI_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": model,
-        "input": text,
-        "voice": voice,
-        "response_format": response_format,
-    }
+    logger.info(
+        f"[TTS] Synthesizing: model={model}, voice={voice}, len={len(text)}, sentences={len(sentences)}"
+    )
 
-    async def stream():
-        async with httpx.AsyncClient() as client:
-            async with client.stream("POST", url, json=payload, headers=headers) as resp:
-                if resp.status_code != 200:
-                    err_body = await resp.aread()
-                    raise HTTPException(
-                        status_code=502,
-                        detail=f"OpenAI TTS error {resp.status_code}: {err_body.decode()[:200]}",
-                    )
-                async for chunk in resp.aiter_bytes(chunk_size=8192):
-                    yield chunk
+    if len(sentences) > 1:
+        stream = await _stream_sentences(model, voice, response_format, sentences)
+    else:
+        stream = await _open_audio(model, voice, response_format, text)
 
     media_type = "application/octet-stream"
     if response_format == "pcm":
@@ -121,7 +298,7 @@ async def speech(
         media_type = "audio/mpeg"
 
     return StreamingResponse(
-        stream(),
+        stream,
         media_type=media_type,
         headers={"Content-Disposition": "inline; filename=speech.audio"},
     )
@@ -0,0 +1,62 @@
+"""Local stand-in for the OpenAI speech endpoint, for benchmarks.
+
+Answers ``POST /v1/audio/speech`` after a fixed time to first byte and then
+streams deterministic 24 kHz Int16 PCM (``--ms-per-char`` of audio per input
+character) at ``--speedup`` times real time. Run:
+
+    python tests/stub_upstream.py --port 18010 --ttfb-ms 300
+"""
+import argparse
+import asyncio
+import hashlib
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+SAMPLE_RATE = 24000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+CHUNK_SIZE = 4800  # 50 ms of audio
+
+app = FastAPI()
+app.state.ttfb_s = 0.3
+app.state.ms_per_char = 60.0
+app.state.speedup = 4.0
+app.state.requests = 0
+
+
+@app.post("/v1/audio/speech")
+async def speech(request: Request):
+    body = await request.json()
+    app.state.requests += 1
+    text = body.get("input", "")
+    size = int(len(text) * app.state.ms_per_char / 1000 * BYTES_PER_SECOND) & ~1
+    seed = hashlib.sha256(text.encode()).digest()
+    pattern = (seed * (CHUNK_SIZE // len(seed) + 1))[:CHUNK_SIZE]
+    chunk_s = CHUNK_SIZE / BYTES_PER_SECOND / app.state.speedup
+
+    async def stream():
+        await asyncio.sleep(app.state.ttfb_s)
+        for offset in range(0, size, CHUNK_SIZE):
+            yield pattern[:min(CHUNK_SIZE, size - offset)]
+            await asyncio.sleep(chunk_s)
+
+    return StreamingResponse(stream(), media_type="audio/pcm")
+
+
+@app.get("/stats")
+async def stats():
+    return {"requests": app.state.requests}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18010)
+    parser.add_argument("--ttfb-ms", type=float, default=300)
+    parser.add_argument("--ms-per-char", type=float, default=60)
+    parser.add_argument("--speedup", type=float, default=4.0)
+    args = parser.parse_args()
+    app.state.ttfb_s = args.ttfb_ms / 1000
+    app.state.ms_per_char = args.ms_per_char
+    app.state.speedup = args.speedup
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
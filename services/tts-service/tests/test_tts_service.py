@@ -0,0 +1,97 @@
+import asyncio
+import json
+import tempfile
+import unittest
+
+import httpx
+
+import main
+from audio_cache import AudioCache, cache_key
+
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_key_ignores_whitespace_but_not_voice(self):
+        self.assertEqual(cache_key("tts-1", "nova", "pcm", " Hello\n  there "), cache_key("tts-1", "nova", "pcm", "Hello there"))
+        self.assertNotEqual(cache_key("tts-1", "nova", "pcm", "Hello"), cache_key("tts-1", "echo", "pcm", "Hello"))
+
+    def test_evicts_least_recently_used_and_survives_restart(self):
+        cache = AudioCache(self.tmp.name, max_bytes=250, max_item_bytes=200)
+        cache.put("a" * 64, b"1" * 100)
+        cache.put("b" * 64, b"2" * 100)
+        cache.open("a" * 64).close()  # a is now the most recent
+        cache.put("c" * 64, b"3" * 100)
+
+        self.assertIsNone(cache.open("b" * 64))
+        with cache.open("a" * 64) as handle:
+            self.assertEqual(handle.read(), b"1" * 100)
+        cache.put("d" * 64, b"4" * 300)  # above max_item_bytes
+        self.assertIsNone(cache.open("d" * 64))
+
+        restarted = AudioCache(self.tmp.name, max_bytes=250, max_item_bytes=200)
+        self.assertEqual(restarted.stats()["entries"], 2)
+        self.assertIsNotNone(restarted.open("c" * 64))
+
+
+def test_split_sentences_joins_short_fragments():
+    text = "Hi. Thanks for joining today. The launch moves to May! Questions?"
+    assert main.split_sentences(text, min_chars=20) == [
+        "Hi. Thanks for joining today.", "The launch moves to May! Questions?",
+    ]
+
+
+class TestSpeech(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.upstream_calls = []
+
+        async def handler(request):
+            text = json.loads(request.content)["input"]
+            self.upstream_calls.append(text)
+            # Earlier sentences take longer, so they finish last
+            await asyncio.sleep(0.05 / len(self.upstream_calls))
+            return httpx.Response(200, content=text.encode())
+
+        self.saved = (main.http_client, main.audio_cache, main.OPENAI_API_KEY)
+        main.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        main.audio_cache = AudioCache(self.tmp.name, max_bytes=1 << 20, max_item_bytes=1 << 16)
+        main.OPENAI_API_KEY = "test"
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://tts")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await main.http_client.aclose()
+        main.http_client, main.audio_cache, main.OPENAI_API_KEY = self.saved
+
+    async def _speak(self, text, **extra):
+        resp = await self.client.post("/v1/audio/speech", json={"input": text, "voice": "nova", **extra})
+        self.assertEqual(resp.status_code, 200)
+        return resp.content
+
+    async def test_repeated_phrase_is_served_from_cache(self):
+        self.assertEqual(await self._speak("Hello, I'm the notetaker."), b"Hello, I'm the notetaker.")
+        self.assertEqual(await self._speak("Hello,  I'm the notetaker. "), b"Hello, I'm the notetaker.")
+        self.assertEqual(len(self.upstream_calls), 1)
+        self.assertEqual(main.audio_cache.stats()["hits"]["disk"], 1)
+
+    async def test_sentences_are_synthesized_concurrently_and_streamed_in_order(self):
+        sentences = [f"This is sentence number {i} of the answer." for i in range(4)]
+        audio = await self._speak(" ".join(sentences), stream_sentences=True)
+
+        self.assertEqual(audio, "".join(sentences).encode())
+        self.assertEqual(sorted(self.upstream_calls), sorted(sentences))
+        # Each sentence is cached on its own
+        self.assertEqual(main.audio_cache.stats()["entries"], len(sentences))
+
+    async def test_long_input_is_one_request_unless_pipelining_is_asked_for(self):
+        text = " ".join(f"This is sentence number {i} of a long answer." for i in range(8))
+        self.assertEqual(await self._speak(text, response_format="pcm"), text.encode())
+        self.assertEqual(self.upstream_calls, [text])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""Time-to-first-byte benchmark of the TTS service against a stub upstream.
+
+Starts ``stub_upstream.py`` and the service (each under uvicorn, on local
+ports, with a throwaway cache directory) and measures:
+
+- a voice-agent phrase repeated ``--repeats`` times (first miss, then cache hits),
+- a long paragraph synthesized in one request vs. pipelined by sentence,
+- a burst of ``--burst`` concurrent distinct phrases over the pooled client.
+
+Run from services/tts-service:
+
+    python tests/tts_benchmark.py --ttfb-ms 300 --repeats 20 --burst 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SERVICE_DIR = os.path.dirname(HERE)
+
+GREETING = "Hi everyone, I'm the meeting assistant. I'll be taking notes today."
+PARAGRAPH = (
+    "Thanks for waiting. Here is a short summary of the discussion so far. "
+    "The team agreed to move the launch to the second week of next month. "
+    "Marketing will prepare the announcement draft by Friday. "
+    "Engineering still needs to finish the migration and the load tests. "
+    "Finally, we will review the budget again during the next call."
+)
+
+
+async def _wait_ready(url: str, timeout_s: float = 20.0):
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def _speak(client: httpx.AsyncClient, url: str, text: str, **extra):
+    started = time.perf_counter()
+    ttfb = None
+    size = 0
+    body = {"model": "tts-1", "voice": "nova", "input": text, "response_format": "pcm", **extra}
+    async with client.stream("POST", url, json=body) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.aiter_bytes():
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+            size += len(chunk)
+    return ttfb, time.perf_counter() - started, size
+
+
+def _ms(values):
+    return f"p50={statistics.median(values) * 1000:.0f}ms max={max(values) * 1000:.0f}ms"
+
+
+async def run(args):
+    url = f"http://127.0.0.1:{args.port}/v1/audio/speech"
+    async with httpx.AsyncClient(timeout=60) as client:
+        results = [await _speak(client, url, GREETING) for _ in range(args.repeats)]
+        print(f"repeated phrase   first ttfb={results[0][0] * 1000:.0f}ms, "
+              f"cached ttfb {_ms([r[0] for r in results[1:]])}")
+
+        for pipelined in (False, True):
+            # Distinct text per run so neither mode benefits from the cache
+            text = f"{PARAGRAPH} Run {int(pipelined)}."
+            ttfb, total, size = await _speak(client, url, text, stream_sentences=pipelined)
+            mode = "pipelined" if pipelined else "single"
+            print(f"paragraph {mode:9} ttfb={ttfb * 1000:.0f}ms total={total * 1000:.0f}ms bytes={size}")
+
+        started = time.perf_counter()
+        burst = await asyncio.gather(*[
+            _speak(client, url, f"Noted, item number {i} is on the list.") for i in range(args.burst)
+        ])
+        print(f"burst of {args.burst:<7} ttfb {_ms([r[0] for r in burst])}, "
+              f"wall={(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18012)
+    parser.add_argument("--upstream-port", type=int, default=18010)
+    parser.add_argument("--ttfb-ms", type=float, default=300)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(
+            os.environ,
+            OPENAI_API_KEY="stub",
+            OPENAI_BASE_URL=f"http://127.0.0.1:{args.upstream_port}",
+            TTS_CACHE_DIR=cache_dir,
+        )
+        upstream = subprocess.Popen(
+            [sys.executable, os.path.join(HERE, "stub_upstream.py"), "--port", str(args.upstream_port),
+             "--ttfb-ms", str(args.ttfb_ms)],
+        )
+        service = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=SERVICE_DIR, env=env,
+        )
+        try:
+            asyncio.run(_wait_ready(f"http://127.0.0.1:{args.upstream_port}/stats"))
+            asyncio.run(_wait_ready(f"http://127.0.0.1:{args.port}/health"))
+            asyncio.run(run(args))
+        finally:
+            service.terminate()
+            upstream.terminate()
+            service.wait()
+            upstream.wait()
+
+
+if __name__ == "__main__":
+    main()
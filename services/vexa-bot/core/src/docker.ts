@@ -1,6 +1,7 @@
 import { runBot } from "."
 import { z } from 'zod';
 import { BotConfig } from "./types"; // Import the BotConfig type
+import { createClient } from 'redis';
 
 // Define a schema that matches your JSON configuration
 export const BotConfigSchema = z.object({
@@ -14,6 +15,7 @@ export const BotConfigSchema = z.object({
   task: z.string().nullish(),     // Optional task
   transcribeEnabled: z.boolean().optional(),
   transcriptionTier: z.enum(["realtime", "deferred"]).optional(),
+  whisperLiveUrl: z.string().optional(), // WhisperLive instance picked by bot-manager
   redisUrl: z.string(),         // Required Redis URL
   container_name: z.string().optional(), // ADDED: Optional container name
   automaticLeave: z.object({
@@ -33,8 +35,63 @@ export const BotConfigSchema = z.object({
 });
 
 
+function startBot(parsedConfig: unknown): void {
+  // Validate and parse the config using zod
+  const botConfig: BotConfig = BotConfigSchema.parse(parsedConfig) as BotConfig;
+
+  // Run the bot with the validated configuration
+  runBot(botConfig).catch((error) => {
+    console.error("Error running bot:", error);
+    process.exit(1);
+  });
+}
+
+// Warm pool standby: the process is already booted (Node + Playwright loaded,
+// Redis connected) and waits for bot-manager to hand it a meeting config via
+// an {"action": "assign", "config": {...}} command on its pool channel.
+async function waitForPoolAssignment(poolChannel: string, redisUrl: string): Promise<void> {
+  const subscriber = createClient({ url: redisUrl });
+  subscriber.on('error', (err) => console.error(`[WarmPool] Redis Client Error: ${err}`));
+  await subscriber.connect();
+
+  let assigned = false;
+  await subscriber.subscribe(poolChannel, async (message) => {
+    if (assigned) return;
+    try {
+      const command = JSON.parse(message);
+      if (command.action !== "assign" || !command.config) {
+        console.error(`[WarmPool] Ignoring unexpected command on ${poolChannel}: ${message}`);
+        return;
+      }
+      assigned = true;
+      console.log(`[WarmPool] Received assignment on ${poolChannel}`);
+      await subscriber.unsubscribe(poolChannel);
+      await subscriber.quit();
+      startBot(command.config);
+    } catch (error) {
+      console.error("[WarmPool] Invalid assignment:", error);
+      process.exit(1);
+    }
+  });
+  console.log(`[WarmPool] Standing by on ${poolChannel}`);
+}
+
+
 (function main() {
 const rawConfig = process.env.BOT_CONFIG;
+const poolChannel = process.env.BOT_POOL_CHANNEL;
+if (!rawConfig && poolChannel) {
+  const redisUrl = process.env.REDIS_URL;
+  if (!redisUrl) {
+    console.error("REDIS_URL environment variable is required in warm pool mode");
+    process.exit(1);
+  }
+  waitForPoolAssignment(poolChannel, redisUrl).catch((error) => {
+    console.error("[WarmPool] Failed to enter standby:", error);
+    process.exit(1);
+  });
+  return;
+}
 if (!rawConfig) {
   console.error("BOT_CONFIG environment variable is not set");
   process.exit(1);
@@ -42,15 +99,7 @@ if (!rawConfig) {
 
   try {
   // Parse the JSON string from the environment variable
-  const parsedConfig = JSON.parse(rawConfig);
-  // Validate and parse the config using zod
-  const botConfig: BotConfig = BotConfigSchema.parse(parsedConfig) as BotConfig;
-
-  // Run the bot with the validated configuration
-  runBot(botConfig).catch((error) => {
-    console.error("Error running bot:", error);
-    process.exit(1);
-  });
+  startBot(JSON.parse(rawConfig));
 } catch (error) {
   console.error("Invalid BOT_CONFIG:", error);
   process.exit(1);
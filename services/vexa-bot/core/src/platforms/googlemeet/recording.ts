@@ -22,7 +22,7 @@ export async function startGoogleRecording(page: Page, botConfig: BotConfig): Pr
   let whisperLiveUrl: string | null = null;
   if (transcriptionEnabled) {
     whisperLiveService = new WhisperLiveService({
-      whisperLiveUrl: process.env.WHISPER_LIVE_URL
+      whisperLiveUrl: botConfig.whisperLiveUrl || process.env.WHISPER_LIVE_URL
     });
     // Initialize WhisperLive connection with STUBBORN reconnection - NEVER GIVES UP!
     whisperLiveUrl = await whisperLiveService.initializeWithStubbornReconnection("Google Meet");
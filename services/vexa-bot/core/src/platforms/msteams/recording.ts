@@ -27,7 +27,7 @@ export async function startTeamsRecording(page: Page, botConfig: BotConfig): Pro
   let whisperLiveUrl: string | null = null;
   if (transcriptionEnabled) {
     whisperLiveService = new WhisperLiveService({
-      whisperLiveUrl: process.env.WHISPER_LIVE_URL
+      whisperLiveUrl: botConfig.whisperLiveUrl || process.env.WHISPER_LIVE_URL
     });
     // Initialize WhisperLive connection with STUBBORN reconnection - NEVER GIVES UP!
     whisperLiveUrl = await whisperLiveService.initializeWithStubbornReconnection("Teams");
@@ -25,7 +25,7 @@ export async function startZoomRecording(page: Page | null, botConfig: BotConfig
     if (transcriptionEnabled) {
       // Initialize WhisperLive service
       whisperLive = new WhisperLiveService({
-        whisperLiveUrl: process.env.WHISPER_LIVE_URL
+        whisperLiveUrl: botConfig.whisperLiveUrl || process.env.WHISPER_LIVE_URL
       });
 
       // Initialize connection
@@ -217,6 +217,12 @@ export class WhisperLiveService {
    */
   async getNextCandidate(failedUrl: string | null): Promise<string | null> {
     log(`[WhisperLive] getNextCandidate called. Failed URL: ${failedUrl}`);
+    const balancerUrl = (process.env.WHISPER_LIVE_URL as string) || null;
+    if (failedUrl && balancerUrl && failedUrl !== balancerUrl && failedUrl === this.config.whisperLiveUrl) {
+      // The instance bot-manager placed us on is gone; go through the balancer from now on
+      if (this.connection) this.connection.allocatedServerUrl = balancerUrl;
+      return balancerUrl;
+    }
     return this.connection?.allocatedServerUrl || this.config.whisperLiveUrl || (process.env.WHISPER_LIVE_URL as string) || null;
   }
 
@@ -10,6 +10,7 @@ export type BotConfig = {
   task?: string | null,
   transcribeEnabled?: boolean,
   transcriptionTier?: "realtime" | "deferred",
+  whisperLiveUrl?: string,  // WhisperLive instance picked by bot-manager; falls back to WHISPER_LIVE_URL
   redisUrl: string,
   container_name?: string,
   automaticLeave: {
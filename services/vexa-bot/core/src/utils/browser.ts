@@ -314,6 +314,7 @@ export class BrowserWhisperLiveService {
   private retryDelayMs: number = 2000;
   private stubbornMode: boolean = false;
   private isManualReconnect: boolean = false; // Flag to prevent auto-reconnect during manual reconfigure
+  private resumeUid: string | null = null; // Session a draining server handed off; resumed on the next connect
 
   constructor(config: any, stubbornMode: boolean = false) {
     this.whisperLiveUrl = config.whisperLiveUrl;
@@ -344,7 +345,7 @@ export class BrowserWhisperLiveService {
       this.socket = new WebSocket(this.whisperLiveUrl);
       
       this.socket.onopen = () => {
-        this.currentUid = generateBrowserUUID();
+        this.currentUid = this.resumeUid || generateBrowserUUID();
         (window as any).logBot(`[Failover] WebSocket connection opened successfully to ${this.whisperLiveUrl}. New UID: ${this.currentUid}. Lang: ${this.botConfigData.language}, Task: ${this.botConfigData.task}`);
         
         const configPayload = {
@@ -358,7 +359,9 @@ export class BrowserWhisperLiveService {
           token: this.botConfigData.token,  // MeetingToken (HS256 JWT)
           meeting_id: this.botConfigData.meeting_id,
           meeting_url: this.botConfigData.meetingUrl || null,
+          resume_uid: this.resumeUid,
         };
+        this.resumeUid = null;
 
         (window as any).logBot(`Sending initial config message: ${JSON.stringify(configPayload)}`);
         this.socket!.send(JSON.stringify(configPayload));
@@ -366,6 +369,7 @@ export class BrowserWhisperLiveService {
 
       this.socket.onmessage = (event) => {
         const data = JSON.parse(event.data);
+        this.handleReconnectHint(data);
         if (this.onMessageCallback) {
           this.onMessageCallback(data);
         }
@@ -393,7 +397,7 @@ export class BrowserWhisperLiveService {
         this.clearReconnectInterval(); // Stop any ongoing reconnection attempts
         this.isServerReady = false; // Will be set to true when SERVER_READY received
         
-        this.currentUid = generateBrowserUUID();
+        this.currentUid = this.resumeUid || generateBrowserUUID();
         
         const configPayload = {
           uid: this.currentUid,
@@ -406,7 +410,9 @@ export class BrowserWhisperLiveService {
           token: this.botConfigData.token,  // MeetingToken (HS256 JWT)
           meeting_id: this.botConfigData.meeting_id,
           meeting_url: this.botConfigData.meetingUrl || null,
+          resume_uid: this.resumeUid,
         };
+        this.resumeUid = null;
 
         (window as any).logBot(`Sending initial config message: ${JSON.stringify(configPayload)}`);
         if (this.socket) {
@@ -416,6 +422,7 @@ export class BrowserWhisperLiveService {
 
       this.socket.onmessage = (event) => {
         const data = JSON.parse(event.data);
+        this.handleReconnectHint(data);
         if (this.onMessageCallback) {
           this.onMessageCallback(data);
         }
@@ -486,6 +493,21 @@ export class BrowserWhisperLiveService {
     }, delay);
   }
 
+  /**
+   * A draining server sends RECONNECT with a peer URL and the uid to resume
+   * before closing; the next connection goes there and continues the session.
+   */
+  private handleReconnectHint(data: any): void {
+    if (!data || data.status !== "RECONNECT") {
+      return;
+    }
+    if (data.url) {
+      this.whisperLiveUrl = data.url;
+    }
+    this.resumeUid = data.resume_uid || null;
+    (window as any).logBot(`[WhisperLive] Server draining; reconnecting to ${this.whisperLiveUrl} (resume: ${this.resumeUid})`);
+  }
+
   private clearReconnectInterval(): void {
     if (this.reconnectInterval) {
       clearTimeout(this.reconnectInterval);
@@ -0,0 +1,487 @@
+"""End-to-end load benchmark of the live transcription path, with local stubs.
+
+Starts, on local ports and against the local Redis and Postgres:
+
+- ``stub_transcriber.py`` in place of the transcription service;
+- WhisperLive (``--backend remote``) pointed at the stub;
+- the transcription-collector;
+- the api-gateway (its other upstreams are never called).
+
+For each level in ``--bots``, it then seeds that many meetings and runs one
+synthetic bot per meeting for ``--duration`` seconds. Each bot streams
+recorded audio in real time over the WhisperLive WebSocket protocol. A
+dashboard client per meeting watches the gateway ``/ws`` for the segments.
+Each level reports:
+
+- ``meetings_per_core``: meetings over the cores that WhisperLive, the
+  collector and the gateway used. The stub's cores are reported apart as
+  ``stub_cores_used``; they are only non-zero with ``--stub-mode cpu``,
+  where the stub burns CPU like a model would and the services compete
+  with it for the host;
+- end-to-end segment latency percentiles, from the ``timing.ingest`` stamp
+  WhisperLive puts on a window to the dashboard receiving it. Everything runs
+  on one host, so there is no clock skew;
+- Redis write commands per second, and Postgres commits and row writes per
+  second;
+- per-stage p50/p99 from each service's latency histograms.
+
+A level is sustained when every meeting received updates and the p99
+end-to-end latency stays within ``--slo-ms``. The headline figure is
+meetings per core at the largest sustained level.
+
+It needs the Python requirements of WhisperLive's server, the collector and
+the gateway, plus ``shared-models`` installed. Redis and Postgres are taken
+from ``REDIS_URL`` and ``DB_*``. Run from the repository root:
+
+    python testing/e2e_benchmark/run.py --bots 4,8,16 --duration 60
+    python testing/e2e_benchmark/run.py --bots 8 --save baseline.json
+    python testing/e2e_benchmark/run.py --bots 8 --baseline baseline.json
+    python testing/e2e_benchmark/run.py --bots 4,8 --stub-mode cpu --stub-slots 2 --stub-ms-per-audio-s 100
+
+``baseline.json`` and ``baseline-cpu.json`` next to this file hold one run of
+``--bots 4,8,16`` with the default stub and with ``--stub-mode cpu
+--stub-slots 1``; their summaries record the host's CPU count.
+"""
+import argparse
+import asyncio
+import base64
+import hmac
+import json
+import os
+import re
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+import wave
+from urllib.parse import urlparse
+
+import httpx
+import numpy as np
+import psutil
+import redis
+import websockets
+
+from shared_models.latency import histogram_quantile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_AUDIO = os.path.join(ROOT, "services", "transcription-service", "tests", "test_audio.wav")
+
+RATE = 16000
+CHUNK_S = 0.1
+ADMIN_TOKEN = "e2e-benchmark-admin-token"
+PLATFORM = "google_meet"
+
+# Commands that write to Redis, for the write-rate figure
+REDIS_WRITE_COMMANDS = {
+    "xadd", "xack", "xtrim", "xdel", "hset", "hdel", "set", "setex", "getdel", "del", "unlink", "expire",
+    "sadd", "srem", "zadd", "zrem", "zremrangebyscore", "publish", "incr", "incrby", "lpush", "rpush",
+}
+
+for _key, _value in {
+    "DB_HOST": "localhost", "DB_PORT": "5432", "DB_NAME": "vexa", "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres", "REDIS_URL": "redis://localhost:6379/0",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def mint_meeting_token(meeting_id: int, user_id: int, native_id: str, ttl_s: int = 7200) -> str:
+    """Same MeetingToken that bot-manager mints, signed with the benchmark's ADMIN_TOKEN."""
+    now = int(time.time())
+    header = {"alg": "HS256", "typ": "JWT"}
+    claims = {
+        "meeting_id": meeting_id, "user_id": user_id, "platform": PLATFORM, "native_meeting_id": native_id,
+        "scope": "transcribe:write", "iss": "bot-manager", "aud": "transcription-collector",
+        "iat": now, "exp": now + ttl_s, "jti": str(uuid.uuid4()),
+    }
+    signing_input = ".".join(_b64url(json.dumps(p, separators=(",", ":")).encode()) for p in (header, claims))
+    signature = hmac.new(ADMIN_TOKEN.encode(), signing_input.encode("ascii"), digestmod="sha256").digest()
+    return f"{signing_input}.{_b64url(signature)}"
+
+
+def native_meeting_id(n: int) -> str:
+    """A valid Google Meet code (``abc-defg-hij``) per integer."""
+    letters = []
+    for _ in range(10):
+        n, r = divmod(n, 26)
+        letters.append(chr(ord("a") + r))
+    code = "".join(reversed(letters))
+    return f"{code[:3]}-{code[3:7]}-{code[7:]}"
+
+
+def load_audio(path: str) -> np.ndarray:
+    with wave.open(path) as wav:
+        channels, rate = wav.getnchannels(), wav.getframerate()
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    samples = pcm.reshape(-1, channels).mean(axis=1).astype(np.float32) / 32768.0
+    if rate != RATE:
+        positions = np.arange(0, samples.shape[0], rate / RATE)
+        samples = np.interp(positions, np.arange(samples.shape[0]), samples).astype(np.float32)
+    return samples
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+# --- Seeding -------------------------------------------------------------------
+
+async def seed_meetings(count: int):
+    """One user with an API key and ``count`` active meetings; returns the key, user id and meetings."""
+    from shared_models.database import async_session_local, init_db
+    from shared_models.models import APIToken, Meeting, User
+
+    await init_db()
+    run = secrets.token_hex(4)
+    async with async_session_local() as db:
+        user = User(email=f"e2e-bench-{run}@example.com", name="e2e benchmark", max_concurrent_bots=count, data={})
+        db.add(user)
+        await db.flush()
+        api_key = secrets.token_urlsafe(32)
+        db.add(APIToken(token=api_key, user_id=user.id))
+        base = int(run, 16) * 1000
+        meetings = [
+            Meeting(user_id=user.id, platform=PLATFORM, platform_specific_id=native_meeting_id(base + i),
+                    status="active", data={})
+            for i in range(count)
+        ]
+        db.add_all(meetings)
+        await db.commit()
+        return api_key, user.id, [(m.id, m.platform_specific_id) for m in meetings]
+
+
+async def db_counters():
+    from sqlalchemy import text
+    from shared_models.database import engine
+
+    async with engine.connect() as conn:
+        row = (await conn.execute(text(
+            "SELECT xact_commit, tup_inserted, tup_updated, tup_deleted "
+            "FROM pg_stat_database WHERE datname = current_database()"
+        ))).one()
+    return {"commits": row[0], "rows_written": row[1] + row[2] + row[3]}
+
+
+# --- Measurements ---------------------------------------------------------------
+
+def redis_write_calls(client: redis.Redis):
+    stats = client.info("commandstats")
+    return {
+        name[len("cmdstat_"):]: value["calls"]
+        for name, value in stats.items()
+        if name[len("cmdstat_"):] in REDIS_WRITE_COMMANDS
+    }
+
+
+def cpu_seconds(processes):
+    """User and system CPU of ``processes`` and their live children (the stub's workers)."""
+    total = 0.0
+    for proc in processes:
+        try:
+            parent = psutil.Process(proc.pid)
+            for p in (parent, *parent.children(recursive=True)):
+                times = p.cpu_times()
+                total += times.user + times.system
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+
+_BUCKET = re.compile(r'^(\w+)_bucket\{.*stage="([^"]+)".*le="([^"]+)"\} (\S+)$')
+
+
+def scrape_histograms(urls):
+    """``{(metric, stage): {le: cumulative_count}}`` from the services' Prometheus endpoints."""
+    buckets = {}
+    for url in urls:
+        try:
+            body = httpx.get(url, timeout=5).text
+        except httpx.HTTPError:
+            continue
+        for line in body.splitlines():
+            match = _BUCKET.match(line)
+            if match:
+                metric, stage, le, count = match.groups()
+                buckets.setdefault((metric, stage), {})[float(le)] = float(count)
+    return buckets
+
+
+# --- Synthetic bots and dashboards ---------------------------------------------------
+
+async def run_bot(url, meeting, user_id, audio, offset, stop_at, stats):
+    meeting_id, native_id = meeting
+    token = mint_meeting_token(meeting_id, user_id, native_id)
+    uid = str(uuid.uuid4())
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps({
+            "uid": uid, "language": "en", "task": "transcribe", "transcription_tier": "realtime",
+            "model": None, "use_vad": False, "platform": PLATFORM, "token": token,
+            "meeting_id": meeting_id, "meeting_url": f"https://meet.google.com/{native_id}",
+        }))
+        while json.loads(await ws.recv()).get("status") != "SERVER_READY":
+            pass
+        started = time.monotonic()
+        await ws.send(json.dumps({"type": "speaker_activity", "payload": {
+            "event_type": "SPEAKER_START", "participant_name": f"Speaker {meeting_id}",
+            "participant_id_meet": str(meeting_id), "relative_client_timestamp_ms": 0, "uid": uid,
+            "token": token, "platform": PLATFORM, "meeting_id": native_id,
+        }}))
+
+        async def drain():
+            async for _ in ws:
+                stats["bot_messages"] += 1
+
+        reader = asyncio.create_task(drain())
+        step = int(CHUNK_S * RATE)
+        position = offset
+        sent = 0
+        try:
+            while time.monotonic() < stop_at:
+                chunk = np.take(audio, range(position, position + step), mode="wrap")
+                position = (position + step) % audio.shape[0]
+                await ws.send(chunk.tobytes())
+                sent += 1
+                # Real-time pacing against the start, so slow sends don't drift
+                await asyncio.sleep(max(0.0, started + sent * CHUNK_S - time.monotonic()))
+        finally:
+            reader.cancel()
+    stats["audio_s"] += sent * CHUNK_S
+
+
+async def run_dashboard(url, api_key, meeting, measure_from, stop_at, latencies, updates):
+    _, native_id = meeting
+    async with websockets.connect(f"{url}?api_key={api_key}", max_size=None) as ws:
+        await ws.send(json.dumps({"action": "subscribe", "meetings": [{"platform": PLATFORM, "native_id": native_id}]}))
+        while time.monotonic() < stop_at:
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=max(0.1, stop_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            received = time.time()
+            event = json.loads(raw)
+            if event.get("type") != "transcript.mutable":
+                continue
+            updates[native_id] = updates.get(native_id, 0) + 1
+            ingest = (event.get("timing") or {}).get("ingest")
+            if ingest is not None and time.monotonic() >= measure_from:
+                latencies.append(received - float(ingest))
+
+
+async def run_level(args, bots, procs, stub, urls, audio, redis_client):
+    api_key, user_id, meetings = await seed_meetings(bots)
+    stub_cpu_before = cpu_seconds([stub])
+    cpu_before, redis_before, db_before = cpu_seconds(procs), redis_write_calls(redis_client), await db_counters()
+    hist_before = scrape_histograms(urls["metrics"])
+    wall_started = time.monotonic()
+    stop_at = wall_started + args.duration
+    measure_from = wall_started + args.warmup
+
+    latencies, updates = [], {}
+    stats = {"bot_messages": 0, "audio_s": 0.0}
+    dashboards = [
+        asyncio.create_task(run_dashboard(urls["gateway_ws"], api_key, m, measure_from, stop_at + args.drain, latencies, updates))
+        for m in meetings
+    ]
+    await asyncio.sleep(1.0)  # subscriptions first, so no early update is missed
+    results = await asyncio.gather(*[
+        run_bot(urls["whisperlive"], m, user_id, audio, (i * 5939) % audio.shape[0], stop_at, stats)
+        for i, m in enumerate(meetings)
+    ], return_exceptions=True)
+    await asyncio.gather(*dashboards, return_exceptions=True)
+    wall = time.monotonic() - wall_started
+
+    cpu_used = cpu_seconds(procs) - cpu_before
+    stub_cpu_used = cpu_seconds([stub]) - stub_cpu_before
+    redis_after, db_after = redis_write_calls(redis_client), await db_counters()
+    hist_after = scrape_histograms(urls["metrics"])
+    redis_writes = {k: v - redis_before.get(k, 0) for k, v in redis_after.items() if v - redis_before.get(k, 0)}
+    cores = cpu_used / wall if wall else 0.0
+    p99 = percentile(latencies, 99)
+    stages = {}
+    for (metric, stage), after in sorted(hist_after.items()):
+        p50 = histogram_quantile(hist_before.get((metric, stage), {}), after, 50)
+        if p50 is not None:
+            service = metric.replace("_stage_latency_seconds", "")
+            stages[f"{service}.{stage}"] = {
+                "p50_ms": round(p50 * 1000, 1),
+                "p99_ms": round(histogram_quantile(hist_before.get((metric, stage), {}), after, 99) * 1000, 1),
+            }
+    return {
+        "bots": bots,
+        "bot_errors": sum(1 for r in results if isinstance(r, Exception)),
+        "meetings_with_updates": len(updates),
+        "updates": sum(updates.values()),
+        "cores_used": round(cores, 3),
+        "meetings_per_core": round(bots / cores, 2) if cores else None,
+        "stub_cores_used": round(stub_cpu_used / wall, 3) if wall else 0.0,
+        "e2e_p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "e2e_p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "e2e_p99_ms": round(p99 * 1000, 1) if latencies else None,
+        "redis_writes_per_s": round(sum(redis_writes.values()) / wall, 1),
+        "redis_writes_by_command": {k: round(v / wall, 1) for k, v in sorted(redis_writes.items())},
+        "db_commits_per_s": round((db_after["commits"] - db_before["commits"]) / wall, 1),
+        "db_rows_written_per_s": round((db_after["rows_written"] - db_before["rows_written"]) / wall, 1),
+        "stages": stages,
+        "sustained": bool(latencies) and len(updates) == bots and p99 * 1000 <= args.slo_ms,
+    }
+
+
+# --- Services ----------------------------------------------------------------------
+
+def start_services(args, log_dir):
+    redis_url = urlparse(os.environ["REDIS_URL"])
+    redis_host, redis_port = redis_url.hostname or "localhost", str(redis_url.port or 6379)
+    shared_env = dict(os.environ, ADMIN_TOKEN=ADMIN_TOKEN, LOG_LEVEL="WARNING", REDIS_HOST=redis_host, REDIS_PORT=redis_port)
+    specs = [
+        ("stub", [sys.executable, os.path.join(HERE, "stub_transcriber.py"), "--port", str(args.stub_port),
+                  "--mode", args.stub_mode, "--slots", str(args.stub_slots), "--ms-per-audio-s", str(args.stub_ms_per_audio_s)],
+         HERE, shared_env),
+        ("whisperlive", [sys.executable, "run_server.py", "--port", str(args.whisperlive_port), "--backend", "remote",
+                         "--wl_recording_dir", ""],
+         os.path.join(ROOT, "services", "WhisperLive"),
+         dict(shared_env,
+              REMOTE_TRANSCRIBER_URL=f"http://127.0.0.1:{args.stub_port}/v1/audio/transcriptions",
+              REMOTE_TRANSCRIBER_API_KEY="stub",
+              REDIS_STREAM_URL=os.environ["REDIS_URL"],
+              WL_MAX_CLIENTS=str(max(args.levels) + 1),
+              WL_RECORDING_UPLOAD_ENABLED="false",
+              CONSUL_ENABLE="false",
+              WL_REDIS_DISCOVERY_ENABLED="false")),
+        ("collector", [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.collector_port), "--log-level", "warning"],
+         os.path.join(ROOT, "services", "transcription-collector"),
+         dict(shared_env, IMMUTABILITY_THRESHOLD=str(args.immutability_s), BACKGROUND_TASK_INTERVAL="2")),
+        ("gateway", [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.gateway_port), "--log-level", "warning"],
+         os.path.join(ROOT, "services", "api-gateway"),
+         dict(shared_env, TRANSCRIPTION_COLLECTOR_URL=f"http://127.0.0.1:{args.collector_port}",
+              ADMIN_API_URL="http://127.0.0.1:9", BOT_MANAGER_URL="http://127.0.0.1:9", MCP_URL="http://127.0.0.1:9")),
+    ]
+    procs = {}
+    for name, cmd, cwd, env in specs:
+        log = open(os.path.join(log_dir, f"{name}.log"), "wb")
+        procs[name] = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return procs
+
+
+async def wait_ready(url, timeout_s=60.0):
+    deadline = time.monotonic() + timeout_s
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def compare(current, baseline):
+    keys = ("meetings_per_core", "e2e_p50_ms", "e2e_p99_ms", "redis_writes_per_s", "db_rows_written_per_s")
+    by_bots = {level["bots"]: level for level in baseline.get("levels", [])}
+    for level in current["levels"]:
+        base = by_bots.get(level["bots"])
+        if not base:
+            continue
+        print(f"\nvs baseline, {level['bots']} bots:")
+        for key in keys:
+            old, new = base.get(key), level.get(key)
+            delta = f"{(new - old) / old * 100:+.1f}%" if old and new is not None else "n/a"
+            print(f"  {key:22} {old!s:>10} -> {new!s:>10}  {delta}")
+
+
+async def main_async(args):
+    audio = load_audio(args.audio)
+    redis_client = redis.Redis.from_url(os.environ["REDIS_URL"], decode_responses=True)
+    with tempfile.TemporaryDirectory(prefix="e2e-bench-") as log_dir:
+        procs = start_services(args, log_dir)
+        try:
+            await wait_ready(f"http://127.0.0.1:{args.stub_port}/health")
+            await wait_ready("http://127.0.0.1:9091/ready")
+            await wait_ready(f"http://127.0.0.1:{args.collector_port}/health")
+            await wait_ready(f"http://127.0.0.1:{args.gateway_port}/")
+            urls = {
+                "whisperlive": f"ws://127.0.0.1:{args.whisperlive_port}/ws",
+                "gateway_ws": f"ws://127.0.0.1:{args.gateway_port}/ws",
+                "metrics": [
+                    "http://127.0.0.1:9091/metrics/prometheus",
+                    f"http://127.0.0.1:{args.collector_port}/metrics",
+                    f"http://127.0.0.1:{args.gateway_port}/metrics",
+                ],
+            }
+            measured = [procs[name] for name in ("whisperlive", "collector", "gateway")]
+            levels = []
+            for bots in args.levels:
+                level = await run_level(args, bots, measured, procs["stub"], urls, audio, redis_client)
+                levels.append(level)
+                print(json.dumps(level, indent=2))
+        finally:
+            for proc in procs.values():
+                proc.terminate()
+            for proc in procs.values():
+                proc.wait()
+            if args.keep_logs:
+                for name in procs:
+                    print(f"--- {name} log (tail) ---")
+                    with open(os.path.join(log_dir, f"{name}.log"), "rb") as log:
+                        print(log.read()[-4000:].decode("utf-8", "replace"))
+
+    sustained = [level for level in levels if level["sustained"]]
+    summary = {
+        "max_sustained_bots": sustained[-1]["bots"] if sustained else 0,
+        "meetings_per_core": sustained[-1]["meetings_per_core"] if sustained else None,
+        "cpu_count": psutil.cpu_count(),
+        "audio": os.path.basename(args.audio),
+        "duration_s": args.duration,
+        "slo_ms": args.slo_ms,
+        "stub_mode": args.stub_mode,
+        "stub_slots": args.stub_slots,
+        "stub_ms_per_audio_s": args.stub_ms_per_audio_s,
+    }
+    result = {"summary": summary, "levels": levels}
+    print(json.dumps(summary, indent=2))
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(result, json.load(f))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bots", default="4,8", help="Comma-separated concurrent meetings per level")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds each level streams audio")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Seconds excluded from latency figures")
+    parser.add_argument("--drain", type=float, default=5.0, help="Seconds to wait for late updates after a level")
+    parser.add_argument("--slo-ms", type=float, default=5000.0, help="p99 end-to-end latency a sustained level must meet")
+    parser.add_argument("--audio", default=DEFAULT_AUDIO, help="WAV file each bot streams in a loop")
+    parser.add_argument("--immutability-s", type=int, default=5, help="Collector IMMUTABILITY_THRESHOLD, so DB writes show up")
+    parser.add_argument("--stub-mode", choices=("sleep", "cpu"), default="sleep",
+                        help="cpu: the stub burns --stub-ms-per-audio-s of CPU per audio second instead of sleeping")
+    parser.add_argument("--stub-ms-per-audio-s", type=float, default=40.0)
+    parser.add_argument("--stub-slots", type=int, default=4)
+    parser.add_argument("--stub-port", type=int, default=18020)
+    parser.add_argument("--whisperlive-port", type=int, default=18090)
+    parser.add_argument("--collector-port", type=int, default=18021)
+    parser.add_argument("--gateway-port", type=int, default=18022)
+    parser.add_argument("--baseline", help="Earlier --save output to compare against")
+    parser.add_argument("--save", help="Write the results as JSON")
+    parser.add_argument("--keep-logs", action="store_true", help="Print the tail of each service log at the end")
+    args = parser.parse_args()
+    args.levels = [int(n) for n in args.bots.split(",") if n.strip()]
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Deterministic stand-in for the transcription-service API, for benchmarks.
+
+Answers ``POST /v1/audio/transcriptions`` the way the real service does for
+WhisperLive's ``RemoteTranscriber``, without a model. It holds one of
+``--slots`` slots for ``--ms-per-audio-s`` per second of audio and answers
+503 with ``Retry-After`` when ``--max-queue`` requests are already waiting.
+The segments are cut every ``--segment-s`` seconds. Their text is derived
+from a hash of the samples, so the same audio always gives the same words.
+Windows quieter than ``--silence-rms`` get no segments, like the service's
+VAD.
+
+With ``--mode sleep`` (the default) a slot just sleeps, so the stub uses no
+CPU and the benchmark measures only the services' own overhead. With
+``--mode cpu`` a slot does ``--ms-per-audio-s`` of CPU time per audio second
+of dense float math in one of ``--slots`` worker processes, a stand-in for
+inference on the same host. The services then compete with it for cores, and
+a slot takes longer than its budget once the host is saturated, as a real
+model would. Run:
+
+    python testing/e2e_benchmark/stub_transcriber.py --port 18020 --ms-per-audio-s 40
+    python testing/e2e_benchmark/stub_transcriber.py --mode cpu --slots 2 --ms-per-audio-s 100
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+# One BLAS thread per worker, so --slots bounds the cores the cpu mode uses
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, File, Form, UploadFile
+from fastapi.responses import JSONResponse
+
+WORDS = (
+    "budget launch review migration customer roadmap release design metrics team "
+    "deadline schedule feedback priority testing support update contract hiring plan"
+).split()
+
+app = FastAPI()
+app.state.mode = "sleep"
+app.state.workers = None
+app.state.ms_per_audio_s = 40.0
+app.state.segment_s = 3.0
+app.state.silence_rms = 0.003
+app.state.max_queue = 64
+app.state.slots = asyncio.Semaphore(4)
+app.state.waiting = 0
+app.state.requests = 0
+app.state.rejected = 0
+app.state.audio_s = 0.0
+app.state.cpu_s = 0.0
+
+
+def _read_wav(data: bytes):
+    with wave.open(io.BytesIO(data)) as wav:
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        rate = wav.getframerate()
+    return pcm.astype(np.float32) / 32768.0, rate
+
+
+def _burn(cpu_s: float) -> float:
+    """Dense float math until this process has used ``cpu_s`` seconds of CPU; returns the CPU time used."""
+    started = time.process_time()
+    matrix = np.random.default_rng(0).standard_normal((128, 128)).astype(np.float32)
+    while time.process_time() - started < cpu_s:
+        matrix = np.tanh(matrix @ matrix.T * 0.01)
+    return time.process_time() - started
+
+
+def _segments(samples: np.ndarray, rate: int):
+    duration = samples.shape[0] / rate
+    step = int(app.state.segment_s * rate)
+    segments = []
+    for idx, offset in enumerate(range(0, samples.shape[0], step)):
+        chunk = samples[offset:offset + step]
+        if chunk.size == 0 or float(np.sqrt(np.mean(chunk ** 2))) < app.state.silence_rms:
+            continue
+        digest = hashlib.sha256(chunk.tobytes()).digest()
+        text = " " + " ".join(WORDS[b % len(WORDS)] for b in digest[:6]) + "."
+        start = offset / rate
+        end = min(duration, (offset + step) / rate)
+        segments.append({
+            "id": idx, "seek": 0, "start": start, "end": end, "text": text, "tokens": [],
+            "temperature": 0.0, "avg_logprob": -0.2, "compression_ratio": 1.2, "no_speech_prob": 0.01,
+            "audio_start": start, "audio_end": end,
+        })
+    return duration, segments
+
+
+@app.post("/v1/audio/transcriptions")
+async def transcriptions(file: UploadFile = File(...), language: str = Form(None)):
+    if app.state.waiting >= app.state.max_queue:
+        app.state.rejected += 1
+        return JSONResponse({"detail": "busy"}, status_code=503, headers={"Retry-After": "1"})
+    samples, rate = _read_wav(await file.read())
+    duration, segments = _segments(samples, rate)
+
+    app.state.waiting += 1
+    try:
+        await app.state.slots.acquire()
+    finally:
+        app.state.waiting -= 1
+    try:
+        cost_s = duration * app.state.ms_per_audio_s / 1000
+        if app.state.mode == "cpu":
+            loop = asyncio.get_running_loop()
+            used_s = await loop.run_in_executor(app.state.workers, _burn, cost_s)
+            app.state.cpu_s += used_s
+        else:
+            await asyncio.sleep(cost_s)
+    finally:
+        app.state.slots.release()
+    app.state.requests += 1
+    app.state.audio_s += duration
+    return {
+        "text": "".join(s["text"] for s in segments).strip(),
+        "language": language or "en",
+        "language_probability": 0.99,
+        "duration": segments[-1]["end"] if segments else 0.0,
+        "segments": segments,
+    }
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/stats")
+async def stats():
+    return {"requests": app.state.requests, "rejected": app.state.rejected, "audio_s": round(app.state.audio_s, 3),
+            "cpu_s": round(app.state.cpu_s, 3)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18020)
+    parser.add_argument("--mode", choices=("sleep", "cpu"), default="sleep",
+                        help="sleep: slots only wait; cpu: slots burn CPU in worker processes")
+    parser.add_argument("--slots", type=int, default=4)
+    parser.add_argument("--ms-per-audio-s", type=float, default=40.0)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--segment-s", type=float, default=3.0)
+    parser.add_argument("--silence-rms", type=float, default=0.003)
+    args = parser.parse_args()
+    app.state.mode = args.mode
+    if args.mode == "cpu":
+        # spawn, not fork: forked workers would inherit the listening socket
+        app.state.workers = ProcessPoolExecutor(max_workers=args.slots, mp_context=multiprocessing.get_context("spawn"))
+    app.state.ms_per_audio_s = args.ms_per_audio_s
+    app.state.max_queue = args.max_queue
+    app.state.segment_s = args.segment_s
+    app.state.silence_rms = args.silence_rms
+    app.state.slots = asyncio.Semaphore(args.slots)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+    if app.state.workers is not None:
+        app.state.workers.shutdown(cancel_futures=True)
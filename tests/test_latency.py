@@ -0,0 +1,54 @@
+"""Tests for the shared latency histograms."""
+import ast
+import inspect
+from pathlib import Path
+
+SERVICES = Path(__file__).resolve().parents[1] / "services"
+SCHEDULER = SERVICES / "transcription-service" / "scheduler.py"
+WHISPERLIVE_COPY = SERVICES / "WhisperLive" / "whisper_live" / "stage_latency.py"
+
+
+def _class_source(tree: ast.Module, name: str) -> str:
+    node = next(n for n in tree.body if isinstance(n, ast.ClassDef) and n.name == name)
+    return ast.dump(node)
+
+
+def test_transcription_service_histogram_matches_shared_one():
+    from shared_models import latency
+    shared = ast.parse(inspect.getsource(latency))
+    copy = ast.parse(SCHEDULER.read_text())
+    assert _class_source(copy, "Histogram") == _class_source(shared, "Histogram")
+
+
+def test_whisperlive_copy_matches_shared_one():
+    from shared_models import latency
+    shared = ast.parse(inspect.getsource(latency))
+    copy = ast.parse(WHISPERLIVE_COPY.read_text())
+    for name in ("Histogram", "StageLatency"):
+        assert _class_source(copy, name) == _class_source(shared, name)
+    buckets = next(n.value for n in copy.body if isinstance(n, ast.Assign) and n.targets[0].id == "LATENCY_BUCKETS")
+    assert ast.literal_eval(buckets) == latency.LATENCY_BUCKETS
+
+
+def test_histogram_renders_cumulative_buckets():
+    from shared_models.latency import Histogram
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+    assert histogram.render("x", 'stage="s"') == [
+        'x_bucket{stage="s",le="0.1"} 1',
+        'x_bucket{stage="s",le="1.0"} 3',
+        'x_bucket{stage="s",le="+Inf"} 4',
+        'x_sum{stage="s"} 4.250000',
+        'x_count{stage="s"} 4',
+    ]
+
+
+def test_histogram_quantile_between_scrapes():
+    from shared_models.latency import histogram_quantile
+    before = {0.1: 10.0, 1.0: 10.0, float("inf"): 10.0}
+    after = {0.1: 10.0, 1.0: 20.0, float("inf"): 30.0}
+    # 20 new observations: 10 in (0.1, 1.0], 10 above 1.0
+    assert histogram_quantile(before, after, 25) == 0.1 + 0.9 * 0.5
+    assert histogram_quantile(before, after, 99) == 1.0
+    assert histogram_quantile(after, after, 50) is None
@@ -0,0 +1,46 @@
+"""Tests for the monthly partitions of the transcriptions table."""
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+
+def test_partition_ddl_covers_one_month():
+    from shared_models.partitions import create_partition_sql, partition_name
+    assert partition_name(datetime(2026, 12, 1)) == "transcriptions_p2026_12"
+    assert create_partition_sql(datetime(2026, 12, 17, 8, 30)) == (
+        "CREATE TABLE IF NOT EXISTS transcriptions_p2026_12 PARTITION OF transcriptions "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+def test_partition_months_span_year_boundary():
+    from shared_models.partitions import partition_months
+    months = partition_months(datetime(2026, 11, 20), datetime(2027, 1, 5))
+    assert months == [datetime(2026, 11, 1), datetime(2026, 12, 1), datetime(2027, 1, 1)]
+
+
+def test_partitions_before_keeps_cutoff_month_and_other_tables():
+    from shared_models.partitions import partitions_before
+    names = ["transcriptions_p2026_08", "transcriptions_p2026_09", "transcriptions_p2026_10", "transcriptions_default"]
+    assert partitions_before(names, datetime(2026, 10, 19)) == ["transcriptions_p2026_08", "transcriptions_p2026_09"]
+
+
+def test_transcriptions_table_is_range_partitioned_on_meeting_created_at():
+    from shared_models.models import Transcription
+    ddl = str(CreateTable(Transcription.__table__).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (id, meeting_created_at)" in ddl
+    assert "PARTITION BY RANGE (meeting_created_at)" in ddl
+
+
+def test_partition_clause_filters_on_meeting_key():
+    from shared_models.partitions import transcription_partition_clause
+    clause = transcription_partition_clause(SimpleNamespace(id=7, created_at=datetime(2026, 10, 2, 9, 0)))
+    sql = str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "transcriptions.meeting_id = 7" in sql
+    assert "transcriptions.meeting_created_at = '2026-10-02 09:00:00'" in sql
+
+    missing = transcription_partition_clause(SimpleNamespace(id=8, created_at=None))
+    sql = str(missing.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "transcriptions.meeting_created_at = '1970-01-01 00:00:00'" in sql
@@ -0,0 +1,141 @@
+"""Tests for the per-user meeting usage rollup.
+
+The trigger and backfill tests need the Postgres of ``DB_*``. They run in a
+scratch schema inside one transaction that is rolled back, and are skipped
+when no database is reachable.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+
+def test_peak_hours_skip_hours_without_meetings():
+    from shared_models.models import UserUsageStats
+    hours = [0] * 24
+    hours[9], hours[14], hours[16], hours[20] = 5, 7, 1, 3
+    assert UserUsageStats(user_id=1, hour_counts=hours).peak_hours() == [14, 9, 20]
+    assert UserUsageStats(user_id=1, hour_counts=[0] * 24).peak_hours() == []
+
+
+def test_most_used_platform_ignores_emptied_platforms():
+    from shared_models.models import UserUsageStats
+    usage = UserUsageStats(user_id=1, platform_counts={"zoom": 0, "google_meet": 2, "teams": 1})
+    assert usage.most_used_platform() == "google_meet"
+    assert UserUsageStats(user_id=1, platform_counts={"zoom": 0}).most_used_platform() is None
+
+
+def _in_scratch_schema(scenario):
+    """Runs ``scenario(conn)`` against every table of the models in a schema that is rolled back."""
+    if not os.environ.get("DB_HOST"):
+        pytest.skip("DB_HOST not set")
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from shared_models.models import Base
+
+    url = "postgresql+asyncpg://{}:{}@{}:{}/{}".format(*(os.environ.get(key, "") for key in (
+        "DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_NAME")))
+    connect_args = {"ssl": False} if os.environ.get("DB_SSL_MODE") == "disable" else {}
+
+    async def run():
+        engine = create_async_engine(url, connect_args=connect_args)
+        try:
+            async with engine.connect() as conn:
+                transaction = await conn.begin()
+                schema = f"test_usage_{uuid.uuid4().hex[:8]}"
+                await conn.execute(text(f"CREATE SCHEMA {schema}"))
+                await conn.execute(text(f"SET LOCAL search_path TO {schema}"))
+                await conn.run_sync(Base.metadata.create_all)
+                try:
+                    return await scenario(conn)
+                finally:
+                    await transaction.rollback()
+        finally:
+            await engine.dispose()
+
+    try:
+        return asyncio.run(run())
+    except (OSError, ConnectionError) as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+
+
+async def _user(conn, email):
+    return (await conn.execute(text("INSERT INTO users (email) VALUES (:email) RETURNING id"), {"email": email})).scalar()
+
+
+async def _meeting(conn, user_id, platform="google_meet", created_at=datetime(2026, 10, 19, 9, 30)):
+    return (await conn.execute(text(
+        "INSERT INTO meetings (user_id, platform, status, data, created_at) "
+        "VALUES (:user_id, :platform, 'requested', '{}', :created_at) RETURNING id"
+    ), {"user_id": user_id, "platform": platform, "created_at": created_at})).scalar()
+
+
+async def _set(conn, meeting_id, assignments):
+    await conn.execute(text(f"UPDATE meetings SET {assignments} WHERE id = :id"), {"id": meeting_id})
+
+
+async def _stats(conn, user_id):
+    row = (await conn.execute(text(
+        "SELECT total_meetings, completed_meetings, failed_meetings, active_meetings, completed_duration_s, "
+        "completed_with_duration, hour_counts[10], platform_counts FROM user_usage_stats WHERE user_id = :user_id"
+    ), {"user_id": user_id})).one()
+    return tuple(row)
+
+
+async def _daily(conn, user_id):
+    rows = await conn.execute(text(
+        "SELECT day::text, meetings, completed_meetings, failed_meetings, completed_duration_s "
+        "FROM user_usage_daily WHERE user_id = :user_id ORDER BY day"
+    ), {"user_id": user_id})
+    return [tuple(row) for row in rows]
+
+
+async def _row_version(conn, user_id):
+    return (await conn.execute(text("SELECT ctid::text FROM user_usage_stats WHERE user_id = :user_id"),
+                               {"user_id": user_id})).scalar()
+
+
+def test_trigger_counts_outcomes_and_skips_joining_steps():
+    async def scenario(conn):
+        user_id = await _user(conn, "a@example.com")
+        done, failed, gone = [await _meeting(conn, user_id) for _ in range(3)]
+        await _set(conn, gone, "platform = 'zoom'")
+        version = await _row_version(conn, user_id)
+
+        for step in ("joining", "awaiting_admission", "active"):
+            await _set(conn, done, f"status = '{step}'")
+        await _set(conn, done, "start_time = '2026-10-19 10:00'")
+        untouched = await _row_version(conn, user_id) == version
+
+        await _set(conn, done, "status = 'completed', end_time = '2026-10-19 10:30'")
+        await _set(conn, failed, "status = 'failed'")
+        await conn.execute(text("DELETE FROM meetings WHERE id = :id"), {"id": gone})
+        return untouched, await _stats(conn, user_id), await _daily(conn, user_id)
+
+    untouched, stats, daily = _in_scratch_schema(scenario)
+    assert untouched
+    # total, completed, failed, active, duration, timed, meetings at 09:xx, platforms
+    assert stats == (2, 1, 1, 0, 1800.0, 1, 2, {"google_meet": 2, "zoom": 0})
+    assert daily == [("2026-10-19", 2, 1, 1, 1800.0)]
+
+
+def test_backfill_matches_the_trigger():
+    from shared_models.models import USER_USAGE_DAILY_BACKFILL, USER_USAGE_STATS_BACKFILL
+
+    async def scenario(conn):
+        user_id = await _user(conn, "b@example.com")
+        for day, status in (("2026-10-18", "completed"), ("2026-10-19", "active"), ("2026-10-19", "failed")):
+            meeting_id = await _meeting(conn, user_id, created_at=datetime.fromisoformat(f"{day} 09:15"))
+            await _set(conn, meeting_id, f"status = '{status}', start_time = '{day} 10:00', end_time = '{day} 10:20'")
+        maintained = await _stats(conn, user_id), await _daily(conn, user_id)
+
+        await conn.execute(text("TRUNCATE user_usage_stats, user_usage_daily"))
+        await conn.execute(text(USER_USAGE_STATS_BACKFILL))
+        await conn.execute(text(USER_USAGE_DAILY_BACKFILL))
+        return maintained, (await _stats(conn, user_id), await _daily(conn, user_id))
+
+    maintained, backfilled = _in_scratch_schema(scenario)
+    assert backfilled == maintained
+    assert maintained[0][:6] == (3, 1, 1, 1, 1200.0, 1)